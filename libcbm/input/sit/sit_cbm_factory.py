@@ -69,6 +69,24 @@ class EventSort(Enum):
 def initialize_inventory(
     sit: SIT, backend_type: BackendType = BackendType.pandas
 ) -> Tuple[DataFrame, DataFrame]:
+    """Converts the SIT inventory to the classifiers and inventory
+    dataframes used by CBM.
+
+    If the SIT inventory is chunked, and the dask backend type is
+    specified, the result is lazy: each inventory chunk is converted only
+    when the rows of its partition are computed, see
+    :py:meth:`libcbm.storage.backends.dask_backend.DaskDataFrameBackend.get_partition`.
+    For any other backend type the converted chunks are concatenated in
+    memory.
+
+    Args:
+        sit (SIT): sit instance as returned by :py:func:`load_sit`
+        backend_type (BackendType, optional): the backend type of the
+            result. Defaults to BackendType.pandas.
+
+    Returns:
+        Tuple[DataFrame, DataFrame]: the classifiers and inventory
+    """
     if not sit.sit_data.chunked_inventory:
         pd_classifiers, pd_inventory = _initialize_inventory(
             sit.sit_mapping,
@@ -83,15 +101,118 @@ def initialize_inventory(
             )
         elif backend_type == backend_type.numpy:
             raise NotImplementedError()
+        elif backend_type == BackendType.dask:
+            return (
+                dataframe.convert_dataframe_backend(
+                    dataframe.from_pandas(pd_classifiers), backend_type
+                ),
+                dataframe.convert_dataframe_backend(
+                    dataframe.from_pandas(pd_inventory), backend_type
+                ),
+            )
     else:
-        for inventory in sit.sit_data.inventory:
-            classifiers_chunk, inventory_chunk = _initialize_inventory(
+        classifiers, inventory = _initialize_chunked_inventory(sit)
+        if backend_type == BackendType.dask:
+            return classifiers, inventory
+        return (
+            dataframe.convert_dataframe_backend(classifiers, backend_type),
+            dataframe.convert_dataframe_backend(inventory, backend_type),
+        )
+
+
+def _initialize_chunked_inventory(sit: SIT) -> Tuple[DataFrame, DataFrame]:
+    """Converts a chunked SIT inventory to lazy dask backed classifiers and
+    inventory dataframes, with one partition for each chunk.  The first
+    chunk is converted immediately to find the column types, which are
+    promoted with the types of the columns copied from the remaining
+    chunks.  Generated inventory ids are numbered across all chunks.
+    """
+    import dask
+    from libcbm.storage.backends import dask_backend
+
+    chunks = list(sit.sit_data.inventory)
+    if not chunks:
+        raise ValueError("chunked inventory has no chunks")
+    offsets = np.cumsum([0] + [len(c.index) for c in chunks[:-1]])
+    first_classifiers, first_inventory = _initialize_inventory(
+        sit.sit_mapping,
+        sit.sit_data.classifiers,
+        sit.sit_data.classifier_values,
+        chunks[0],
+    )
+    dtypes = (
+        first_classifiers.dtypes.to_dict(),
+        _promote_inventory_dtypes(first_inventory.dtypes.to_dict(), chunks),
+    )
+    convert = dask.delayed(_initialize_inventory_chunk, nout=2, pure=True)
+    classifiers_partitions = []
+    inventory_partitions = []
+    for i, inventory in enumerate(chunks):
+        if i == 0:
+            classifiers_chunk = dask.delayed(first_classifiers)
+            inventory_chunk = dask.delayed(first_inventory)
+        else:
+            classifiers_chunk, inventory_chunk = convert(
+                i,
+                dtypes,
                 sit.sit_mapping,
                 sit.sit_data.classifiers,
                 sit.sit_data.classifier_values,
-                sit.sit_data.inventory,
+                inventory,
+                int(offsets[i]),
             )
-            # TODO: initialize dask backend
+        n_rows = len(inventory.index)
+        classifiers_partitions.append((classifiers_chunk, n_rows))
+        inventory_partitions.append((inventory_chunk, n_rows))
+    return (
+        dask_backend.from_delayed(classifiers_partitions, dtypes[0]),
+        dask_backend.from_delayed(inventory_partitions, dtypes[1]),
+    )
+
+
+def _promote_inventory_dtypes(
+    dtypes: dict[str, np.dtype], chunks: list[pd.DataFrame]
+) -> dict[str, np.dtype]:
+    """Promote the specified converted inventory column types with the
+    types of the columns which are copied unchanged from each SIT
+    inventory chunk, so that for example an integer age column in the
+    first chunk becomes float if a later chunk has float ages.
+    """
+    result = dict(dtypes)
+    for col, dtype in dtypes.items():
+        chunk_dtypes = [c[col].dtype for c in chunks if col in c.columns]
+        if all(isinstance(d, np.dtype) for d in [dtype] + chunk_dtypes):
+            result[col] = np.result_type(dtype, *chunk_dtypes)
+    return result
+
+
+def _initialize_inventory_chunk(
+    chunk_index: int,
+    dtypes: Tuple[dict[str, np.dtype], dict[str, np.dtype]],
+    *args,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Converts one chunk of a chunked SIT inventory with
+    :py:func:`_initialize_inventory`, and checks that the converted
+    columns can be stored with the column types of the chunked result.
+
+    Raises:
+        ValueError: a converted column type cannot be safely cast to the
+            type of the chunked result, for example a classifier column
+            with missing values in a later chunk.
+    """
+    result = _initialize_inventory(*args)
+    for df, df_dtypes in zip(result, dtypes):
+        for col, dtype in df_dtypes.items():
+            col_dtype = df[col].dtype
+            if isinstance(col_dtype, np.dtype) and not np.can_cast(
+                col_dtype, dtype
+            ):
+                raise ValueError(
+                    f"column '{col}' of inventory chunk {chunk_index} has "
+                    f"type {col_dtype}, which cannot be converted to "
+                    f"the type {dtype} of the preceding chunks"
+                )
+    return result
 
 
 def _initialize_inventory(
@@ -99,11 +220,15 @@ def _initialize_inventory(
     sit_classifiers: pd.DataFrame,
     sit_classifier_values: pd.DataFrame,
     sit_inventory: pd.DataFrame,
+    inventory_id_offset: int = 0,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Converts SIT inventory data input for CBM
 
     Args:
         sit (object): sit instance as returned by :py:func:`load_sit`
+        inventory_id_offset (int, optional): if the SIT inventory has no
+            inventory_id column, the generated ids start after this value.
+            Defaults to 0.
 
     Returns:
         tuple: classifiers, inventory pandas.DataFrame pair for CBM use
@@ -138,7 +263,10 @@ def _initialize_inventory(
     if "inventory_id" in sit_inventory:
         inventory_id = sit_inventory["inventory_id"]
     else:
-        inventory_id = np.arange(1, len(sit_inventory.index) + 1)
+        inventory_id = np.arange(
+            inventory_id_offset + 1,
+            inventory_id_offset + len(sit_inventory.index) + 1,
+        )
     data = {
         "inventory_id": inventory_id,
         "age": sit_inventory["age"],
@@ -10,6 +10,17 @@ from libcbm.input.sit import sit_format
 from typing import Callable
 
 
+def _factorize(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Encode the specified values as integer codes into an array of the
+    unique values, where missing values are encoded as the final element
+    of the unique values.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = np.append(np.asarray(uniques, dtype=object), np.nan)
+    codes = np.where(codes < 0, uniques.shape[0] - 1, codes)
+    return codes, uniques
+
+
 class SITMapping:
     def __init__(self, config: dict, sit_cbm_defaults: SITCBMDefaults):
         self.config = config
@@ -109,19 +120,12 @@ class SITMapping:
                     "default species value."
                 )
 
-        default_species_map = {
-            row["classifier_value"]: row["default_species"]
-            for _, row in pd.DataFrame(
-                {
-                    "classifier_value": species_values[
-                        "name_classifier_value"
-                    ],
-                    "default_species": species_values["description"].map(
-                        get_default_species
-                    ),
-                }
-            ).iterrows()
-        }
+        default_species_map = dict(
+            zip(
+                species_values["name_classifier_value"],
+                species_values["description"].map(get_default_species),
+            )
+        )
         # check for values that are defined in the species series but not
         # defined in the default_species_map
         undefined_species = np.setdiff1d(
@@ -145,6 +149,36 @@ class SITMapping:
 
         return get_mapped_value
 
+    def _get_spatial_unit_ids(
+        self, admin_boundary: pd.Series, eco_boundary: pd.Series
+    ) -> np.ndarray:
+        """Get the spatial unit id for each pair of the specified default
+        admin and eco boundary names.  The spatial unit id of each distinct
+        pair is looked up once, and assigned to the pair's rows by its
+        index in a table of the distinct pairs.
+        """
+        admin_codes, admin_uniques = _factorize(admin_boundary)
+        eco_codes, eco_uniques = _factorize(eco_boundary)
+        n_eco = eco_uniques.shape[0]
+        pair_codes, pair_index = np.unique(
+            admin_codes.astype("int64") * n_eco + eco_codes,
+            return_inverse=True,
+        )
+        spatial_unit_ids = np.empty(pair_codes.shape[0], dtype="int64")
+        for i_pair, pair_code in enumerate(pair_codes):
+            admin = admin_uniques[pair_code // n_eco]
+            eco = eco_uniques[pair_code % n_eco]
+            try:
+                spatial_unit_ids[i_pair] = (
+                    self.sit_cbm_defaults.get_spatial_unit_id(admin, eco)
+                )
+            except KeyError:
+                raise KeyError(
+                    "The specified administrative/ecological boundary "
+                    f"combination does not exist: '{admin}', '{eco}'"
+                )
+        return spatial_unit_ids[pair_index]
+
     def _get_spatial_unit_joined_admin_eco(
         self,
         inventory: pd.DataFrame,
@@ -170,33 +204,28 @@ class SITMapping:
         spu_values = merged_classifiers.loc[
             merged_classifiers["name_classifier"] == spu_classifier
         ]
-        default_spu_map = {
-            row["classifier_value"]: row["default_spatial_unit"]
-            for _, row in pd.DataFrame(
-                {
-                    "classifier_value": spu_values["name_classifier_value"],
-                    "default_spatial_unit": spu_values["description"].map(
-                        self._get_mapping_error_handling_function(
-                            spu_map,
-                            error_fmt="specified classifier value description "
-                            "'{}' not found in spatial unit map",
-                        )
-                    ),
-                }
-            ).iterrows()
-        }
-        output = []
-        for admin, eco in inventory[spu_classifier].map(default_spu_map):
-            try:
-                output.append(
-                    self.sit_cbm_defaults.get_spatial_unit_id(admin, eco)
-                )
-            except KeyError:
-                raise KeyError(
-                    "The specified administrative/ecological boundary "
-                    f"combination does not exist: '{admin}', '{eco}'"
-                )
-        return pd.Series(output)
+        default_spu_map = dict(
+            zip(
+                spu_values["name_classifier_value"],
+                spu_values["description"].map(
+                    self._get_mapping_error_handling_function(
+                        spu_map,
+                        error_fmt="specified classifier value description "
+                        "'{}' not found in spatial unit map",
+                    )
+                ),
+            )
+        )
+        # the admin and eco boundaries are found for each distinct
+        # classifier value rather than for each inventory row
+        value_codes, values = _factorize(inventory[spu_classifier])
+        admin_eco = [default_spu_map.get(x, (np.nan, np.nan)) for x in values]
+        return pd.Series(
+            self._get_spatial_unit_ids(
+                pd.Series([x[0] for x in admin_eco]).take(value_codes),
+                pd.Series([x[1] for x in admin_eco]).take(value_codes),
+            )
+        )
 
     def _get_spatial_unit_separate_admin_eco(
         self,
@@ -226,66 +255,44 @@ class SITMapping:
             merged_classifiers["name_classifier"] == admin_classifier
         ]
 
-        default_admin_map = {
-            row["classifier_value"]: row["default_admin_boundary"]
-            for _, row in pd.DataFrame(
-                {
-                    "classifier_value": admin_values["name_classifier_value"],
-                    "default_admin_boundary": admin_values["description"].map(
-                        self._get_mapping_error_handling_function(
-                            admin_map,
-                            error_fmt="specified classifier value description "
-                            "'{}' not found in admin boundary map",
-                        )
-                    ),
-                }
-            ).iterrows()
-        }
+        default_admin_map = dict(
+            zip(
+                admin_values["name_classifier_value"],
+                admin_values["description"].map(
+                    self._get_mapping_error_handling_function(
+                        admin_map,
+                        error_fmt="specified classifier value description "
+                        "'{}' not found in admin boundary map",
+                    )
+                ),
+            )
+        )
         eco_classifier = sit_format.adjust_classifier_name(
             self.config["spatial_units"]["eco_classifier"]
         )
         eco_values = merged_classifiers.loc[
             merged_classifiers["name_classifier"] == eco_classifier
         ]
-        default_eco_map = {
-            row["classifier_value"]: row["default_eco_boundary"]
-            for _, row in pd.DataFrame(
-                {
-                    "classifier_value": eco_values["name_classifier_value"],
-                    "default_eco_boundary": eco_values["description"].map(
-                        self._get_mapping_error_handling_function(
-                            eco_map,
-                            error_fmt="specified classifier value description "
-                            "'{}' not found in ecological boundary map",
-                        )
-                    ),
-                }
-            ).iterrows()
-        }
-
-        def spu_map_func(row: pd.Series) -> int:
-            try:
-                return self.sit_cbm_defaults.get_spatial_unit_id(
-                    row.default_admin_boundary, row.default_eco_boundary
-                )
-            except KeyError:
-                raise KeyError(
-                    "The specified administrative/ecological boundary "
-                    "combination does not exist: "
-                    f"'{row.default_admin_boundary}', "
-                    f"'{row.default_eco_boundary}'"
-                )
-
-        return pd.DataFrame(
-            {
-                "default_admin_boundary": inventory[admin_classifier].map(
-                    default_admin_map
-                ),
-                "default_eco_boundary": inventory[eco_classifier].map(
-                    default_eco_map
+        default_eco_map = dict(
+            zip(
+                eco_values["name_classifier_value"],
+                eco_values["description"].map(
+                    self._get_mapping_error_handling_function(
+                        eco_map,
+                        error_fmt="specified classifier value description "
+                        "'{}' not found in ecological boundary map",
+                    )
                 ),
-            }
-        ).apply(spu_map_func, axis=1)
+            )
+        )
+
+        return pd.Series(
+            self._get_spatial_unit_ids(
+                inventory[admin_classifier].map(default_admin_map),
+                inventory[eco_classifier].map(default_eco_map),
+            ),
+            index=inventory.index,
+        )
 
     def get_spatial_unit(
         self,
@@ -461,19 +468,14 @@ class SITMapping:
                 f"mapped to a default type: {missing_map_entries}"
             )
 
-        default_nonforest_type_map = {
-            row["classifier_value"]: row["default_species"]
-            for _, row in pd.DataFrame(
-                {
-                    "classifier_value": non_forest_classifier_values[
-                        "name_classifier_value"
-                    ],
-                    "default_species": non_forest_classifier_values[
-                        "description"
-                    ].map(non_forest_map),
-                }
-            ).iterrows()
-        }
+        default_nonforest_type_map = dict(
+            zip(
+                non_forest_classifier_values["name_classifier_value"],
+                non_forest_classifier_values["description"].map(
+                    non_forest_map
+                ),
+            )
+        )
 
         undefined_values = np.setdiff1d(
             inventory[non_forest_classifier].unique(),
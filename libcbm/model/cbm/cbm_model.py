@@ -10,7 +10,13 @@ from libcbm.wrapper.libcbm_wrapper import LibCBMWrapper
 from libcbm.wrapper.cbm.cbm_wrapper import CBMWrapper
 from libcbm.storage.series import Series
 from libcbm.storage.series import SeriesDef
+from libcbm.storage import series
 from libcbm.storage import dataframe
+from libcbm.storage.dataframe import DataFrame
+from libcbm.model.model_definition import spinup_cache
+from libcbm.model.model_definition.spinup_cache import SpinupCache
+import numpy as np
+import pandas as pd
 
 
 def get_op_names() -> list[str]:
@@ -50,6 +56,56 @@ def get_op_processes() -> dict[str, int]:
     }
 
 
+def _take_spinup_vars(cbm_vars: CBMVariables, indices: Series) -> CBMVariables:
+    """Gather the specified rows of spinup variables into a new, smaller
+    instance of spinup variables.
+    """
+    return CBMVariables(
+        pools=cbm_vars.pools.take(indices),
+        flux=None,
+        classifiers=cbm_vars.classifiers.take(indices),
+        state=cbm_vars.state.take(indices),
+        inventory=cbm_vars.inventory.take(indices),
+        parameters=cbm_vars.parameters.take(indices),
+    )
+
+
+def _scatter_spinup_vars(
+    src: CBMVariables, dst: CBMVariables, indices: Series = None
+) -> None:
+    """Copy the pools and state of the spinup variables gathered by
+    :py:func:`_take_spinup_vars` back to the specified rows of the
+    original spinup variables.  If indices is None, all rows are copied.
+    """
+    dataframe.assign_rows(src.pools, dst.pools, indices)
+    dataframe.assign_rows(src.state, dst.state, indices)
+
+
+_production_columns = [
+    "DisturbanceSoftProduction",
+    "DisturbanceHardProduction",
+    "DisturbanceDOMProduction",
+    "Total",
+]
+
+
+def _get_spinup_key_data(cbm_vars: CBMVariables) -> pd.DataFrame:
+    """Get the values which determine the spinup result of each stand.
+    Since pools are computed as area densities, the area is excluded.
+    """
+    key_data = {}
+    for table_name, table in [
+        ("classifiers", cbm_vars.classifiers),
+        ("inventory", cbm_vars.inventory),
+        ("parameters", cbm_vars.parameters),
+    ]:
+        for col in table.columns:
+            if table_name == "inventory" and col == "area":
+                continue
+            key_data[f"{table_name}.{col}"] = table[col].to_numpy()
+    return pd.DataFrame(key_data)
+
+
 class CBM:
     """The CBM model.
 
@@ -78,10 +134,39 @@ class CBM:
         self.pool_codes = pool_codes
         self.flux_indicator_codes = flux_indicator_codes
 
+    def _init_spinup_ops(self, cbm_vars: CBMVariables) -> dict[str, int]:
+        n_stands = cbm_vars.pools.n_rows
+
+        ops = {
+            x: self.compute_functions.allocate_op(n_stands)
+            for x in self.op_names
+        }
+
+        self.model_functions.get_turnover_ops(
+            ops["snag_turnover"], ops["biomass_turnover"], cbm_vars.inventory
+        )
+
+        self.model_functions.get_decay_ops(
+            ops["dom_decay"],
+            ops["slow_decay"],
+            ops["slow_mixing"],
+            cbm_vars.inventory,
+            cbm_vars.parameters,
+            historical_mean_annual_temp=True,
+        )
+        return ops
+
+    def _free_ops(self, ops: dict[str, int]) -> None:
+        for op_name in self.op_names:
+            self.compute_functions.free_op(ops[op_name])
+
     def spinup(
         self,
         cbm_vars: CBMVariables,
         reporting_func: Callable[[int, CBMVariables], None] = None,
+        compaction_threshold: float = None,
+        deduplicate: bool = False,
+        cache: SpinupCache = None,
     ) -> CBMVariables:
         """Run the CBM-CFS3 spinup function on an array of stands,
         initializing the specified variables.
@@ -94,6 +179,29 @@ class CBM:
             reporting_func (function): a function which accepts the spinup
                 iteration spinup variables for reporting results by spinup
                 iteration. The function returns None.
+            compaction_threshold (float, optional): if specified, whenever
+                the fraction of stands still running spinup falls to or
+                below this value, the unfinished stands are gathered into
+                a smaller set of variables on which the remaining spinup
+                iterations are computed, and the results are copied back to
+                cbm_vars when spinup finishes.  This reduces the cost of
+                spinup for inventories where a small number of stands
+                require many more iterations than the others.  Must be
+                between 0 and 1, and cannot be used in combination with
+                reporting_func.  If unspecified all stands are processed
+                at every iteration. Defaults to None.
+            deduplicate (bool, optional): if set to True, spinup is run only
+                once for each unique combination of classifiers, inventory
+                values other than area, and spinup parameters, and the
+                resulting pools and state are copied to all stands sharing
+                the combination. Cannot be used in combination with
+                reporting_func. Defaults to False.
+            cache (SpinupCache, optional): if specified, the spinup results
+                of each unique combination described for `deduplicate` are
+                read from this cache if present, and otherwise computed
+                and stored in the cache.  Implies `deduplicate`. The cache
+                parameter hash must identify the CBM parameters and growth
+                curves used by this instance.  Defaults to None.
 
         Returns:
             CBMVariables: cbm_vars
@@ -103,26 +211,28 @@ class CBM:
             # sense to compute flux and not use reporting func since the result
             # will not be visible
             raise ValueError("flux specified without reporting_func")
+        if deduplicate or cache is not None:
+            if reporting_func is not None:
+                raise ValueError(
+                    "deduplicate and cache cannot be used with reporting_func"
+                )
+            return self._spinup_unique(cbm_vars, compaction_threshold, cache)
+        if compaction_threshold is not None:
+            if reporting_func is not None:
+                raise ValueError(
+                    "compaction_threshold cannot be used with reporting_func"
+                )
+            if not 0 < compaction_threshold < 1:
+                raise ValueError(
+                    "compaction_threshold must be between 0 and 1"
+                )
 
-        n_stands = cbm_vars.pools.n_rows
-
-        ops = {
-            x: self.compute_functions.allocate_op(n_stands)
-            for x in self.op_names
-        }
-
-        self.model_functions.get_turnover_ops(
-            ops["snag_turnover"], ops["biomass_turnover"], cbm_vars.inventory
-        )
+        # the variables on which spinup is computed, and their row indices
+        # in cbm_vars.  These differ from cbm_vars only after compaction.
+        working_vars = cbm_vars
+        working_idx: Series = None
 
-        self.model_functions.get_decay_ops(
-            ops["dom_decay"],
-            ops["slow_decay"],
-            ops["slow_mixing"],
-            cbm_vars.inventory,
-            cbm_vars.parameters,
-            historical_mean_annual_temp=True,
-        )
+        ops = self._init_spinup_ops(working_vars)
 
         op_schedule = [
             "growth",
@@ -139,8 +249,11 @@ class CBM:
         iteration = 0
 
         while True:
+            n_stands = working_vars.pools.n_rows
             n_finished = self.model_functions.advance_spinup_state(
-                cbm_vars.inventory, cbm_vars.state, cbm_vars.parameters
+                working_vars.inventory,
+                working_vars.state,
+                working_vars.parameters,
             )
 
             if n_finished == n_stands:
@@ -149,41 +262,113 @@ class CBM:
             self.model_functions.get_merch_volume_growth_ops(
                 ops["growth"],
                 ops["overmature_decline"],
-                cbm_vars.classifiers,
-                cbm_vars.inventory,
-                cbm_vars.pools,
-                cbm_vars.state,
+                working_vars.classifiers,
+                working_vars.inventory,
+                working_vars.pools,
+                working_vars.state,
             )
 
             self.model_functions.get_disturbance_ops(
-                ops["disturbance"], cbm_vars.inventory, cbm_vars.state
+                ops["disturbance"], working_vars.inventory, working_vars.state
             )
 
-            if cbm_vars.flux is None:
+            if working_vars.flux is None:
                 self.compute_functions.compute_pools(
                     [ops[x] for x in op_schedule],
-                    cbm_vars.pools,
-                    cbm_vars.state["enabled"],
+                    working_vars.pools,
+                    working_vars.state["enabled"],
                 )
             else:
-                cbm_vars.flux.zero()
+                working_vars.flux.zero()
                 self.compute_functions.compute_flux(
                     [ops[x] for x in op_schedule],
                     [self.op_processes[x] for x in op_schedule],
-                    cbm_vars.pools,
-                    cbm_vars.flux,
-                    cbm_vars.state["enabled"],
+                    working_vars.pools,
+                    working_vars.flux,
+                    working_vars.state["enabled"],
                 )
 
             self.model_functions.end_spinup_step(
-                cbm_vars.pools, cbm_vars.state
+                working_vars.pools, working_vars.state
             )
+
+            # compaction is done after end_spinup_step so that stands which
+            # finished during this iteration have their final state
+            if (
+                compaction_threshold is not None
+                and n_stands - n_finished <= compaction_threshold * n_stands
+            ):
+                if working_idx is not None:
+                    _scatter_spinup_vars(working_vars, cbm_vars, working_idx)
+                active_idx = working_vars.state["enabled"].indices_nonzero()
+                working_vars = _take_spinup_vars(working_vars, active_idx)
+                working_idx = (
+                    active_idx
+                    if working_idx is None
+                    else working_idx.take(active_idx)
+                )
+                self._free_ops(ops)
+                ops = self._init_spinup_ops(working_vars)
+
             if reporting_func:
-                reporting_func(iteration, cbm_vars)
+                reporting_func(iteration, working_vars)
             iteration = iteration + 1
 
-        for op_name in self.op_names:
-            self.compute_functions.free_op(ops[op_name])
+        if working_idx is not None:
+            _scatter_spinup_vars(working_vars, cbm_vars, working_idx)
+        self._free_ops(ops)
+        return cbm_vars
+
+    def _spinup_unique(
+        self,
+        cbm_vars: CBMVariables,
+        compaction_threshold: float,
+        cache: SpinupCache,
+    ) -> CBMVariables:
+        key_data = _get_spinup_key_data(cbm_vars)
+        unique_idx, inverse = spinup_cache.unique_rows(key_data)
+        unique_vars = _take_spinup_vars(
+            cbm_vars, series.from_numpy("unique_idx", unique_idx)
+        )
+        if cache is None:
+            self.spinup(unique_vars, compaction_threshold=compaction_threshold)
+        else:
+            unique_key_data = key_data.iloc[unique_idx]
+            found, cached = cache.get(unique_key_data)
+            if found.any():
+                found_idx = series.from_numpy(
+                    "found_idx", np.flatnonzero(found)
+                )
+                for table_name, table in cached.items():
+                    dataframe.assign_rows(
+                        dataframe.convert_dataframe_backend(
+                            dataframe.from_pandas(table),
+                            cbm_vars.pools.backend_type,
+                        ),
+                        getattr(unique_vars, table_name),
+                        found_idx,
+                    )
+            if not found.all():
+                run_idx = series.from_numpy("run_idx", np.flatnonzero(~found))
+                run_vars = _take_spinup_vars(unique_vars, run_idx)
+                self.spinup(
+                    run_vars, compaction_threshold=compaction_threshold
+                )
+                _scatter_spinup_vars(run_vars, unique_vars, run_idx)
+                cache.put(
+                    unique_key_data.iloc[run_idx.to_numpy()],
+                    {
+                        "pools": run_vars.pools.to_pandas(),
+                        "state": run_vars.state.to_pandas(),
+                    },
+                )
+
+        _scatter_spinup_vars(
+            _take_spinup_vars(
+                unique_vars, series.from_numpy("inverse", inverse)
+            ),
+            cbm_vars,
+        )
         return cbm_vars
 
     def init(self, cbm_vars: CBMVariables) -> CBMVariables:
@@ -264,8 +449,9 @@ class CBM:
             eligible (Series, optional): Bit values where True
                 specifies the index is eligible for the disturbance, and
                 false the opposite. In the returned result False indices
-                will be set with 0's.  Specifying None is equivant to an
-                full array of True values. Defaults to None.
+                will be set with 0's, and the disturbance matrices are
+                built for the eligible indices only.  Specifying None is
+                equivant to an full array of True values. Defaults to None.
             density (bool, optional): if set to True the return value is
                 expressed in units of tonnes Carbon/hectare, and if False
                 the return value is expressed in units of tonnes Carbon.
@@ -292,6 +478,13 @@ class CBM:
         # The number of stands is the number of rows in the inventory table.
         n_stands = cbm_vars.inventory.n_rows
 
+        if eligible is not None:
+            eligible_idx = eligible.indices_nonzero()
+            if eligible_idx.length < n_stands:
+                return self._compute_sparse_disturbance_production(
+                    cbm_vars, disturbance_type, eligible_idx, density
+                )
+
         # allocate space for computing the Carbon flows
         disturbance_op = self.compute_functions.allocate_op(n_stands)
 
@@ -364,7 +557,49 @@ class CBM:
         else:
             return df.multiply(cbm_vars.inventory["area"])
 
-    def step_disturbance(self, cbm_vars: CBMVariables) -> CBMVariables:
+    def _compute_sparse_disturbance_production(
+        self,
+        cbm_vars: CBMVariables,
+        disturbance_type: Union[Series, int],
+        eligible_idx: Series,
+        density: bool,
+    ) -> DataFrame:
+        """Compute the disturbance production of the specified subset of
+        stands, so that disturbance matrices and flux are computed for the
+        subset only. The other stands have zero production.
+        """
+        production = dataframe.numeric_dataframe(
+            cols=_production_columns,
+            nrows=cbm_vars.inventory.n_rows,
+            back_end=cbm_vars.inventory.backend_type,
+        )
+        if eligible_idx.length > 0:
+            if isinstance(disturbance_type, Series):
+                disturbance_type = disturbance_type.take(eligible_idx)
+            subset_production = self.compute_disturbance_production(
+                CBMVariables(
+                    pools=cbm_vars.pools.take(eligible_idx),
+                    flux=None,
+                    classifiers=None,
+                    state=None,
+                    inventory=cbm_vars.inventory.take(eligible_idx),
+                    parameters=(
+                        cbm_vars.parameters.take(eligible_idx)
+                        if disturbance_type is None
+                        else None
+                    ),
+                ),
+                disturbance_type,
+            )
+            dataframe.assign_rows(subset_production, production, eligible_idx)
+        if density:
+            return production
+        else:
+            return production.multiply(cbm_vars.inventory["area"])
+
+    def step_disturbance(
+        self, cbm_vars: CBMVariables, sparse: bool = False
+    ) -> CBMVariables:
         """Compute disturbance dynamics and compute disturbance flux on the
         current value of cbm_vars.pools.  The values stored in array
         `cbm_vars.parameters.disturbance_type` determines the disturbance
@@ -379,21 +614,42 @@ class CBM:
 
         Args:
             cbm_vars (CBMVariables): cbm_vars object
+            sparse (bool, optional): if set to True, the disturbance
+                operation is built and computed only for the stands with a
+                `disturbance_type` greater than zero, whose pools and flux
+                are gathered before, and copied back after, the
+                computation.  This is faster when a small proportion of
+                stands are disturbed. Defaults to False.
 
         Returns:
             CBMVariables: cbm_vars
         """
-        n_stands = cbm_vars.pools.n_rows
-        disturbance_op = self.compute_functions.allocate_op(n_stands)
+        if sparse:
+            disturbed_idx = (
+                cbm_vars.parameters["disturbance_type"] > 0
+            ).indices_nonzero()
+            if disturbed_idx.length == 0:
+                return cbm_vars
+            inventory = cbm_vars.inventory.take(disturbed_idx)
+            parameters = cbm_vars.parameters.take(disturbed_idx)
+            pools = cbm_vars.pools.take(disturbed_idx)
+            flux = cbm_vars.flux.take(disturbed_idx)
+        else:
+            inventory = cbm_vars.inventory
+            parameters = cbm_vars.parameters
+            pools = cbm_vars.pools
+            flux = cbm_vars.flux
+
+        disturbance_op = self.compute_functions.allocate_op(pools.n_rows)
         self.model_functions.get_disturbance_ops(
-            disturbance_op, cbm_vars.inventory, cbm_vars.parameters
+            disturbance_op, inventory, parameters
         )
 
         self.compute_functions.compute_flux(
             [disturbance_op],
             [self.op_processes["disturbance"]],
-            cbm_vars.pools,
-            cbm_vars.flux,
+            pools,
+            flux,
             enabled=None,
         )
         # enabled = none on line above is due to a possible bug in CBM3. This
@@ -401,6 +657,9 @@ class CBM:
         # stands can be disturbed despite having all other C-dynamics processes
         # disabled (which happens in peatland)
         self.compute_functions.free_op(disturbance_op)
+        if sparse:
+            dataframe.assign_rows(pools, cbm_vars.pools, disturbed_idx)
+            dataframe.assign_rows(flux, cbm_vars.flux, disturbed_idx)
         return cbm_vars
 
     def step_annual_process(self, cbm_vars: CBMVariables) -> CBMVariables:
@@ -477,7 +736,9 @@ class CBM:
         self.model_functions.end_step(cbm_vars.state)
         return cbm_vars
 
-    def step(self, cbm_vars: CBMVariables) -> CBMVariables:
+    def step(
+        self, cbm_vars: CBMVariables, sparse_disturbance: bool = False
+    ) -> CBMVariables:
         """Run all default cbm step methods.  It is assumed that any
         records in the specified cbm_vars that require the spinup routine
         have been passed into the :py:func:`init` and :py:func:`spinup`
@@ -485,12 +746,15 @@ class CBM:
 
         Args:
             cbm_vars (CBMVariables): cbm_vars object
+            sparse_disturbance (bool, optional): compute disturbances only
+                for disturbed stands. See :py:func:`step_disturbance`.
+                Defaults to False.
 
         Returns:
             CBMVariables: cbm_vars
         """
         cbm_vars = self.step_start(cbm_vars)
-        cbm_vars = self.step_disturbance(cbm_vars)
+        cbm_vars = self.step_disturbance(cbm_vars, sparse_disturbance)
         cbm_vars = self.step_annual_process(cbm_vars)
         cbm_vars = self.step_end(cbm_vars)
         return cbm_vars
@@ -4,6 +4,8 @@ from libcbm.storage import dataframe
 from libcbm.storage.dataframe import DataFrame
 from libcbm.storage import series
 from libcbm.storage.backends import BackendType
+from libcbm.storage.output_sink import OutputSink
+from libcbm.storage.output_sink import InMemorySink
 
 
 def _add_timestep_series(timestep: int, dataframe: DataFrame) -> DataFrame:
@@ -31,19 +33,6 @@ def _add_timestep_series(timestep: int, dataframe: DataFrame) -> DataFrame:
     return dataframe
 
 
-def _concat_timestep_results(
-    timestep: int,
-    running_result: DataFrame,
-    timestep_result: DataFrame,
-    backend_type: BackendType,
-) -> DataFrame:
-    _add_timestep_series(timestep, timestep_result)
-
-    return dataframe.concat_data_frame(
-        [running_result, timestep_result], backend_type
-    )
-
-
 class CBMOutput:
     """
     Initialize CBMOutput
@@ -67,6 +56,13 @@ class CBMOutput:
             :py:class:`libcbm.storage.backends.BackendType`. Defaults to
             `BackendType.numpy` meaning simulation results will be stored
             in memory.
+        sink (OutputSink, optional): the destination for the timestep
+            results, for example
+            :py:class:`libcbm.storage.output_sink.ParquetSink` to write
+            results to disk as they are produced. If unspecified results are
+            accumulated in memory. The result accessors of this class read
+            from the sink, and return DataFrames of the specified
+            `backend_type`. Defaults to None.
     """
 
     def __init__(
@@ -75,17 +71,13 @@ class CBMOutput:
         classifier_map: dict[int, str] = None,
         disturbance_type_map: dict[int, str] = None,
         backend_type: BackendType = BackendType.numpy,
+        sink: OutputSink = None,
     ):
         self._density = density
         self._disturbance_type_map = disturbance_type_map
         self._classifier_map = classifier_map
         self._backend_type = backend_type
-        self._pools: DataFrame = None
-        self._flux: DataFrame = None
-        self._state: DataFrame = None
-        self._classifiers: DataFrame = None
-        self._parameters: DataFrame = None
-        self._area: DataFrame = None
+        self._sink = sink if sink is not None else InMemorySink(backend_type)
 
     @property
     def density(self) -> bool:
@@ -106,35 +98,52 @@ class CBMOutput:
         """get this instance's backend type"""
         return self._backend_type
 
+    @property
+    def sink(self) -> OutputSink:
+        """get this instance's output sink"""
+        return self._sink
+
+    def _get_result(self, name: str) -> DataFrame:
+        result = self._sink.get(name)
+        if result is None:
+            return None
+        return dataframe.convert_dataframe_backend(result, self._backend_type)
+
+    def _append_result(
+        self, name: str, timestep: int, timestep_result: DataFrame
+    ) -> None:
+        _add_timestep_series(timestep, timestep_result)
+        self._sink.append(name, timestep, timestep_result)
+
     @property
     def pools(self) -> DataFrame:
         """get all accumulated pool results"""
-        return self._pools
+        return self._get_result("pools")
 
     @property
     def flux(self) -> DataFrame:
         """get all accumulated flux results"""
-        return self._flux
+        return self._get_result("flux")
 
     @property
     def state(self) -> DataFrame:
         """get all accumulated state results"""
-        return self._state
+        return self._get_result("state")
 
     @property
     def classifiers(self) -> DataFrame:
         """get all accumulated clasifier results"""
-        return self._classifiers
+        return self._get_result("classifiers")
 
     @property
     def parameters(self) -> DataFrame:
         """get all accumulated parameter results"""
-        return self._parameters
+        return self._get_result("parameters")
 
     @property
     def area(self) -> DataFrame:
         """get all accumulated area results"""
-        return self._area
+        return self._get_result("area")
 
     def append_simulation_result(self, timestep: int, cbm_vars: CBMVariables):
         """Append simulation resuls
@@ -148,9 +157,7 @@ class CBMOutput:
             if self._density
             else cbm_vars.pools.multiply(cbm_vars.inventory["area"])
         )
-        self._pools = _concat_timestep_results(
-            timestep, self._pools, timestep_pools, self._backend_type
-        )
+        self._append_result("pools", timestep, timestep_pools)
 
         if cbm_vars.flux is not None and cbm_vars.flux.n_rows > 0:
             timestep_flux = (
@@ -158,9 +165,7 @@ class CBMOutput:
                 if self._density
                 else cbm_vars.flux.multiply(cbm_vars.inventory["area"])
             )
-            self._flux = _concat_timestep_results(
-                timestep, self._flux, timestep_flux, self._backend_type
-            )
+            self._append_result("flux", timestep, timestep_flux)
 
         if self._disturbance_type_map:
             timestep_state_data = {
@@ -192,39 +197,25 @@ class CBMOutput:
             timestep_state = cbm_vars.state.copy()
             timestep_params = cbm_vars.parameters.copy()
 
-        self._state = _concat_timestep_results(
-            timestep, self._state, timestep_state, self._backend_type
-        )
-
-        self._parameters = _concat_timestep_results(
-            timestep, self._parameters, timestep_params, self._backend_type
-        )
+        self._append_result("state", timestep, timestep_state)
+        self._append_result("parameters", timestep, timestep_params)
 
         if self._classifier_map is None:
-            self._classifiers = _concat_timestep_results(
-                timestep,
-                self._classifiers,
-                cbm_vars.classifiers.copy(),
-                self._backend_type,
+            self._append_result(
+                "classifiers", timestep, cbm_vars.classifiers.copy()
             )
         else:
             timestep_classifiers = cbm_vars.classifiers.copy()
             timestep_classifiers = timestep_classifiers.map(
                 self.classifier_map
             )
-            self._classifiers = _concat_timestep_results(
-                timestep,
-                self._classifiers,
-                timestep_classifiers,
-                self._backend_type,
-            )
-        self._area = _concat_timestep_results(
+            self._append_result("classifiers", timestep, timestep_classifiers)
+        self._append_result(
+            "area",
             timestep,
-            self._area,
             dataframe.from_series_list(
                 [cbm_vars.inventory["area"]],
                 nrows=cbm_vars.inventory.n_rows,
                 back_end=self._backend_type,
             ),
-            self._backend_type,
         )
@@ -3,11 +3,26 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 
+from __future__ import annotations
+import os
+import tempfile
 from typing import Callable
+from typing import Union
+from typing import ContextManager
+from typing import Iterator
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from libcbm.storage import dataframe
+from libcbm.storage import series
 from libcbm.storage.dataframe import DataFrame
 from libcbm.model.cbm import cbm_variables
 from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.model.cbm.cbm_model import CBM
+from libcbm.model.cbm.cbm_output import CBMOutput
+from libcbm.storage.output_sink import OutputSink
 from libcbm.storage.backends import BackendType
 
 
@@ -88,3 +103,329 @@ def simulate(
 
         cbm_vars = cbm.step(cbm_vars)
         reporting_func(time_step, cbm_vars)
+
+
+_RESULT_NAMES = [
+    "pools",
+    "flux",
+    "state",
+    "classifiers",
+    "parameters",
+    "area",
+]
+
+# per-process state of the simulate_parallel worker processes, set by
+# _init_worker
+_worker_cbm_factory: Callable[[], ContextManager[CBM]] = None
+_worker_pre_dynamics_func: Callable[[int, CBMVariables], CBMVariables] = None
+
+
+def _init_worker(
+    cbm_factory: Callable[[], ContextManager[CBM]],
+    pre_dynamics_func: Callable[[int, CBMVariables], CBMVariables],
+) -> None:
+    global _worker_cbm_factory
+    global _worker_pre_dynamics_func
+    _worker_cbm_factory = cbm_factory
+    _worker_pre_dynamics_func = pre_dynamics_func
+
+
+class _TimestepFileSink(OutputSink):
+    """Writes each appended timestep result of a simulate_parallel
+    partition to its own pickle file, so that the worker process holds a
+    single timestep of results in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: dict[int, dict[str, str]] = {}
+        self.max_identifier = 0
+        os.makedirs(path, exist_ok=True)
+
+    def append(self, name: str, timestep: int, df: DataFrame) -> None:
+        result = df.to_pandas()
+        if result.shape[0] > 0:
+            self.max_identifier = max(
+                self.max_identifier, int(result["identifier"].max())
+            )
+        file_path = os.path.join(self.path, f"{name}_{timestep}.pkl")
+        result.to_pickle(file_path)
+        self.files.setdefault(timestep, {})[name] = file_path
+
+    def get(self, name: str) -> Union[DataFrame, None]:
+        results = [
+            pd.read_pickle(files[name])
+            for _, files in sorted(self.files.items())
+            if name in files
+        ]
+        if not results:
+            return None
+        return dataframe.from_pandas(pd.concat(results, ignore_index=True))
+
+
+def _simulate_partition(args: tuple) -> tuple[dict[int, dict[str, str]], int]:
+    (
+        path,
+        n_steps,
+        classifiers,
+        inventory,
+        spinup_params,
+        backend_type,
+        density,
+        classifier_map,
+        disturbance_type_map,
+    ) = args
+
+    def _load(df: pd.DataFrame) -> DataFrame:
+        if df is None:
+            return None
+        return dataframe.convert_dataframe_backend(
+            dataframe.from_pandas(df), backend_type
+        )
+
+    sink = _TimestepFileSink(path)
+    output = CBMOutput(
+        density=density,
+        classifier_map=classifier_map,
+        disturbance_type_map=disturbance_type_map,
+        backend_type=BackendType.pandas,
+        sink=sink,
+    )
+    with _worker_cbm_factory() as cbm:
+        simulate(
+            cbm,
+            n_steps=n_steps,
+            classifiers=_load(classifiers),
+            inventory=_load(inventory),
+            reporting_func=output.append_simulation_result,
+            pre_dynamics_func=_worker_pre_dynamics_func,
+            spinup_params=_load(spinup_params),
+            backend_type=backend_type,
+        )
+    return sink.files, sink.max_identifier
+
+
+def _get_partitions(
+    classifiers: DataFrame,
+    inventory: DataFrame,
+    partition_by: str,
+    n_partitions: int,
+) -> list[np.ndarray]:
+    n_rows = inventory.n_rows
+    if partition_by is None:
+        partitions = np.array_split(np.arange(n_rows), n_partitions)
+    else:
+        if partition_by in classifiers.columns:
+            partition_col = classifiers[partition_by]
+        elif partition_by in inventory.columns:
+            partition_col = inventory[partition_by]
+        else:
+            raise ValueError(
+                f"partition_by column '{partition_by}' not found in "
+                "classifiers or inventory"
+            )
+        groups = [
+            np.asarray(row_idx, dtype="int64")
+            for row_idx in pd.Series(np.arange(n_rows))
+            .groupby(partition_col.to_numpy(), sort=True)
+            .groups.values()
+        ]
+        # assign the largest groups first, each to the partition with the
+        # fewest rows so far
+        groups.sort(key=lambda x: -len(x))
+        buckets = [[] for _ in range(min(n_partitions, len(groups)))]
+        bucket_sizes = np.zeros(len(buckets), dtype="int64")
+        for group in groups:
+            i_bucket = int(np.argmin(bucket_sizes))
+            buckets[i_bucket].append(group)
+            bucket_sizes[i_bucket] += len(group)
+        partitions = [np.sort(np.concatenate(b)) for b in buckets]
+    return [p for p in partitions if len(p) > 0]
+
+
+def _map_bounded(
+    executor: Executor,
+    func: Callable,
+    tasks: Iterator,
+    max_pending: int,
+) -> Iterator:
+    """Like Executor.map, but with at most max_pending tasks submitted and
+    not yet yielded, since Executor.map consumes all tasks up front.
+    """
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, task))
+    while pending:
+        yield pending.popleft().result()
+
+
+def simulate_parallel(
+    cbm_factory: Callable[[], ContextManager[CBM]],
+    n_workers: int,
+    n_steps: int,
+    classifiers: DataFrame,
+    inventory: DataFrame,
+    output: CBMOutput,
+    partition_by: str = None,
+    n_partitions: int = None,
+    pre_dynamics_func: Callable[[int, CBMVariables], CBMVariables] = None,
+    spinup_params: DataFrame = None,
+    backend_type: BackendType = None,
+):
+    """Runs the specified number of timesteps of the CBM model over
+    partitions of the inventory in a pool of worker processes.  Each
+    partition is spun up and simulated with :py:func:`simulate` by a worker
+    process using its own instance of the CBM model.  The worker processes
+    write the results of each timestep to temporary files rather than
+    accumulating them in memory. Once all partitions are complete, the
+    results are appended to the specified output one timestep at a time.
+
+    Since the partitions are simulated independently, this is suitable
+    for simulations where the stands do not interact, for example
+    simulations without rule based disturbance events, or where the events
+    of each partition are independent of the other partitions.
+
+    The `identifier` column of the merged results refers to the row of the
+    specified inventory (1 based).  Rows created during the simulation of a
+    partition, for example by stand splitting in the `pre_dynamics_func`,
+    are assigned identifiers greater than the number of inventory rows.
+    As with :py:func:`simulate`, the merged results are ordered by
+    timestep, and then by identifier.
+
+    Args:
+        cbm_factory (func): a function that returns a context manager
+            which yields an instance of the CBM model, for example
+            :py:func:`libcbm.model.cbm.stand_cbm_factory.StandCBMFactory.initialize_cbm`.
+            It is called once per partition within the worker processes.
+        n_workers (int): the number of worker processes
+        n_steps (int): The number of CBM timesteps to run
+        classifiers (DataFrame): CBM classifiers for each of the rows
+            in the inventory
+        inventory (DataFrame): CBM inventory which defines the initial
+            state of the simulation
+        output (CBMOutput): the merged simulation results are appended to
+            this object's sink.  Its density, classifier map and
+            disturbance type map settings are used by each worker.
+        partition_by (str, optional): the name of a column in the
+            classifiers or inventory, for example a classifier name or
+            "spatial_unit", by which to partition the stands.  All rows
+            sharing a value of this column are simulated in the same
+            partition. If unspecified, the inventory is split into
+            contiguous row ranges. Defaults to None.
+        n_partitions (int, optional): the number of partitions. If
+            unspecified `n_workers` partitions are used. Defaults to None.
+        pre_dynamics_func (function, optional): A function which accepts the
+            simulation timestep and all CBM variables of a partition, and
+            which is called prior to computing C dynamics. See
+            :py:func:`simulate`.  Defaults to None.
+        spinup_params (DataFrame, optional): Collection of spinup specific
+            parameters for each of the rows in the inventory.  See
+            :py:func:`simulate`. Defaults to None.
+        backend_type (BackendType): specifies the backend storage method for
+            dataframes in the worker processes. If unspecified, the
+            inventory data frame's backend type is used.
+
+    The cbm_factory and pre_dynamics_func are passed to the worker
+    processes when they start, and must therefore be picklable unless the
+    "fork" multiprocessing start method is in use.
+    """
+    if not backend_type:
+        backend_type = inventory.backend_type
+    if not n_partitions:
+        n_partitions = n_workers
+    n_total = inventory.n_rows
+    partitions = _get_partitions(
+        classifiers, inventory, partition_by, n_partitions
+    )
+
+    def _take(df: DataFrame, row_idx: np.ndarray) -> pd.DataFrame:
+        if df is None:
+            return None
+        return (
+            df.take(series.from_numpy(None, row_idx))
+            .to_pandas()
+            .reset_index(drop=True)
+        )
+
+    def _tasks(path: str):
+        # the rows of each partition are only gathered when the partition
+        # is submitted, so that chunked storage backends are not loaded
+        # into memory all at once
+        for i_partition, row_idx in enumerate(partitions):
+            yield (
+                os.path.join(path, f"partition_{i_partition}"),
+                n_steps,
+                _take(classifiers, row_idx),
+                _take(inventory, row_idx),
+                _take(spinup_params, row_idx),
+                backend_type,
+                output.density,
+                output.classifier_map,
+                output.disturbance_type_map,
+            )
+
+    with tempfile.TemporaryDirectory() as path:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(cbm_factory, pre_dynamics_func),
+        ) as executor:
+            partition_results = list(
+                _map_bounded(
+                    executor,
+                    _simulate_partition,
+                    _tasks(path),
+                    2 * n_workers,
+                )
+            )
+
+        # the identifiers of rows created in each partition past its
+        # inventory rows follow the inventory rows, and those of the
+        # preceding partitions
+        split_offsets = np.cumsum(
+            [n_total]
+            + [
+                max(max_identifier - len(row_idx), 0)
+                for row_idx, (_, max_identifier) in zip(
+                    partitions, partition_results
+                )
+            ][:-1]
+        )
+        timesteps = sorted(
+            set().union(*[files.keys() for files, _ in partition_results])
+        )
+        for timestep in timesteps:
+            for name in _RESULT_NAMES:
+                timestep_results = []
+                for row_idx, split_offset, (files, _) in zip(
+                    partitions, split_offsets, partition_results
+                ):
+                    file_path = files.get(timestep, {}).get(name)
+                    if file_path is None:
+                        continue
+                    result = pd.read_pickle(file_path)
+                    os.remove(file_path)
+                    # map the partition local identifiers to inventory rows,
+                    # and rows created in the partition past the inventory
+                    # rows
+                    n_partition_rows = len(row_idx)
+                    local_id = result["identifier"].to_numpy()
+                    result["identifier"] = np.where(
+                        local_id > n_partition_rows,
+                        split_offset + local_id - n_partition_rows,
+                        row_idx[np.minimum(local_id, n_partition_rows) - 1]
+                        + 1,
+                    ).astype("int64")
+                    timestep_results.append(result)
+                if not timestep_results:
+                    continue
+                result = (
+                    pd.concat(timestep_results, ignore_index=True)
+                    .sort_values(by="identifier", kind="mergesort")
+                    .reset_index(drop=True)
+                )
+                output.sink.append(
+                    name, timestep, dataframe.from_pandas(result)
+                )
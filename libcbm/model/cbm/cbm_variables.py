@@ -2,6 +2,8 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
+from typing import TYPE_CHECKING
+from typing import Union
 from libcbm.storage import dataframe
 from libcbm.storage.dataframe import DataFrame
 from libcbm.storage.series import SeriesDef
@@ -9,6 +11,9 @@ from libcbm.storage.series import Series
 from libcbm.storage import series
 from libcbm.storage.backends import BackendType
 
+if TYPE_CHECKING:
+    from libcbm.model.cbm.rule_based.classifier_index import ClassifierIndex
+
 
 class CBMVariables:
     """
@@ -25,6 +30,7 @@ class CBMVariables:
         state: DataFrame,
         inventory: DataFrame,
         parameters: DataFrame,
+        classifier_index: ClassifierIndex = None,
     ):
         self._pools = pools
         self._flux = flux
@@ -32,6 +38,7 @@ class CBMVariables:
         self._state = state
         self._inventory = inventory
         self._parameters = parameters
+        self._classifier_index = classifier_index
 
     @property
     def pools(self) -> DataFrame:
@@ -95,6 +102,26 @@ class CBMVariables:
         self._classifiers = dataframe.convert_dataframe_backend(
             df, self._classifiers.backend_type
         )
+        # the index is for the replaced table
+        self._classifier_index = None
+
+    @property
+    def classifier_index(self) -> Union[ClassifierIndex, None]:
+        """
+        Get or set an optional index of the classifiers dataframe by
+        classifier value id, used by rule based events and transitions to
+        select the stands matching a classifier set without scanning every
+        stand. Defaults to None, meaning no index is used. The index is
+        discarded when the classifiers dataframe is set.
+
+        Returns:
+            ClassifierIndex: the index, or None
+        """
+        return self._classifier_index
+
+    @classifier_index.setter
+    def classifier_index(self, index: ClassifierIndex):
+        self._classifier_index = index
 
     @property
     def state(self) -> DataFrame:
@@ -158,6 +185,93 @@ class CBMVariables:
             df, self._parameters.backend_type
         )
 
+    @property
+    def n_active(self) -> int:
+        """
+        Get the number of stands in use. Each of the dataframes has this
+        number of rows, which may be less than the number of rows reserved
+        with :py:meth:`reserve`.
+
+        Returns:
+            int: the number of active stands
+        """
+        return self._inventory.n_rows
+
+    def reserve(self, n_rows: int) -> None:
+        """Reserve storage so that the stands can be extended to the
+        specified number of stands with :py:func:`append_cbm_variables`
+        without reallocating the storage of the existing stands. Has no
+        effect for storage backends which do not support spare capacity.
+
+        Args:
+            n_rows (int): the total number of stands to reserve storage for
+        """
+        for name in _table_names:
+            df = getattr(self, f"_{name}")
+            if df is not None:
+                setattr(
+                    self, f"_{name}", dataframe.reserve_data_frame(df, n_rows)
+                )
+
+
+_table_names = [
+    "pools",
+    "flux",
+    "classifiers",
+    "state",
+    "inventory",
+    "parameters",
+]
+
+
+def append_cbm_variables(
+    cbm_vars: CBMVariables, rows: CBMVariables
+) -> CBMVariables:
+    """Append stands to the specified variables, for example the records
+    split from existing stands by a disturbance or a transition.
+
+    The stands are appended to each dataframe with
+    :py:func:`libcbm.storage.dataframe.append_data_frame`, so that spare
+    capacity is used if available, and otherwise the storage grows
+    geometrically. The specified variables remain valid, but may share
+    the storage of their rows with the result.
+
+    Args:
+        cbm_vars (CBMVariables): the variables to append to
+        rows (CBMVariables): the stands to append, with the same columns as
+            cbm_vars. Tables which are None in cbm_vars are ignored.
+
+    Returns:
+        CBMVariables: variables with the stands in cbm_vars followed by the
+            specified stands
+    """
+    appended = {}
+    for name in _table_names:
+        df = getattr(cbm_vars, name)
+        appended[name] = (
+            None
+            if df is None
+            else dataframe.append_data_frame(df, getattr(rows, name))
+        )
+    # the index detects the appended rows the next time it is used
+    index = get_classifier_index(cbm_vars)
+    if index is not None:
+        index.append_rows(appended["classifiers"])
+    return CBMVariables(**appended, classifier_index=index)
+
+
+def get_classifier_index(cbm_vars: CBMVariables) -> ClassifierIndex:
+    """Get the classifier index of the specified variables, if any.
+
+    Args:
+        cbm_vars (CBMVariables): CBM simulation variables, or any object
+            with the same dataframe properties, which has no index.
+
+    Returns:
+        ClassifierIndex: the index, or None
+    """
+    return getattr(cbm_vars, "classifier_index", None)
+
 
 def _initialize_pools(
     n_stands: int, pool_codes: list[str], back_end: BackendType
@@ -3,12 +3,19 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import annotations
+import numpy as np
 from libcbm.input.sit import sit_classifier_parser
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.series import Series
 from libcbm.storage.dataframe import DataFrame
 from libcbm.model.cbm.rule_based.rule_filter import RuleFilter
 from libcbm.model.cbm.rule_based import rule_filter
+from libcbm.model.cbm.rule_based import classifier_index
+from libcbm.model.cbm.rule_based.classifier_index import ClassifierIndex
 import itertools
 from typing import Iterable
+from typing import Union
 
 
 def _to_ranges(iterable: Iterable[int]) -> Iterable[tuple[int, int]]:
@@ -31,6 +38,76 @@ def _to_ranges(iterable: Iterable[int]) -> Iterable[tuple[int, int]]:
         yield group[0][1], group[-1][1]
 
 
+class ClassifierSetFilter(RuleFilter):
+    """A filter selecting the stands matching a classifier set, evaluated
+    with a lookup table for each classifier indexed by classifier value id.
+
+    Args:
+        expression (str): the equivalent filter expression
+        lookups (dict[str, np.ndarray]): boolean lookup tables by classifier
+            name, where the final element is False and is used for value
+            ids out of the range of the table. Classifiers without a lookup
+            table are not filtered.
+        data (DataFrame, optional): the classifier value ids to filter.
+            Defaults to None.
+        index (ClassifierIndex, optional): an index of the rows of data by
+            classifier value id, used to select the matching rows without
+            evaluating the filter over all rows. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        expression: str,
+        lookups: dict[str, np.ndarray],
+        data: DataFrame = None,
+        index: ClassifierIndex = None,
+    ):
+        super().__init__(expression, data)
+        self._lookups = lookups
+        self._index = index
+
+    def bind(
+        self, data: DataFrame, index: ClassifierIndex = None
+    ) -> ClassifierSetFilter:
+        """Get a copy of this filter for the specified classifier values
+
+        Args:
+            data (DataFrame): the classifier value ids to filter
+            index (ClassifierIndex, optional): an index of the rows of data.
+                Defaults to None.
+
+        Returns:
+            ClassifierSetFilter: the filter
+        """
+        return ClassifierSetFilter(self.expression, self._lookups, data, index)
+
+    def evaluate(self, data: DataFrame = None) -> Series:
+        if data is None:
+            data = self.data
+        result = np.ones(data.n_rows, dtype=bool)
+        for classifier_name, lookup in self._lookups.items():
+            np.logical_and(
+                result,
+                classifier_index.match_value_ids(
+                    lookup, data[classifier_name].to_numpy()
+                ),
+                out=result,
+            )
+        return dataframe.convert_series_backend(
+            series.from_numpy(None, result), data.backend_type
+        )
+
+    def selected_indices(self) -> Union[Series, None]:
+        if self._index is None:
+            return None
+        return dataframe.convert_series_backend(
+            series.from_numpy(
+                None, self._index.select(self.data, self._lookups)
+            ),
+            self.data.backend_type,
+        )
+
+
 class ClassifierFilter:
     """ClassifierFilter creates a filter for deeming stands
     eligible or ineligible for disturbance or transition.
@@ -54,6 +131,7 @@ class ClassifierFilter:
             x["name"]: self._get_classifier_aggregate_index(x["id"])
             for x in self.classifiers_config["classifiers"]
         }
+        self._compiled: dict[tuple[str, ...], ClassifierSetFilter] = {}
 
     def _get_classifier_aggregate_index(self, classifier_id: int) -> dict:
         result = {}
@@ -74,45 +152,14 @@ class ClassifierFilter:
             if x["classifier_id"] == classifier_id
         }
 
-    def create_classifiers_filter(
-        self, classifier_set: list[str], classifier_values: DataFrame
-    ) -> RuleFilter:
-        """Creates a filter based on the specified classifier set to select a
-        subset of the values in classifier_values
-
-        Args:
-            classifier_set (list): a list of strings, these may be any of:
-
-                - a defined classifier value
-                - a classifier aggregate
-                - or a wildcard "?"
-
-            classifier_values (DataFrame): dataframe of classifier
-                value ids by stand (row), by classifier (columns).  Column
-                labels are the classifier names.
-
-        Raises:
-            ValueError: mismatch in the number of classifiers
-            ValueError: a classifier value in the specified classifier
-                set is not defined
-
-        Returns:
-            RuleFilter: rule filter object
-
+    def _compile(self, classifier_set: tuple[str, ...]) -> ClassifierSetFilter:
+        """Compile the specified classifier set into an expression, and
+        a lookup table for each non-wildcard classifier, indexed by
+        classifier value id, which is True for the ids matching the
+        classifier set.
         """
-
-        if (
-            self.n_classifiers != classifier_values.n_cols
-            or self.n_classifiers != len(classifier_set)
-        ):
-            raise ValueError(
-                "mismatch in number of classifiers: "
-                f"classifier_set {len(classifier_set)}, "
-                f"classifiers_config: {self.n_classifiers}, "
-                f"classifier value columns {classifier_values.n_cols}"
-            )
-
         expression_tokens = []
+        lookups: dict[str, np.ndarray] = {}
 
         def get_classifier_variable(name: str) -> str:
             return f"{name}"
@@ -128,16 +175,17 @@ class ClassifierFilter:
             ]
             aggregates = self.aggregate_value_lookup[classifier_name]
             if classifier_set_value in classifier_id_by_name:
+                value_ids = [classifier_id_by_name[classifier_set_value]]
                 expression_tokens.append(
                     "({0} == {1})".format(
                         classifier_variable,
-                        str(classifier_id_by_name[classifier_set_value]),
+                        str(value_ids[0]),
                     )
                 )
             elif classifier_set_value in aggregates:
                 aggregate_expression_tokens = []
-                aggregate_values = aggregates[classifier_set_value]
-                ranges = _to_ranges(aggregate_values)
+                value_ids = aggregates[classifier_set_value]
+                ranges = _to_ranges(value_ids)
                 for lower, upper in ranges:
                     if lower == upper:
                         aggregate_expression_tokens.append(
@@ -158,14 +206,75 @@ class ClassifierFilter:
                 raise ValueError(
                     f"undefined classifier set value {classifier_set_value}"
                 )
+            else:
+                continue
+
+            # the final element of the lookup is False, and is used for any
+            # id outside of the range of the classifier's value ids
+            lookup = np.zeros(
+                max(classifier_id_by_name.values()) + 2, dtype=bool
+            )
+            lookup[value_ids] = True
+            lookups[classifier_name] = lookup
+
+        return ClassifierSetFilter(" & ".join(expression_tokens), lookups)
+
+    def create_classifiers_filter(
+        self,
+        classifier_set: list[str],
+        classifier_values: DataFrame,
+        index: ClassifierIndex = None,
+    ) -> RuleFilter:
+        """Creates a filter based on the specified classifier set to select a
+        subset of the values in classifier_values
+
+        Each distinct classifier set is compiled once, and the compiled
+        filter is evaluated by looking up each classifier value id rather
+        than by parsing the filter expression.
+
+        Args:
+            classifier_set (list): a list of strings, these may be any of:
+
+                - a defined classifier value
+                - a classifier aggregate
+                - or a wildcard "?"
+
+            classifier_values (DataFrame): dataframe of classifier
+                value ids by stand (row), by classifier (columns).  Column
+                labels are the classifier names.
+            index (ClassifierIndex, optional): if specified, an index of
+                classifier_values used to select the matching stands without
+                scanning every stand. Defaults to None.
 
-        result = rule_filter.create_filter(expression="", data=None)
-        if not expression_tokens:
+        Raises:
+            ValueError: mismatch in the number of classifiers
+            ValueError: a classifier value in the specified classifier
+                set is not defined
+
+        Returns:
+            RuleFilter: rule filter object
+
+        """
+
+        if (
+            self.n_classifiers != classifier_values.n_cols
+            or self.n_classifiers != len(classifier_set)
+        ):
+            raise ValueError(
+                "mismatch in number of classifiers: "
+                f"classifier_set {len(classifier_set)}, "
+                f"classifiers_config: {self.n_classifiers}, "
+                f"classifier value columns {classifier_values.n_cols}"
+            )
+
+        key = tuple(classifier_set)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._compile(key)
+            self._compiled[key] = compiled
+
+        if not compiled.expression:
             # this can happen if the classifier set is all wildcards
-            return result
+            return rule_filter.create_filter(expression="", data=None)
 
-        result = rule_filter.create_filter(
-            expression=" & ".join(expression_tokens),
-            data=classifier_values,
-        )
-        return result
+        return compiled.bind(classifier_values, index)
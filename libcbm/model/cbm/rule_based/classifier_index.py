@@ -0,0 +1,199 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+import weakref
+import numpy as np
+from libcbm.storage.series import Series
+from libcbm.storage.dataframe import DataFrame
+
+
+def match_value_ids(lookup: np.ndarray, value_ids: np.ndarray) -> np.ndarray:
+    """Look up the specified classifier value ids in a boolean lookup table
+
+    Args:
+        lookup (np.ndarray): boolean lookup table indexed by classifier value
+            id, where the final element is False and is used for value ids
+            out of the range of the table.
+        value_ids (np.ndarray): the classifier value ids to look up
+
+    Returns:
+        np.ndarray: boolean array, True where the value id matches
+    """
+    out_of_range = lookup.shape[0] - 1
+    return lookup[
+        np.where(
+            (value_ids >= 0) & (value_ids < out_of_range),
+            value_ids,
+            out_of_range,
+        )
+    ]
+
+
+class ClassifierIndex:
+    """An inverted index from classifier value ids to the rows of a table of
+    classifier values, used to select the stands matching a classifier set
+    without scanning every stand.
+
+    For each classifier the index stores the row indices sorted by value id,
+    so the rows with a given value id are a contiguous slice found by binary
+    search. The index is built from the table the first time it is used,
+    and is then kept up to date incrementally:
+
+        * rows appended to the table (for example by splits) are detected
+          by the growth of the number of rows. If appending produced a new
+          table object it must be reported with :py:meth:`append_rows`
+        * rows whose classifier values change (for example by transition
+          rules) must be reported with :py:meth:`update_rows`
+
+    Any other table object passed to :py:meth:`select` is treated as a new
+    table, and the index is rebuilt.
+
+    Appended and changed rows are checked directly against their current
+    values until they exceed a proportion of the table, at which point the
+    index is rebuilt.
+
+    Args:
+        rebuild_fraction (float, optional): the proportion of rows that may
+            be appended or changed before the index is rebuilt. Defaults to
+            0.1.
+    """
+
+    def __init__(self, rebuild_fraction: float = 0.1):
+        self._rebuild_fraction = rebuild_fraction
+        self._table: weakref.ref = None
+        self._n_indexed = 0
+        self._sorted_rows: dict[str, np.ndarray] = {}
+        self._sorted_value_ids: dict[str, np.ndarray] = {}
+        self._is_changed = np.zeros(0, dtype=bool)
+        self._changed_rows: list[np.ndarray] = []
+
+    def update_rows(self, indices: Series) -> None:
+        """Report rows of the indexed table whose classifier values have
+        changed.
+
+        Args:
+            indices (Series): the indices of the changed rows
+        """
+        rows = indices.to_numpy()
+        rows = rows[rows < self._n_indexed]
+        self._is_changed[rows] = True
+        self._changed_rows.append(rows)
+
+    def append_rows(self, classifiers: DataFrame) -> None:
+        """Report that the specified table is the indexed table with rows
+        appended, for example when appending returns a new dataframe.
+
+        Args:
+            classifiers (DataFrame): the table with the indexed rows
+                followed by the appended rows
+        """
+        self._table = weakref.ref(classifiers)
+
+    def _rebuild(self, classifiers: DataFrame) -> None:
+        n_rows = classifiers.n_rows
+        self._table = weakref.ref(classifiers)
+        self._n_indexed = n_rows
+        self._sorted_rows.clear()
+        self._sorted_value_ids.clear()
+        self._is_changed = np.zeros(n_rows, dtype=bool)
+        self._changed_rows = []
+
+    def _get_sorted(
+        self, classifiers: DataFrame, classifier_name: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        sorted_rows = self._sorted_rows.get(classifier_name)
+        if sorted_rows is None:
+            # rows appended since the index was built are checked
+            # directly, so they are excluded here
+            value_ids = classifiers[classifier_name].to_numpy()[
+                : self._n_indexed
+            ]
+            sorted_rows = np.argsort(value_ids, kind="stable")
+            self._sorted_rows[classifier_name] = sorted_rows
+            self._sorted_value_ids[classifier_name] = value_ids[sorted_rows]
+        return sorted_rows, self._sorted_value_ids[classifier_name]
+
+    def select(
+        self, classifiers: DataFrame, lookups: dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Get the rows of the specified table matching the specified
+        classifier value lookup tables
+
+        Args:
+            classifiers (DataFrame): the indexed table of classifier value
+                ids by stand (row), by classifier (columns).
+            lookups (dict[str, np.ndarray]): boolean lookup tables by
+                classifier name, as used by
+                :py:func:`match_value_ids`. Classifiers without a lookup
+                table are not filtered.
+
+        Returns:
+            np.ndarray: the sorted indices of the matching rows
+        """
+        n_rows = classifiers.n_rows
+        if (
+            self._table is None
+            or self._table() is not classifiers
+            or n_rows < self._n_indexed
+        ):
+            # the index is for a different table, or rows were removed
+            self._rebuild(classifiers)
+        if self._changed_rows:
+            changed_rows = np.unique(np.concatenate(self._changed_rows))
+            self._changed_rows = [changed_rows]
+        else:
+            changed_rows = np.zeros(0, dtype="int64")
+        if (
+            changed_rows.shape[0] + n_rows - self._n_indexed
+            > self._rebuild_fraction * n_rows
+        ):
+            self._rebuild(classifiers)
+            changed_rows = np.zeros(0, dtype="int64")
+        unindexed_rows = np.concatenate(
+            [changed_rows, np.arange(self._n_indexed, n_rows)]
+        )
+        if not lookups:
+            return np.arange(n_rows)
+
+        # select the rows matching the most selective classifier with the
+        # index, and then check the other classifiers for those rows only
+        slices = {}
+        for classifier_name, lookup in lookups.items():
+            _, sorted_value_ids = self._get_sorted(
+                classifiers, classifier_name
+            )
+            value_ids = np.flatnonzero(lookup[:-1])
+            slices[classifier_name] = (
+                np.searchsorted(sorted_value_ids, value_ids, side="left"),
+                np.searchsorted(sorted_value_ids, value_ids, side="right"),
+            )
+        selective_name = min(
+            slices, key=lambda name: (slices[name][1] - slices[name][0]).sum()
+        )
+        sorted_rows, _ = self._get_sorted(classifiers, selective_name)
+        indexed_rows = np.concatenate(
+            [np.zeros(0, dtype=sorted_rows.dtype)]
+            + [
+                sorted_rows[start:stop]
+                for start, stop in zip(*slices[selective_name])
+            ]
+        )
+        indexed_rows = indexed_rows[~self._is_changed[indexed_rows]]
+        unindexed_rows = unindexed_rows[
+            match_value_ids(
+                lookups[selective_name],
+                classifiers[selective_name].to_numpy()[unindexed_rows],
+            )
+        ]
+        rows = np.sort(np.concatenate([indexed_rows, unindexed_rows]))
+        for classifier_name, lookup in lookups.items():
+            if classifier_name == selective_name:
+                continue
+            rows = rows[
+                match_value_ids(
+                    lookup, classifiers[classifier_name].to_numpy()[rows]
+                )
+            ]
+        return rows
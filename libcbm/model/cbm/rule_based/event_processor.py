@@ -8,6 +8,7 @@ import numpy as np
 from libcbm.model.cbm.rule_based import rule_filter
 from libcbm.model.cbm.rule_based.rule_filter import RuleFilter
 from libcbm.model.cbm.rule_based.rule_target import RuleTargetResult
+from libcbm.model.cbm import cbm_variables
 from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.storage import series
 from libcbm.storage.series import Series
@@ -72,8 +73,46 @@ def process_event(
             disturbance event
     """
 
-    filter_result = rule_filter.evaluate_filters(*event_filters)
+    return process_filtered_event(
+        filter_result=rule_filter.evaluate_filters(*event_filters),
+        undisturbed=undisturbed,
+        target_func=target_func,
+        disturbance_type_id=disturbance_type_id,
+        cbm_vars=cbm_vars,
+        disturbance_event_id=disturbance_event_id,
+    )
+
+
+def process_filtered_event(
+    filter_result: Series,
+    undisturbed: Series,
+    target_func: Callable[[CBMVariables, Series], RuleTargetResult],
+    disturbance_type_id: int,
+    cbm_vars: CBMVariables,
+    disturbance_event_id: int = None,
+) -> ProcessEventResult:
+    """Computes a CBM rule based event as :py:func:`process_event` does,
+    using an already evaluated filter result, for example one evaluated with
+    a :py:class:`libcbm.model.cbm.rule_based.rule_filter.FilterCache`.
+
+    Args:
+        filter_result (Series): a boolean value series indicating each
+            specified index passes (True) or fails (False) the event filters
+        undisturbed (Series): a boolean value series indicating each
+            specified index is eligible (True) or ineligible (False) for
+            disturbance.
+        target_func (func): a function for creating a disturbance target.
+        disturbance_type_id (int): the id for the disturbance event being
+            processed.
+        cbm_vars (CBMVariables): an object containing dataframes that store cbm
+            simulation state and variables
+        disturbance_event_id (int, optional): an identifier for the disturbance
+            event being processed.
 
+    Returns:
+        ProcessEventResult: instance of class containing results for the
+            disturbance event
+    """
     # set to false those stands affected by a previous disturbance from
     # eligibility
     filter_result = dataframe.logical_and(undisturbed, filter_result)
@@ -157,33 +196,21 @@ def apply_rule_based_event(
             )
         )
 
-        # create the updated inventory by appending the split records
-        inventory = dataframe.concat_data_frame(
-            [cbm_vars.inventory, split_inventory]
-        )
-
-        # Since classifiers, pools, flux, and state variables are not altered
-        # here (this is done in the model) splitting is just a matter of
-        # adding a copy of the split values.
-        classifiers = dataframe.concat_data_frame(
-            [cbm_vars.classifiers, cbm_vars.classifiers.take(split_index)]
-        )
-        state = dataframe.concat_data_frame(
-            [cbm_vars.state, cbm_vars.state.take(split_index)]
-        )
-        pools = dataframe.concat_data_frame(
-            [cbm_vars.pools, cbm_vars.pools.take(split_index)]
-        )
-        flux = dataframe.concat_data_frame(
-            [cbm_vars.flux, cbm_vars.flux.take(split_index)]
-        )
-
-        parameters = dataframe.concat_data_frame(
-            [cbm_vars.parameters, cbm_vars.parameters.take(split_index)]
-        )
-
-        cbm_vars = CBMVariables(
-            pools, flux, classifiers, state, inventory, parameters
+        # append the split records. Since classifiers, pools, flux, and
+        # state variables are not altered here (this is done in the model)
+        # splitting is just a matter of adding a copy of the split values.
+        # The records are appended into spare capacity where the storage
+        # backend supports it, rather than reallocating all of the tables.
+        cbm_vars = cbm_variables.append_cbm_variables(
+            cbm_vars,
+            CBMVariables(
+                cbm_vars.pools.take(split_index),
+                cbm_vars.flux.take(split_index),
+                cbm_vars.classifiers.take(split_index),
+                cbm_vars.state.take(split_index),
+                split_inventory,
+                cbm_vars.parameters.take(split_index),
+            ),
         )
 
     # set the disturbance types for the disturbed indices, based on
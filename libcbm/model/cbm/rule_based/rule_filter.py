@@ -2,8 +2,11 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from typing import Callable
+from typing import Iterable
 from typing import Union
 from libcbm.storage import dataframe
+from libcbm.storage import series
 from libcbm.storage.series import Series
 from libcbm.storage.dataframe import DataFrame
 
@@ -28,6 +31,32 @@ class RuleFilter:
         """
         return self._data
 
+    def evaluate(self, data: DataFrame = None) -> Series:
+        """Evaluate this filter
+
+        Args:
+            data (DataFrame, optional): if specified, a table with the
+                columns of self.data to evaluate this filter on instead,
+                for example a subset of the rows of self.data. Defaults to
+                None.
+
+        Returns:
+            Series: filter result (boolean array)
+        """
+        if data is None:
+            data = self._data
+        return data.evaluate_filter(self._expression)
+
+    def selected_indices(self) -> Union[Series, None]:
+        """Get the indices of the rows of self.data which pass this filter,
+        if they can be found without evaluating the filter over all rows.
+
+        Returns:
+            Series: the sorted indices of the passing rows, or None if
+                this filter must be evaluated.
+        """
+        return None
+
 
 def create_filter(expression: str, data: DataFrame):
     """Creates a filter object for filtering a pandas dataframe using an
@@ -60,9 +89,23 @@ def evaluate_filters(*filter_objs: RuleFilter) -> Union[Series, None]:
     Returns:
         Series: filter result (boolean array)
     """
+    return _evaluate_filters(
+        filter_objs,
+        lambda filter_obj: filter_obj.evaluate(),
+        lambda filter_obj, indices: filter_obj.evaluate(
+            filter_obj.data.take(indices)
+        ),
+    )
+
+
+def _evaluate_filters(
+    filter_objs: Iterable[RuleFilter],
+    evaluate: Callable[[RuleFilter], Series],
+    evaluate_rows: Callable[[RuleFilter, Series], Series],
+) -> Union[Series, None]:
     out_series_length = None
     out_series_backend_type = None
-    output = None
+    active_filters: list[RuleFilter] = []
 
     for filter_obj in filter_objs:
         if filter_obj and filter_obj.data:
@@ -74,9 +117,31 @@ def evaluate_filters(*filter_objs: RuleFilter) -> Union[Series, None]:
 
         if not filter_obj or not filter_obj.expression or not filter_obj.data:
             continue
+        active_filters.append(filter_obj)
+
+    # if a filter can select its passing rows directly (for example with a
+    # classifier index) the other filters are evaluated for those rows only
+    selected = None
+    for filter_obj in active_filters:
+        selected = filter_obj.selected_indices()
+        if selected is not None:
+            active_filters.remove(filter_obj)
+            break
+
+    if selected is not None:
+        for filter_obj in active_filters:
+            if not selected.length:
+                break
+            selected = selected.filter(evaluate_rows(filter_obj, selected))
+        output = dataframe.make_boolean_series(
+            False, out_series_length, out_series_backend_type
+        )
+        output.assign(True, selected)
+        return output
 
-        result = filter_obj.data.evaluate_filter(filter_obj.expression)
-
+    output = None
+    for filter_obj in active_filters:
+        result = evaluate(filter_obj)
         if output is None:
             output = result
         else:
@@ -87,3 +152,102 @@ def evaluate_filters(*filter_objs: RuleFilter) -> Union[Series, None]:
             True, out_series_length, out_series_backend_type
         )
     return output
+
+
+class FilterCache:
+    """Evaluates filters, storing the result of each distinct filter so that
+    it is evaluated once over the full data no matter how many times it is
+    used, for example by the rule based events of a single timestep.
+
+    Results are keyed by filter expression and the columns of the filtered
+    data, so that filters created from successive versions of the same
+    table share results. Rows appended to a table after its results were
+    stored are evaluated the next time a result is used. Rows whose values
+    change must be reported with :py:meth:`update_rows`.
+
+    Filters restricted to the rows selected by another filter (see
+    :py:meth:`RuleFilter.selected_indices`) are evaluated for those rows
+    only, using a stored result if there is one.
+    """
+
+    def __init__(self):
+        self._results: dict[tuple[str, tuple[str, ...]], Series] = {}
+        self._updated_rows: dict[tuple[str, tuple[str, ...]], list] = {}
+
+    def evaluate(self, filter_obj: RuleFilter) -> Series:
+        """Get the result of evaluating the specified filter
+
+        Args:
+            filter_obj (RuleFilter): a filter with a non-empty expression
+                and data
+
+        Returns:
+            Series: filter result (boolean array). The result is shared
+                with later calls, and should not be modified.
+        """
+        data = filter_obj.data
+        expression = filter_obj.expression
+        key = (expression, tuple(data.columns))
+        result = self._results.get(key)
+        if result is None:
+            result = filter_obj.evaluate()
+        else:
+            if result.length < data.n_rows:
+                new_rows = series.range(
+                    "",
+                    result.length,
+                    data.n_rows,
+                    1,
+                    "int64",
+                    data.backend_type,
+                )
+                result = dataframe.concat_series(
+                    [result, filter_obj.evaluate(data.take(new_rows))],
+                    backend_type=data.backend_type,
+                )
+            updated_rows = self._updated_rows[key]
+            if updated_rows:
+                rows = dataframe.concat_series(
+                    updated_rows, backend_type=data.backend_type
+                ).unique()
+                result = result.copy()
+                result.assign(filter_obj.evaluate(data.take(rows)), rows)
+        self._results[key] = result
+        self._updated_rows[key] = []
+        return result
+
+    def evaluate_filters(
+        self, *filter_objs: RuleFilter
+    ) -> Union[Series, None]:
+        """Evaluates the specified sequence of filter objects with the same
+        result as :py:func:`evaluate_filters`, re-using stored results.
+
+        Args:
+            filter_objs (list): list of RuleFilter objects:
+
+        Returns:
+            Series: filter result (boolean array)
+        """
+        return _evaluate_filters(
+            filter_objs, self.evaluate, self._evaluate_rows
+        )
+
+    def _evaluate_rows(
+        self, filter_obj: RuleFilter, indices: Series
+    ) -> Series:
+        # a stored result is re-used, but a filter is not evaluated over all
+        # rows just to store its result
+        data = filter_obj.data
+        if (filter_obj.expression, tuple(data.columns)) in self._results:
+            return self.evaluate(filter_obj).take(indices)
+        return filter_obj.evaluate(data.take(indices))
+
+    def update_rows(self, indices: Series) -> None:
+        """Mark rows of the filtered data as changed, so that they are
+        evaluated again the next time each stored result is used.
+
+        Args:
+            indices (Series): the indices of the changed rows
+        """
+        for updated_rows in self._updated_rows.values():
+            updated_rows.append(indices)
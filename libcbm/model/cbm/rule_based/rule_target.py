@@ -1,6 +1,7 @@
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
+import numpy as np
 from libcbm.storage import dataframe
 from libcbm.storage.dataframe import DataFrame
 from libcbm.storage import series
@@ -111,127 +112,128 @@ def sorted_disturbance_target(
     """
     if target < 0:
         raise ValueError("target is less than zero")
-    if (target_var < 0).any():
+    target_values = target_var.to_numpy()
+    if (target_values < 0).any():
         raise ValueError("less than zero values detected in target_var")
 
-    remaining_target = target
-    filter = (
-        eligible
-        & (target_var > 0)
-        # filter out records that produced nothing towards the target
+    sort_values = sort_var.to_numpy()
+    (
+        disturbed_index,
+        area_proportions,
+        total_eligible_value,
+        remaining_target,
+        num_splits,
+    ) = solve_sorted_target(
+        target_values, sort_values, eligible.to_numpy(), target
     )
-    idx_disturbed = dataframe.indices_nonzero(filter)
-    out_index = series.range(
-        "disturbed_index",
-        0,
-        target_var.length,
-        1,
-        "int",
-        target_var.backend_type,
-    ).take(idx_disturbed)
-    target_var = target_var.take(idx_disturbed)
-    target_var.name = "target_var"
-    sort_var = sort_var.take(idx_disturbed)
-    sort_var.name = "sort_var"
-    disturbed = dataframe.from_series_list(
-        [
-            out_index,
-            target_var,
-            sort_var,
-        ],
-        target_var.length,
-        target_var.backend_type,
-    )
-
-    disturbed = disturbed.sort_values(by="sort_var", ascending=False)
+    num_eligible = eligible.sum()
 
-    if disturbed.n_rows == 0:
+    if disturbed_index.shape[0] == 0:
         return RuleTargetResult(
             target=None,
             statistics={
-                "total_eligible_value": disturbed["target_var"].sum(),
+                "total_eligible_value": total_eligible_value,
                 "total_achieved": 0,
                 "shortfall": target,
                 "num_records_disturbed": 0,
                 "num_splits": 0,
-                "num_eligible": eligible.sum(),
+                "num_eligible": num_eligible,
             },
         )
 
-    # compute the cumulative sums of the target var to compare versus the
-    # target value
-    target_var_sums = disturbed["target_var"].cumsum()
-
-    max_target_var_sum = target_var_sums.at(target_var_sums.length - 1)
-    fully_disturbed_idx = dataframe.indices_nonzero(target_var_sums <= target)
-    fully_disturbed_records = disturbed.take(fully_disturbed_idx)
-    target_var_sums = target_var_sums.take(fully_disturbed_idx)
-
-    if fully_disturbed_records.n_rows > 0:
-        last_sum = target_var_sums.at(target_var_sums.length - 1)
-        remaining_target = target - last_sum
-
-    result = dataframe.from_series_list(
-        [
-            fully_disturbed_records["target_var"],
-            fully_disturbed_records["sort_var"],
-            fully_disturbed_records["disturbed_index"],
-            SeriesDef("area_proportions", 1.0, "float"),
-        ],
-        nrows=fully_disturbed_records.n_rows,
-        back_end=target_var.backend_type,
+    result = dataframe.convert_dataframe_backend(
+        dataframe.from_numpy(
+            {
+                "target_var": target_values[disturbed_index],
+                "sort_var": sort_values[disturbed_index],
+                "disturbed_index": disturbed_index,
+                "area_proportions": area_proportions,
+            }
+        ),
+        target_var.backend_type,
     )
 
-    num_splits = 0
-    if remaining_target > 0 and max_target_var_sum > target:
-        # for merch C and area targets a final record is split to meet target
-        # exactly
-        num_splits = 1
-        split_record_idx = (
-            (fully_disturbed_idx.at(fully_disturbed_idx.length - 1) + 1)
-            if fully_disturbed_idx.length > 0
-            else 0
-        )
-        split_record = disturbed.at(split_record_idx)
-        proportion = remaining_target / split_record["target_var"]
-        remaining_target = 0
-
-        result = dataframe.concat_data_frame(
-            [
-                result,
-                dataframe.from_series_list(
-                    [
-                        SeriesDef(
-                            "target_var", split_record["target_var"], "float"
-                        ),
-                        SeriesDef(
-                            "sort_var", split_record["sort_var"], "float"
-                        ),
-                        SeriesDef(
-                            "disturbed_index",
-                            split_record["disturbed_index"],
-                            "int",
-                        ),
-                        SeriesDef("area_proportions", proportion, "float"),
-                    ],
-                    nrows=1,
-                    back_end=target_var.backend_type,
-                ),
-            ],
-            backend_type=target_var.backend_type,
-        )
-
     stats = {
-        "total_eligible_value": disturbed["target_var"].sum(),
+        "total_eligible_value": total_eligible_value,
         "total_achieved": target - remaining_target,
         "shortfall": remaining_target,
         "num_records_disturbed": result.n_rows,
         "num_splits": num_splits,
-        "num_eligible": eligible.sum(),
+        "num_eligible": num_eligible,
     }
     return RuleTargetResult(target=result, statistics=stats)
 
 
+def solve_sorted_target(
+    target_var: np.ndarray,
+    sort_var: np.ndarray,
+    eligible: np.ndarray,
+    target: float,
+) -> tuple[np.ndarray, np.ndarray, float, float, int]:
+    """Find the records, in descending order of sort_var, whose
+    cumulative target_var meets the target, splitting the final record if
+    needed to meet the target exactly. Records with equal sort_var values
+    are taken in their original order.
+
+    Args:
+        target_var (np.ndarray): the non-negative value of each record
+            accumulated towards the target
+        sort_var (np.ndarray): the value of each record whose descending
+            sort defines the order of accumulation
+        eligible (np.ndarray): boolean array indicating whether or not
+            each record is eligible
+        target (float): the cumulative target
+
+    Returns:
+        tuple:
+
+            - the indices of the disturbed records, in order of
+              accumulation
+            - the proportion of each disturbed record to disturb, which
+              is 1.0 except for a final split record
+            - the sum of target_var for the eligible records
+            - the remaining, unmet target
+            - the number of split records: 1 if the final record is
+              split, and otherwise 0
+    """
+    # records that produce nothing towards the target are excluded
+    candidates = np.flatnonzero(eligible & (target_var > 0))
+    # a stable sort of the negated values is a descending sort which
+    # keeps equal values in their original order
+    sort_keys = sort_var[candidates].astype("float", copy=False)
+    order = candidates[np.argsort(-sort_keys, kind="stable")]
+    target_values = target_var[order]
+    if not target_values.shape[0]:
+        return order, np.ones(0, dtype="float"), target_values.sum(), target, 0
+
+    # the cumulative sums are non-decreasing, so the fully disturbed
+    # records are the prefix with sums not exceeding the target
+    target_var_sums = np.cumsum(target_values)
+    n_fully_disturbed = np.searchsorted(target_var_sums, target, "right")
+    remaining_target = target
+    if n_fully_disturbed > 0:
+        remaining_target = target - target_var_sums[n_fully_disturbed - 1]
+    area_proportions = np.ones(n_fully_disturbed, dtype="float")
+    num_splits = 0
+    if remaining_target > 0 and target_var_sums[-1] > target:
+        # for merch C and area targets a final record is split to meet
+        # the target exactly
+        area_proportions = np.append(
+            area_proportions,
+            remaining_target / target_values[n_fully_disturbed],
+        )
+        n_fully_disturbed += 1
+        num_splits = 1
+        remaining_target = 0
+    return (
+        order[:n_fully_disturbed],
+        area_proportions,
+        target_values.sum(),
+        remaining_target,
+        num_splits,
+    )
+
+
 def proportion_area_target(
     area_target_value: float, inventory: DataFrame, eligible: Series
 ) -> RuleTargetResult:
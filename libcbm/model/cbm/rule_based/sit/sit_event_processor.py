@@ -13,11 +13,100 @@ from libcbm.model.cbm.rule_based.classifier_filter import ClassifierFilter
 from libcbm.model.cbm.rule_based.sit import sit_stand_filter
 from libcbm.model.cbm.rule_based.sit import sit_stand_target
 from libcbm.model.cbm.cbm_model import CBM
+from libcbm.model.cbm import cbm_variables
 from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.storage import dataframe
 from libcbm.storage.series import Series
 from libcbm.storage.dataframe import DataFrame
 
 
+class _DisturbanceProductionCache:
+    """Stores the disturbance production of each disturbance type, for
+    re-use by the events of a single timestep. Events do not change the
+    pools of existing stands, so the production of a stand is computed at
+    most once per disturbance type, and only for the stands which are
+    eligible for an event using it.
+    """
+
+    def __init__(self, cbm: CBM):
+        self._cbm = cbm
+        self._production: dict[int, DataFrame] = {}
+        self._computed: dict[int, Series] = {}
+
+    def compute(
+        self,
+        cbm_vars: CBMVariables,
+        disturbance_type_id: Union[int, Series],
+        eligible: Series,
+    ) -> DataFrame:
+        if isinstance(disturbance_type_id, Series):
+            return self._cbm.compute_disturbance_production(
+                cbm_vars=cbm_vars,
+                disturbance_type=disturbance_type_id,
+                eligible=eligible,
+            )
+        disturbance_type_id = int(disturbance_type_id)
+        production = self._production.get(disturbance_type_id)
+        computed = self._computed.get(disturbance_type_id)
+        if production is None:
+            production = self._cbm.compute_disturbance_production(
+                cbm_vars=cbm_vars,
+                disturbance_type=disturbance_type_id,
+                eligible=eligible,
+            )
+            computed = eligible.copy()
+
+        n_stands = cbm_vars.inventory.n_rows
+        backend_type = cbm_vars.inventory.backend_type
+        if production.n_rows < n_stands:
+            # stands added by splits since the production was last used
+            # have not been computed
+            n_new = n_stands - production.n_rows
+            production = dataframe.concat_data_frame(
+                [
+                    production,
+                    dataframe.numeric_dataframe(
+                        cols=production.columns,
+                        nrows=n_new,
+                        back_end=backend_type,
+                    ),
+                ],
+                backend_type,
+            )
+            computed = dataframe.concat_series(
+                [
+                    computed,
+                    dataframe.make_boolean_series(False, n_new, backend_type),
+                ],
+                backend_type=backend_type,
+            )
+
+        missing_idx = dataframe.logical_and(
+            eligible, dataframe.logical_not(computed)
+        ).indices_nonzero()
+        if missing_idx.length > 0:
+            missing_production = self._cbm.compute_disturbance_production(
+                cbm_vars=CBMVariables(
+                    pools=cbm_vars.pools.take(missing_idx),
+                    flux=None,
+                    classifiers=None,
+                    state=None,
+                    inventory=cbm_vars.inventory.take(missing_idx),
+                    parameters=cbm_vars.parameters.take(missing_idx),
+                ),
+                disturbance_type=disturbance_type_id,
+            )
+            for col in production.columns:
+                production[col].assign(missing_production[col], missing_idx)
+            computed.assign(True, missing_idx)
+        self._production[disturbance_type_id] = production
+        self._computed[disturbance_type_id] = computed
+
+        # ineligible stands have zero production, as when the production
+        # is computed for the eligible stands only
+        return production.multiply(eligible)
+
+
 class SITEventProcessor:
     """SITEventProcessor processes standard import tool format events.
 
@@ -46,15 +135,13 @@ class SITEventProcessor:
         self._disturbance_type_map = disturbance_type_map
 
     def _get_compute_disturbance_production(
-        self, cbm: CBM, eligible: Series
+        self, production_cache: _DisturbanceProductionCache, eligible: Series
     ) -> Callable[[CBMVariables, Union[int, Series]], Series]:
         def compute_disturbance_production(
             cbm_vars: CBMVariables, disturbance_type_id: Union[int, Series]
         ):
-            return cbm.compute_disturbance_production(
-                cbm_vars=cbm_vars,
-                disturbance_type=disturbance_type_id,
-                eligible=eligible,
+            return production_cache.compute(
+                cbm_vars, disturbance_type_id, eligible
             )
 
         return compute_disturbance_production
@@ -64,11 +151,13 @@ class SITEventProcessor:
         eligible: Series,
         sit_event: dict,
         cbm_vars: CBMVariables,
+        filter_cache: rule_filter.FilterCache,
+        production_cache: _DisturbanceProductionCache,
         sit_eligibility: Series = None,
     ) -> event_processor.ProcessEventResult:
         compute_disturbance_production = (
             self._get_compute_disturbance_production(
-                cbm=self._cbm, eligible=eligible
+                production_cache=production_cache, eligible=eligible
             )
         )
 
@@ -95,11 +184,14 @@ class SITEventProcessor:
                         sit_event, cbm_vars.classifiers.columns
                     ),
                     cbm_vars.classifiers,
+                    cbm_variables.get_classifier_index(cbm_vars),
                 ),
             ]
 
-        process_event_result = event_processor.process_event(
-            event_filters=event_filters,
+        # each distinct filter is evaluated over all stands once per
+        # timestep, rather than once per event
+        process_event_result = event_processor.process_filtered_event(
+            filter_result=filter_cache.evaluate_filters(*event_filters),
             undisturbed=eligible,
             target_func=target_factory,
             disturbance_type_id=sit_event["disturbance_type_id"],
@@ -140,6 +232,7 @@ class SITEventProcessor:
                     sit_event, cbm_vars.classifiers.columns
                 ),
                 cbm_vars.classifiers,
+                cbm_variables.get_classifier_index(cbm_vars),
             ),
             rule_filter.create_filter(
                 expression=dist_type_filter_expression, data=cbm_vars.state
@@ -203,6 +296,8 @@ class SITEventProcessor:
                 for _, row in sit_eligibilities.iterrows()
             }
 
+        filter_cache = rule_filter.FilterCache()
+        production_cache = _DisturbanceProductionCache(self._cbm)
         for event_index, sit_event in self._event_iterator(time_step_events):
             eligible = cbm_vars.parameters["disturbance_type"] <= 0
             expression = None
@@ -211,9 +306,18 @@ class SITEventProcessor:
                     int(sit_event["eligibility_id"])
                 ]
             process_event_result = self._process_event(
-                eligible, sit_event, cbm_vars, expression
+                eligible,
+                sit_event,
+                cbm_vars,
+                filter_cache,
+                production_cache,
+                expression,
             )
             cbm_vars = process_event_result.cbm_vars
+            target = process_event_result.rule_target_result.target
+            if target is not None:
+                # the state of the disturbed stands has changed
+                filter_cache.update_rows(target["disturbed_index"])
             stats = process_event_result.rule_target_result.statistics
             if stats is not None:
                 stats["sit_event_index"] = event_index
@@ -13,6 +13,7 @@ from libcbm.model.cbm.rule_based.transition_rule_processor import (
 from libcbm.model.cbm.rule_based.rule_filter import RuleFilter
 from libcbm.storage.dataframe import DataFrame
 from libcbm.storage import dataframe
+from libcbm.model.cbm import cbm_variables
 from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.model.cbm.rule_based.classifier_filter import ClassifierFilter
 
@@ -100,7 +101,9 @@ def get_transition_rule_filters(
     tr_filters = [
         create_state_variable_filter(tr_group_key, cbm_vars.state),
         classifier_filter.create_classifiers_filter(
-            classifier_set, cbm_vars.classifiers
+            classifier_set,
+            cbm_vars.classifiers,
+            cbm_variables.get_classifier_index(cbm_vars),
         ),
         rule_filter.create_filter(
             expression=f"(disturbance_type == {dist_type_target})",
@@ -265,6 +268,7 @@ class SITTransitionRuleProcessor:
                 self._classifier_filter.create_classifiers_filter(
                     [tr_group_key[x] for x in cbm_vars.classifiers.columns],
                     cbm_vars.classifiers,
+                    cbm_variables.get_classifier_index(cbm_vars),
                 ),
             ]
         else:
@@ -10,11 +10,25 @@ from libcbm.storage import dataframe
 from libcbm.storage.dataframe import DataFrame
 from libcbm.storage import series
 from libcbm.storage.series import Series
+from libcbm.model.cbm import cbm_variables
 from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.model.cbm.rule_based import rule_filter
 from libcbm.model.cbm.rule_based.rule_filter import RuleFilter
 
 
+def _concat_splits(splits: list[CBMVariables]) -> CBMVariables:
+    return CBMVariables(
+        pools=dataframe.concat_data_frame([s.pools for s in splits]),
+        flux=dataframe.concat_data_frame([s.flux for s in splits]),
+        classifiers=dataframe.concat_data_frame(
+            [s.classifiers for s in splits]
+        ),
+        state=dataframe.concat_data_frame([s.state for s in splits]),
+        inventory=dataframe.concat_data_frame([s.inventory for s in splits]),
+        parameters=dataframe.concat_data_frame([s.parameters for s in splits]),
+    )
+
+
 class TransitionRuleProcessor(object):
     def __init__(
         self,
@@ -113,12 +127,7 @@ class TransitionRuleProcessor(object):
         eligible_idx = dataframe.indices_nonzero(eligible)
 
         # storage for split records
-        classifier_split = None
-        inventory_split = None
-        pool_split = None
-        state_split = None
-        parameters_split = None
-        flux_split = None
+        splits: list[CBMVariables] = []
         next_id = cbm_vars.inventory["inventory_id"].max() + 1
         for i_proportion, proportion in enumerate(proportions):
             if i_proportion == 0:
@@ -188,25 +197,16 @@ class TransitionRuleProcessor(object):
                     int(tr_group["reset_age"].at(i_proportion))
                 )
 
-            classifier_split = dataframe.concat_data_frame(
-                [classifier_split, classifiers]
-            )
-            inventory_split = dataframe.concat_data_frame(
-                [inventory_split, inventory]
-            )
-            pool_split = dataframe.concat_data_frame([pool_split, pools])
-            state_split = dataframe.concat_data_frame([state_split, state])
-            parameters_split = dataframe.concat_data_frame(
-                [parameters_split, parameters]
+            splits.append(
+                CBMVariables(
+                    pools, flux, classifiers, state, inventory, parameters
+                )
             )
-            flux_split = dataframe.concat_data_frame([flux_split, flux])
 
         classifiers = cbm_vars.classifiers
         inventory = cbm_vars.inventory
-        pools = cbm_vars.pools
         state = cbm_vars.state
         parameters = cbm_vars.parameters
-        flux = cbm_vars.flux
         # for the first index in the tr_group use the existing matched records
         transition_classifier_ids = self._get_transition_classifier_set(
             transition_rule=tr_group.at(0)
@@ -216,6 +216,9 @@ class TransitionRuleProcessor(object):
             classifiers[classifier_name].assign(
                 np.int32(value_id), eligible_idx
             )
+        classifier_index = cbm_variables.get_classifier_index(cbm_vars)
+        if classifier_index is not None:
+            classifier_index.update_rows(eligible_idx)
 
         if proportions[0] < 1.0:
             inventory["area"].assign(
@@ -233,20 +236,12 @@ class TransitionRuleProcessor(object):
             np.int32(tr_group["reset_age"].at(0)), eligible_idx
         )
 
-        if len(proportions) > 1:
-            classifiers = dataframe.concat_data_frame(
-                [classifiers, classifier_split]
-            )
-            inventory = dataframe.concat_data_frame(
-                [inventory, inventory_split]
+        if splits:
+            # the split records are appended into spare capacity where the
+            # storage backend supports it, rather than reallocating all of
+            # the tables
+            cbm_vars = cbm_variables.append_cbm_variables(
+                cbm_vars, _concat_splits(splits)
             )
-            pools = dataframe.concat_data_frame([pools, pool_split])
-            state = dataframe.concat_data_frame([state, state_split])
-            parameters = dataframe.concat_data_frame(
-                [parameters, parameters_split]
-            )
-            flux = dataframe.concat_data_frame([flux, flux_split])
 
-        return transition_mask_output, CBMVariables(
-            pools, flux, classifiers, state, inventory, parameters
-        )
+        return transition_mask_output, cbm_vars
@@ -3,6 +3,21 @@ import numpy as np
 import pandas as pd
 
 
+def _growth_info_index(
+    growth_info: dict[str, np.ndarray],
+) -> dict[str, np.ndarray]:
+    """Get the index columns of growth info computed by age, which is keyed
+    either by growth curve or by row"""
+    if "age" not in growth_info:
+        return {}
+    if "growth_curve_id" in growth_info:
+        index = {"[state.growth_curve_id]": growth_info["growth_curve_id"]}
+    else:
+        index = {"[row_idx]": growth_info["row_idx"]}
+    index["[state.age]"] = growth_info["age"]
+    return index
+
+
 def net_growth(
     growth_info: dict[str, np.ndarray],
 ) -> pd.DataFrame:
@@ -15,10 +30,7 @@ def net_growth(
     Returns:
         pd.DataFrame: The growth matrices formatted as a dataframe.
     """
-    matrices = {}
-    if "age" in growth_info:
-        matrices["[row_idx]"] = growth_info["row_idx"]
-        matrices["[state.age]"] = growth_info["age"]
+    matrices = _growth_info_index(growth_info)
     matrices.update(
         {
             "Input.Merch": growth_info["merch_inc"] * 0.5,
@@ -44,10 +56,7 @@ def overmature_decline(
     Returns:
         pd.DataFrame: The overmature decline matrices formatted as a dataframe.
     """
-    matrices = {}
-    if "age" in growth_info:
-        matrices["[row_idx]"] = growth_info["row_idx"]
-        matrices["[state.age]"] = growth_info["age"]
+    matrices = _growth_info_index(growth_info)
     matrices.update(
         {
             "Merch.StemSnag": growth_info["merch_to_stem_snag_prop"],
@@ -263,6 +272,73 @@ def slow_decay(
     return slow_decay_ops
 
 
+class DecayMatrices:
+    """Memoizes the dom and slow decay matrices of :py:func:`dom_decay` and
+    :py:func:`slow_decay` by mean annual temperature.  The matrices are
+    computed once for each unique temperature, and are indexed by the
+    `[parameters.mean_annual_temperature]` column, so that their size
+    depends on the number of unique temperatures rather than the number of
+    stands.
+
+    Args:
+        decay_parameters (dict[str, dict[str, float]]): CBM3 decay parameters
+    """
+
+    temperature_key = "[parameters.mean_annual_temperature]"
+
+    def __init__(self, decay_parameters: dict[str, dict[str, float]]):
+        self._decay_parameters = decay_parameters
+        self._temperatures = np.array([], dtype="float64")
+        self._dom_decay: Union[pd.DataFrame, None] = None
+        self._slow_decay: Union[pd.DataFrame, None] = None
+
+    def _update(self, mean_annual_temp: np.ndarray) -> None:
+        if (
+            self._dom_decay is not None
+            and np.isin(mean_annual_temp, self._temperatures).all()
+        ):
+            return
+        self._temperatures = np.union1d(
+            self._temperatures, mean_annual_temp.astype("float64")
+        )
+        self._dom_decay = dom_decay(self._temperatures, self._decay_parameters)
+        self._dom_decay.insert(0, self.temperature_key, self._temperatures)
+        self._slow_decay = slow_decay(
+            self._temperatures, self._decay_parameters
+        )
+        self._slow_decay.insert(0, self.temperature_key, self._temperatures)
+
+    def dom_decay(self, mean_annual_temp: np.ndarray) -> pd.DataFrame:
+        """Get the dom decay matrices for all temperatures computed so far,
+        including those specified.
+
+        Args:
+            mean_annual_temp (np.ndarray): the mean annual temperature in
+                deg C
+
+        Returns:
+            pd.DataFrame: Formatted dataframe of dom decay matrices indexed
+                by mean annual temperature
+        """
+        self._update(mean_annual_temp)
+        return self._dom_decay
+
+    def slow_decay(self, mean_annual_temp: np.ndarray) -> pd.DataFrame:
+        """Get the slow decay matrices for all temperatures computed so
+        far, including those specified.
+
+        Args:
+            mean_annual_temp (np.ndarray): the mean annual temperature in
+                deg C
+
+        Returns:
+            pd.DataFrame: Formatted dataframe of slow decay matrices indexed
+                by mean annual temperature
+        """
+        self._update(mean_annual_temp)
+        return self._slow_decay
+
+
 def slow_mixing(rate: float) -> pd.DataFrame:
     """Compute the slow mixing rate matrix and return it in a formatted
     dataframe
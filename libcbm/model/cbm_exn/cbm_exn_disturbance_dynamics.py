@@ -2,13 +2,63 @@ import numpy as np
 import pandas as pd
 
 
-def disturbance(
+def _disturbance_matrix_flows(
+    pools: list[str], disturbance_matrices: pd.DataFrame
+) -> tuple[np.ndarray, pd.DataFrame]:
+    """Pivot the disturbance matrix values into a dense table with one row
+    per disturbance matrix id and one column per source.sink flow, sorted by
+    name. Pools which are not the source of any flow in a matrix retain
+    their value (diagonal proportion of 1).
+
+    Returns:
+        tuple[np.ndarray, pd.DataFrame]: the sorted unique disturbance
+            matrix ids, and the table of flows for each of them
+    """
+    dm_values = disturbance_matrices.drop_duplicates(
+        ["disturbance_matrix_id", "source_pool", "sink_pool"], keep="last"
+    )
+    dmids, dmid_codes = np.unique(
+        dm_values["disturbance_matrix_id"].to_numpy(), return_inverse=True
+    )
+    source = dm_values["source_pool"].astype(str)
+    flow_names = (source + "." + dm_values["sink_pool"].astype(str)).to_numpy()
+
+    # the pools which are not the source of any flow in each matrix
+    pool_index = pd.Index(pools)
+    source_codes = pool_index.get_indexer(source.to_numpy())
+    is_pool = source_codes >= 0
+    has_source = np.zeros((len(dmids), len(pools)), dtype=bool)
+    has_source[dmid_codes[is_pool], source_codes[is_pool]] = True
+    identity_dmid_codes, identity_pool_codes = np.nonzero(~has_source)
+    identity_pools = np.array(pools, dtype=object)[identity_pool_codes]
+
+    identity_flow_names = identity_pools + "." + identity_pools
+    flows, flow_codes = np.unique(
+        np.concatenate([flow_names, identity_flow_names]).astype(str),
+        return_inverse=True,
+    )
+    n_values = flow_names.shape[0]
+    flow_values = np.zeros((len(dmids), len(flows)), dtype="float")
+    flow_values[dmid_codes, flow_codes[:n_values]] = dm_values[
+        "proportion"
+    ].to_numpy()
+    flow_values[identity_dmid_codes, flow_codes[n_values:]] = 1.0
+    return dmids, pd.DataFrame(flow_values, columns=flows.tolist())
+
+
+def compact_disturbance(
     pools: list[str],
     disturbance_matrices: pd.DataFrame,
     dm_associations: pd.DataFrame,
     spinup_format: bool,
-) -> pd.DataFrame:
-    """Compute a formatted dataframe containing all
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute the disturbance matrices as a table of unique matrices, and
+    an index table mapping each disturbance type, spatial unit and sw_hw
+    association to a row of the matrix table.  Identical matrices are stored
+    once even when they have different disturbance matrix ids.
+
+    The result can be used as the `op_data` and `matrices` arguments of
+    :py:meth:`ModelMatrixOps.create_operation`.
 
     Args:
         pools (list[str]): the list of CBM pools
@@ -20,9 +70,14 @@ def disturbance(
         spinup_format (bool): set to true if the result is being used
             for spinup and false for stepping.
 
+    Raises:
+        ValueError: an association refers to a disturbance matrix id with
+            no disturbance matrix values
+
     Returns:
-        pd.DataFrame: formatted dataframe containing indexed disturbance
-            matrices on each row
+        tuple[pd.DataFrame, pd.DataFrame]: the formatted index table, whose
+            `matrix_index` column is the row of the matrix table for each
+            association, and the formatted table of unique matrices
     """
     if spinup_format:
         dist_table_name = "state"
@@ -32,45 +87,67 @@ def disturbance(
         dist_table_name = "parameters"
         spu_table_name = "state"
         sw_hw_table_name = "state"
-    matrix_data_by_dmid: dict[int, list[list]] = {}
-    dmid = disturbance_matrices["disturbance_matrix_id"].to_numpy()
-    source = disturbance_matrices["source_pool"].to_list()
-    sink = disturbance_matrices["sink_pool"].to_list()
-    proportion = disturbance_matrices["proportion"].to_numpy()
-    for i in range(dmid.shape[0]):
-        dmid_i = dmid[i]
-        if dmid_i not in matrix_data_by_dmid:
-            matrix_data_by_dmid[dmid_i] = []
-        matrix_data_by_dmid[dmid_i].append([source[i], sink[i], proportion[i]])
-    dmids = list(matrix_data_by_dmid.keys())
-    for dmid in dmids:
-        pool_set = set(pools)
-        for row in matrix_data_by_dmid[dmid]:
-            pool_set.discard(row[0])
-        for pool in pool_set:
-            matrix_data_by_dmid[dmid].append([pool, pool, 1.0])
-
-    flow_cols = {"dmid": np.full(len(matrix_data_by_dmid), 0, "int64")}
-    for i_dmid, (dmid, matrix_list) in enumerate(matrix_data_by_dmid.items()):
-        flow_cols["dmid"][i_dmid] = dmid
-        for row in matrix_list:
-            flow_colname = f"{row[0]}.{row[1]}"
-            if flow_colname not in flow_cols:
-                flow_cols[flow_colname] = np.full(
-                    len(matrix_data_by_dmid), 0, "float"
-                )
-            flow_cols[flow_colname][i_dmid] = row[2]
-    dm_flows = pd.DataFrame(flow_cols)
-    dm_flows = dm_flows.reindex(sorted(dm_flows.columns), axis=1)
-    dm_associations = dm_associations.rename(
+
+    dmids, dm_flows = _disturbance_matrix_flows(pools, disturbance_matrices)
+    unique_flows, dmid_matrix_index = np.unique(
+        dm_flows.to_numpy(), axis=0, return_inverse=True
+    )
+    matrices = pd.DataFrame(unique_flows, columns=dm_flows.columns)
+
+    association_dmids = dm_associations["disturbance_matrix_id"].to_numpy()
+    missing = ~np.isin(association_dmids, dmids)
+    if missing.any():
+        raise ValueError(
+            "no disturbance matrix values found for disturbance_matrix_id "
+            f"{association_dmids[np.flatnonzero(missing)[0]]}"
+        )
+    dmid_pos = np.searchsorted(dmids, association_dmids)
+    index = dm_associations.rename(
         columns={
             "spatial_unit_id": f"[{spu_table_name}.spatial_unit_id]",
             "disturbance_type_id": f"[{dist_table_name}.disturbance_type]",
             "sw_hw": f"[{sw_hw_table_name}.sw_hw]",
         }
+    ).drop(columns=["disturbance_matrix_id"])
+    index["matrix_index"] = dmid_matrix_index.reshape(-1)[dmid_pos]
+    return index, matrices
+
+
+def disturbance(
+    pools: list[str],
+    disturbance_matrices: pd.DataFrame,
+    dm_associations: pd.DataFrame,
+    spinup_format: bool,
+) -> pd.DataFrame:
+    """Compute a formatted dataframe containing all
+
+    See :py:func:`compact_disturbance` for a more compact representation of
+    the same matrices.
+
+    Args:
+        pools (list[str]): the list of CBM pools
+        disturbance_matrices (pd.DataFrame): disturbance matrix values drawn
+            from CBM default parameters
+        dm_associations (pd.DataFrame): the matrix-id to
+            disturbance type/spatial unit relationship table drawn from CBM
+            default parameters
+        spinup_format (bool): set to true if the result is being used
+            for spinup and false for stepping.
+
+    Returns:
+        pd.DataFrame: formatted dataframe containing indexed disturbance
+            matrices on each row
+    """
+    index, matrices = compact_disturbance(
+        pools, disturbance_matrices, dm_associations, spinup_format
     )
-    output = dm_associations.merge(
-        dm_flows, left_on="disturbance_matrix_id", right_on="dmid", how="left"
+    output = pd.concat(
+        [
+            index.drop(columns=["matrix_index"]).reset_index(drop=True),
+            matrices.iloc[index["matrix_index"].to_numpy()].reset_index(
+                drop=True
+            ),
+        ],
+        axis=1,
     )
-    output = output.drop(columns=["disturbance_matrix_id", "dmid"])
     return output
@@ -3,80 +3,73 @@ import pandas as pd
 import numpy as np
 import numba as nb
 from libcbm.model.model_definition.model_variables import ModelVariables
-
-
-def _total_root_bio_hw(
-    root_parameters: dict[str, float], total_ag_bio_t: np.ndarray
-):
-    """
-    Compute the total root biomass for a hardwood record
-    """
-
-    return root_parameters["hw_a"] * np.power(
-        total_ag_bio_t / root_parameters["biomass_to_carbon_rate"],
-        root_parameters["hw_b"],
-    )
-
-
-def _total_root_bio_sw(
-    root_parameters: dict[str, float], total_ag_bio_t: np.ndarray
-) -> np.ndarray:
-    """Compute the total root biomass for a softwood record"""
-    return (
-        root_parameters["sw_a"]
-        * total_ag_bio_t
-        / root_parameters["biomass_to_carbon_rate"]
-    )
-
-
-def _fine_root_proportion(
-    root_parameters: dict[str, float], total_root_bio: np.ndarray
-) -> np.ndarray:
-    """Compute fine root proportion."""
-    return root_parameters["frp_a"] + root_parameters["frp_b"] * np.exp(
-        root_parameters["frp_c"] * total_root_bio
-    )
-
-
-def _compute_root_inc(
-    sw_hw: np.ndarray,
+from libcbm.model.model_definition import spinup_cache
+
+# the growth and overmature decline flows, in the order of the rows of the
+# _compute_growth output buffer
+_GROWTH_FLOWS = [
+    "coarse_root_inc",
+    "fine_root_inc",
+    "merch_to_stem_snag_prop",
+    "other_to_branch_snag_prop",
+    "other_to_ag_fast_prop",
+    "foliage_to_ag_fast_prop",
+    "coarse_root_to_ag_fast_prop",
+    "coarse_root_to_bg_fast_prop",
+    "fine_root_to_ag_vfast_prop",
+    "fine_root_to_bg_vfast_prop",
+]
+
+
+@nb.njit(parallel=True)
+def _total_ag_bio_compute(
     merch: np.ndarray,
     foliage: np.ndarray,
     other: np.ndarray,
-    coarse_root: np.ndarray,
-    fine_root: np.ndarray,
     merch_inc: np.ndarray,
     foliage_inc: np.ndarray,
     other_inc: np.ndarray,
-    root_parameters: dict[str, float],
-) -> dict[str, np.ndarray]:
-    total_ag_bio_t = (
-        merch + merch_inc + foliage + foliage_inc + other + other_inc
-    )
-
-    total_root_bio = np.where(
-        sw_hw,  # sw=0, hw=1
-        _total_root_bio_hw(root_parameters, total_ag_bio_t),
-        _total_root_bio_sw(root_parameters, total_ag_bio_t),
-    )
-    fine_root_prop = _fine_root_proportion(root_parameters, total_root_bio)
-    coarse_root_inc = (
-        total_root_bio
-        * (1 - fine_root_prop)
-        * root_parameters["biomass_to_carbon_rate"]
-        - coarse_root
-    )
-    fine_root_inc = (
-        total_root_bio
-        * fine_root_prop
-        * root_parameters["biomass_to_carbon_rate"]
-        - fine_root
-    )
-    return {"coarse_root_inc": coarse_root_inc, "fine_root_inc": fine_root_inc}
+    biomass_to_carbon_rate: float,
+    total_ag_bio: np.ndarray,
+    hw_root_bio: np.ndarray,
+):
+    for i in nb.prange(merch.shape[0]):
+        total = (
+            merch[i]
+            + merch_inc[i]
+            + foliage[i]
+            + foliage_inc[i]
+            + other[i]
+            + other_inc[i]
+        )
+        total_ag_bio[i] = total
+        hw_root_bio[i] = total / biomass_to_carbon_rate
 
 
-@nb.njit()
-def _overmature_decline_compute(
+@nb.njit(parallel=True)
+def _total_root_bio_compute(
+    sw_hw: np.ndarray,
+    hw_a: float,
+    sw_a: float,
+    frp_c: float,
+    biomass_to_carbon_rate: float,
+    total_bio: np.ndarray,
+    hw_root_bio: np.ndarray,
+):
+    # total_bio holds the total above ground biomass on input and the
+    # total root biomass on output, and hw_root_bio is overwritten with
+    # the exponent of the fine root proportion
+    for i in nb.prange(sw_hw.shape[0]):
+        if sw_hw[i] != 0:
+            total_root_bio = hw_a * hw_root_bio[i]
+        else:
+            total_root_bio = sw_a * total_bio[i] / biomass_to_carbon_rate
+        total_bio[i] = total_root_bio
+        hw_root_bio[i] = frp_c * total_root_bio
+
+
+@nb.njit(parallel=True)
+def _growth_compute(
     merch: np.ndarray,
     foliage: np.ndarray,
     other: np.ndarray,
@@ -85,61 +78,112 @@ def _overmature_decline_compute(
     merch_inc: np.ndarray,
     foliage_inc: np.ndarray,
     other_inc: np.ndarray,
-    coarse_root_inc: np.ndarray,
-    fine_root_inc: np.ndarray,
+    total_root_bio: np.ndarray,
+    frp_exp: np.ndarray,
+    frp_a: float,
+    frp_b: float,
+    biomass_to_carbon_rate: float,
     other_to_branch_snag_split: np.ndarray,
     coarse_root_ag_split: np.ndarray,
     fine_root_ag_split: np.ndarray,
-    merch_to_stem_snag_prop: np.ndarray,
-    other_to_branch_snag_prop: np.ndarray,
-    other_to_ag_fast_prop: np.ndarray,
-    foliage_to_ag_fast_prop: np.ndarray,
-    coarse_root_to_ag_fast_prop: np.ndarray,
-    coarse_root_to_bg_fast_prop: np.ndarray,
-    fine_root_to_ag_vfast_prop: np.ndarray,
-    fine_root_to_bg_vfast_prop: np.ndarray,
+    out: np.ndarray,
 ):
     tolerance = -0.0001
-    size = merch.shape[0]
-    for i in range(size):
+    for i in nb.prange(merch.shape[0]):
+        fine_root_prop = frp_a + frp_b * frp_exp[i]
+        coarse_root_inc = (
+            total_root_bio[i] * (1 - fine_root_prop) * biomass_to_carbon_rate
+            - coarse_root[i]
+        )
+        fine_root_inc = (
+            total_root_bio[i] * fine_root_prop * biomass_to_carbon_rate
+            - fine_root[i]
+        )
+        out[0, i] = coarse_root_inc
+        out[1, i] = fine_root_inc
+        for j in range(2, out.shape[0]):
+            out[j, i] = 0.0
         overmature = (
             merch_inc[i]
             + foliage_inc[i]
             + other_inc[i]
-            + fine_root_inc[i]
-            + coarse_root_inc[i]
+            + fine_root_inc
+            + coarse_root_inc
         ) < tolerance
-        if overmature and merch_inc[i] < 0:
-            merch_to_stem_snag_prop[i] = -merch_inc[i] / merch[i]
-        if overmature and other_inc[i] < 0:
-            other_to_branch_snag_prop[i] = (
+        if not overmature:
+            continue
+        if merch_inc[i] < 0:
+            out[2, i] = -merch_inc[i] / merch[i]
+        if other_inc[i] < 0:
+            out[3, i] = (
                 -other_inc[i] * other_to_branch_snag_split[i] / other[i]
             )
-            other_to_ag_fast_prop[i] = (
+            out[4, i] = (
                 -other_inc[i] * (1 - other_to_branch_snag_split[i]) / other[i]
             )
-        if overmature and foliage_inc[i] < 0:
-            foliage_to_ag_fast_prop[i] = -foliage_inc[i] / foliage[i]
-        if overmature and coarse_root_inc[i] < 0:
-            coarse_root_to_ag_fast_prop[i] = (
-                -coarse_root_inc[i] * coarse_root_ag_split[i] / coarse_root[i]
+        if foliage_inc[i] < 0:
+            out[5, i] = -foliage_inc[i] / foliage[i]
+        if coarse_root_inc < 0:
+            out[6, i] = (
+                -coarse_root_inc * coarse_root_ag_split[i] / coarse_root[i]
             )
-            coarse_root_to_bg_fast_prop[i] = (
-                -coarse_root_inc[i]
+            out[7, i] = (
+                -coarse_root_inc
                 * (1 - coarse_root_ag_split[i])
                 / coarse_root[i]
             )
-        if overmature and fine_root_inc[i] < 0:
-            fine_root_to_ag_vfast_prop[i] = (
-                -fine_root_inc[i] * fine_root_ag_split[i] / fine_root[i]
-            )
-            fine_root_to_bg_vfast_prop[i] = (
-                -fine_root_inc[i] * (1 - fine_root_ag_split[i]) / fine_root[i]
+        if fine_root_inc < 0:
+            out[8, i] = -fine_root_inc * fine_root_ag_split[i] / fine_root[i]
+            out[9, i] = (
+                -fine_root_inc * (1 - fine_root_ag_split[i]) / fine_root[i]
             )
 
 
-def _compute_overmature_decline(
+def _get_turnover_splits(
     spatial_unit_id: np.ndarray,
+    sw_hw: np.ndarray,
+    turnover_parameters: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the overmature decline turnover splits for each of the specified
+    spatial unit and sw_hw values
+    """
+    # look up the splits once for each unique key rather than once per row
+    spu_codes, unique_spu = pd.factorize(spatial_unit_id)
+    sw_hw_codes, unique_sw_hw = pd.factorize(sw_hw)
+    key_codes, unique_keys = pd.factorize(
+        spu_codes * len(unique_sw_hw) + sw_hw_codes
+    )
+    turnover_parameters_merged = pd.DataFrame(
+        {
+            "spatial_unit_id": unique_spu[unique_keys // len(unique_sw_hw)],
+            "sw_hw": unique_sw_hw[unique_keys % len(unique_sw_hw)],
+        }
+    ).merge(
+        turnover_parameters[
+            [
+                "spatial_unit_id",
+                "sw_hw",
+                "OtherToBranchSnagSplit",
+                "CoarseRootAGSplit",
+                "FineRootAGSplit",
+            ]
+        ],
+        how="left",
+        on=["spatial_unit_id", "sw_hw"],
+    )
+    splits = turnover_parameters_merged[
+        ["OtherToBranchSnagSplit", "CoarseRootAGSplit", "FineRootAGSplit"]
+    ]
+    if len(turnover_parameters_merged.index) != len(
+        unique_keys
+    ) or splits.isna().any(axis=None):
+        raise ValueError()
+    return tuple(
+        splits[col].to_numpy(dtype="float")[key_codes] for col in splits
+    )
+
+
+def _compute_growth(
     sw_hw: np.ndarray,
     merch: np.ndarray,
     foliage: np.ndarray,
@@ -149,49 +193,45 @@ def _compute_overmature_decline(
     merch_inc: np.ndarray,
     foliage_inc: np.ndarray,
     other_inc: np.ndarray,
-    coarse_root_inc: np.ndarray,
-    fine_root_inc: np.ndarray,
-    turnover_parameters: pd.DataFrame,
-) -> dict[str, np.ndarray]:
+    turnover_splits: tuple[np.ndarray, np.ndarray, np.ndarray],
+    root_parameters: dict[str, float],
+    out: np.ndarray,
+) -> None:
     """
-    Compute the C flows for CBM-CFS3 overmature decline
-    IE. when the net C incremenet is negative.
+    Compute the root increments and the C flows for CBM-CFS3 overmature
+    decline (IE. when the net C incremenet is negative) and write them to
+    the rows of the specified output buffer, in the order of
+    `_GROWTH_FLOWS`.
+
+    The exponentiation steps are evaluated with numpy, so that the
+    results do not depend on the math library used by numba.
     """
-    turnover_parameters_merged = turnover_parameters[
-        [
-            "spatial_unit_id",
-            "sw_hw",
-            "OtherToBranchSnagSplit",
-            "CoarseRootAGSplit",
-            "FineRootAGSplit",
-        ]
-    ].merge(
-        pd.DataFrame({"spatial_unit_id": spatial_unit_id, "sw_hw": sw_hw}),
-        left_on=["spatial_unit_id", "sw_hw"],
-        right_on=["spatial_unit_id", "sw_hw"],
+    biomass_to_carbon_rate = root_parameters["biomass_to_carbon_rate"]
+    total_bio = np.empty(merch.shape[0])
+    work = np.empty(merch.shape[0])
+    _total_ag_bio_compute(
+        merch,
+        foliage,
+        other,
+        merch_inc,
+        foliage_inc,
+        other_inc,
+        biomass_to_carbon_rate,
+        total_bio,
+        work,
     )
-
-    if len(turnover_parameters_merged.index) != spatial_unit_id.shape[0]:
-        raise ValueError()
-
-    other_to_branch_snag_split = turnover_parameters_merged[
-        "OtherToBranchSnagSplit"
-    ].to_numpy()
-    coarse_root_ag_split = turnover_parameters_merged[
-        "CoarseRootAGSplit"
-    ].to_numpy()
-    fine_root_ag_split = turnover_parameters_merged[
-        "FineRootAGSplit"
-    ].to_numpy()
-    merch_to_stem_snag_prop = np.zeros(spatial_unit_id.shape)
-    other_to_branch_snag_prop = np.zeros(spatial_unit_id.shape)
-    other_to_ag_fast_prop = np.zeros(spatial_unit_id.shape)
-    foliage_to_ag_fast_prop = np.zeros(spatial_unit_id.shape)
-    coarse_root_to_ag_fast_prop = np.zeros(spatial_unit_id.shape)
-    coarse_root_to_bg_fast_prop = np.zeros(spatial_unit_id.shape)
-    fine_root_to_ag_vfast_prop = np.zeros(spatial_unit_id.shape)
-    fine_root_to_bg_vfast_pro = np.zeros(spatial_unit_id.shape)
-    _overmature_decline_compute(
+    np.power(work, root_parameters["hw_b"], out=work)
+    _total_root_bio_compute(
+        sw_hw,
+        root_parameters["hw_a"],
+        root_parameters["sw_a"],
+        root_parameters["frp_c"],
+        biomass_to_carbon_rate,
+        total_bio,
+        work,
+    )
+    np.exp(work, out=work)
+    _growth_compute(
         merch,
         foliage,
         other,
@@ -200,30 +240,79 @@ def _compute_overmature_decline(
         merch_inc,
         foliage_inc,
         other_inc,
-        coarse_root_inc,
-        fine_root_inc,
-        other_to_branch_snag_split,
-        coarse_root_ag_split,
-        fine_root_ag_split,
-        merch_to_stem_snag_prop,
-        other_to_branch_snag_prop,
-        other_to_ag_fast_prop,
-        foliage_to_ag_fast_prop,
-        coarse_root_to_ag_fast_prop,
-        coarse_root_to_bg_fast_prop,
-        fine_root_to_ag_vfast_prop,
-        fine_root_to_bg_vfast_pro,
+        total_bio,
+        work,
+        root_parameters["frp_a"],
+        root_parameters["frp_b"],
+        biomass_to_carbon_rate,
+        *turnover_splits,
+        out,
     )
-    return {
-        "merch_to_stem_snag_prop": merch_to_stem_snag_prop,
-        "other_to_branch_snag_prop": other_to_branch_snag_prop,
-        "other_to_ag_fast_prop": other_to_ag_fast_prop,
-        "foliage_to_ag_fast_prop": foliage_to_ag_fast_prop,
-        "coarse_root_to_ag_fast_prop": coarse_root_to_ag_fast_prop,
-        "coarse_root_to_bg_fast_prop": coarse_root_to_bg_fast_prop,
-        "fine_root_to_ag_vfast_prop": fine_root_to_ag_vfast_prop,
-        "fine_root_to_bg_vfast_prop": fine_root_to_bg_vfast_pro,
-    }
+
+
+def _unique_growth_curves(
+    row_idx: np.ndarray,
+    age: np.ndarray,
+    increments: list[np.ndarray],
+    stand_keys: list[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the unique combinations of increment curve and the specified
+    stand values.  Missing increments are equivalent to zero increments.
+
+    Args:
+        row_idx (np.ndarray): the stand of each increment, sorted
+        age (np.ndarray): the age of each increment, sorted within each
+            stand
+        increments (list[np.ndarray]): the increment values
+        stand_keys (list[np.ndarray]): values for each stand which, in
+            addition to its curve, identify its growth
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the first stand with each unique
+            combination, and for each stand the position of its combination
+            in the first array
+    """
+    n_stands = stand_keys[0].shape[0]
+    non_zero = np.zeros(row_idx.shape[0], dtype=bool)
+    for values in increments:
+        non_zero |= values != 0
+    row_idx = row_idx[non_zero]
+    age = age[non_zero]
+    increments = [values[non_zero] for values in increments]
+
+    # each curve is hashed as the sum of the hashes of its increments
+    increment_hash = spinup_cache.hash_rows(
+        pd.DataFrame(
+            {"age": age, **{str(i): v for i, v in enumerate(increments)}}
+        )
+    )
+    lengths = np.bincount(row_idx, minlength=n_stands)
+    starts = np.concatenate([[0], lengths.cumsum()[:-1]])
+    curve_hash = np.zeros(n_stands, dtype="uint64")
+    has_curve = lengths > 0
+    curve_hash[has_curve] = np.add.reduceat(increment_hash, starts[has_curve])
+    key_data = pd.DataFrame(
+        {
+            "curve_hash": curve_hash,
+            "length": lengths,
+            **{f"key_{i}": k for i, k in enumerate(stand_keys)},
+        }
+    )
+    unique_idx, inverse = spinup_cache.unique_rows(key_data)
+
+    # check that the increments of each stand match those of the first
+    # stand with the same key, and otherwise give the stand its own key
+    first_start = starts[unique_idx[inverse]][row_idx]
+    other = first_start + np.arange(row_idx.shape[0]) - starts[row_idx]
+    match = age[other] == age
+    for values in increments:
+        match &= values[other] == values
+    if not match.all():
+        mismatched = np.unique(row_idx[~match])
+        key_data["stand"] = 0
+        key_data.loc[mismatched, "stand"] = mismatched + 1
+        unique_idx, inverse = spinup_cache.unique_rows(key_data)
+    return unique_idx, inverse
 
 
 def prepare_spinup_growth_info(
@@ -233,6 +322,11 @@ def prepare_spinup_growth_info(
 ) -> dict[str, np.ndarray]:
     """Pre-compute all growth C flow operations for spinup.
 
+    The C flows are computed once for each unique combination of increment
+    curve, spatial unit and sw_hw, and are identified by a
+    `growth_curve_id` which is assigned to the spinup_vars `state` for
+    each stand.
+
     Args:
         spinup_vars (ModelVariables): collection of CBM parameters, simulation
             and state variables
@@ -243,51 +337,79 @@ def prepare_spinup_growth_info(
         ValueError: specified increment table was not formatted correctly.
 
     Returns:
-        dict[str, np.ndarray]: a dictionary of labelled pool C flows
+        dict[str, np.ndarray]: a dictionary of labelled pool C flows by
+            growth_curve_id and age
     """
-
-    sw_hw = spinup_vars["parameters"]["sw_hw"].to_numpy()
-
-    spatial_unit_id = spinup_vars["parameters"]["spatial_unit_id"].to_numpy()
-    spinup_incremements = spinup_vars["increments"].to_pandas()
-    unique_ages = spinup_incremements["age"].drop_duplicates().sort_values()
-    if not unique_ages.diff().iloc[1:].eq(1).all():
+    n_stands = spinup_vars["parameters"].n_rows
+    stand_sw_hw = spinup_vars["parameters"]["sw_hw"].to_numpy()
+    stand_spatial_unit_id = spinup_vars["parameters"][
+        "spatial_unit_id"
+    ].to_numpy()
+    spinup_incremements = spinup_vars["increments"]
+    inc_row_idx = spinup_incremements["row_idx"].to_numpy().astype("int64")
+    inc_age = spinup_incremements["age"].to_numpy().astype("int64")
+    unique_ages = np.unique(inc_age)
+    if not (np.diff(unique_ages) == 1).all():
         raise ValueError("expected a sequential set of ages")
-    if unique_ages.iloc[0] != 1:
+    if unique_ages[0] != 1:
         raise ValueError("expected a minimum age of 1")
-
-    merch_inc = (
-        spinup_incremements.pivot(
-            index="row_idx", columns="age", values="merch_inc"
-        )
-        .fillna(0)
-        .to_numpy()
-    )
-
-    foliage_inc = (
-        spinup_incremements.pivot(
-            index="row_idx", columns="age", values="foliage_inc"
-        )
-        .fillna(0)
-        .to_numpy()
+    # increments of rows other than the spinup stands are never used
+    in_range = (inc_row_idx >= 0) & (inc_row_idx < n_stands)
+    order = None if in_range.all() else np.flatnonzero(in_range)
+    if order is not None:
+        inc_row_idx = inc_row_idx[order]
+        inc_age = inc_age[order]
+    is_sorted = (inc_row_idx[1:] > inc_row_idx[:-1]) | (
+        (inc_row_idx[1:] == inc_row_idx[:-1]) & (inc_age[1:] > inc_age[:-1])
     )
-    other_inc = (
-        spinup_incremements.pivot(
-            index="row_idx", columns="age", values="other_inc"
-        )
-        .fillna(0)
-        .to_numpy()
-    )
-
-    # add one additional column for each for the "null" increments,
-    # used when the simulation age exceed the max age in the data
-    merch_inc = np.column_stack([merch_inc, np.zeros(merch_inc.shape[0])])
-    foliage_inc = np.column_stack(
-        [foliage_inc, np.zeros(foliage_inc.shape[0])]
+    if not is_sorted.all():
+        sort_order = np.lexsort((inc_age, inc_row_idx))
+        order = sort_order if order is None else order[sort_order]
+        inc_row_idx = inc_row_idx[sort_order]
+        inc_age = inc_age[sort_order]
+        if (
+            (inc_row_idx[1:] == inc_row_idx[:-1])
+            & (inc_age[1:] == inc_age[:-1])
+        ).any():
+            raise ValueError(
+                "Index contains duplicate entries, cannot reshape"
+            )
+    increments = []
+    for name in ["merch_inc", "foliage_inc", "other_inc"]:
+        values = spinup_incremements[name].to_numpy().astype("float")
+        if order is not None:
+            values = values[order]
+        increments.append(np.where(np.isnan(values), 0.0, values))
+
+    # the growth C flows depend on the stand's increment curve, sw_hw and
+    # spatial unit, and are computed once for each unique combination
+    curve_rows, growth_curve_id = _unique_growth_curves(
+        inc_row_idx,
+        inc_age,
+        increments,
+        [stand_sw_hw, stand_spatial_unit_id],
     )
-    other_inc = np.column_stack([other_inc, np.zeros(other_inc.shape[0])])
+    spinup_vars["state"]["growth_curve_id"].assign(growth_curve_id)
+    sw_hw = stand_sw_hw[curve_rows]
+    spatial_unit_id = stand_spatial_unit_id[curve_rows]
+
+    # one additional column for the "null" increments, used when the
+    # simulation age exceeds the max age in the data
+    n_rows = curve_rows.shape[0]
+    curve_pos = np.full(n_stands, -1, dtype="int64")
+    curve_pos[curve_rows] = np.arange(n_rows)
+    inc_curve_pos = curve_pos[inc_row_idx]
+    is_curve_row = inc_curve_pos >= 0
+    merch_inc, foliage_inc, other_inc = [
+        np.zeros((n_rows, unique_ages.shape[0] + 1)) for _ in increments
+    ]
+    for curve_values, values in zip(
+        [merch_inc, foliage_inc, other_inc], increments
+    ):
+        curve_values[
+            inc_curve_pos[is_curve_row], inc_age[is_curve_row] - 1
+        ] = values[is_curve_row]
 
-    n_rows = merch_inc.shape[0]
     merch: np.ndarray = np.column_stack(
         [np.full(n_rows, 0.0), merch_inc.cumsum(axis=1)]
     )
@@ -300,13 +422,16 @@ def prepare_spinup_growth_info(
     if ((merch < 0) | (foliage < 0) | (other < 0)).any():
         raise ValueError("specified increments result in negative pools")
     coarse_root = np.zeros_like(merch)
-    coarse_root_inc = np.zeros_like(merch_inc)
     fine_root = np.zeros_like(merch)
-    fine_root_inc = np.zeros_like(merch_inc)
-    overmature_decline = {}
+    turnover_splits = _get_turnover_splits(
+        spatial_unit_id, sw_hw, turnover_parameters
+    )
+    growth = np.zeros((len(_GROWTH_FLOWS),) + merch_inc.shape)
+    coarse_root_inc = growth[_GROWTH_FLOWS.index("coarse_root_inc")]
+    fine_root_inc = growth[_GROWTH_FLOWS.index("fine_root_inc")]
 
-    for col_idx, age in enumerate(unique_ages):
-        root_inc = _compute_root_inc(
+    for col_idx in range(unique_ages.shape[0]):
+        _compute_growth(
             sw_hw,
             merch[:, col_idx],
             foliage[:, col_idx],
@@ -316,45 +441,22 @@ def prepare_spinup_growth_info(
             merch_inc[:, col_idx],
             foliage_inc[:, col_idx],
             other_inc[:, col_idx],
+            turnover_splits,
             root_parameters,
+            growth[:, :, col_idx],
         )
-        coarse_root_inc[:, col_idx] = root_inc["coarse_root_inc"]
-        fine_root_inc[:, col_idx] = root_inc["fine_root_inc"]
-        col_overmature_decline = _compute_overmature_decline(
-            spatial_unit_id,
-            sw_hw,
-            merch[:, col_idx],
-            foliage[:, col_idx],
-            other[:, col_idx],
-            coarse_root[:, col_idx],
-            fine_root[:, col_idx],
-            merch_inc[:, col_idx],
-            foliage_inc[:, col_idx],
-            other_inc[:, col_idx],
-            coarse_root_inc[:, col_idx],
-            fine_root_inc[:, col_idx],
-            turnover_parameters,
-        )
-        if not overmature_decline:
-            for k, v in col_overmature_decline.items():
-                overmature_decline[k] = np.zeros_like(merch_inc)
-
-        for k, v in col_overmature_decline.items():
-            overmature_decline[k][:, col_idx] = col_overmature_decline[k]
         coarse_root[:, col_idx + 1] = (
-            coarse_root[:, col_idx] + root_inc["coarse_root_inc"]
+            coarse_root[:, col_idx] + coarse_root_inc[:, col_idx]
         )
         fine_root[:, col_idx + 1] = (
-            fine_root[:, col_idx] + root_inc["fine_root_inc"]
+            fine_root[:, col_idx] + fine_root_inc[:, col_idx]
         )
 
-    n_rows = merch_inc.shape[0]
     n_cols = merch_inc.shape[1]
     data = {
-        "row_idx": np.tile(
-            np.arange(0, n_rows, dtype="int64").reshape(n_rows, 1),
-            [1, n_cols],
-        ).flatten(),
+        "growth_curve_id": np.repeat(
+            np.arange(0, n_rows, dtype="int64"), n_cols
+        ),
         "age": np.tile(np.arange(0, n_cols), [1, n_rows]).flatten(),
         "merch_inc": merch_inc.flatten(),
         "other_inc": other_inc.flatten(),
@@ -362,12 +464,8 @@ def prepare_spinup_growth_info(
     }
 
     data.update(
-        {
-            "coarse_root_inc": coarse_root_inc.flatten(),
-            "fine_root_inc": fine_root_inc.flatten(),
-        }
+        {k: growth[i].reshape(-1) for i, k in enumerate(_GROWTH_FLOWS)}
     )
-    data.update({k: v.flatten() for k, v in overmature_decline.items()})
 
     return data
 
@@ -408,7 +506,8 @@ def prepare_growth_info(
         cbm_vars["parameters"]["other_inc"].to_numpy(),
     )
 
-    root_inc = _compute_root_inc(
+    growth = np.empty((len(_GROWTH_FLOWS), merch.shape[0]))
+    _compute_growth(
         sw_hw,
         merch,
         foliage,
@@ -418,22 +517,9 @@ def prepare_growth_info(
         merch_inc,
         foliage_inc,
         other_inc,
+        _get_turnover_splits(spatial_unit_id, sw_hw, turnover_parameters),
         root_parameters,
-    )
-    overmature_decline = _compute_overmature_decline(
-        spatial_unit_id,
-        sw_hw,
-        merch,
-        foliage,
-        other,
-        coarse_root,
-        fine_root,
-        merch_inc,
-        foliage_inc,
-        other_inc,
-        root_inc["coarse_root_inc"],
-        root_inc["fine_root_inc"],
-        turnover_parameters,
+        growth,
     )
 
     data = {
@@ -442,7 +528,6 @@ def prepare_growth_info(
         "foliage_inc": foliage_inc,
     }
 
-    data.update(root_inc)
-    data.update(overmature_decline)
+    data.update({k: growth[i] for i, k in enumerate(_GROWTH_FLOWS)})
 
     return data
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Union
 from typing import Dict
 from typing import Iterator
+from typing import TYPE_CHECKING
 from contextlib import contextmanager
 import pandas as pd
 from libcbm import resources
@@ -10,13 +11,47 @@ from libcbm.model.model_definition.model import CBMModel
 from libcbm.model.model_definition.model_matrix_ops import ModelMatrixOps
 from libcbm.model.model_definition.model_variables import ModelVariables
 from libcbm.model.model_definition.output_processor import ModelOutputProcessor
+from libcbm.model.model_definition.spinup_cache import SpinupCache
 from libcbm.model.cbm_exn import cbm_exn_spinup
 from libcbm.model.cbm_exn import cbm_exn_step
 from libcbm.model.cbm_exn.cbm_exn_parameters import parameters_factory
 from libcbm.model.cbm_exn.cbm_exn_parameters import CBMEXNParameters
 
+if TYPE_CHECKING:
+    import pyarrow
 
-cbm_vars_type = Union[ModelVariables, Dict[str, pd.DataFrame]]
+
+cbm_vars_type = Union[
+    ModelVariables, Dict[str, pd.DataFrame], Dict[str, "pyarrow.Table"]
+]
+
+
+def _is_pandas_dict(cbm_vars: dict) -> bool:
+    return all(isinstance(v, pd.DataFrame) for v in cbm_vars.values())
+
+
+def _to_model_variables(cbm_vars: cbm_vars_type) -> ModelVariables:
+    """Wrap a dictionary of pandas dataframes, or of arrow tables, as
+    ModelVariables without copying.
+    """
+    if isinstance(cbm_vars, ModelVariables):
+        return cbm_vars
+    elif _is_pandas_dict(cbm_vars):
+        return ModelVariables.from_pandas(cbm_vars)
+    else:
+        return ModelVariables.from_arrow(cbm_vars)
+
+
+def _from_model_variables(
+    result: ModelVariables, cbm_vars: cbm_vars_type
+) -> cbm_vars_type:
+    """Return the result in the same form as the specified input"""
+    if isinstance(cbm_vars, ModelVariables):
+        return result
+    elif _is_pandas_dict(cbm_vars):
+        return result.to_pandas()
+    else:
+        return result.to_arrow()
 
 
 class SpinupReporter:
@@ -58,6 +93,7 @@ class CBMEXNModel:
         cbm_model: CBMModel,
         parameters: CBMEXNParameters,
         spinup_reporter: Union[SpinupReporter, None] = None,
+        fuse_operations: bool = False,
     ):
         """initialize the CBMEXNModel
 
@@ -66,10 +102,15 @@ class CBMEXNModel:
             parameters (CBMEXNParameters): cbm_constant parameter
             spinup_reporter (SpinupReporter, optional): If specified, spinup
                 results are tracked for debugging purposes. Defaults to None.
+            fuse_operations (bool, optional): If set to True, operations
+                are fused where possible when fluxes are not tracked. See
+                :py:func:`compute`. Defaults to False.
         """
         self._cbm_model = cbm_model
         self._spinup_reporter = spinup_reporter
+        self._fuse_operations = fuse_operations
         self._parameters = parameters
+        self._step_op_registry = cbm_exn_step.StepOpRegistry(parameters)
 
     @property
     def pool_names(self) -> list[str]:
@@ -109,53 +150,68 @@ class CBMEXNModel:
         """
         return self._parameters
 
+    @property
+    def step_op_registry(self) -> cbm_exn_step.StepOpRegistry:
+        """Registry of the default step operations, which keeps the
+        operations that do not depend on the simulation state across
+        timesteps
+
+        Returns:
+            StepOpRegistry: the step operation registry
+        """
+        return self._step_op_registry
+
     def step(
         self,
         cbm_vars: cbm_vars_type,
         ops: Union[list[dict], None] = None,
         disturbance_op_sequence: Union[list[str], None] = None,
         step_op_sequence: Union[list[str], None] = None,
+        sparse_disturbance: bool = False,
     ) -> cbm_vars_type:
         """Perform one timestep of the CBMEXNModel
 
         Args:
             cbm_vars (cbm_vars_type): the simulation state
                 and variables
+            sparse_disturbance (bool, optional): compute disturbances only
+                for disturbed rows. See
+                :py:func:`libcbm.model.cbm_exn.cbm_exn_step.step_disturbance`.
+                Defaults to False.
 
         Returns:
             cbm_vars_type: modified state and variables.
         """
-        return_pandas_dict = False
-        if isinstance(cbm_vars, dict):
-            return_pandas_dict = True
-            _cbm_vars = ModelVariables.from_pandas(cbm_vars)
-        else:
-            _cbm_vars = cbm_vars
-
         result = cbm_exn_step.step(
             self,
-            _cbm_vars,
+            _to_model_variables(cbm_vars),
             ops,
             step_op_sequence,
             disturbance_op_sequence,
+            sparse_disturbance,
         )
-
-        if return_pandas_dict:
-            return result.to_pandas()
-        else:
-            return result
+        return _from_model_variables(result, cbm_vars)
 
     def spinup(
         self,
         spinup_input: cbm_vars_type,
         ops: Union[list[dict], None] = None,
         op_sequence: Union[list[str], None] = None,
+        deduplicate: bool = False,
+        cache: Union[SpinupCache, None] = None,
     ) -> cbm_vars_type:
         """initializes Carbon pools along the row axis of the specified
         spinup input using the CBM-CFS3 approach for spinup.
 
         Args:
             spinup_input (cbm_vars_type): spinup variables and parameters
+            deduplicate (bool, optional): run spinup once per unique stand.
+                See :py:func:`libcbm.model.cbm_exn.cbm_exn_spinup.spinup`.
+                Defaults to False.
+            cache (SpinupCache, optional): persistent cache of spinup
+                results. See
+                :py:func:`libcbm.model.cbm_exn.cbm_exn_spinup.spinup`.
+                Defaults to None.
 
         Returns:
             cbm_vars_type: initlaized CBM variables and state, prepared
@@ -166,14 +222,10 @@ class CBMEXNModel:
             if self._spinup_reporter
             else None
         )
-        return_pandas_dict = False
-        if isinstance(spinup_input, dict):
-            return_pandas_dict = True
-            _spinup_input = ModelVariables.from_pandas(spinup_input)
-        else:
-            _spinup_input = spinup_input
         spinup_vars = cbm_exn_spinup.prepare_spinup_vars(
-            _spinup_input, self.parameters, reporting_func is not None
+            _to_model_variables(spinup_input),
+            self.parameters,
+            reporting_func is not None,
         )
         result = cbm_exn_spinup.spinup(
             self,
@@ -181,12 +233,10 @@ class CBMEXNModel:
             reporting_func=reporting_func,
             ops=ops,
             op_sequence=op_sequence,
+            deduplicate=deduplicate,
+            cache=cache,
         )
-
-        if return_pandas_dict:
-            return result.to_pandas()
-        else:
-            return result
+        return _from_model_variables(result, spinup_input)
 
     def get_spinup_output(self) -> cbm_vars_type:
         """If spinup debugging was enabled during construction of this class,
@@ -211,7 +261,12 @@ class CBMEXNModel:
         op_names: list[str],
     ):
         """Apply several sequential operations to the pools, and flux stored
-        in the specified `cbm_vars`.
+        in the specified `cbm_vars`.  If this model was initialized with
+        `fuse_operations` and `cbm_vars` has no flux, runs of consecutive
+        operations which do not require re-indexing are applied as single
+        fused operations (see :py:class:`ModelMatrixOps`).  Fused results
+        are equal to within floating point rounding, but are not
+        bit-identical to the results of the unfused operations.
 
         Args:
             cbm_vars (ModelVariables): Collection of CBM simulation variables.
@@ -223,7 +278,11 @@ class CBMEXNModel:
 
         self._cbm_model.compute(
             cbm_vars,
-            self._cbm_model.matrix_ops.get_operations(op_names, cbm_vars),
+            self._cbm_model.matrix_ops.get_operations(
+                op_names,
+                cbm_vars,
+                fuse=self._fuse_operations and "flux" not in cbm_vars,
+            ),
         )
 
 
@@ -232,6 +291,7 @@ def initialize(
     parameters: Union[dict, None] = None,
     config_path: Union[str, None] = None,
     include_spinup_debug: bool = False,
+    fuse_operations: bool = False,
 ) -> Iterator[CBMEXNModel]:
     """Initialize CBMEXNModel
 
@@ -248,6 +308,11 @@ def initialize(
             `get_spinup_output` of the returned class instance can be used to
             inspect timestep-by-timestep spinup output.  This will cause slow
             spinup performance. Defaults to False.
+        fuse_operations (bool, optional): If set to true, runs of
+            operations which do not require re-indexing are fused when
+            fluxes are not tracked, which is faster, but not bit-identical
+            to applying the operations one by one. See
+            :py:func:`CBMEXNModel.compute`. Defaults to False.
 
     Yields:
         Iterator[CBMEXNModel]: instance of CBMEXNModel
@@ -267,6 +332,7 @@ def initialize(
             cbm_model,
             params,
             spinup_reporter=spinup_reporter,
+            fuse_operations=fuse_operations,
         )
         yield m
         m.matrix_ops.dispose()
@@ -4,6 +4,9 @@ import copy
 import os
 import json
 import pandas as pd
+from libcbm.model.cbm_exn.cbm_exn_annual_process_dynamics import (
+    DecayMatrices,
+)
 
 
 CBMEXN_PARAMETERS_DATA = {
@@ -69,6 +72,7 @@ class CBMEXNParameters:
             self._decay_param_dict[str(row["pool"])] = {
                 col: float(row[col]) for col in decay_params.columns[1:]
             }
+        self._decay_matrices = DecayMatrices(self._decay_param_dict)
 
         dm_associations = self._data["disturbance_matrix_association"]
         if not dm_associations["sw_hw"].isin(["sw", "hw"]).all():
@@ -141,6 +145,15 @@ class CBMEXNParameters:
         """
         return self._decay_param_dict
 
+    def get_decay_matrices(self) -> DecayMatrices:
+        """Get the dom and slow decay matrices computed from the decay
+        parameters, memoized by mean annual temperature.
+
+        Returns:
+            DecayMatrices: the memoized decay matrices
+        """
+        return self._decay_matrices
+
     def get_disturbance_matrices(self) -> pd.DataFrame:
         """
         Gets a dataframe with disturbance matrix value information.
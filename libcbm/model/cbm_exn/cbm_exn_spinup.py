@@ -2,11 +2,17 @@ from __future__ import annotations
 from typing import Callable
 from typing import TYPE_CHECKING
 from typing import Union
+import numpy as np
+import pandas as pd
 
 if TYPE_CHECKING:
     from libcbm.model.cbm_exn.cbm_exn_model import CBMEXNModel
 from libcbm.model.cbm_exn.cbm_exn_parameters import CBMEXNParameters
 from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm.model.model_definition import spinup_cache
+from libcbm.model.model_definition.spinup_cache import SpinupCache
+from libcbm.storage import dataframe
+from libcbm.storage import series
 from libcbm.model.cbm_exn import cbm_exn_variables
 from libcbm.model.cbm_exn import cbm_exn_land_state
 from libcbm.model.cbm_exn import cbm_exn_annual_process_dynamics
@@ -73,6 +79,14 @@ def get_default_ops(
     overmature_decline = cbm_exn_annual_process_dynamics.overmature_decline(
         growth_info,
     )
+    disturbance_index, disturbance_matrices = (
+        cbm_exn_disturbance_dynamics.compact_disturbance(
+            parameters.pool_configuration(),
+            parameters.get_disturbance_matrices(),
+            parameters.get_disturbance_matrix_associations(),
+            True,
+        )
+    )
 
     ops = [
         {
@@ -94,22 +108,16 @@ def get_default_ops(
         {
             "name": "dom_decay",
             "op_process_name": "Decay",
-            "op_data": cbm_exn_annual_process_dynamics.dom_decay(
-                spinup_vars["parameters"][
-                    "mean_annual_temperature"
-                ].to_numpy(),
-                parameters.get_decay_parameters(),
+            "op_data": parameters.get_decay_matrices().dom_decay(
+                spinup_vars["parameters"]["mean_annual_temperature"].to_numpy()
             ),
             "requires_reindexing": False,
         },
         {
             "name": "slow_decay",
             "op_process_name": "Decay",
-            "op_data": cbm_exn_annual_process_dynamics.slow_decay(
-                spinup_vars["parameters"][
-                    "mean_annual_temperature"
-                ].to_numpy(),
-                parameters.get_decay_parameters(),
+            "op_data": parameters.get_decay_matrices().slow_decay(
+                spinup_vars["parameters"]["mean_annual_temperature"].to_numpy()
             ),
             "requires_reindexing": False,
         },
@@ -124,12 +132,8 @@ def get_default_ops(
         {
             "name": "disturbance",
             "op_process_name": "Disturbance",
-            "op_data": cbm_exn_disturbance_dynamics.disturbance(
-                parameters.pool_configuration(),
-                parameters.get_disturbance_matrices(),
-                parameters.get_disturbance_matrix_associations(),
-                True,
-            ),
+            "op_data": disturbance_index,
+            "matrices": disturbance_matrices,
             "requires_reindexing": True,
         },
         {
@@ -164,31 +168,13 @@ def get_default_op_list() -> list[str]:
     ]
 
 
-def spinup(
+def _run_spinup(
     model: "CBMEXNModel",
     spinup_vars: ModelVariables,
-    reporting_func: Union[Callable[[int, ModelVariables], None], None] = None,
-    ops: Union[list[dict], None] = None,
-    op_sequence: Union[list[str], None] = None,
+    reporting_func: Union[Callable[[int, ModelVariables], None], None],
+    ops: Union[list[dict], None],
+    op_sequence: Union[list[str], None],
 ) -> ModelVariables:
-    """Run the CBM spinup routine.
-
-    Args:
-        model (CBMEXNModel): Initialized cbm_exn model.
-        spinup_vars (ModelVariables): Spinup vars, as returned by
-            :py:func:`cbm_exn_spinup.prepare_spinup_vars`.
-        reporting_func (Callable[[int, ModelVariables], None], optional):
-            Optional function for accepting timestep-by-timestep spinup
-            results for debugging. Defaults to None.
-        include_flux (bool, optional): if reporting func is specified,
-            flux values will additionally be tracked during the spinup
-            process. Defaults to False.
-
-    Returns:
-        ModelVariables: A collection of dataframes with initialized C pools and
-            state, ready for CBM stepping.
-    """
-
     if ops is None:
         ops = get_default_ops(model.parameters, spinup_vars)
     for op_def in ops:
@@ -211,5 +197,167 @@ def spinup(
         if reporting_func:
             reporting_func(t, spinup_vars)
         t += 1
+    return spinup_vars
+
+
+def _get_spinup_key_data(spinup_vars: ModelVariables) -> pd.DataFrame:
+    """Get the values which determine the spinup result of each stand:
+    the spinup parameters other than area, and a digest of each stand's
+    increment curve.
+    """
+    parameters = spinup_vars["parameters"]
+    key_data = pd.DataFrame(
+        {
+            col: parameters[col].to_numpy()
+            for col in parameters.columns
+            if col != "area"
+        }
+    )
+    increments = spinup_vars["increments"].to_pandas()
+    curves = increments.pivot(
+        index="row_idx",
+        columns="age",
+        values=["merch_inc", "foliage_inc", "other_inc"],
+    ).reindex(np.arange(parameters.n_rows))
+    key_data["increments"] = spinup_cache.digest_rows(curves)
+    return key_data
+
+
+def _take_spinup_vars(
+    spinup_vars: ModelVariables, indices: np.ndarray
+) -> ModelVariables:
+    """Gather the specified rows of spinup variables into a new instance
+    of spinup variables, with the increment row_idx values re-numbered
+    to the gathered rows.
+    """
+    idx = series.from_numpy("idx", indices)
+    increments = spinup_vars["increments"].to_pandas()
+    row_map = np.full(spinup_vars["parameters"].n_rows, -1, dtype="int64")
+    row_map[indices] = np.arange(len(indices))
+    increments = increments[
+        np.isin(increments["row_idx"].to_numpy(), indices)
+    ].copy()
+    increments["row_idx"] = row_map[increments["row_idx"].to_numpy()]
+    increments = increments.sort_values(
+        by=["row_idx", "age"], kind="mergesort"
+    ).reset_index(drop=True)
+    return ModelVariables(
+        {
+            "parameters": spinup_vars["parameters"].take(idx),
+            "increments": dataframe.convert_dataframe_backend(
+                dataframe.from_pandas(increments),
+                spinup_vars["increments"].backend_type,
+            ),
+            "state": spinup_vars["state"].take(idx),
+            "pools": spinup_vars["pools"].take(idx),
+        }
+    )
+
+
+def _spinup_unique(
+    model: "CBMEXNModel",
+    spinup_vars: ModelVariables,
+    op_sequence: Union[list[str], None],
+    cache: Union[SpinupCache, None],
+) -> ModelVariables:
+    key_data = _get_spinup_key_data(spinup_vars)
+    unique_idx, inverse = spinup_cache.unique_rows(key_data)
+    unique_vars = _take_spinup_vars(spinup_vars, unique_idx)
+    if cache is None:
+        unique_vars = _run_spinup(model, unique_vars, None, None, op_sequence)
+    else:
+        unique_key_data = key_data.iloc[unique_idx]
+        found, cached = cache.get(unique_key_data)
+        if found.any():
+            found_idx = series.from_numpy("found_idx", np.flatnonzero(found))
+            for table_name, table in cached.items():
+                dataframe.assign_rows(
+                    dataframe.convert_dataframe_backend(
+                        dataframe.from_pandas(table),
+                        unique_vars[table_name].backend_type,
+                    ),
+                    unique_vars[table_name],
+                    found_idx,
+                )
+        if not found.all():
+            run_idx = np.flatnonzero(~found)
+            run_vars = _run_spinup(
+                model,
+                _take_spinup_vars(unique_vars, run_idx),
+                None,
+                None,
+                op_sequence,
+            )
+            for table_name in ["pools", "state"]:
+                dataframe.assign_rows(
+                    run_vars[table_name],
+                    unique_vars[table_name],
+                    series.from_numpy("run_idx", run_idx),
+                )
+            cache.put(
+                unique_key_data.iloc[run_idx],
+                {
+                    "pools": run_vars["pools"].to_pandas(),
+                    "state": run_vars["state"].to_pandas(),
+                },
+            )
+
+    inverse_idx = series.from_numpy("inverse", inverse)
+    for table_name in ["pools", "state"]:
+        dataframe.assign_rows(
+            unique_vars[table_name].take(inverse_idx),
+            spinup_vars[table_name],
+            None,
+        )
+    return spinup_vars
+
+
+def spinup(
+    model: "CBMEXNModel",
+    spinup_vars: ModelVariables,
+    reporting_func: Union[Callable[[int, ModelVariables], None], None] = None,
+    ops: Union[list[dict], None] = None,
+    op_sequence: Union[list[str], None] = None,
+    deduplicate: bool = False,
+    cache: Union[SpinupCache, None] = None,
+) -> ModelVariables:
+    """Run the CBM spinup routine.
+
+    Args:
+        model (CBMEXNModel): Initialized cbm_exn model.
+        spinup_vars (ModelVariables): Spinup vars, as returned by
+            :py:func:`cbm_exn_spinup.prepare_spinup_vars`.
+        reporting_func (Callable[[int, ModelVariables], None], optional):
+            Optional function for accepting timestep-by-timestep spinup
+            results for debugging. Defaults to None.
+        include_flux (bool, optional): if reporting func is specified,
+            flux values will additionally be tracked during the spinup
+            process. Defaults to False.
+        deduplicate (bool, optional): if set to True, spinup is run only
+            once for each unique combination of spinup parameters (other
+            than area) and increment curve, and the resulting pools and
+            state are copied to all rows sharing the combination. Cannot be
+            used with reporting_func or ops. Defaults to False.
+        cache (SpinupCache, optional): if specified, the spinup results of
+            each unique combination described for `deduplicate` are read
+            from this cache if present, and otherwise computed and stored
+            in the cache. Implies `deduplicate`. The cache parameter hash
+            must identify the model parameters. Defaults to None.
+
+    Returns:
+        ModelVariables: A collection of dataframes with initialized C pools and
+            state, ready for CBM stepping.
+    """
+    if deduplicate or cache is not None:
+        if reporting_func is not None or ops is not None:
+            raise ValueError(
+                "deduplicate and cache cannot be used with reporting_func "
+                "or ops"
+            )
+        spinup_vars = _spinup_unique(model, spinup_vars, op_sequence, cache)
+    else:
+        spinup_vars = _run_spinup(
+            model, spinup_vars, reporting_func, ops, op_sequence
+        )
 
     return cbm_exn_land_state.init_cbm_vars(model, spinup_vars)
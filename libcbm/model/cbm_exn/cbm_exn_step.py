@@ -5,110 +5,181 @@ if TYPE_CHECKING:
     from libcbm.model.cbm_exn.cbm_exn_model import CBMEXNModel
 from libcbm.model.cbm_exn.cbm_exn_parameters import CBMEXNParameters
 from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm.model.model_definition.model_matrix_ops import ModelMatrixOps
+from libcbm.storage import dataframe
+from libcbm.storage.series import Series
 from libcbm.model.cbm_exn import cbm_exn_land_state
 from libcbm.model.cbm_exn import cbm_exn_annual_process_dynamics
 from libcbm.model.cbm_exn import cbm_exn_disturbance_dynamics
 from libcbm.model.cbm_exn import cbm_exn_growth_functions
 
 
-def get_default_ops(
-    parameters: CBMEXNParameters, cbm_vars: ModelVariables, which: str = "all"
+def _get_disturbance_ops(parameters: CBMEXNParameters) -> list[dict]:
+    index, matrices = cbm_exn_disturbance_dynamics.compact_disturbance(
+        parameters.pool_configuration(),
+        parameters.get_disturbance_matrices(),
+        parameters.get_disturbance_matrix_associations(),
+        False,
+    )
+    return [
+        {
+            "name": "disturbance",
+            "op_process_name": "Disturbance",
+            "op_data": index,
+            "matrices": matrices,
+            "requires_reindexing": True,
+        }
+    ]
+
+
+def _get_static_annual_process_ops(
+    parameters: CBMEXNParameters,
 ) -> list[dict]:
+    return [
+        {
+            "name": "snag_turnover",
+            "op_process_name": "Growth and Turnover",
+            "op_data": cbm_exn_annual_process_dynamics.snag_turnover(
+                parameters.get_turnover_parameters(), False
+            ),
+            "requires_reindexing": False,
+        },
+        {
+            "name": "biomass_turnover",
+            "op_process_name": "Growth and Turnover",
+            "op_data": cbm_exn_annual_process_dynamics.biomass_turnover(
+                parameters.get_turnover_parameters(), False
+            ),
+            "requires_reindexing": False,
+        },
+        {
+            "name": "slow_mixing",
+            "op_process_name": "Decay",
+            "op_data": cbm_exn_annual_process_dynamics.slow_mixing(
+                parameters.get_slow_mixing_rate(),
+            ),
+            "requires_reindexing": False,
+        },
+    ]
+
+
+def _get_state_annual_process_ops(
+    parameters: CBMEXNParameters, cbm_vars: ModelVariables
+) -> list[dict]:
+    growth_info = cbm_exn_growth_functions.prepare_growth_info(
+        cbm_vars,
+        parameters.get_turnover_parameters(),
+        parameters.get_root_parameters(),
+    )
+    mean_annual_temperature = cbm_vars["parameters"][
+        "mean_annual_temperature"
+    ].to_numpy()
+    return [
+        {
+            "name": "dom_decay",
+            "op_process_name": "Decay",
+            "op_data": parameters.get_decay_matrices().dom_decay(
+                mean_annual_temperature
+            ),
+            "requires_reindexing": True,
+        },
+        {
+            "name": "slow_decay",
+            "op_process_name": "Decay",
+            "op_data": parameters.get_decay_matrices().slow_decay(
+                mean_annual_temperature
+            ),
+            "requires_reindexing": True,
+        },
+        {
+            "name": "growth",
+            "op_process_name": "Growth and Turnover",
+            "op_data": cbm_exn_annual_process_dynamics.net_growth(
+                growth_info,
+            ),
+            "requires_reindexing": True,
+        },
+        {
+            "name": "overmature_decline",
+            "op_process_name": "Growth and Turnover",
+            "op_data": cbm_exn_annual_process_dynamics.overmature_decline(
+                growth_info,
+            ),
+            "requires_reindexing": True,
+        },
+    ]
+
+
+def _check_which(which: str):
     if which not in ["disturbance", "annual_process", "all"]:
         raise ValueError(f"uknown parameter value for which '{which}'")
 
-    output = []
 
+def get_default_ops(
+    parameters: CBMEXNParameters, cbm_vars: ModelVariables, which: str = "all"
+) -> list[dict]:
+    _check_which(which)
+    output = []
     if which in ["disturbance", "all"]:
-        output.append(
-            {
-                "name": "disturbance",
-                "op_process_name": "Disturbance",
-                "op_data": cbm_exn_disturbance_dynamics.disturbance(
-                    parameters.pool_configuration(),
-                    parameters.get_disturbance_matrices(),
-                    parameters.get_disturbance_matrix_associations(),
-                    False,
-                ),
-                "requires_reindexing": True,
-            }
-        )
-
+        output.extend(_get_disturbance_ops(parameters))
     if which in ["annual_process", "all"]:
-        growth_info = cbm_exn_growth_functions.prepare_growth_info(
-            cbm_vars,
-            parameters.get_turnover_parameters(),
-            parameters.get_root_parameters(),
-        )
-        annual_process_ops = [
-            {
-                "name": "snag_turnover",
-                "op_process_name": "Growth and Turnover",
-                "op_data": cbm_exn_annual_process_dynamics.snag_turnover(
-                    parameters.get_turnover_parameters(), False
-                ),
-                "requires_reindexing": False,
-            },
-            {
-                "name": "biomass_turnover",
-                "op_process_name": "Growth and Turnover",
-                "op_data": cbm_exn_annual_process_dynamics.biomass_turnover(
-                    parameters.get_turnover_parameters(), False
-                ),
-                "requires_reindexing": False,
-            },
-            {
-                "name": "dom_decay",
-                "op_process_name": "Decay",
-                "op_data": cbm_exn_annual_process_dynamics.dom_decay(
-                    cbm_vars["parameters"][
-                        "mean_annual_temperature"
-                    ].to_numpy(),
-                    parameters.get_decay_parameters(),
-                ),
-                "requires_reindexing": True,
-            },
-            {
-                "name": "slow_decay",
-                "op_process_name": "Decay",
-                "op_data": cbm_exn_annual_process_dynamics.slow_decay(
-                    cbm_vars["parameters"][
-                        "mean_annual_temperature"
-                    ].to_numpy(),
-                    parameters.get_decay_parameters(),
-                ),
-                "requires_reindexing": True,
-            },
-            {
-                "name": "slow_mixing",
-                "op_process_name": "Decay",
-                "op_data": cbm_exn_annual_process_dynamics.slow_mixing(
-                    parameters.get_slow_mixing_rate(),
-                ),
-                "requires_reindexing": False,
-            },
-            {
-                "name": "growth",
-                "op_process_name": "Growth and Turnover",
-                "op_data": cbm_exn_annual_process_dynamics.net_growth(
-                    growth_info,
-                ),
-                "requires_reindexing": True,
-            },
-            {
-                "name": "overmature_decline",
-                "op_process_name": "Growth and Turnover",
-                "op_data": cbm_exn_annual_process_dynamics.overmature_decline(
-                    growth_info,
-                ),
-                "requires_reindexing": True,
-            },
-        ]
-        output.extend(annual_process_ops)
-
+        output.extend(_get_static_annual_process_ops(parameters))
+        output.extend(_get_state_annual_process_ops(parameters, cbm_vars))
     return output
 
 
+class StepOpRegistry:
+    """Registers the default step operations of :py:func:`get_default_ops`
+    in a model's matrix ops, building the operations which do not depend on
+    the simulation state (disturbance, turnover and slow mixing) once, and
+    keeping them across timesteps.  The decay operations are re-created
+    only when new mean annual temperatures occur, and the values of the
+    growth and overmature decline operations are replaced on each timestep.
+    See :py:meth:`ModelMatrixOps.register_operation`.
+
+    Args:
+        parameters (CBMEXNParameters): the model parameters
+    """
+
+    def __init__(self, parameters: CBMEXNParameters):
+        self._parameters = parameters
+        self._disturbance_ops: Union[list[dict], None] = None
+        self._static_annual_process_ops: Union[list[dict], None] = None
+
+    def register(
+        self,
+        matrix_ops: ModelMatrixOps,
+        cbm_vars: ModelVariables,
+        which: str = "all",
+    ):
+        """Register the default operations for the specified simulation
+        state
+
+        Args:
+            matrix_ops (ModelMatrixOps): the model's matrix ops
+            cbm_vars (ModelVariables): cbm variables and state
+            which (str, optional): one of "disturbance", "annual_process"
+                or "all". Defaults to "all".
+        """
+        _check_which(which)
+        ops = []
+        if which in ["disturbance", "all"]:
+            if self._disturbance_ops is None:
+                self._disturbance_ops = _get_disturbance_ops(self._parameters)
+            ops.extend(self._disturbance_ops)
+        if which in ["annual_process", "all"]:
+            if self._static_annual_process_ops is None:
+                self._static_annual_process_ops = (
+                    _get_static_annual_process_ops(self._parameters)
+                )
+            ops.extend(self._static_annual_process_ops)
+            ops.extend(
+                _get_state_annual_process_ops(self._parameters, cbm_vars)
+            )
+        for op_def in ops:
+            matrix_ops.register_operation(**op_def)
+
+
 def get_default_annual_process_op_sequence() -> list[str]:
     return [
         "growth",
@@ -126,11 +197,65 @@ def get_default_disturbance_op_sequence() -> list[str]:
     return ["disturbance"]
 
 
+def _take_rows(cbm_vars: ModelVariables, indices: Series) -> ModelVariables:
+    return ModelVariables(
+        {k: v.take(indices) for k, v in cbm_vars.get_collection().items()}
+    )
+
+
+def _assign_rows(
+    src: ModelVariables, dst: ModelVariables, indices: Series, names: list[str]
+) -> None:
+    for name in names:
+        dataframe.assign_rows(src[name], dst[name], indices)
+
+
+def _create_ops(
+    model: "CBMEXNModel",
+    cbm_vars: ModelVariables,
+    ops: Union[list[dict], None],
+    which: str,
+    op_sequence: Union[list[str], None] = None,
+) -> None:
+    if ops is None:
+        model.step_op_registry.register(model.matrix_ops, cbm_vars, which)
+    else:
+        for op_def in ops:
+            if op_sequence is None or op_def["name"] in op_sequence:
+                model.matrix_ops.create_operation(**op_def)
+
+
+def _compute_disturbance(
+    model: "CBMEXNModel",
+    cbm_vars: ModelVariables,
+    op_sequence: list[str],
+    sparse: bool,
+) -> ModelVariables:
+    if sparse:
+        disturbed_idx = (
+            cbm_vars["parameters"]["disturbance_type"] > 0
+        ).indices_nonzero()
+        if disturbed_idx.length == 0:
+            return cbm_vars
+        disturbed_vars = _take_rows(cbm_vars, disturbed_idx)
+        model.compute(disturbed_vars, op_sequence)
+        _assign_rows(
+            disturbed_vars,
+            cbm_vars,
+            disturbed_idx,
+            [n for n in ["pools", "flux"] if n in cbm_vars],
+        )
+    else:
+        model.compute(cbm_vars, op_sequence)
+    return cbm_vars
+
+
 def step_disturbance(
     model: "CBMEXNModel",
     cbm_vars: ModelVariables,
     ops: Union[list[dict], None] = None,
     op_sequence: Union[list[str], None] = None,
+    sparse: bool = False,
 ) -> ModelVariables:
     """Compute and track disturbance matrix effects across multiple stands.
 
@@ -144,20 +269,19 @@ def step_disturbance(
     Args:
         model (CBMEXNModel): initialized cbm_exn model
         cbm_vars (ModelVariables): cbm variables and state
+        sparse (bool, optional): if set to True, the disturbance operations
+            are indexed and computed only for the rows with a positive
+            disturbance_type, which are gathered before, and copied back
+            after, the computation.  This is faster when a small proportion
+            of stands are disturbed. Defaults to False.
 
     Returns:
         ModelVariables: updated cbm_variables and state
     """
     if op_sequence is None:
         op_sequence = get_default_disturbance_op_sequence()
-    if ops is None:
-        ops = get_default_ops(model.parameters, cbm_vars, "disturbance")
-    for op_def in ops:
-        if op_def["name"] in op_sequence:
-            model.matrix_ops.create_operation(**op_def)
-
-    model.compute(cbm_vars, op_sequence)
-    return cbm_vars
+    _create_ops(model, cbm_vars, ops, "disturbance", op_sequence)
+    return _compute_disturbance(model, cbm_vars, op_sequence, sparse)
 
 
 def step_annual_process(
@@ -177,12 +301,7 @@ def step_annual_process(
     """
     if op_sequence is None:
         op_sequence = get_default_annual_process_op_sequence()
-    if ops is None:
-        ops = get_default_ops(model.parameters, cbm_vars, "annual_process")
-    for op_def in ops:
-        if op_def["name"] in op_sequence:
-            model.matrix_ops.create_operation(**op_def)
-
+    _create_ops(model, cbm_vars, ops, "annual_process", op_sequence)
     model.compute(cbm_vars, op_sequence)
     return cbm_vars
 
@@ -193,6 +312,7 @@ def step(
     ops: Union[list[dict], None] = None,
     step_op_sequence: Union[list[str], None] = None,
     disturbance_op_sequence: Union[list[str], None] = None,
+    sparse_disturbance: bool = False,
 ) -> ModelVariables:
     """Advance CBM state by one timestep, and track results.
 
@@ -201,21 +321,31 @@ def step(
     dataframe is updated with changed pool values. The cbm_vars `flux`
     dataframe tracks specific flows between pools for meaningful indicators.
 
+    If `ops` is not specified, the default operations are registered with
+    the model's :py:class:`StepOpRegistry`, so that only the operations
+    which depend on the simulation state are updated on each timestep.
+
     Args:
         model (CBMEXNModel): initialized cbm_exn model
         cbm_vars (ModelVariables): cbm variables and state
+        sparse_disturbance (bool, optional): compute disturbances only for
+            disturbed rows. See :py:func:`step_disturbance`. Defaults to
+            False.
 
     Returns:
         ModelVariables: updated cbm_vars
     """
-    if ops is None:
-        ops = get_default_ops(model.parameters, cbm_vars, "all")
-    for op_def in ops:
-        model.matrix_ops.create_operation(**op_def)
+    if disturbance_op_sequence is None:
+        disturbance_op_sequence = get_default_disturbance_op_sequence()
+    if step_op_sequence is None:
+        step_op_sequence = get_default_annual_process_op_sequence()
+    _create_ops(model, cbm_vars, ops, "all")
 
     cbm_vars["flux"].zero()
     cbm_vars = cbm_exn_land_state.start_step(cbm_vars, model.parameters)
-    cbm_vars = step_disturbance(model, cbm_vars, ops, disturbance_op_sequence)
-    cbm_vars = step_annual_process(model, cbm_vars, ops, step_op_sequence)
+    cbm_vars = _compute_disturbance(
+        model, cbm_vars, disturbance_op_sequence, sparse_disturbance
+    )
+    model.compute(cbm_vars, step_op_sequence)
     cbm_vars = cbm_exn_land_state.end_step(cbm_vars, model.parameters)
     return cbm_vars
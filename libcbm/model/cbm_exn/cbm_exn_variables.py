@@ -151,6 +151,8 @@ def init_spinup_state(n_rows: int, backend_type: BackendType) -> DataFrame:
         * this_rotation_slow - the sum of slow C values for this rotation
         * enabled - set to 0 when spinup has finished for the corresponding
             dataframe row
+        * growth_curve_id - identifies the spinup growth C flows of the row,
+            assigned by the spinup growth functions
 
     Args:
         n_rows (int): the number of rows in the resulting dataframe
@@ -169,6 +171,7 @@ def init_spinup_state(n_rows: int, backend_type: BackendType) -> DataFrame:
             SeriesDef("last_rotation_slow", 0, "float"),
             SeriesDef("this_rotation_slow", 0, "float"),
             SeriesDef("enabled", 1, "int"),
+            SeriesDef("growth_curve_id", 0, "int"),
         ],
         nrows=n_rows,
         back_end=backend_type,
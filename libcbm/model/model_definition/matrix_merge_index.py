@@ -1,86 +1,39 @@
-from typing import Callable
 from typing import Union
 import numpy as np
-import numba
-import numba.typed
 from libcbm.model.model_definition.model_variables import ModelVariables
 
+# the size of the packed key space below which merges use a lookup table
+# rather than a binary search
+_MAX_LOOKUP_SIZE = 1 << 20
 
-@numba.njit(inline="always")
-def k1(i, m):
-    return (m[0][i],)
 
-
-@numba.njit(inline="always")
-def k2(i, m):
-    return (m[0][i], m[1][i])
-
-
-@numba.njit(inline="always")
-def k3(i, m):
-    return (m[0][i], m[1][i], m[2][i])
-
-
-@numba.njit(inline="always")
-def k4(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i])
-
-
-@numba.njit(inline="always")
-def k5(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i], m[4][i])
-
-
-@numba.njit(inline="always")
-def k6(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i], m[4][i], m[5][i])
-
-
-@numba.njit(inline="always")
-def k7(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i], m[4][i], m[5][i], m[6][i])
-
-
-@numba.njit(inline="always")
-def k8(i, m):
-    return (
-        m[0][i],
-        m[1][i],
-        m[2][i],
-        m[3][i],
-        m[4][i],
-        m[5][i],
-        m[6][i],
-        m[7][i],
+def _to_int64_keys(name: str, values: np.ndarray) -> np.ndarray:
+    """Convert the specified key values to int64, raising an error if any
+    value is not an integer
+    """
+    if values.dtype.kind in "iub":
+        return values.astype("int64")
+    if values.dtype.kind == "f":
+        int_values = values.astype("int64")
+        not_integer = int_values != values
+        if not not_integer.any():
+            return int_values
+        bad_value = values[np.flatnonzero(not_integer)[0]]
+    else:
+        bad_value = values[0] if values.shape[0] > 0 else None
+    raise ValueError(
+        f"only integer keys supported. Found: {bad_value} in {name} series"
     )
 
 
-KEY_FUNC_MAP = {1: k1, 2: k2, 3: k3, 4: k4, 5: k5, 6: k6, 7: k7, 8: k8}
-
-
-def get_key_func(size: int) -> Callable:
-    return KEY_FUNC_MAP[size]
-
-
-@numba.njit()
-def merge(
-    k_func,
-    out,
-    merge_dict: numba.typed.Dict,
-    len_merge_arrays: int,
-    fill: int,
-    error_on_missing: bool,
-    *merge_arrays,
-):
-    for i in range(len_merge_arrays):
-        k = k_func(i, merge_arrays)
-        if k in merge_dict:
-            out[i] = merge_dict[k]
-        else:
-            if error_on_missing:
-                return i
-            out[i] = fill
-    return -1
+def _float_to_int64_keys(values: np.ndarray) -> np.ndarray:
+    """Map floating point values to int64 values which are equal if and
+    only if the floating point values are exactly equal, or both NaN
+    """
+    # adding 0.0 maps -0.0 to 0.0
+    values = values.astype("float64") + 0.0
+    values[np.isnan(values)] = np.nan
+    return values.view("int64")
 
 
 class MatrixMergeIndex:
@@ -91,50 +44,136 @@ class MatrixMergeIndex:
     """
 
     def __init__(
-        self, nrows: int, key_data: Union[dict[str, np.ndarray], None]
+        self,
+        nrows: int,
+        key_data: Union[dict[str, np.ndarray], None],
+        float_keys: Union[list[str], None] = None,
     ):
         """Intialize a MatrixMergeIndex
 
         Args:
             key_data (dict[str, np.ndarray]): the key data for each matrix
+            float_keys (list[str], optional): the names of keys in key_data
+                whose values are matched by exact floating point equality,
+                for example a mean annual temperature. All other keys must
+                have integer values. Defaults to None.
 
         Raises:
-            ValueError: only integer type keys are supported
+            ValueError: only integer type keys are supported, unless listed
+                in float_keys
         """
+        self._float_keys = set(float_keys) if float_keys else set()
         self._len_key_data = nrows
+        self._key_min: list[int] = []
+        self._key_max: list[int] = []
+        self._key_stride: list[int] = []
+        self._key_levels: list[np.ndarray] = []
+        self._combined_levels: list[np.ndarray] = []
+        self._sorted_keys: np.ndarray = None
+        self._sorted_rows: np.ndarray = None
+        self._lookup: np.ndarray = None
         if key_data:
             self._merge_keys = list(key_data.keys())
             self._key_data = key_data
             # assumption here is that all members of key_data are of equal
             # length
-            for i_v, v in enumerate(key_data.values()):
+            for v in key_data.values():
                 if v.ndim > 1:
                     raise ValueError("expected single dimensional key values")
 
                 if self._len_key_data != v.shape[0]:
                     raise ValueError("lengths of key data array non-uniform")
-
-            key_index_type = numba.types.UniTuple(
-                numba.types.int64, len(self._merge_keys)
-            )
-            self._merge_dict = numba.typed.Dict.empty(
-                key_type=key_index_type, value_type=numba.types.types.uint64
-            )
-            for i in range(self._len_key_data):
-                tuple_values = []
-                for k in self._merge_keys:
-                    key_val = int(key_data[k][i])
-                    if key_val != key_data[k][i]:
-                        raise ValueError(
-                            "only integer keys supported. Found: "
-                            f"{key_data[k][i]} in {k} series"
-                        )
-                    tuple_values.append(key_val)
-                self._merge_dict[tuple(tuple_values)] = np.uint64(i)
+            int_key_data = [
+                (
+                    _float_to_int64_keys(key_data[k])
+                    if k in self._float_keys
+                    else _to_int64_keys(k, key_data[k])
+                )
+                for k in self._merge_keys
+            ]
+            if self._len_key_data > 0:
+                self._build_index(int_key_data)
         else:
             self._merge_keys = []
             self._key_data = {}
-            self._merge_dict = {}
+
+    def _build_index(self, int_key_data: list[np.ndarray]) -> None:
+        # Each key tuple is packed into a single int64 value, and the packed
+        # values are stored sorted so that merging is a single vectorized
+        # searchsorted with no limit on the number of key columns.
+        stride = 1
+        for values in int_key_data:
+            key_min = int(values.min())
+            key_max = int(values.max())
+            self._key_min.append(key_min)
+            self._key_max.append(key_max)
+            self._key_stride.append(stride)
+            stride *= key_max - key_min + 1
+
+        if stride <= np.iinfo("int64").max:
+            packed = self._pack(int_key_data)[0]
+        else:
+            # the ranges of the key values are too large to pack directly,
+            # so instead encode the key tuples as dense ids, one column at a
+            # time: each value is replaced with its position in the sorted
+            # unique values of its column, and combined with the id of the
+            # tuple so far, which is then re-densified.
+            self._key_stride = []
+            packed = np.zeros(self._len_key_data, dtype="int64")
+            for values in int_key_data:
+                levels, codes = np.unique(values, return_inverse=True)
+                combined_levels, packed = np.unique(
+                    packed * len(levels) + codes, return_inverse=True
+                )
+                self._key_levels.append(levels)
+                self._combined_levels.append(combined_levels)
+
+        # where a key occurs on several rows, the last row is used
+        order = np.argsort(packed, kind="stable")
+        sorted_keys = packed[order]
+        is_last = np.append(sorted_keys[1:] != sorted_keys[:-1], True)
+        self._sorted_keys = sorted_keys[is_last]
+        self._sorted_rows = order[is_last].astype("int64")
+        if self._key_stride and stride <= max(
+            4 * self._len_key_data, _MAX_LOOKUP_SIZE
+        ):
+            # the packed key space is small enough for a direct lookup table
+            self._lookup = np.full(stride, -1, dtype="int64")
+            self._lookup[self._sorted_keys] = self._sorted_rows
+
+    def _pack(
+        self, int_key_data: list[np.ndarray]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Pack the specified key columns into single values comparable
+        with the stored sorted keys, and flag the values which cannot be
+        present in the index.
+        """
+        n = int_key_data[0].shape[0]
+        packed = np.zeros(n, dtype="int64")
+        valid = np.ones(n, dtype=bool)
+        if self._key_stride:
+            for values, key_min, key_max, stride in zip(
+                int_key_data, self._key_min, self._key_max, self._key_stride
+            ):
+                valid &= (values >= key_min) & (values <= key_max)
+                packed += (
+                    np.clip(values, key_min, key_max) - key_min
+                ) * stride
+        else:
+            for values, levels, combined_levels in zip(
+                int_key_data, self._key_levels, self._combined_levels
+            ):
+                codes = np.minimum(
+                    np.searchsorted(levels, values), len(levels) - 1
+                )
+                valid &= levels[codes] == values
+                combined = packed * len(levels) + codes
+                packed = np.minimum(
+                    np.searchsorted(combined_levels, combined),
+                    len(combined_levels) - 1,
+                )
+                valid &= combined_levels[packed] == combined
+        return packed, valid
 
     @property
     def has_keys(self) -> bool:
@@ -169,17 +208,39 @@ class MatrixMergeIndex:
                     "of length 1."
                 )
         else:
-            merge_data = {}
-            for idx_name in self.merge_keys:
-                if idx_name == "row_idx":
-                    merge_data["row_idx"] = np.arange(0, n_rows, dtype="int64")
-                else:
-                    s = idx_name.split(".")
-                    merge_data[idx_name] = (
-                        model_variables[s[0]][s[1]].to_numpy().astype("int64")
-                    )
+            return self.merge(
+                self.get_merge_data(model_variables), default_matrix_index
+            )
+
+    def get_merge_data(
+        self, model_variables: ModelVariables
+    ) -> dict[str, np.ndarray]:
+        """Get copies of the values of this instance's merge keys from the
+        specified model variables, for use with :py:func:`merge`.
 
-            return self.merge(merge_data, default_matrix_index)
+        Args:
+            model_variables (ModelVariables): the simulation variables. Keys
+                other than `row_idx` are of the form `table.column`
+
+        Returns:
+            dict[str, np.ndarray]: int64, or for float keys float64, arrays
+                of key values by key name
+        """
+        n_rows = model_variables["pools"].n_rows
+        merge_data = {}
+        for idx_name in self.merge_keys:
+            if idx_name == "row_idx":
+                merge_data["row_idx"] = np.arange(0, n_rows, dtype="int64")
+            else:
+                s = idx_name.split(".")
+                merge_data[idx_name] = (
+                    model_variables[s[0]][s[1]]
+                    .to_numpy()
+                    .astype(
+                        "float64" if idx_name in self._float_keys else "int64"
+                    )
+                )
+        return merge_data
 
     def merge(
         self,
@@ -215,17 +276,40 @@ class MatrixMergeIndex:
                     f"got: {fill_value}"
                 )
         len_merge_arrays = len((next(iter(merge_data.values()))))
-        out = np.empty(len_merge_arrays, dtype="int64")
-        err_idx = merge(
-            get_key_func(len(self._merge_keys)),
-            out,
-            self._merge_dict,
-            len_merge_arrays,
-            fill_value if fill_value is not None else -1,
-            fill_value is None,
-            *list(merge_data.values()),
-        )
-        if err_idx >= 0:
-            values_not_found = {k: v[err_idx] for k, v in merge_data.items()}
-            raise ValueError(f"did not find values for {values_not_found}")
+        if self._len_key_data == 0:
+            # there is nothing to match
+            out = np.full(len_merge_arrays, -1, dtype="int64")
+            found = np.zeros(len_merge_arrays, dtype=bool)
+        else:
+            found = np.ones(len_merge_arrays, dtype=bool)
+            int_merge_data = []
+            for k in self._merge_keys:
+                values = merge_data[k]
+                if k in self._float_keys:
+                    int_values = _float_to_int64_keys(values)
+                else:
+                    int_values = values.astype("int64")
+                    if values.dtype.kind == "f":
+                        found &= int_values == values
+                int_merge_data.append(int_values)
+            packed, valid = self._pack(int_merge_data)
+            found &= valid
+            if self._lookup is not None:
+                out = self._lookup[packed]
+                found &= out >= 0
+            else:
+                pos = np.minimum(
+                    np.searchsorted(self._sorted_keys, packed),
+                    len(self._sorted_keys) - 1,
+                )
+                found &= self._sorted_keys[pos] == packed
+                out = self._sorted_rows[pos]
+        if not found.all():
+            if fill_value is None:
+                err_idx = np.flatnonzero(~found)[0]
+                values_not_found = {
+                    k: v[err_idx] for k, v in merge_data.items()
+                }
+                raise ValueError(f"did not find values for {values_not_found}")
+            out[~found] = fill_value
         return out
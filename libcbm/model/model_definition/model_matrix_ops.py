@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import Union
 from libcbm.model.model_definition.model_handle import ModelHandle
@@ -82,6 +83,48 @@ def prepare_operation_dataframe(
     return result_df
 
 
+def prepare_matrix_table(
+    index_df: pd.DataFrame, matrices_df: pd.DataFrame, pool_names: set[str]
+) -> tuple[pd.DataFrame, pd.DataFrame, np.ndarray]:
+    """Validate and prepare an operation whose matrices are stored in a
+    separate table from the index, so that a matrix referenced by several
+    index rows is stored once.
+
+    Args:
+        index_df (pd.DataFrame): a dataframe with the index columns
+            described in :py:func:`prepare_operation_dataframe`, and a
+            `matrix_index` column with the 0 based row of `matrices_df`
+            for each of its rows
+        matrices_df (pd.DataFrame): a dataframe of pool source sink pair
+            columns, storing one matrix on each row
+        pool_names (set[str]): the pool names for validation of formatted
+            column names
+
+    Raises:
+        ValueError: index_df has no `matrix_index` column, or its values
+            are not rows of matrices_df
+        ValueError: matrices_df has index columns
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, np.ndarray]: the prepared matrix
+            and index dataframes, and the matrix index of each index row
+    """
+    if "matrix_index" not in index_df.columns:
+        raise ValueError("expected a matrix_index column")
+    if any(c.strip().startswith("[") for c in matrices_df.columns):
+        raise ValueError("unexpected index columns in matrix dataframe")
+    matrix_ids = index_df["matrix_index"].to_numpy().astype("int64")
+    if ((matrix_ids < 0) | (matrix_ids >= len(matrices_df.index))).any():
+        raise ValueError("matrix_index values out of range")
+    return (
+        prepare_operation_dataframe(matrices_df, pool_names),
+        prepare_operation_dataframe(
+            index_df.drop(columns=["matrix_index"]), pool_names
+        ),
+        matrix_ids,
+    )
+
+
 def init_index(operation_data: pd.DataFrame) -> MatrixMergeIndex:
     if (
         len(operation_data.index.names) == 1
@@ -95,9 +138,77 @@ def init_index(operation_data: pd.DataFrame) -> MatrixMergeIndex:
     return MatrixMergeIndex(
         len(df.index),
         key_data,
+        float_keys=[name for name in names if df[name].dtype.kind == "f"],
     )
 
 
+def compose_matrices(
+    matrices_list: list[list[list]],
+    matrix_indices: np.ndarray,
+    chunk_size: int = 4096,
+) -> list[list]:
+    """Compute the products of sequences of matrices, so that applying
+    each product to the pools is equivalent to applying the sequence of
+    matrices one after the other.  Diagonal values which are not specified
+    are taken to be 1.
+
+    Args:
+        matrices_list (list[list[list]]): for each matrix operation in the
+            sequence, its matrices in `repeating_coordinates` format:
+            a list of `[source_pool, sink_pool, values]`
+        matrix_indices (np.ndarray): a 2d array with one column for each
+            matrix operation.  Each row defines one product, and its values
+            are the index of the matrix in the corresponding operation.
+        chunk_size (int, optional): the number of products computed at
+            once. Defaults to 4096.
+
+    Returns:
+        list[list]: the products in `repeating_coordinates` format, with one
+            value for each row of matrix_indices
+    """
+    pools: dict[str, int] = {}
+    for matrices in matrices_list:
+        for src, sink, _ in matrices:
+            pools.setdefault(src, len(pools))
+            pools.setdefault(sink, len(pools))
+    n_pools = len(pools)
+    identity = np.eye(n_pools)
+
+    # the coordinates which can be non-zero in any of the products
+    pattern = identity > 0
+    for matrices in matrices_list:
+        op_pattern = identity > 0
+        for src, sink, _ in matrices:
+            op_pattern[pools[src], pools[sink]] = True
+        pattern = (pattern.astype(int) @ op_pattern.astype(int)) > 0
+    rows, cols = np.nonzero(pattern)
+
+    n_products = matrix_indices.shape[0]
+    values = np.empty((n_products, len(rows)))
+    for start in range(0, n_products, chunk_size):
+        stop = start + chunk_size
+        chunk = matrix_indices[start:stop]
+        product = np.broadcast_to(
+            identity, (chunk.shape[0], n_pools, n_pools)
+        ).copy()
+        for i_op, matrices in enumerate(matrices_list):
+            op_matrix = np.broadcast_to(
+                identity, (chunk.shape[0], n_pools, n_pools)
+            ).copy()
+            for src, sink, op_values in matrices:
+                op_matrix[:, pools[src], pools[sink]] = np.asarray(op_values)[
+                    chunk[:, i_op]
+                ]
+            product = product @ op_matrix
+        values[start:stop] = product[:, rows, cols]
+
+    pool_names = list(pools.keys())
+    return [
+        [pool_names[row], pool_names[col], values[:, i]]
+        for i, (row, col) in enumerate(zip(rows, cols))
+    ]
+
+
 class OperationWrapper:
     def __init__(
         self,
@@ -109,63 +220,285 @@ class OperationWrapper:
         requires_reindexing: bool = True,
         init_value: int = 1,
         default_matrix_index: Union[int, None] = None,
+        matrices: Union[pd.DataFrame, None] = None,
     ):
         self._name = name
         self._model_handle = model_handle
         self._op_process_id = op_process_id
-        self._operation_data = prepare_operation_dataframe(
-            operation_data, pool_names
-        )
-        self._index_len = len(self._operation_data.index)
+        # the matrix of each row of the index data, if the matrices are
+        # stored separately
+        self._matrix_ids: Union[np.ndarray, None] = None
+        if matrices is None:
+            self._operation_data = prepare_operation_dataframe(
+                operation_data, pool_names
+            )
+            index_data = self._operation_data
+        else:
+            self._operation_data, index_data, self._matrix_ids = (
+                prepare_matrix_table(operation_data, matrices, pool_names)
+            )
+        self._index_len = len(index_data.index)
         self._non_indexed = False
-        self._op_index = init_index(self._operation_data)
+        self._op_index = init_index(index_data)
         self._requires_reindexing = requires_reindexing
         self._init_value = init_value
         self._default_matrix_index = default_matrix_index
         self._op: Union[Operation, None] = None
+        self._op_n_rows: Union[int, None] = None
+        self._values_changed = False
+        # the matrix index most recently assigned to self._op, and the key
+        # values it was computed from, used to re-merge only changed rows
+        self._matrix_index: Union[np.ndarray, None] = None
+        self._merge_data: Union[dict[str, np.ndarray], None] = None
+
+    @property
+    def requires_reindexing(self) -> bool:
+        return self._requires_reindexing
+
+    @property
+    def init_value(self) -> int:
+        return self._init_value
+
+    @property
+    def op_process_id(self) -> int:
+        return self._op_process_id
 
     def dispose(self):
         if self._op:
             self._op.dispose()
+            self._op = None
+        self._values_changed = False
+
+    def update_values(self, operation_data: pd.DataFrame) -> bool:
+        """Replace the matrix values of this operation with those of the
+        specified dataframe, which must have the same source sink columns
+        as the existing operation data and, like it, no index columns.  The
+        number of rows may differ.  The validation and re-indexing of
+        :py:func:`prepare_operation_dataframe` is skipped.
+
+        Args:
+            operation_data (pd.DataFrame): the formatted dataframe of new
+                matrix values
+
+        Returns:
+            bool: True if the values were replaced, or False if the
+                dataframe is not compatible with this operation, in which
+                case this operation is unchanged.
+        """
+        if (
+            self._op_index.has_keys
+            or self._matrix_ids is not None
+            or list(operation_data.columns)
+            != list(self._operation_data.columns)
+        ):
+            return False
+        self._operation_data = operation_data
+        if len(operation_data.index) != self._index_len:
+            self._index_len = len(operation_data.index)
+            self._op_index = MatrixMergeIndex(self._index_len, None)
+            self.dispose()
+        elif self._op is not None:
+            # the values are copied into the existing operation when it is
+            # next requested
+            self._values_changed = True
+        return True
+
+    def get_matrices(self) -> list[list]:
+        """Get this operation's matrices in `repeating_coordinates` format
+
+        Returns:
+            list[list]: list of `[source_pool, sink_pool, values]`
+        """
+        return [
+            [*col.split("."), self._operation_data[col].to_numpy()]
+            for col in self._operation_data.columns
+        ]
+
+    def get_merge_data(
+        self, model_variables: ModelVariables
+    ) -> dict[str, np.ndarray]:
+        """Get the values of the simulation state which determine the matrix
+        index of this operation.  See
+        :py:func:`libcbm.model.model_definition.matrix_merge_index.MatrixMergeIndex.get_merge_data`
+
+        Args:
+            model_variables (ModelVariables): the simulation variables
+
+        Returns:
+            dict[str, np.ndarray]: key values by key name, empty if the
+                operation has no index columns
+        """
+        return self._op_index.get_merge_data(model_variables)
+
+    def get_matrix_index(self, model_variables: ModelVariables) -> np.ndarray:
+        """Compute the index of the matrix applied to each row of the
+        specified model variables, without creating or updating the
+        operation.
+
+        Args:
+            model_variables (ModelVariables): the simulation variables
+
+        Returns:
+            np.ndarray: the matrix index of each row
+        """
+        return self._to_matrix_index(
+            self._op_index.compute_matrix_index(
+                model_variables, self._default_matrix_index
+            )
+        )
+
+    def _to_matrix_index(self, index: np.ndarray) -> np.ndarray:
+        """Map rows of the index data to rows of the matrix data"""
+        if self._matrix_ids is None:
+            return index
+        return self._matrix_ids[index]
+
+    def _compute_matrix_index(
+        self, model_variables: ModelVariables
+    ) -> np.ndarray:
+        """Compute the matrix index for the specified model variables.  If
+        the number of rows is unchanged since the last call, only rows whose
+        merge key values changed are merged.  Returns None if the matrix
+        index is unchanged.
+        """
+        if not self._op_index.has_keys:
+            return self.get_matrix_index(model_variables)
+        merge_data = self._op_index.get_merge_data(model_variables)
+        n_rows = model_variables["pools"].n_rows
+        if self._matrix_index is None or self._matrix_index.shape[0] != n_rows:
+            matrix_index = self._to_matrix_index(
+                self._op_index.merge(merge_data, self._default_matrix_index)
+            )
+        else:
+            changed = np.zeros(n_rows, dtype=bool)
+            for k, v in merge_data.items():
+                changed |= v != self._merge_data[k]
+            if not changed.any():
+                return None
+            changed_idx = np.flatnonzero(changed)
+            matrix_index = self._matrix_index.copy()
+            matrix_index[changed_idx] = self._to_matrix_index(
+                self._op_index.merge(
+                    {k: v[changed_idx] for k, v in merge_data.items()},
+                    self._default_matrix_index,
+                )
+            )
+        self._merge_data = merge_data
+        self._matrix_index = matrix_index
+        return matrix_index
 
     def get_operation(self, model_variables: ModelVariables) -> Operation:
+        matrix_index = None
         if self._op is not None:
             n_rows = model_variables["pools"].n_rows
-            curr_idx_len = self._index_len
-            must_index = curr_idx_len != 1 or curr_idx_len != n_rows
             if self._requires_reindexing:
-                matrix_index = self._op_index.compute_matrix_index(
-                    model_variables, self._default_matrix_index
+                matrix_index = self._compute_matrix_index(model_variables)
+                if (
+                    matrix_index is not None
+                    and matrix_index.shape[0] != self._op_n_rows
+                ):
+                    # the operation is allocated for a different number of
+                    # rows
+                    self.dispose()
+            elif self._op_n_rows != n_rows:
+                self.dispose()
+
+        if self._op is not None:
+            if self._values_changed:
+                # the pending values are applied only to an operation that
+                # is kept, since a re-created operation copies them anyway
+                self._op.update_values(
+                    self._operation_data.to_numpy(), matrix_index
                 )
+                self._values_changed = False
+            elif matrix_index is not None:
                 self._op.update_index(matrix_index)
-                return self._op
-            elif not must_index:
-                return self._op
-            else:
-                self._op.dispose()
-                self._op = None
-
-        op_cols = list(self._operation_data.columns)
-        pool_src_sink_tuples: list[tuple] = [
-            tuple(x.split(".")) for x in self._operation_data.columns
-        ]
-
-        matrices = [
-            [p[0], p[1], self._operation_data[op_cols[i]].to_numpy()]
-            for i, p in enumerate(pool_src_sink_tuples)
-        ]
+            return self._op
 
-        matrix_index = self._op_index.compute_matrix_index(
-            model_variables, self._default_matrix_index
-        )
+        if matrix_index is None:
+            self._matrix_index = None
+            matrix_index = self._compute_matrix_index(model_variables)
         self._op = self._model_handle.create_operation(
-            matrices,
+            self.get_matrices(),
             "repeating_coordinates",
             self._op_process_id,
             matrix_index,
             init_value=self._init_value,
         )
+        self._op_n_rows = matrix_index.shape[0]
+
+        return self._op
+
+
+class FusedOperationWrapper:
+    """Applies a sequence of operations which do not require re-indexing as
+    a single operation, whose matrices are the products of the sequence's
+    matrices for each unique combination of their matrix indices.  Since the
+    intermediate pool values are never computed, the fused operation cannot
+    be used for flux tracking.
+
+    The products are computed when first requested and re-used for as long
+    as the number of simulation rows, and the simulation state values the
+    underlying operations are indexed by, are unchanged.
+    """
+
+    def __init__(
+        self, model_handle: ModelHandle, op_wrappers: list[OperationWrapper]
+    ):
+        self._model_handle = model_handle
+        self._op_wrappers = op_wrappers
+        self._op: Union[Operation, None] = None
+        self._n_rows: Union[int, None] = None
+        # the index key values of each operation the products were
+        # computed for
+        self._merge_data: Union[list[dict[str, np.ndarray]], None] = None
+
+    def dispose(self):
+        if self._op:
+            self._op.dispose()
+            self._op = None
+
+    def _is_current(
+        self, n_rows: int, merge_data: list[dict[str, np.ndarray]]
+    ) -> bool:
+        if self._op is None or self._n_rows != n_rows:
+            return False
+        for stored, current in zip(self._merge_data, merge_data):
+            for k, v in current.items():
+                if not np.array_equal(
+                    stored[k], v, equal_nan=v.dtype.kind == "f"
+                ):
+                    return False
+        return True
 
+    def get_operation(self, model_variables: ModelVariables) -> Operation:
+        n_rows = model_variables["pools"].n_rows
+        merge_data = [
+            w.get_merge_data(model_variables) for w in self._op_wrappers
+        ]
+        if self._is_current(n_rows, merge_data):
+            return self._op
+        self.dispose()
+        matrix_indices = [
+            w.get_matrix_index(model_variables) for w in self._op_wrappers
+        ]
+        unique_indices, matrix_index = np.unique(
+            np.column_stack([m.astype("int64") for m in matrix_indices]),
+            axis=0,
+            return_inverse=True,
+        )
+        self._op = self._model_handle.create_operation(
+            compose_matrices(
+                [w.get_matrices() for w in self._op_wrappers],
+                unique_indices,
+            ),
+            "repeating_coordinates",
+            self._op_wrappers[0].op_process_id,
+            matrix_index.reshape(-1),
+            init_value=1,
+        )
+        self._n_rows = n_rows
+        self._merge_data = merge_data
         return self._op
 
 
@@ -190,6 +523,11 @@ class ModelMatrixOps:
                 categorization of fluxes extracted from the C flows
         """
         self._op_wrappers: dict[str, OperationWrapper] = {}
+        # the arguments each stored operation was created or updated with
+        self._op_definitions: dict[str, dict] = {}
+        self._fused_op_wrappers: dict[
+            tuple[str, ...], FusedOperationWrapper
+        ] = {}
         self._model_handle = model_handel
         self._pool_names = set(pool_names)
         self._op_process_ids = op_process_ids
@@ -202,6 +540,7 @@ class ModelMatrixOps:
         requires_reindexing: bool = True,
         init_value: int = 1,
         default_matrix_index: Union[int, None] = None,
+        matrices: Union[pd.DataFrame, None] = None,
     ):
         """Create a C flow operation using a dataframe formatted so that each
             row is an index C flow matrix.
@@ -226,10 +565,26 @@ class ModelMatrixOps:
                 specified 0 based index will be used as a default fill-value.
                 If this value is not specified, such missing values will
                 instead result in an error being raised. Defaults to None.
+            matrices (pd.DataFrame, optional): If specified, the C flow
+                matrices are stored on the rows of this dataframe of pool
+                source sink columns rather than in `op_data`, whose
+                non-index columns are replaced with a single `matrix_index`
+                column referencing the rows of `matrices`.  This avoids
+                repeating matrices shared by many `op_data` rows.  See
+                :py:func:`prepare_matrix_table`. Defaults to None.
         """
         if name in self._op_wrappers:
             self._op_wrappers[name].dispose()
             del self._op_wrappers[name]
+        self._dispose_fused(name)
+        self._op_definitions[name] = dict(
+            op_process_name=op_process_name,
+            op_data=op_data,
+            requires_reindexing=requires_reindexing,
+            init_value=init_value,
+            default_matrix_index=default_matrix_index,
+            matrices=matrices,
+        )
         self._op_wrappers[name] = OperationWrapper(
             name,
             self._model_handle,
@@ -239,10 +594,98 @@ class ModelMatrixOps:
             requires_reindexing,
             init_value,
             default_matrix_index,
+            matrices,
+        )
+
+    def _dispose_fused(self, name: str):
+        for fused_names in list(self._fused_op_wrappers.keys()):
+            if name in fused_names:
+                self._fused_op_wrappers.pop(fused_names).dispose()
+
+    def register_operation(
+        self,
+        name: str,
+        op_process_name: str,
+        op_data: pd.DataFrame,
+        requires_reindexing: bool = True,
+        init_value: int = 1,
+        default_matrix_index: Union[int, None] = None,
+        matrices: Union[pd.DataFrame, None] = None,
+    ):
+        """Store a C flow operation as with :py:func:`create_operation`,
+        re-using the stored operation of the same name where possible, so
+        that operations can be registered on every timestep at little cost:
+
+            * if the operation is stored with the same arguments, and the
+              same `op_data` instance, it is kept as is
+            * if only the matrix values differ, and `op_data` has no index
+              columns, the values of the stored operation are replaced
+            * otherwise the operation is re-created
+
+        Since `op_data` and `matrices` instances are compared by identity,
+        they should not be modified after being registered.
+
+        Args:
+            name (str): The operation's unique name.
+            op_process_name (str): See :py:func:`create_operation`
+            op_data (pd.DataFrame): See :py:func:`create_operation`
+            requires_reindexing (bool, optional): See
+                :py:func:`create_operation`. Defaults to True.
+            init_value (int, optional): See :py:func:`create_operation`.
+                Defaults to 1.
+            default_matrix_index (Union[int, None], optional): See
+                :py:func:`create_operation`. Defaults to None.
+            matrices (pd.DataFrame, optional): See
+                :py:func:`create_operation`. Defaults to None.
+        """
+        definition = self._op_definitions.get(name)
+        if definition is not None and (
+            definition["op_process_name"] == op_process_name
+            and definition["requires_reindexing"] == requires_reindexing
+            and definition["init_value"] == init_value
+            and definition["default_matrix_index"] == default_matrix_index
+            and definition["matrices"] is matrices
+        ):
+            if definition["op_data"] is op_data:
+                return
+            if self._op_wrappers[name].update_values(op_data):
+                definition["op_data"] = op_data
+                self._dispose_fused(name)
+                return
+        self.create_operation(
+            name,
+            op_process_name,
+            op_data,
+            requires_reindexing,
+            init_value,
+            default_matrix_index,
+            matrices,
         )
 
+    def _fuse_op_names(self, op_names: list[str]) -> list[tuple[str, ...]]:
+        """Group runs of consecutive operations which do not require
+        re-indexing and which have a unit diagonal default value.
+        """
+        groups: list[tuple[str, ...]] = []
+        run: list[str] = []
+        for name in op_names:
+            wrapper = self._op_wrappers[name]
+            if not wrapper.requires_reindexing and wrapper.init_value == 1:
+                run.append(name)
+            else:
+                if run:
+                    groups.append(tuple(run))
+                    run = []
+                groups.append((name,))
+        if run:
+            groups.append(tuple(run))
+        return groups
+
     def get_operations(
-        self, op_names: list[str], model_variables: ModelVariables
+        self,
+        op_names: list[str],
+        model_variables: ModelVariables,
+        fuse: bool = False,
     ) -> list[Operation]:
         """Get C flow operations for computation of C flows on the current
         model state stored in model_variables.
@@ -252,20 +695,40 @@ class ModelMatrixOps:
                 operations to apply (duplicates allowed)
             model_variables (ModelVariables): the current model state:
                 pools, flux, state etc.
+            fuse (bool, optional): if set to True, each run of two or more
+                consecutive operations which do not require re-indexing is
+                replaced by a single cached operation storing the matrix
+                products of the run.  The resulting pools are equal to
+                within floating point rounding, but the fluxes of the fused
+                operations cannot be tracked. Defaults to False.
 
         Returns:
             list[Operation]: a list of C flow operations to apply
         """
-        unique_ops: dict[str, Operation] = {}
+        unique_ops: dict[tuple[str, ...], Operation] = {}
         out: list[Operation] = []
-        for name in op_names:
-            if name not in unique_ops:
-                unique_ops[name] = self._op_wrappers[name].get_operation(
-                    model_variables
-                )
-            out.append(unique_ops[name])
+        groups = (
+            self._fuse_op_names(op_names)
+            if fuse
+            else [(name,) for name in op_names]
+        )
+        for group in groups:
+            if group not in unique_ops:
+                if len(group) == 1:
+                    wrapper = self._op_wrappers[group[0]]
+                else:
+                    if group not in self._fused_op_wrappers:
+                        self._fused_op_wrappers[group] = FusedOperationWrapper(
+                            self._model_handle,
+                            [self._op_wrappers[name] for name in group],
+                        )
+                    wrapper = self._fused_op_wrappers[group]
+                unique_ops[group] = wrapper.get_operation(model_variables)
+            out.append(unique_ops[group])
         return out
 
     def dispose(self):
         for w in self._op_wrappers.values():
             w.dispose()
+        for f in self._fused_op_wrappers.values():
+            f.dispose()
@@ -1,8 +1,12 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
 from libcbm.storage.dataframe import DataFrame
 from libcbm.storage import dataframe
 import pandas as pd
 
+if TYPE_CHECKING:
+    import pyarrow
+
 
 class ModelVariables:
     """
@@ -48,3 +52,24 @@ class ModelVariables:
         if the underlying dataframe storage backend is not pandas
         """
         return {k: v.to_pandas() for k, v in self._data.items()}
+
+    @staticmethod
+    def from_arrow(tables: dict[str, pyarrow.Table]) -> "ModelVariables":
+        """
+        Assemble a ModelVariables instance from a collection of arrow
+        tables. The memory of the tables is shared where possible. Requires
+        the optional `pyarrow` package.
+        """
+        return ModelVariables(
+            {k: dataframe.from_arrow(v) for k, v in tables.items()}
+        )
+
+    def to_arrow(self) -> dict[str, pyarrow.Table]:
+        """
+        return the dataframes in this collection as a dictionary of named
+        arrow tables.  The memory of arrow backed dataframes is shared with
+        the tables where possible, and other backends are copied.
+        """
+        from libcbm.storage.backends import arrow_backend
+
+        return {k: arrow_backend.to_arrow(v) for k, v in self._data.items()}
@@ -1,8 +1,7 @@
 from __future__ import annotations
 from libcbm.model.model_definition.model_variables import ModelVariables
 from libcbm.storage import series
-from libcbm.storage import dataframe
-from libcbm.storage.dataframe import DataFrame
+from libcbm.storage.output_sink import InMemorySink
 
 
 class ModelOutputProcessor:
@@ -14,14 +13,18 @@ class ModelOutputProcessor:
 
     Note the numpy and pandas DataFrame backends will store information in
     memory limiting the scalability of this method.
+
+    Timestep results are held as a list of chunks, and are concatenated only
+    when :py:func:`get_results` is called.
     """
 
     def __init__(self):
-        self._results: dict[str, DataFrame] = {}
+        self._names: list[str] = []
+        self._sink = InMemorySink()
 
     def append_results(self, t: int, results: ModelVariables):
         """Append results to the output processor.  Values from the specified
-        results will be concatenated with previous timestep results.
+        results will be stored along with previous timestep results.
 
         Two columns will be added to the internally stored dataframes to
         identify rows: identifier and timestep.
@@ -54,12 +57,9 @@ class ModelOutputProcessor:
                 ),
                 1,
             )
-            if name not in self._results:
-                self._results[name] = results_t
-            else:
-                self._results[name] = dataframe.concat_data_frame(
-                    [self._results[name], results_t]
-                )
+            if name not in self._names:
+                self._names.append(name)
+            self._sink.append(name, t, results_t)
 
     def get_results(self) -> ModelVariables:
         """Return the collection of accumulated results
@@ -67,4 +67,6 @@ class ModelOutputProcessor:
         Returns:
             dict[str, DataFrame]: collection of dataframes holding results.
         """
-        return ModelVariables(self._results)
+        return ModelVariables(
+            {name: self._sink.get(name) for name in self._names}
+        )
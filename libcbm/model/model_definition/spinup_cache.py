@@ -0,0 +1,262 @@
+from __future__ import annotations
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+def unique_rows(key_data: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Find the unique rows of the specified key data.
+
+    Args:
+        key_data (pd.DataFrame): the columns defining the identity of each
+            row
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: a pair of arrays:
+
+            * the index of the first occurrence of each unique row, in
+              ascending order
+            * for each row of key_data, the position of its unique row in
+              the first array, so that taking the unique rows by this array
+              reproduces all rows.
+    """
+    if len(key_data.columns) == 0:
+        group_id = np.zeros(len(key_data.index), dtype="int64")
+    else:
+        group_id = (
+            key_data.groupby(list(key_data.columns), sort=False, dropna=False)
+            .ngroup()
+            .to_numpy()
+        )
+    _, unique_idx, inverse = np.unique(
+        group_id, return_index=True, return_inverse=True
+    )
+    return unique_idx, inverse
+
+
+def hash_rows(data: pd.DataFrame) -> np.ndarray:
+    """Compute a 64 bit hash of the values in each row of the specified
+    dataframe.  The hashes are stable across processes, but distinct rows
+    can have equal hashes, so rows with equal hashes must still be
+    compared.
+
+    Args:
+        data (pd.DataFrame): the data to hash
+
+    Returns:
+        np.ndarray: array of uint64 row hashes
+    """
+    return pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+
+def digest_rows(data: pd.DataFrame) -> np.ndarray:
+    """Compute a SHA-256 digest of the column labels and the values in each
+    row of the specified numeric dataframe.  Unlike :py:func:`hash_rows`,
+    the digests can be relied on to be distinct for distinct rows, and
+    are suitable as persistent keys.  Rows with equal values are digested
+    once.
+
+    Args:
+        data (pd.DataFrame): the data to digest
+
+    Returns:
+        np.ndarray: array of hex digest strings
+    """
+    unique_idx, inverse = unique_rows(
+        data.set_axis(range(len(data.columns)), axis=1)
+    )
+    labels = repr(list(data.columns)).encode("utf-8")
+    values = data.to_numpy(dtype="float64")
+    digests = []
+    for i in unique_idx:
+        digest = hashlib.sha256(labels)
+        digest.update(values[i].tobytes())
+        digests.append(digest.hexdigest())
+    return np.array(digests, dtype=str)[inverse]
+
+
+def hash_files(paths: list[str]) -> str:
+    """Compute a digest of the contents of the specified files, for example
+    a parameter database, which can be used as the `parameter_hash` of
+    :py:class:`SpinupCache`.
+
+    Args:
+        paths (list[str]): the files to hash
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _match_rows(
+    stored_keys: pd.DataFrame, key_data: pd.DataFrame
+) -> np.ndarray:
+    """Find the row of stored_keys, whose rows are unique, with values
+    exactly equal to each row of key_data.  Missing values are equal to
+    each other.
+
+    Returns:
+        np.ndarray: the matching stored row of each row of key_data, or -1
+            where there is no match
+    """
+    n_stored = len(stored_keys.index)
+    columns = range(len(key_data.columns))
+    _, inverse = unique_rows(
+        pd.concat(
+            [
+                stored_keys.set_axis(columns, axis=1),
+                key_data.set_axis(columns, axis=1),
+            ],
+            ignore_index=True,
+        )
+    )
+    lookup = np.full(len(inverse), -1, dtype="int64")
+    lookup[inverse[:n_stored]] = np.arange(n_stored)
+    return lookup[inverse[n_stored:]]
+
+
+def _to_storable(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind == "O":
+        return values.astype(str)
+    return values
+
+
+class SpinupCache:
+    """Persistent on-disk cache of spinup results, keyed by the attributes
+    which define the spinup of each stand.
+
+    Results are stored per combination of parameter hash and key columns in
+    a single numpy `.npz` file in the cache directory, which is read
+    without allowing pickled objects.  The key values of each stored row
+    are stored with it, and rows are returned only for keys with exactly
+    equal values. The cache is not safe for concurrent writes by several
+    processes.
+
+    Args:
+        cache_dir (str): the directory in which results are stored. It is
+            created if it does not exist.
+        parameter_hash (str): a string identifying all model parameters
+            which affect spinup and which are not part of the per-stand
+            keys, for example the parameter database (see
+            :py:func:`hash_files`) and growth curves.  Results stored
+            under a different parameter hash are never returned.
+    """
+
+    def __init__(self, cache_dir: str, parameter_hash: str):
+        self._cache_dir = cache_dir
+        self._parameter_hash = parameter_hash
+        self._tables: dict[str, pd.DataFrame] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_path(self, key_columns: list[str]) -> str:
+        name = hashlib.sha256(
+            f"{self._parameter_hash}:{','.join(key_columns)}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self._cache_dir, f"{name}.npz")
+
+    def _load(self, path: str) -> pd.DataFrame:
+        if path not in self._tables:
+            if os.path.exists(path):
+                with np.load(path, allow_pickle=False) as stored:
+                    self._tables[path] = pd.DataFrame(
+                        {name: stored[name] for name in stored.files}
+                    )
+            else:
+                self._tables[path] = None
+        return self._tables[path]
+
+    def get(
+        self, key_data: pd.DataFrame
+    ) -> tuple[np.ndarray, dict[str, pd.DataFrame]]:
+        """Get the stored results for the specified keys
+
+        Args:
+            key_data (pd.DataFrame): the spinup key of each stand
+
+        Returns:
+            tuple[np.ndarray, dict[str, pd.DataFrame]]: a boolean array
+                which is True for each row of key_data with stored results,
+                and the stored results of those rows by table name.  If no
+                rows were found the dictionary is empty.
+        """
+        key_columns = list(key_data.columns)
+        stored = self._load(self._get_path(key_columns))
+        if stored is None:
+            return np.zeros(len(key_data.index), dtype=bool), {}
+        stored_rows = _match_rows(
+            stored[[f"key.{c}" for c in key_columns]], key_data
+        )
+        found = stored_rows >= 0
+        if not found.any():
+            return found, {}
+        rows = stored.iloc[stored_rows[found]]
+        tables: dict[str, dict[str, np.ndarray]] = {}
+        for col in rows.columns:
+            table_name, col_name = col.split(".", 1)
+            if table_name == "key":
+                continue
+            if table_name not in tables:
+                tables[table_name] = {}
+            tables[table_name][col_name] = rows[col].to_numpy()
+        return found, {k: pd.DataFrame(v) for k, v in tables.items()}
+
+    def put(
+        self, key_data: pd.DataFrame, results: dict[str, pd.DataFrame]
+    ) -> None:
+        """Store the results for the specified keys, and write them to the
+        cache directory.
+
+        Args:
+            key_data (pd.DataFrame): the spinup key of each stand
+            results (dict[str, pd.DataFrame]): row aligned spinup results by
+                table name, for example "pools" and "state". Table names
+                may not be "key".
+        """
+        if len(key_data.index) == 0:
+            return
+        key_columns = list(key_data.columns)
+        path = self._get_path(key_columns)
+        rows = pd.DataFrame(
+            {
+                **{
+                    f"key.{col}": key_data[col].to_numpy()
+                    for col in key_columns
+                },
+                **{
+                    f"{table_name}.{col}": table[col].to_numpy()
+                    for table_name, table in results.items()
+                    for col in table.columns
+                },
+            }
+        )
+        # where a key occurs more than once, the last row is stored
+        rows = rows[
+            ~rows[[f"key.{c}" for c in key_columns]].duplicated(keep="last")
+        ]
+        stored = self._load(path)
+        if stored is not None:
+            replaced = (
+                _match_rows(
+                    rows[[f"key.{c}" for c in key_columns]],
+                    stored[[f"key.{c}" for c in key_columns]],
+                )
+                >= 0
+            )
+            rows = pd.concat([stored[~replaced], rows], ignore_index=True)
+        rows = rows.reset_index(drop=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                **{
+                    col: _to_storable(rows[col].to_numpy())
+                    for col in rows.columns
+                },
+            )
+        self._tables[path] = rows
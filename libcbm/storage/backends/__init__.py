@@ -11,8 +11,14 @@ class BackendType(Enum):
     pandas = 2
     """the pandas backend type
     """
-    # dask = 3
-    # pyarrow = 3
+
+    dask = 3
+    """the dask backend type, for chunked storage
+    """
+
+    arrow = 4
+    """the arrow backend type, for storage shared with arrow memory
+    """
 
 
 def get_backend(backend_type: BackendType):
@@ -36,5 +42,13 @@ def get_backend(backend_type: BackendType):
         from libcbm.storage.backends import pandas_backend
 
         return pandas_backend
+    elif backend_type == BackendType.dask:
+        from libcbm.storage.backends import dask_backend
+
+        return dask_backend
+    elif backend_type == BackendType.arrow:
+        from libcbm.storage.backends import arrow_backend
+
+        return arrow_backend
     else:
         raise NotImplementedError()
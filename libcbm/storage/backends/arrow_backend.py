@@ -0,0 +1,628 @@
+"""Storage backend based on Apache Arrow memory.
+
+Each column of an :py:class:`ArrowDataFrameBackend` is a contiguous buffer.
+Integer and floating point columns without nulls are stored as numpy arrays
+which share memory with the arrow arrays they are imported from or exported
+to, so that they can be passed to the libcbm library, or written to
+Parquet or Feather files, without copying. Columns of other types, for
+example strings, are stored as arrow arrays until they are operated on as
+numpy arrays.
+
+Arrays imported from arrow memory are read-only, and are copied the first
+time they are modified. When a numeric dataframe is accessed as a matrix
+(see :py:meth:`ArrowDataFrameBackend.to_numpy`) its columns are copied into
+a single row major matrix once, and from then on are strided views of that
+matrix which are assigned in place. Strided columns are copied when a
+contiguous buffer is required: when they are exported to arrow, or passed
+to the libcbm library.
+"""
+
+from __future__ import annotations
+from typing import Any
+from typing import Union
+import ctypes
+import numpy as np
+import pandas as pd
+import numexpr
+import pyarrow as pa
+from libcbm.storage.dataframe import DataFrame
+from libcbm.storage.series import Series
+from libcbm.storage.backends import BackendType
+from libcbm.storage.backends import numpy_backend
+
+ColumnType = Union[np.ndarray, pa.Array]
+
+
+def _from_arrow(column: Union[pa.Array, pa.ChunkedArray]) -> ColumnType:
+    if isinstance(column, pa.ChunkedArray):
+        if column.num_chunks == 1:
+            column = column.chunk(0)
+        else:
+            column = column.combine_chunks()
+    if (
+        pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+    ) and column.null_count == 0:
+        return column.to_numpy(zero_copy_only=True)
+    return column
+
+
+def _to_arrow(data: ColumnType) -> pa.Array:
+    if isinstance(data, pa.Array):
+        return data
+    # contiguous numeric arrays are wrapped without copying
+    return pa.array(np.ascontiguousarray(data))
+
+
+def _to_numpy(data: ColumnType) -> np.ndarray:
+    if isinstance(data, np.ndarray):
+        return data
+    return data.to_numpy(zero_copy_only=False)
+
+
+def _take(data: ColumnType, indices: np.ndarray) -> ColumnType:
+    if isinstance(data, np.ndarray):
+        return data[indices]
+    n = len(data)
+    if indices.size and (indices.max() >= n or indices.min() < -n):
+        raise IndexError(f"index out of bounds for array of length {n}")
+    return data.take(pa.array(np.where(indices < 0, indices + n, indices)))
+
+
+class ArrowDataFrameBackend(DataFrame):
+    def __init__(
+        self, data: Union[pa.Table, dict[str, ColumnType]], n_rows: int = None
+    ) -> None:
+        """Initialize an ArrowDataFrameBackend
+
+        Args:
+            data (Union[pa.Table, dict[str, ColumnType]]): an arrow table,
+                whose memory is shared where possible, or a dictionary of
+                equal length numpy or arrow arrays.
+            n_rows (int, optional): the number of rows, used only if data
+                has no columns. Defaults to None.
+        """
+        if isinstance(data, pa.Table):
+            n_rows = data.num_rows
+            data = {
+                name: _from_arrow(data.column(name))
+                for name in data.column_names
+            }
+        for k, v in data.items():
+            if isinstance(v, np.ndarray) and v.ndim != 1:
+                raise ValueError(f"specified array '{k}' has ndim {v.ndim}")
+            if n_rows is None:
+                n_rows = len(v)
+            elif n_rows != len(v):
+                raise ValueError("uneven array lengths")
+        self._data: dict[str, ColumnType] = dict(data)
+        self._n_rows = 0 if n_rows is None else n_rows
+        # when set, each column is a view of a column of this matrix
+        self._matrix: np.ndarray = None
+
+    def _get_column(self, col_name: str) -> np.ndarray:
+        """Get the specified column as a numpy array, converting and storing
+        it if it is an arrow array
+        """
+        data = self._data[col_name]
+        if not isinstance(data, np.ndarray):
+            data = _to_numpy(data)
+            self._set_column(col_name, data)
+        return data
+
+    def _get_writable_column(self, col_name: str) -> np.ndarray:
+        """Get the specified column as a writable numpy array, copying it if
+        it is read-only memory imported from arrow. Strided views of the
+        matrix returned by :py:meth:`to_numpy` are writable, so they are
+        never copied here.
+        """
+        data = self._get_column(col_name)
+        if not data.flags["WRITEABLE"]:
+            data = np.array(data)
+            self._set_column(col_name, data)
+        return data
+
+    def _set_column(self, col_name: str, data: ColumnType) -> None:
+        self._matrix = None
+        self._data[col_name] = data
+
+    def _take_rows(self, row_idx: np.ndarray) -> ArrowDataFrameBackend:
+        return ArrowDataFrameBackend(
+            {col: _take(data, row_idx) for col, data in self._data.items()},
+            n_rows=row_idx.shape[0],
+        )
+
+    def __getitem__(self, col_name: str) -> Series:
+        return ArrowSeriesBackend(col_name, parent_df=self)
+
+    def filter(self, arg: Series) -> DataFrame:
+        return self._take_rows(np.flatnonzero(arg.to_numpy()))
+
+    def take(self, indices: Series) -> DataFrame:
+        return self._take_rows(indices.to_numpy())
+
+    def at(self, index: int) -> dict:
+        return {
+            col: (
+                data[index]
+                if isinstance(data, np.ndarray)
+                else data[index].as_py()
+            )
+            for col, data in self._data.items()
+        }
+
+    @property
+    def n_rows(self) -> int:
+        return self._n_rows
+
+    @property
+    def n_cols(self) -> int:
+        return len(self._data)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._data.keys())
+
+    @property
+    def backend_type(self) -> BackendType:
+        return BackendType.arrow
+
+    def copy(self) -> DataFrame:
+        # arrow arrays are immutable, and so are shared with the copy
+        return ArrowDataFrameBackend(
+            {
+                col: (data.copy() if isinstance(data, np.ndarray) else data)
+                for col, data in self._data.items()
+            },
+            n_rows=self._n_rows,
+        )
+
+    def multiply(self, series: Series) -> DataFrame:
+        rh = series.to_numpy()
+        return ArrowDataFrameBackend(
+            {col: self._get_column(col) * rh for col in self.columns},
+            n_rows=self._n_rows,
+        )
+
+    def add_column(self, series: Series, index: int) -> None:
+        if series.name in self._data:
+            raise ValueError(
+                f"{series.name} already present in this Dataframe"
+            )
+        insert_data = series.to_numpy()
+        if insert_data.shape[0] != self._n_rows:
+            raise ValueError(
+                "specified series does not have the same length as the "
+                "number of rows in this DataFrame"
+            )
+        columns = self.columns
+        columns.insert(index, series.name)
+        self._set_column(series.name, insert_data)
+        self._data = {col: self._data[col] for col in columns}
+
+    def to_numpy(self, make_c_contiguous=True) -> np.ndarray:
+        """Get all columns as a single matrix, which is stored as this
+        dataframe's memory, so that changes to the returned matrix are
+        reflected in this dataframe.
+
+        Raises:
+            ValueError: the columns are not of a uniform type
+
+        Returns:
+            np.ndarray: the C contiguous matrix of column values
+        """
+        if self._matrix is not None:
+            return self._matrix
+        columns = self.columns
+        data = [self._get_column(col) for col in columns]
+        if len(set(d.dtype for d in data)) > 1:
+            raise ValueError("to_numpy not supported for non-uniform matrix")
+        matrix = np.ascontiguousarray(np.column_stack(data))
+        self._data = {col: matrix[:, i] for i, col in enumerate(columns)}
+        self._matrix = matrix
+        return matrix
+
+    def to_pandas(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                col: (
+                    data if isinstance(data, np.ndarray) else data.to_pandas()
+                )
+                for col, data in self._data.items()
+            }
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """Get this dataframe as an arrow table. Contiguous numeric columns
+        are shared with the table without copying, so the table should not
+        be used after this dataframe is modified.
+
+        Returns:
+            pa.Table: the arrow table
+        """
+        return pa.table(
+            {col: _to_arrow(data) for col, data in self._data.items()}
+        )
+
+    def zero(self):
+        for col in self.columns:
+            self._get_writable_column(col)[:] = 0
+
+    def map(self, arg: dict) -> DataFrame:
+        return ArrowDataFrameBackend(
+            {
+                col: numpy_backend._map(self._get_column(col), arg)
+                for col in self.columns
+            },
+            n_rows=self._n_rows,
+        )
+
+    def evaluate_filter(self, expression: str) -> Series:
+        return ArrowSeriesBackend(
+            None, numexpr.evaluate(expression, _LocalDictWrap(self))
+        )
+
+    def sort_values(self, by: str, ascending: bool = True) -> DataFrame:
+        index_array = np.argsort(self._get_column(by), kind="mergesort")
+        if not ascending:
+            index_array = index_array[::-1]
+        return self._take_rows(index_array)
+
+
+class _LocalDictWrap:
+    def __init__(self, df: ArrowDataFrameBackend):
+        self._df = df
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._df._get_column(key)
+
+
+class ArrowSeriesBackend(Series):
+    """
+    Series is a wrapper for one of several underlying storage types which
+    presents a limited interface for internal usage by libcbm.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        data: ColumnType = None,
+        parent_df: ArrowDataFrameBackend = None,
+    ):
+        if not ((data is None) ^ (parent_df is None)):
+            raise ValueError("one of data, or parent_df must be specified")
+        self._name = name
+        self._data = data
+        self._parent_df = parent_df
+
+    def _get_data(self) -> np.ndarray:
+        if self._parent_df is not None:
+            return self._parent_df._get_column(self._name)
+        if not isinstance(self._data, np.ndarray):
+            self._data = _to_numpy(self._data)
+        return self._data
+
+    def _get_writable_data(self) -> np.ndarray:
+        if self._parent_df is not None:
+            return self._parent_df._get_writable_column(self._name)
+        data = self._get_data()
+        if not data.flags["WRITEABLE"]:
+            self._data = np.array(data)
+        return self._data
+
+    def _new(self, data: ColumnType) -> ArrowSeriesBackend:
+        return ArrowSeriesBackend(self._name, data)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value) -> str:
+        self._name = value
+
+    def copy(self):
+        return self._new(self._get_data().copy())
+
+    def filter(self, arg: "Series") -> "Series":
+        return self._new(self._get_data()[arg.to_numpy()])
+
+    def take(self, indices: "Series") -> "Series":
+        return self._new(self._get_data()[indices.to_numpy()])
+
+    def is_null(self) -> "Series":
+        return self._new(pd.isnull(self._get_data()))
+
+    def as_type(self, type_name: str) -> "Series":
+        return self._new(self._get_data().astype(type_name))
+
+    def assign(
+        self,
+        value: Union["Series", Any],
+        indices: "Series" = None,
+    ):
+        this_dtype = self._get_data().dtype
+        if isinstance(value, Series):
+            assignment_value = value.as_type(this_dtype).to_numpy()
+        else:
+            assignment_value = np.array(value, dtype=this_dtype)
+        if indices is not None:
+            _idx = indices.to_numpy()
+            if _idx.size == 0:
+                return
+        else:
+            _idx = slice(None)
+        self._get_writable_data()[_idx] = assignment_value
+
+    def map(self, arg: dict) -> "Series":
+        return self._new(numpy_backend._map(self._get_data(), arg))
+
+    def at(self, idx: int) -> Any:
+        """Gets the value at the specified sequential index"""
+        return self._get_data()[idx]
+
+    def any(self) -> bool:
+        """
+        return True if at least one value in this series is
+        non-zero
+        """
+        return self._get_data().any()
+
+    def all(self) -> bool:
+        """
+        return True if all values in this series are non-zero
+        """
+        return self._get_data().all()
+
+    def indices_nonzero(self) -> "Series":
+        """Get the indices of values that are non-zero in this series"""
+        return self._new(np.nonzero(self._get_data())[0])
+
+    def unique(self) -> "Series":
+        return self._new(np.unique(self._get_data()))
+
+    def to_numpy(self) -> np.ndarray:
+        """Get the values of this series as a writable numpy array, which
+        is this series' memory. Read-only memory imported from arrow is
+        copied. The array is a strided view if the parent dataframe was
+        accessed as a matrix.
+        """
+        return self._get_writable_data()
+
+    def to_list(self) -> list:
+        return self._get_data().tolist()
+
+    def to_numpy_ptr(self) -> ctypes.pointer:
+        dtype = str(self._get_data().dtype)
+        if dtype == "int32":
+            ptr_type = ctypes.c_int32
+        elif dtype == "float64":
+            ptr_type = ctypes.c_double
+        else:
+            raise ValueError(f"series type not supported {dtype}")
+        data = self.to_numpy()
+        if not data.flags["C_CONTIGUOUS"]:
+            # a column of the matrix is strided, so a copy is used
+            data = np.ascontiguousarray(data)
+        return numpy_backend.get_numpy_pointer(data, ptr_type)
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._get_data()
+
+    def sum(self) -> Union[int, float]:
+        return self._get_data().sum()
+
+    def cumsum(self) -> "Series":
+        return self._new(self._get_data().cumsum())
+
+    def max(self) -> Union[int, float]:
+        return self._get_data().max()
+
+    def min(self) -> Union[int, float]:
+        return self._get_data().min()
+
+    @property
+    def length(self) -> int:
+        return self._get_data().size
+
+    @property
+    def backend_type(self) -> BackendType:
+        return BackendType.arrow
+
+    def __mul__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() * self._get_operand(other))
+
+    def __rmul__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_operand(other) * self._get_data())
+
+    def __truediv__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() / self._get_operand(other))
+
+    def __rtruediv__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_operand(other) / self._get_data())
+
+    def __add__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() + self._get_operand(other))
+
+    def __radd__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_operand(other) + self._get_data())
+
+    def __sub__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() - self._get_operand(other))
+
+    def __rsub__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_operand(other) - self._get_data())
+
+    def __ge__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() >= self._get_operand(other))
+
+    def __gt__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() > self._get_operand(other))
+
+    def __le__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() <= self._get_operand(other))
+
+    def __lt__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() < self._get_operand(other))
+
+    def __eq__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() == self._get_operand(other))
+
+    def __ne__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() != self._get_operand(other))
+
+    def __and__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() & self._get_operand(other))
+
+    def __or__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_data() | self._get_operand(other))
+
+    def __rand__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_operand(other) & self._get_data())
+
+    def __ror__(self, other: Union[int, float, "Series"]) -> "Series":
+        return self._new(self._get_operand(other) | self._get_data())
+
+    def __invert__(self) -> "Series":
+        return self._new(~self._get_data())
+
+
+def _concat(arrays: list[ColumnType]) -> ColumnType:
+    if all(isinstance(a, pa.Array) for a in arrays):
+        return pa.concat_arrays(arrays)
+    return np.concatenate([_to_numpy(a) for a in arrays])
+
+
+def concat_data_frame(
+    dfs: list[ArrowDataFrameBackend],
+) -> ArrowDataFrameBackend:
+    cols = []
+    for df in dfs:
+        if not cols:
+            cols = list(df.columns)
+        elif cols != df.columns:
+            raise ValueError("cols do not match")
+    return ArrowDataFrameBackend(
+        {col: _concat([df._data[col] for df in dfs]) for col in cols},
+        n_rows=sum(df.n_rows for df in dfs),
+    )
+
+
+def reserve_data_frame(
+    df: ArrowDataFrameBackend, n_rows: int
+) -> ArrowDataFrameBackend:
+    # spare row capacity is not supported by this backend
+    return df
+
+
+def append_data_frame(
+    df: ArrowDataFrameBackend, rows: ArrowDataFrameBackend
+) -> ArrowDataFrameBackend:
+    return concat_data_frame([df, rows])
+
+
+def concat_series(series: list[ArrowSeriesBackend]) -> ArrowSeriesBackend:
+    return ArrowSeriesBackend(
+        None, np.concatenate([s._get_data() for s in series])
+    )
+
+
+def logical_and(
+    s1: ArrowSeriesBackend, s2: ArrowSeriesBackend
+) -> ArrowSeriesBackend:
+    return ArrowSeriesBackend(
+        None, np.logical_and(s1._get_data(), s2._get_data())
+    )
+
+
+def logical_not(series: ArrowSeriesBackend) -> ArrowSeriesBackend:
+    return ArrowSeriesBackend(None, np.logical_not(series._get_data()))
+
+
+def logical_or(
+    s1: ArrowSeriesBackend, s2: ArrowSeriesBackend
+) -> ArrowSeriesBackend:
+    return ArrowSeriesBackend(
+        None, np.logical_or(s1._get_data(), s2._get_data())
+    )
+
+
+def make_boolean_series(init: bool, size: int) -> ArrowSeriesBackend:
+    return ArrowSeriesBackend(
+        None, np.full(shape=size, fill_value=init, dtype="bool")
+    )
+
+
+def is_null(series: ArrowSeriesBackend) -> ArrowSeriesBackend:
+    return series.is_null()
+
+
+def indices_nonzero(series: ArrowSeriesBackend) -> ArrowSeriesBackend:
+    return series.indices_nonzero()
+
+
+def numeric_dataframe(
+    cols: list[str],
+    nrows: int,
+    init: float = 0.0,
+) -> ArrowDataFrameBackend:
+    return ArrowDataFrameBackend(
+        {col: np.full(nrows, init, "float64") for col in cols}, n_rows=nrows
+    )
+
+
+def from_series_list(
+    series_list: list[ArrowSeriesBackend],
+) -> ArrowDataFrameBackend:
+    return ArrowDataFrameBackend({s.name: s._get_data() for s in series_list})
+
+
+def from_series_dict(
+    data: dict[str, ArrowSeriesBackend],
+) -> ArrowDataFrameBackend:
+    return ArrowDataFrameBackend({k: v._get_data() for k, v in data.items()})
+
+
+def from_arrow(table: pa.Table) -> ArrowDataFrameBackend:
+    """Create a dataframe which shares the memory of the specified arrow
+    table where possible.
+
+    Args:
+        table (pa.Table): the arrow table
+
+    Returns:
+        ArrowDataFrameBackend: the dataframe
+    """
+    return ArrowDataFrameBackend(table)
+
+
+def to_arrow(df: DataFrame) -> pa.Table:
+    """Get the specified dataframe, of any backend type, as an arrow table.
+    The memory of arrow backed dataframes is shared with the table where
+    possible.
+
+    Args:
+        df (DataFrame): the dataframe
+
+    Returns:
+        pa.Table: the arrow table
+    """
+    if isinstance(df, ArrowDataFrameBackend):
+        return df.to_arrow()
+    return pa.Table.from_pandas(df.to_pandas(), preserve_index=False)
+
+
+def allocate(name: str, len: int, init: Any, dtype: str) -> ArrowSeriesBackend:
+    return ArrowSeriesBackend(name, np.full(len, init, dtype))
+
+
+def range(
+    name: str,
+    start: int,
+    stop: int,
+    step: int,
+    dtype: str,
+) -> Series:
+    return ArrowSeriesBackend(
+        name, np.arange(start=start, stop=stop, step=step, dtype=dtype)
+    )
@@ -1,226 +1,666 @@
+"""Chunked storage backend based on dask arrays.
+
+Each column of a :py:class:`DaskDataFrameBackend` is a one dimensional
+array partitioned into row chunks which are shared by all columns. Columns
+remain lazy dask arrays until their memory is required, for example when a
+pointer is passed to the libcbm library, at which point the column is
+computed and stored as a numpy array. Computed columns are mutable and are
+operated on eagerly, while lazy columns are immutable and operations on them
+build dask graphs which are evaluated partition by partition.
+
+Since the libcbm compute functions require contiguous memory, getting the
+numpy values of, or a pointer to, a column computes the entire column, and
+the dataframe is not out-of-core from then on.  Simulations of inventories
+larger than memory should instead be run one partition at a time, see
+:py:meth:`DaskDataFrameBackend.get_partition` and
+:py:func:`libcbm.model.cbm.cbm_simulator.simulate_parallel`.
+"""
+
+from __future__ import annotations
+import re
+import builtins
 from typing import Any
 from typing import Union
 import ctypes
 import numpy as np
 import pandas as pd
+import numexpr
+import dask
+from dask import array as da
 from libcbm.storage.dataframe import DataFrame
 from libcbm.storage.series import Series
 from libcbm.storage.backends import BackendType
-from dask import array as da
+from libcbm.storage.backends import numpy_backend
+
+DEFAULT_PARTITION_SIZE = 1_000_000
+"""the default maximum number of rows in each partition"""
+
+ArrayType = Union[np.ndarray, da.Array]
+
+
+def _get_chunks(n_rows: int, partition_size: int = None) -> tuple[int, ...]:
+    if partition_size is None:
+        partition_size = DEFAULT_PARTITION_SIZE
+    return da.core.normalize_chunks(partition_size, (n_rows,))[0]
+
+
+def _to_dask(data: ArrayType, chunks: tuple[int, ...]) -> da.Array:
+    """Get a lazy array for the specified data.  Numpy arrays are copied so
+    that in-place modification of the numpy array does not alter the result.
+    """
+    if isinstance(data, da.Array):
+        if data.chunks[0] != chunks:
+            return data.rechunk((chunks,))
+        return data
+    return da.from_array(np.array(data), chunks=(chunks,))
+
+
+def _to_numpy(data: ArrayType) -> np.ndarray:
+    """Compute the specified data as a C contiguous numpy array which does
+    not share memory with any input of a dask graph.
+    """
+    if isinstance(data, np.ndarray):
+        return data
+    result = data.compute()
+    if (
+        len(data.chunks[0]) <= 1
+        or result.base is not None
+        or not result.flags["C_CONTIGUOUS"]
+    ):
+        result = np.array(result)
+    return result
+
+
+def _map_block(block: np.ndarray, arg: dict) -> np.ndarray:
+    return numpy_backend._map(block, arg)
+
+
+def _map(data: ArrayType, arg: dict) -> ArrayType:
+    if data.shape[0] == 0:
+        if len(arg) > 0:
+            return data.astype(numpy_backend._get_map_value_type(arg))
+        else:
+            return data.copy()
+    elif len(arg) == 0:
+        raise ValueError("empty dictionary provided")
+    if isinstance(data, np.ndarray):
+        return numpy_backend._map(data, arg)
+    # check the keys up front, rather than when the result is computed
+    unique_values = da.unique(data).compute()
+    if any(v not in arg for v in unique_values):
+        raise KeyError(
+            "values in array not found as keys in specified dictionary"
+        )
+    return da.map_blocks(
+        _map_block,
+        data,
+        arg,
+        dtype=np.dtype(numpy_backend._get_map_value_type(arg)),
+    )
+
+
+def _as_object_block(block: np.ndarray, type_name: str) -> np.ndarray:
+    return block.astype(type_name).astype("object")
+
+
+def _as_type(data: ArrayType, type_name: str) -> ArrayType:
+    if isinstance(data, np.ndarray):
+        return data.astype(type_name)
+    dtype = np.dtype(type_name)
+    if dtype.kind in "US" and dtype.itemsize == 0:
+        # the length of the strings is not known until computed
+        return da.map_blocks(
+            _as_object_block, data, type_name, dtype=np.dtype("object")
+        )
+    return data.astype(dtype)
+
+
+def _evaluate_block(*blocks: np.ndarray, names: list, expression: str):
+    return numexpr.evaluate(expression, dict(zip(names, blocks)))
 
 
 class DaskDataFrameBackend(DataFrame):
-    def __init__(self, data: dict[str, da.Array]):
-        self._data = data
+    def __init__(
+        self,
+        data: dict[str, ArrayType],
+        chunks: tuple[int, ...] = None,
+        n_rows: int = None,
+    ) -> None:
+        """Initialize a DaskDataFrameBackend
+
+        Args:
+            data (dict[str, ArrayType]): the columns of the dataframe, as
+                numpy or dask arrays of equal length.
+            chunks (tuple[int, ...], optional): the number of rows in each
+                partition. If unspecified the chunks of the first dask
+                column are used, or if there are none, partitions of
+                :py:data:`DEFAULT_PARTITION_SIZE` rows. Defaults to None.
+            n_rows (int, optional): the number of rows, used only if data
+                has no columns. Defaults to None.
+        """
+        for k, v in data.items():
+            if v.ndim != 1:
+                raise ValueError(f"specified array '{k}' has ndim {v.ndim}")
+            if n_rows is None:
+                n_rows = v.shape[0]
+            elif n_rows != v.shape[0]:
+                raise ValueError("uneven array lengths")
+        if n_rows is None:
+            n_rows = 0
+        if chunks is None:
+            dask_chunks = [
+                v.chunks[0] for v in data.values() if isinstance(v, da.Array)
+            ]
+            chunks = dask_chunks[0] if dask_chunks else _get_chunks(n_rows)
+        self._chunks: tuple[int, ...] = tuple(chunks)
+        self._data: dict[str, ArrayType] = {
+            k: (_to_dask(v, self._chunks) if isinstance(v, da.Array) else v)
+            for k, v in data.items()
+        }
+        self._n_rows = n_rows
+        # when set, each column is a view of a column of this matrix
+        self._matrix: np.ndarray = None
+
+    def _column(self, col_name: str) -> da.Array:
+        return _to_dask(self._data[col_name], self._chunks)
+
+    def _materialize(self, col_name: str) -> np.ndarray:
+        """Compute the specified column, and store it as a C contiguous
+        numpy array
+        """
+        data = self._data[col_name]
+        if isinstance(data, np.ndarray) and data.flags["C_CONTIGUOUS"]:
+            return data
+        self._set_column(col_name, np.ascontiguousarray(_to_numpy(data)))
+        return self._data[col_name]
+
+    def _set_column(self, col_name: str, data: ArrayType) -> None:
+        self._matrix = None
+        if isinstance(data, da.Array):
+            data = _to_dask(data, self._chunks)
+        self._data[col_name] = data
+
+    def _take_rows(self, row_idx: np.ndarray) -> DaskDataFrameBackend:
+        return DaskDataFrameBackend(
+            {col: data[row_idx] for col, data in self._data.items()},
+            n_rows=row_idx.shape[0],
+        )
 
     def __getitem__(self, col_name: str) -> Series:
-        pass
+        return DaskSeriesBackend(col_name, parent_df=self)
 
-    def filter(self, arg: Series) -> "DataFrame":
-        pass
+    def filter(self, arg: Series) -> DataFrame:
+        return self._take_rows(np.flatnonzero(arg.to_numpy()))
 
-    def take(self, indices: Series) -> "DataFrame":
-        pass
+    def take(self, indices: Series) -> DataFrame:
+        row_idx = indices.to_numpy()
+        if row_idx.size and (
+            row_idx.max() >= self._n_rows or row_idx.min() < -self._n_rows
+        ):
+            raise IndexError(
+                f"index out of bounds for DataFrame of {self._n_rows} rows"
+            )
+        return self._take_rows(row_idx)
 
     def at(self, index: int) -> dict:
-        pass
+        values = dask.compute(*[data[index] for data in self._data.values()])
+        return dict(zip(self._data.keys(), values))
 
     @property
     def n_rows(self) -> int:
-        pass
+        return self._n_rows
 
     @property
     def n_cols(self) -> int:
-        pass
+        return len(self._data)
 
     @property
     def columns(self) -> list[str]:
-        pass
+        return list(self._data.keys())
 
     @property
     def backend_type(self) -> BackendType:
         return BackendType.dask
 
-    def copy(self) -> "DataFrame":
-        pass
+    @property
+    def chunks(self) -> tuple[int, ...]:
+        """the number of rows in each partition"""
+        return self._chunks
 
-    def multiply(self, series: Series) -> "DataFrame":
-        pass
+    @property
+    def n_partitions(self) -> int:
+        """the number of partitions"""
+        return len(self._chunks)
+
+    def get_partition(self, index: int) -> DataFrame:
+        """Compute the rows of the specified partition as a numpy backed
+        dataframe. Only the specified partition of each lazy column is
+        computed.
+
+        Args:
+            index (int): the partition index
+
+        Returns:
+            DataFrame: a numpy backend DataFrame of the partition's rows
+        """
+        start = int(np.sum(self._chunks[:index], dtype="int64"))
+        stop = start + self._chunks[index]
+        values = dask.compute(
+            *[data[start:stop] for data in self._data.values()]
+        )
+        return numpy_backend.NumpyDataFrameFrameBackend(
+            {
+                col: np.array(value)
+                for col, value in zip(self._data.keys(), values)
+            }
+        )
+
+    def copy(self) -> DataFrame:
+        return DaskDataFrameBackend(
+            {
+                col: (data.copy() if isinstance(data, np.ndarray) else data)
+                for col, data in self._data.items()
+            },
+            chunks=self._chunks,
+            n_rows=self._n_rows,
+        )
+
+    def multiply(self, series: Series) -> DataFrame:
+        rh = DaskSeriesBackend._get_operand(series)
+        return DaskDataFrameBackend(
+            {col: data * rh for col, data in self._data.items()},
+            chunks=self._chunks,
+            n_rows=self._n_rows,
+        )
 
     def add_column(self, series: Series, index: int) -> None:
-        pass
+        if series.name in self._data:
+            raise ValueError(
+                f"{series.name} already present in this Dataframe"
+            )
+        insert_data = DaskSeriesBackend._get_operand(series)
+        if insert_data.shape[0] != self._n_rows:
+            raise ValueError(
+                "specified series does not have the same length as the "
+                "number of rows in this DataFrame"
+            )
+        columns = self.columns
+        columns.insert(index, series.name)
+        self._set_column(series.name, insert_data)
+        self._data = {col: self._data[col] for col in columns}
 
     def to_numpy(self, make_c_contiguous=True) -> np.ndarray:
-        pass
+        """Compute all columns as a single matrix, which is stored as this
+        dataframe's memory, so that changes to the returned matrix are
+        reflected in this dataframe.
+
+        Raises:
+            ValueError: the columns are not of a uniform type
+
+        Returns:
+            np.ndarray: the C contiguous matrix of column values
+        """
+        if self._matrix is not None:
+            return self._matrix
+        if len(set(data.dtype for data in self._data.values())) > 1:
+            raise ValueError("to_numpy not supported for non-uniform matrix")
+        columns = self.columns
+        matrix = np.column_stack(
+            dask.compute(*[self._data[col] for col in columns])
+        )
+        if not matrix.flags["C_CONTIGUOUS"]:
+            matrix = np.ascontiguousarray(matrix)
+        self._data = {col: matrix[:, i] for i, col in enumerate(columns)}
+        self._matrix = matrix
+        return matrix
 
     def to_pandas(self) -> pd.DataFrame:
-        pass
+        values = dask.compute(*self._data.values())
+        return pd.DataFrame(
+            {col: value for col, value in zip(self._data.keys(), values)}
+        )
 
     def zero(self):
-        pass
-
-    def map(self, arg: dict) -> "DataFrame":
-        pass
+        for col, data in self._data.items():
+            if isinstance(data, np.ndarray):
+                data[:] = 0
+            else:
+                self._data[col] = da.zeros_like(data)
+
+    def map(self, arg: dict) -> DataFrame:
+        return DaskDataFrameBackend(
+            {col: _map(data, arg) for col, data in self._data.items()},
+            chunks=self._chunks,
+            n_rows=self._n_rows,
+        )
 
     def evaluate_filter(self, expression: str) -> Series:
-        pass
-
-    def sort_values(self, by: str, ascending: bool = True) -> "DataFrame":
-        pass
+        names = [
+            name
+            for name in dict.fromkeys(
+                re.findall(r"[A-Za-z_][A-Za-z0-9_]*", expression)
+            )
+            if name in self._data
+        ]
+        with np.errstate(all="ignore"):
+            dtype = numexpr.evaluate(
+                expression,
+                {name: np.ones(1, self._data[name].dtype) for name in names},
+            ).dtype
+        return DaskSeriesBackend(
+            None,
+            da.map_blocks(
+                _evaluate_block,
+                *[self._column(name) for name in names],
+                names=names,
+                expression=expression,
+                dtype=dtype,
+            ),
+        )
+
+    def sort_values(self, by: str, ascending: bool = True) -> DataFrame:
+        index_array = np.argsort(_to_numpy(self._data[by]), kind="mergesort")
+        if not ascending:
+            index_array = index_array[::-1]
+        return self._take_rows(index_array)
 
 
 class DaskSeriesBackend(Series):
-    def __init__(self, name: str, data: da.Array):
+    """
+    Series is a wrapper for one of several underlying storage types which
+    presents a limited interface for internal usage by libcbm.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        data: ArrayType = None,
+        parent_df: DaskDataFrameBackend = None,
+    ):
+        if not ((data is None) ^ (parent_df is None)):
+            raise ValueError("one of data, or parent_df must be specified")
         self._name = name
         self._data = data
+        self._parent_df = parent_df
+
+    def _get_data(self) -> ArrayType:
+        if self._parent_df is not None:
+            return self._parent_df._data[self._name]
+        return self._data
+
+    def _set_data(self, data: ArrayType) -> None:
+        if self._parent_df is not None:
+            self._parent_df._set_column(self._name, data)
+        else:
+            self._data = data
+
+    def _get_dask(self) -> da.Array:
+        if self._parent_df is not None:
+            return self._parent_df._column(self._name)
+        return _to_dask(self._data, _get_chunks(self._data.shape[0]))
+
+    def _new(self, data: ArrayType) -> DaskSeriesBackend:
+        return DaskSeriesBackend(self._name, data)
+
+    @staticmethod
+    def _get_operand(
+        op: Union[int, float, "Series"],
+    ) -> Union[int, float, np.ndarray, da.Array]:
+        if isinstance(op, DaskSeriesBackend):
+            return op._get_data()
+        elif isinstance(op, Series):
+            return op.to_numpy()
+        return op
+
+    def _operate(self, func, other: Union[int, float, "Series"]) -> Series:
+        # computed numpy data is mutable, and so operations on it are
+        # evaluated eagerly rather than deferred
+        data = self._get_data()
+        operand = self._get_operand(other)
+        if isinstance(data, da.Array) or isinstance(operand, da.Array):
+            data = self._get_dask()
+            if isinstance(operand, np.ndarray) and operand.ndim > 0:
+                operand = _to_dask(operand, data.chunks[0])
+        return self._new(func(data, operand))
 
-    @property  # pragma: no cover
+    @property
     def name(self) -> str:
         return self._name
 
-    @name.setter  # pragma: no cover
-    def name(self, value: str) -> str:
-        pass
+    @name.setter
+    def name(self, value) -> str:
+        self._name = value
 
-    def copy(self) -> "Series":
-        return DaskSeriesBackend(self._name, self._data.copy())
+    def copy(self) -> Series:
+        data = self._get_data()
+        if isinstance(data, np.ndarray):
+            data = data.copy()
+        return self._new(data)
 
     def filter(self, arg: "Series") -> "Series":
-        idx = da.flatnonzero(arg.data)
-        return DaskSeriesBackend(self._name, da.take(self._data, idx))
+        return self._new(self._get_data()[np.flatnonzero(arg.to_numpy())])
 
     def take(self, indices: "Series") -> "Series":
-        return DaskSeriesBackend(self._name, da.take(self._data, indices.data))
+        return self._new(self._get_data()[indices.to_numpy()])
+
+    def is_null(self) -> "Series":
+        data = self._get_data()
+        if isinstance(data, np.ndarray):
+            return self._new(pd.isnull(data))
+        return self._new(da.map_blocks(pd.isnull, data, dtype="bool"))
 
     def as_type(self, type_name: str) -> "Series":
-        return self._data.astype(type_name)
+        return self._new(_as_type(self._get_data(), type_name))
 
     def assign(
         self,
         value: Union["Series", Any],
         indices: "Series" = None,
-        allow_type_change=False,
     ):
-        pass
+        data = self._get_data()
+        if isinstance(value, Series):
+            assignment_value = self._get_operand(
+                value.as_type(str(data.dtype))
+            )
+        else:
+            assignment_value = np.array(value, dtype=data.dtype)
+
+        if indices is not None:
+            _idx = indices.to_numpy()
+            if _idx.size == 0:
+                return
+        else:
+            _idx = slice(None)
+
+        if isinstance(data, np.ndarray):
+            data[_idx] = _to_numpy(assignment_value)
+        elif indices is None and assignment_value.ndim == 0:
+            self._set_data(da.full_like(data, assignment_value))
+        else:
+            data = data.copy()
+            data[_idx] = assignment_value
+            self._set_data(data)
 
     def map(self, arg: dict) -> "Series":
-        pass
+        return self._new(_map(self._get_data(), arg))
 
     def at(self, idx: int) -> Any:
-        pass
+        """Gets the value at the specified sequential index"""
+        return dask.compute(self._get_data()[idx])[0]
 
     def any(self) -> bool:
-        pass
+        """
+        return True if at least one value in this series is
+        non-zero
+        """
+        return bool(dask.compute(self._get_data().any())[0])
 
     def all(self) -> bool:
-        pass
+        """
+        return True if all values in this series are non-zero
+        """
+        return bool(dask.compute(self._get_data().all())[0])
+
+    def indices_nonzero(self) -> "Series":
+        """Get the indices of values that are non-zero in this series"""
+        return self._new(np.flatnonzero(_to_numpy(self._get_data())))
 
     def unique(self) -> "Series":
-        pass
+        return self._new(np.unique(_to_numpy(self._get_data())))
 
     def to_numpy(self) -> np.ndarray:
-        pass
+        """Get the values of this series as a numpy array.  The series is
+        computed if it is not already, and the returned array is this
+        series' memory.
+        """
+        if self._parent_df is not None:
+            return self._parent_df._materialize(self._name)
+        if not isinstance(self._data, np.ndarray):
+            self._data = _to_numpy(self._data)
+        return self._data
 
     def to_list(self) -> list:
-        pass
+        return dask.compute(self._get_data())[0].tolist()
 
     def to_numpy_ptr(self) -> ctypes.pointer:
-        pass
+        dtype = str(self._get_data().dtype)
+        if dtype == "int32":
+            ptr_type = ctypes.c_int32
+        elif dtype == "float64":
+            ptr_type = ctypes.c_double
+        else:
+            raise ValueError(f"series type not supported {dtype}")
+        return numpy_backend.get_numpy_pointer(self.to_numpy(), ptr_type)
 
-    @property  # pragma: no cover
-    def data(self) -> Union[np.ndarray, pd.Series, da.Array]:
-        pass
+    @property
+    def data(self) -> ArrayType:
+        return self._get_data()
 
     def sum(self) -> Union[int, float]:
-        pass
+        return dask.compute(self._get_data().sum())[0]
 
     def cumsum(self) -> "Series":
-        pass
+        return self._new(self._get_data().cumsum())
 
     def max(self) -> Union[int, float]:
-        pass
+        return dask.compute(self._get_data().max())[0]
 
     def min(self) -> Union[int, float]:
-        pass
+        return dask.compute(self._get_data().min())[0]
 
-    @property  # pragma: no cover
+    @property
     def length(self) -> int:
-        pass
+        return self._get_data().shape[0]
 
-    @property  # pragma: no cover
+    @property
     def backend_type(self) -> BackendType:
-        pass
+        return BackendType.dask
 
     def __mul__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a * b, other)
 
     def __rmul__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: b * a, other)
 
     def __truediv__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a / b, other)
 
     def __rtruediv__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: b / a, other)
 
     def __add__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a + b, other)
 
     def __radd__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: b + a, other)
 
     def __sub__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a - b, other)
 
     def __rsub__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: b - a, other)
 
     def __ge__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a >= b, other)
 
     def __gt__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a > b, other)
 
     def __le__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a <= b, other)
 
     def __lt__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a < b, other)
 
     def __eq__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a == b, other)
 
     def __ne__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a != b, other)
 
     def __and__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a & b, other)
 
     def __or__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: a | b, other)
 
     def __rand__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: b & a, other)
 
     def __ror__(self, other: Union[int, float, "Series"]) -> "Series":
-        pass
+        return self._operate(lambda a, b: b | a, other)
 
     def __invert__(self) -> "Series":
-        pass
+        return self._new(~self._get_data())
 
 
-def concat_series(series: list[DaskSeriesBackend]) -> DaskSeriesBackend:
-    return DaskSeriesBackend(
-        None, np.concatenate([s._get_data() for s in series])
+def _concat(arrays: list[ArrayType]) -> ArrayType:
+    if all(isinstance(a, np.ndarray) for a in arrays):
+        return np.concatenate(arrays)
+    return da.concatenate(
+        [_to_dask(a, _get_chunks(a.shape[0])) for a in arrays]
+    )
+
+
+def concat_data_frame(
+    dfs: list[DaskDataFrameBackend],
+) -> DaskDataFrameBackend:
+    cols = []
+    for df in dfs:
+        if not cols:
+            cols = list(df.columns)
+        elif cols != df.columns:
+            raise ValueError("cols do not match")
+    # the partitions of each dataframe are preserved
+    chunks = tuple(c for df in dfs for c in df.chunks if c > 0)
+    return DaskDataFrameBackend(
+        {col: da.concatenate([df._column(col) for df in dfs]) for col in cols},
+        chunks=chunks if chunks else None,
+        n_rows=builtins.sum(df.n_rows for df in dfs),
     )
 
 
+def reserve_data_frame(
+    df: DaskDataFrameBackend, n_rows: int
+) -> DaskDataFrameBackend:
+    # spare row capacity is not supported by this backend
+    return df
+
+
+def append_data_frame(
+    df: DaskDataFrameBackend, rows: DaskDataFrameBackend
+) -> DaskDataFrameBackend:
+    return concat_data_frame([df, rows])
+
+
+def concat_series(series: list[DaskSeriesBackend]) -> DaskSeriesBackend:
+    return DaskSeriesBackend(None, _concat([s._get_data() for s in series]))
+
+
 def logical_and(
     s1: DaskSeriesBackend, s2: DaskSeriesBackend
 ) -> DaskSeriesBackend:
-    return DaskSeriesBackend(
-        None, np.logical_and(s1._get_data(), s2._get_data())
-    )
+    return s1._operate(np.logical_and, s2)
 
 
 def logical_not(series: DaskSeriesBackend) -> DaskSeriesBackend:
@@ -230,23 +670,21 @@ def logical_not(series: DaskSeriesBackend) -> DaskSeriesBackend:
 def logical_or(
     s1: DaskSeriesBackend, s2: DaskSeriesBackend
 ) -> DaskSeriesBackend:
-    return DaskSeriesBackend(
-        None, np.logical_or(s1._get_data(), s2._get_data())
-    )
+    return s1._operate(np.logical_or, s2)
 
 
 def make_boolean_series(init: bool, size: int) -> DaskSeriesBackend:
     return DaskSeriesBackend(
-        None, np.full(shape=size, fill_value=init, dtype="bool")
+        None, da.full(size, init, dtype="bool", chunks=(_get_chunks(size),))
     )
 
 
 def is_null(series: DaskSeriesBackend) -> DaskSeriesBackend:
-    return DaskSeriesBackend(None, pd.isnull(series._get_data()))
+    return series.is_null()
 
 
 def indices_nonzero(series: DaskSeriesBackend) -> DaskSeriesBackend:
-    return DaskSeriesBackend(None, np.nonzero(series._get_data())[0])
+    return series.indices_nonzero()
 
 
 def numeric_dataframe(
@@ -254,23 +692,126 @@ def numeric_dataframe(
     nrows: int,
     init: float = 0.0,
 ) -> DaskDataFrameBackend:
-    pass
+    chunks = _get_chunks(nrows)
+    return DaskDataFrameBackend(
+        {
+            col: da.full(nrows, init, dtype="float64", chunks=(chunks,))
+            for col in cols
+        },
+        chunks=chunks,
+        n_rows=nrows,
+    )
 
 
 def from_series_list(
     series_list: list[DaskSeriesBackend],
 ) -> DaskDataFrameBackend:
-    pass
+    return DaskDataFrameBackend({s.name: s._get_data() for s in series_list})
 
 
 def from_series_dict(
     data: dict[str, DaskSeriesBackend],
-) -> DataFrame:
-    pass
+) -> DaskDataFrameBackend:
+    return DaskDataFrameBackend({k: v._get_data() for k, v in data.items()})
+
+
+def from_numpy(
+    data: dict[str, np.ndarray], partition_size: int = None
+) -> DaskDataFrameBackend:
+    """Create a lazy dataframe of the specified arrays, copying their
+    values.
+
+    Args:
+        data (dict[str, np.ndarray]): name array pairs
+        partition_size (int, optional): the maximum number of rows in
+            each partition. Defaults to :py:data:`DEFAULT_PARTITION_SIZE`.
+
+    Returns:
+        DaskDataFrameBackend: the dataframe
+    """
+    n_rows = next(iter(data.values())).shape[0] if data else 0
+    chunks = _get_chunks(n_rows, partition_size)
+    return DaskDataFrameBackend(
+        {k: _to_dask(v, chunks) for k, v in data.items()},
+        chunks=chunks,
+        n_rows=n_rows,
+    )
+
+
+def _partition_column(
+    df: pd.DataFrame, col: str, dtype: np.dtype
+) -> np.ndarray:
+    return df[col].to_numpy().astype(dtype)
+
+
+def from_delayed(
+    partitions: list[tuple[dask.delayed, int]],
+    dtypes: dict[str, np.dtype],
+) -> DaskDataFrameBackend:
+    """Create a lazy dataframe with one partition for each of the specified
+    delayed pandas dataframes.  Nothing is computed until the rows of a
+    partition are requested, and each partition is computed independently
+    of the others.
+
+    Args:
+        partitions (list[tuple[dask.delayed, int]]): pairs of a delayed
+            pandas dataframe and its number of rows
+        dtypes (dict[str, np.dtype]): the names and types of the columns.
+            The values of each partition are converted to these types.
+
+    Returns:
+        DaskDataFrameBackend: the dataframe
+    """
+    partitions = [(df, n_rows) for df, n_rows in partitions if n_rows > 0]
+    chunks = tuple(n_rows for _, n_rows in partitions)
+    get_column = dask.delayed(_partition_column, pure=True)
+    data = {
+        col: (
+            da.concatenate(
+                [
+                    da.from_delayed(
+                        get_column(df, col, dtype),
+                        shape=(n_rows,),
+                        dtype=dtype,
+                    )
+                    for df, n_rows in partitions
+                ]
+            )
+            if partitions
+            else np.empty(0, dtype=dtype)
+        )
+        for col, dtype in dtypes.items()
+    }
+    return DaskDataFrameBackend(
+        data,
+        chunks=chunks if chunks else None,
+        n_rows=builtins.sum(chunks),
+    )
+
+
+def series_from_numpy(
+    name: str, data: np.ndarray, partition_size: int = None
+) -> DaskSeriesBackend:
+    """Create a lazy series of the specified array, copying its values.
+
+    Args:
+        name (str): the series name
+        data (np.ndarray): the series values
+        partition_size (int, optional): the maximum number of elements in
+            each partition. Defaults to :py:data:`DEFAULT_PARTITION_SIZE`.
+
+    Returns:
+        DaskSeriesBackend: the series
+    """
+    return DaskSeriesBackend(
+        name, _to_dask(data, _get_chunks(data.shape[0], partition_size))
+    )
 
 
 def allocate(name: str, len: int, init: Any, dtype: str) -> DaskSeriesBackend:
-    pass
+    return DaskSeriesBackend(
+        name, da.full(len, init, dtype=dtype, chunks=(_get_chunks(len),))
+    )
 
 
 def range(
@@ -280,4 +821,5 @@ def range(
     step: int,
     dtype: str,
 ) -> Series:
-    pass
+    data = da.arange(start, stop, step, dtype=dtype)
+    return DaskSeriesBackend(name, data.rechunk((_get_chunks(data.shape[0]),)))
@@ -16,6 +16,77 @@ class StorageFormat(Enum):
     mixed_columns = 1
 
 
+_layout_conversions = {"row_major": 0, "mixed_columns": 0}
+
+
+def _count_layout_conversion(layout: str) -> None:
+    _layout_conversions[layout] += 1
+
+
+def get_layout_conversion_counts() -> dict[str, int]:
+    """Get the number of times the storage of a numpy backend dataframe has
+    been copied into a different layout since the last call to
+    :py:func:`reset_layout_conversion_counts`, by target layout:
+
+        * row_major: a uniform matrix which was not in C order, for example
+          one constructed from Fortran ordered data, converted to C order
+          for access to the whole matrix with
+          :py:meth:`NumpyDataFrameFrameBackend.to_numpy`
+        * mixed_columns: a uniform matrix split into columns, when a column
+          of a different type is added
+
+    Columns of a uniform matrix are strided views of it, so accessing them
+    never changes the layout. Each conversion is a full copy of a table,
+    and so in a simulation the counts should not increase after the first
+    timestep.
+
+    Returns:
+        dict[str, int]: the number of conversions by target layout
+    """
+    return dict(_layout_conversions)
+
+
+def reset_layout_conversion_counts() -> None:
+    """Reset the counts returned by :py:func:`get_layout_conversion_counts`"""
+    for k in _layout_conversions:
+        _layout_conversions[k] = 0
+
+
+# the factor by which the row capacity of a dataframe grows when rows are
+# appended beyond its spare capacity
+_ROW_GROWTH_FACTOR = 1.5
+
+
+class _RowBuffer:
+    """Storage with spare capacity for rows appended to a dataframe. The
+    dataframe holds views of the first `n_used` rows of the storage. Only
+    the dataframe whose length is `n_used` may append into the spare rows,
+    since other dataframes sharing this storage are views of fewer rows.
+    """
+
+    def __init__(
+        self,
+        data: Union[np.ndarray, dict[str, np.ndarray]],
+        columns: list[str],
+        capacity: int,
+        n_used: int,
+    ):
+        self.data = data
+        self.columns = columns
+        self.capacity = capacity
+        self.n_used = n_used
+
+
+def _is_prefix_view(arr: np.ndarray, buffer_arr: np.ndarray) -> bool:
+    return (
+        arr.__array_interface__["data"][0]
+        == buffer_arr.__array_interface__["data"][0]
+        and arr.dtype == buffer_arr.dtype
+        and arr.strides == buffer_arr.strides
+        and arr.shape[1:] == buffer_arr.shape[1:]
+    )
+
+
 class _numepxr_local_dict_wrap:
     def __init__(self, col_idx: dict[str, int], arr: np.ndarray):
         self._arr = arr
@@ -118,7 +189,26 @@ class NumpyDataFrameFrameBackend(DataFrame):
         else:
             self._from_matrix(cols, data)
 
+    @classmethod
+    def _from_row_buffer(
+        cls, buffer: _RowBuffer
+    ) -> NumpyDataFrameFrameBackend:
+        df = cls.__new__(cls)
+        n_rows = buffer.n_used
+        if isinstance(buffer.data, dict):
+            df._storage_format = StorageFormat.mixed_columns
+            df._data_matrix = None
+            df._data_cols = {
+                col: arr[:n_rows] for col, arr in buffer.data.items()
+            }
+            df._initialize(n_rows, list(buffer.columns))
+        else:
+            df._from_matrix(list(buffer.columns), buffer.data[:n_rows])
+        df._row_buffer = buffer
+        return df
+
     def _initialize(self, n_rows: int, columns: list[str]):
+        self._row_buffer: _RowBuffer = None
         self._columns = columns
         self._col_idx = {col: i for i, col in enumerate(self._columns)}
         self._n_rows: int = n_rows
@@ -208,7 +298,7 @@ class NumpyDataFrameFrameBackend(DataFrame):
     def copy(self) -> DataFrame:
         if self._storage_format == StorageFormat.uniform_matrix:
             return NumpyDataFrameFrameBackend(
-                self._data_matrix.copy(), self.columns
+                self._data_matrix.copy(order="K"), self.columns
             )
         else:
             return NumpyDataFrameFrameBackend(
@@ -253,6 +343,7 @@ class NumpyDataFrameFrameBackend(DataFrame):
                     self._data_matrix, index, insert_data, axis=1
                 )
             else:
+                _count_layout_conversion("mixed_columns")
                 self._storage_format = StorageFormat.mixed_columns
                 self._data_cols = {
                     col: np.ascontiguousarray(self._data_matrix[:, idx])
@@ -268,11 +359,20 @@ class NumpyDataFrameFrameBackend(DataFrame):
         self._col_idx = {col: i for i, col in enumerate(self._columns)}
         self._n_cols: int = len(self._columns)
 
+    def _set_row_major_layout(self) -> None:
+        """Copy the uniform matrix storage into row major order, if it is
+        not already. Columns of the matrix are strided views, so the layout
+        is otherwise never changed.
+        """
+        if not self._data_matrix.flags["C_CONTIGUOUS"]:
+            _count_layout_conversion("row_major")
+            self._data_matrix = np.ascontiguousarray(self._data_matrix)
+
     def to_numpy(self, make_c_contiguous=True) -> np.ndarray:
         if self._storage_format != StorageFormat.uniform_matrix:
             raise ValueError("to_numpy not supported for non-uniform matrix")
-        if make_c_contiguous and not self._data_matrix.flags["C_CONTIGUOUS"]:
-            self._data_matrix = np.ascontiguousarray(self._data_matrix)
+        if make_c_contiguous:
+            self._set_row_major_layout()
         return self._data_matrix
 
     def to_pandas(self) -> pd.DataFrame:
@@ -368,30 +468,15 @@ class NumpySeriesBackend(Series):
             else:
                 return str(self._parent_df._data_cols[self.name].dtype)
 
-    def _get_data(self, reference_required=False) -> np.ndarray:
+    def _get_data(self) -> np.ndarray:
         if self._data is not None:
             return self._data
         else:
             if self._parent_df._storage_format == StorageFormat.uniform_matrix:
-                if reference_required:
-                    self._parent_df._data_cols = {
-                        col: np.ascontiguousarray(
-                            self._parent_df._data_matrix[
-                                :,
-                                self._parent_df._col_idx[col],
-                            ]
-                        )
-                        for col in self._parent_df.columns
-                    }
-                    self._parent_df._data_matrix = None
-                    self._parent_df._storage_format = (
-                        StorageFormat.mixed_columns
-                    )
-                    return self._parent_df._data_cols[self.name]
-                else:
-                    return self._parent_df._data_matrix[
-                        :, self._parent_df._col_idx[self.name]
-                    ]
+                # a strided view of the column, which shares the matrix
+                # storage without changing its layout
+                column = self._parent_df._col_idx[self.name]
+                return self._parent_df._data_matrix[:, column]
             else:
                 return self._parent_df._data_cols[self.name]
 
@@ -502,7 +587,7 @@ class NumpySeriesBackend(Series):
         return NumpySeriesBackend(self._name, np.unique(self._get_data()))
 
     def to_numpy(self) -> np.ndarray:
-        return self._get_data(reference_required=True)
+        return self._get_data()
 
     def to_list(self) -> list:
         return self._get_data().tolist()
@@ -515,9 +600,12 @@ class NumpySeriesBackend(Series):
             ptr_type = ctypes.c_double
         else:
             raise ValueError(f"series type not supported {dtype}")
-        return get_numpy_pointer(
-            self._get_data(reference_required=True), ptr_type
-        )
+        data = self._get_data()
+        if not data.flags["C_CONTIGUOUS"]:
+            # a column of a uniform matrix is strided, and the layout of the
+            # matrix is not changed for it, so a copy is used
+            data = np.ascontiguousarray(data)
+        return get_numpy_pointer(data, ptr_type)
 
     @property
     def data(self) -> np.ndarray:
@@ -656,7 +744,7 @@ def concat_data_frame(
     ):
         # case 1, all incoming df's are uniform_matrix
         matrix_data = np.concatenate(
-            [df._data_matrix for df in dfs], axis=0, casting="no"
+            [df._data_matrix for df in dfs], axis=0
         )
         return NumpyDataFrameFrameBackend(matrix_data, cols)
     else:
@@ -669,11 +757,132 @@ def concat_data_frame(
             for df in dfs:
                 ser = df[col]
                 concat_list.append(ser.to_numpy())
-            new_data[col] = np.concatenate(concat_list, casting="no")
+            new_data[col] = np.concatenate(concat_list)
 
         return NumpyDataFrameFrameBackend(new_data)
 
 
+def _get_row_buffer(
+    df: NumpyDataFrameFrameBackend, n_rows: int
+) -> Union[_RowBuffer, None]:
+    """Get the row buffer holding the specified dataframe, if the dataframe
+    still views that buffer's storage, may append into its spare rows, and
+    the buffer has capacity for the specified number of rows.
+    """
+    buffer = df._row_buffer
+    if (
+        buffer is None
+        or buffer.n_used != df.n_rows
+        or buffer.capacity < n_rows
+        or buffer.columns != df.columns
+    ):
+        return None
+    if df._storage_format == StorageFormat.uniform_matrix:
+        if isinstance(buffer.data, dict) or not _is_prefix_view(
+            df._data_matrix, buffer.data
+        ):
+            return None
+    elif not isinstance(buffer.data, dict) or not all(
+        _is_prefix_view(df._data_cols[col], buffer.data[col])
+        for col in df.columns
+    ):
+        return None
+    return buffer
+
+
+def _allocate_row_buffer(
+    df: NumpyDataFrameFrameBackend,
+    capacity: int,
+    dtypes: Union[np.dtype, dict[str, np.dtype]] = None,
+) -> _RowBuffer:
+    """Copy the specified dataframe into new storage with the specified row
+    capacity, keeping the layout of the dataframe's storage. If specified,
+    dtypes is the dtype of the uniform matrix storage, or the dtypes of the
+    columns of mixed storage, and otherwise the dtypes are kept.
+    """
+    n_rows = df.n_rows
+    if df._storage_format == StorageFormat.uniform_matrix:
+        matrix = df._data_matrix
+        order = (
+            "F"
+            if matrix.flags["F_CONTIGUOUS"]
+            and not matrix.flags["C_CONTIGUOUS"]
+            else "C"
+        )
+        data = np.empty(
+            (capacity, matrix.shape[1]),
+            dtype=matrix.dtype if dtypes is None else dtypes,
+            order=order,
+        )
+        data[:n_rows] = matrix
+    else:
+        data = {}
+        for col in df.columns:
+            arr = df._data_cols[col]
+            data[col] = np.empty(
+                capacity, dtype=arr.dtype if dtypes is None else dtypes[col]
+            )
+            data[col][:n_rows] = arr
+    return _RowBuffer(data, df.columns, capacity, n_rows)
+
+
+def _get_append_dtypes(
+    df: NumpyDataFrameFrameBackend, rows: NumpyDataFrameFrameBackend
+) -> Union[np.dtype, dict[str, np.dtype]]:
+    """Get the dtypes of the storage of the specified dataframe with the
+    specified rows appended, promoted as by :py:func:`concat_data_frame`
+    """
+    if df._storage_format == StorageFormat.uniform_matrix:
+        return np.result_type(
+            df._data_matrix.dtype,
+            *[rows[col]._get_dtype() for col in rows.columns],
+        )
+    return {
+        col: np.result_type(df._data_cols[col].dtype, rows[col]._get_dtype())
+        for col in df.columns
+    }
+
+
+def reserve_data_frame(
+    df: NumpyDataFrameFrameBackend, n_rows: int
+) -> NumpyDataFrameFrameBackend:
+    if n_rows <= df.n_rows or _get_row_buffer(df, n_rows):
+        return df
+    return NumpyDataFrameFrameBackend._from_row_buffer(
+        _allocate_row_buffer(df, n_rows)
+    )
+
+
+def append_data_frame(
+    df: NumpyDataFrameFrameBackend, rows: NumpyDataFrameFrameBackend
+) -> NumpyDataFrameFrameBackend:
+    if df.columns != rows.columns:
+        raise ValueError("cols do not match")
+    start = df.n_rows
+    stop = start + rows.n_rows
+    dtypes = _get_append_dtypes(df, rows)
+    buffer = _get_row_buffer(df, stop)
+    is_promoted = buffer is not None and (
+        buffer.data.dtype != dtypes
+        if not isinstance(buffer.data, dict)
+        else any(buffer.data[col].dtype != dtypes[col] for col in df.columns)
+    )
+    if buffer is None or is_promoted:
+        buffer = _allocate_row_buffer(
+            df, max(stop, int(stop * _ROW_GROWTH_FACTOR)), dtypes
+        )
+    if isinstance(buffer.data, dict):
+        for col in buffer.columns:
+            np.copyto(buffer.data[col][start:stop], rows[col]._get_data())
+    elif rows._storage_format == StorageFormat.uniform_matrix:
+        np.copyto(buffer.data[start:stop], rows._data_matrix)
+    else:
+        for col, col_idx in df._col_idx.items():
+            np.copyto(buffer.data[start:stop, col_idx], rows._data_cols[col])
+    buffer.n_used = stop
+    return NumpyDataFrameFrameBackend._from_row_buffer(buffer)
+
+
 def concat_series(series: list[NumpySeriesBackend]) -> NumpySeriesBackend:
     return NumpySeriesBackend(
         None, np.concatenate([s._get_data() for s in series])
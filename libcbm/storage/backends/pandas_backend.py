@@ -375,6 +375,19 @@ def concat_data_frame(
     )
 
 
+def reserve_data_frame(
+    df: PandasDataFrameBackend, n_rows: int
+) -> PandasDataFrameBackend:
+    # spare row capacity is not supported by this backend
+    return df
+
+
+def append_data_frame(
+    df: PandasDataFrameBackend, rows: PandasDataFrameBackend
+) -> PandasDataFrameBackend:
+    return concat_data_frame([df, rows])
+
+
 def concat_series(series: list[PandasSeriesBackend]) -> PandasSeriesBackend:
     return PandasSeriesBackend(
         None, pd.concat([s._get_series() for s in series], ignore_index=True)
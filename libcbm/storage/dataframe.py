@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 
 from typing import Union
+from typing import TYPE_CHECKING
 from libcbm.storage.backends import BackendType
 from libcbm.storage import backends
 from libcbm.storage.series import Series
@@ -10,6 +11,9 @@ from libcbm.storage.series import SeriesDef
 from abc import ABC
 from abc import abstractmethod
 
+if TYPE_CHECKING:
+    import pyarrow
+
 
 class DataFrame(ABC):
     """
@@ -184,6 +188,74 @@ def concat_data_frame(
     return backends.get_backend(backend_type).concat_data_frame(uniform_dfs)
 
 
+def reserve_data_frame(df: DataFrame, n_rows: int) -> DataFrame:
+    """Get a dataframe with the same values as the specified dataframe,
+    with spare capacity so that appending rows with
+    :py:func:`append_data_frame` does not reallocate its storage until it
+    has more than the specified number of rows.
+
+    Backends which do not support spare capacity return the specified
+    dataframe.
+
+    Args:
+        df (DataFrame): the dataframe to copy
+        n_rows (int): the number of rows to reserve storage for
+
+    Returns:
+        DataFrame: a dataframe with the values of df
+    """
+    return backends.get_backend(df.backend_type).reserve_data_frame(df, n_rows)
+
+
+def append_data_frame(df: DataFrame, rows: DataFrame) -> DataFrame:
+    """Append rows to a dataframe.
+
+    Where the backend supports it, the rows are copied into spare storage
+    following the rows of the specified dataframe, and otherwise the
+    storage grows geometrically, so that repeatedly appending to the
+    returned dataframe copies the existing rows an amortized constant
+    number of times. Column types are promoted as by
+    :py:func:`concat_data_frame`.
+
+    When the rows are copied into spare storage, the specified dataframe
+    remains valid as a fixed-length view of the leading rows of the
+    result, so that changes to its values are visible in the result and
+    vice versa. Appending to it again copies its rows rather than
+    overwriting the rows of the result. Otherwise the result does not
+    share memory with the specified dataframe.
+
+    Backends which do not support spare capacity concatenate the
+    dataframes with :py:func:`concat_data_frame`.
+
+    Args:
+        df (DataFrame): the dataframe to append to
+        rows (DataFrame): the rows to append, with the same columns as df.
+            If the backend type differs from df the rows are converted.
+
+    Returns:
+        DataFrame: a dataframe with the rows of df followed by the
+            specified rows
+    """
+    rows = convert_dataframe_backend(rows, df.backend_type)
+    return backends.get_backend(df.backend_type).append_data_frame(df, rows)
+
+
+def assign_rows(src: DataFrame, dst: DataFrame, indices: Series) -> None:
+    """Assign the rows of a dataframe to the specified rows of another
+    dataframe, for example to scatter the results computed for a subset of
+    rows gathered with :py:func:`DataFrame.take` back to the full set.
+
+    Args:
+        src (DataFrame): the rows to assign. Each of its columns must exist
+            in dst.
+        dst (DataFrame): the dataframe assigned to
+        indices (Series): the row indices of dst to assign, one per row of
+            src. If None, all rows of dst are assigned.
+    """
+    for col in src.columns:
+        dst[col].assign(src[col], indices)
+
+
 def concat_series(
     series: list[Series], backend_type: BackendType = None
 ) -> Series:
@@ -405,6 +477,21 @@ def from_numpy(data: dict[str, np.ndarray]) -> DataFrame:
     return numpy_backend.NumpyDataFrameFrameBackend(data)
 
 
+def from_arrow(table: pyarrow.Table) -> DataFrame:
+    """Create a DataFrame object which shares the memory of the specified
+    arrow table where possible.  Requires the optional `pyarrow` package.
+
+    Args:
+        table (pyarrow.Table): an arrow table
+
+    Returns:
+        DataFrame: the DataFrame instance
+    """
+    from libcbm.storage.backends import arrow_backend
+
+    return arrow_backend.from_arrow(table)
+
+
 def convert_series_backend(
     series: Series, backend_type: BackendType
 ) -> Series:
@@ -437,6 +524,14 @@ def convert_series_backend(
         return pandas_backend.PandasSeriesBackend(
             series.name, pd.Series(series.to_numpy())
         )
+    elif backend_type == BackendType.dask:
+        from libcbm.storage.backends import dask_backend
+
+        return dask_backend.series_from_numpy(series.name, series.to_numpy())
+    elif backend_type == BackendType.arrow:
+        from libcbm.storage.backends import arrow_backend
+
+        return arrow_backend.ArrowSeriesBackend(series.name, series.to_numpy())
     else:
         raise NotImplementedError()
 
@@ -474,6 +569,18 @@ def convert_dataframe_backend(
         return pandas_backend.PandasDataFrameBackend(
             pd.DataFrame({col: df[col].to_numpy() for col in df.columns})
         )
+    elif backend_type == BackendType.dask:
+        from libcbm.storage.backends import dask_backend
+
+        return dask_backend.from_numpy(
+            {col: df[col].to_numpy() for col in df.columns}
+        )
+    elif backend_type == BackendType.arrow:
+        from libcbm.storage.backends import arrow_backend
+
+        return arrow_backend.ArrowDataFrameBackend(
+            {col: df[col].to_numpy() for col in df.columns}
+        )
     else:
         raise NotImplementedError()
 
@@ -0,0 +1,252 @@
+from __future__ import annotations
+import os
+from typing import Union
+from typing import TYPE_CHECKING
+from abc import ABC
+from abc import abstractmethod
+from libcbm.storage import dataframe
+from libcbm.storage.dataframe import DataFrame
+from libcbm.storage.backends import BackendType
+
+if TYPE_CHECKING:
+    import pyarrow
+
+
+def _concat_promote(tables: list[pyarrow.Table]) -> pyarrow.Table:
+    """Concatenate arrow tables, promoting differing column types to a
+    common type
+    """
+    import pyarrow
+
+    try:
+        return pyarrow.concat_tables(tables, promote_options="permissive")
+    except TypeError:
+        # pyarrow < 14 supports only null type promotion, so unify the
+        # schemas via pandas
+        import pandas as pd
+
+        return pyarrow.Table.from_pandas(
+            pd.concat([t.to_pandas() for t in tables], ignore_index=True),
+            preserve_index=False,
+        )
+
+
+class OutputSink(ABC):
+    """
+    Destination for timestep-by-timestep simulation results.  Each call to
+    :py:func:`append` stores the rows of one named table for one timestep,
+    and :py:func:`get` returns all rows stored so far for a named table.
+    """
+
+    @abstractmethod  # pragma: no cover
+    def append(self, name: str, timestep: int, df: DataFrame) -> None:
+        """Store the rows of the specified dataframe for the named table
+
+        Args:
+            name (str): the table name, for example "pools" or "flux"
+            timestep (int): the timestep associated with the rows, or None
+                if the rows span several timesteps
+            df (DataFrame): the rows to store.  The sink takes ownership of
+                the dataframe, and callers should not modify it afterwards.
+        """
+        pass
+
+    @abstractmethod  # pragma: no cover
+    def get(self, name: str) -> Union[DataFrame, None]:
+        """Get all rows stored for the named table, in the order they were
+        appended.
+
+        Args:
+            name (str): the table name
+
+        Returns:
+            Union[DataFrame, None]: the stored rows, or None if nothing has
+                been appended for the named table.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by this sink"""
+        pass
+
+
+class InMemorySink(OutputSink):
+    """
+    Stores appended results in memory as a list of per-timestep chunks.  The
+    chunks of a table are concatenated only when the table is requested via
+    :py:func:`get`, so appending T timesteps costs O(T) rather than re-copying
+    the accumulated result at every timestep.
+
+    Args:
+        backend_type (BackendType, optional): the storage backend of the
+            stored results. If unspecified, the backend type of the appended
+            dataframes is used. Defaults to None.
+    """
+
+    def __init__(self, backend_type: BackendType = None):
+        self._backend_type = backend_type
+        self._chunks: dict[str, list[DataFrame]] = {}
+
+    def append(self, name: str, timestep: int, df: DataFrame) -> None:
+        if self._backend_type is not None:
+            df = dataframe.convert_dataframe_backend(df, self._backend_type)
+        if name not in self._chunks:
+            self._chunks[name] = []
+        self._chunks[name].append(df)
+
+    def get(self, name: str) -> Union[DataFrame, None]:
+        chunks = self._chunks.get(name)
+        if not chunks:
+            return None
+        if len(chunks) > 1:
+            # collapse the chunks so that repeated calls do not repeat the
+            # concatenation
+            chunks[:] = [
+                dataframe.concat_data_frame(chunks, self._backend_type)
+            ]
+        return chunks[0]
+
+
+class ParquetSink(OutputSink):
+    """
+    Writes appended results to parquet files as they are produced, so that
+    the memory used for results is bounded by a single timestep.  Requires
+    the optional `pyarrow` package.
+
+    Results are not held in memory while they are appended.  However
+    :py:func:`get` reads all of the written files for the requested table
+    and returns them as a single pandas backed DataFrame, so for large
+    results the files should instead be read directly, for example with
+    `pyarrow.dataset`, in manageable pieces.
+
+    Args:
+        path (str): directory in which the parquet files are written. It is
+            created if it does not exist.
+        partition_by (str, optional): if set to "timestep", each appended
+            timestep is written to its own file in a sub directory named
+            for the table.  If set to None, each table is written to a
+            single file with one row group per appended timestep. If the
+            column types of a later timestep differ, the file is rewritten
+            with the promoted types. In this case the file is permanently
+            finalized when :py:func:`get` or :py:func:`close` is called,
+            and a later :py:func:`append` to that table raises a
+            ValueError. Defaults to "timestep".
+    """
+
+    def __init__(self, path: str, partition_by: Union[str, None] = "timestep"):
+        if partition_by not in ["timestep", None]:
+            raise ValueError(
+                f"unsupported partition_by value '{partition_by}', expected "
+                "'timestep' or None"
+            )
+        self._path = path
+        self._partition_by = partition_by
+        self._files: dict[str, list[str]] = {}
+        self._writers: dict = {}
+        self._finalized: set[str] = set()
+        os.makedirs(path, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        """get the output directory of this sink"""
+        return self._path
+
+    @property
+    def partition_by(self) -> Union[str, None]:
+        """get the partitioning scheme of this sink"""
+        return self._partition_by
+
+    def append(self, name: str, timestep: int, df: DataFrame) -> None:
+        from pyarrow import parquet
+        from libcbm.storage.backends import arrow_backend
+
+        # arrow backed dataframes are written without conversion
+        table = arrow_backend.to_arrow(df)
+        if self._partition_by == "timestep":
+            table_dir = os.path.join(self._path, name)
+            if name not in self._files:
+                os.makedirs(table_dir, exist_ok=True)
+                self._files[name] = []
+            file_path = os.path.join(
+                table_dir, f"{name}_{len(self._files[name]):06d}.parquet"
+            )
+            parquet.write_table(table, file_path)
+            self._files[name].append(file_path)
+        else:
+            if name in self._finalized:
+                raise ValueError(
+                    f"results for '{name}' have already been finalized, and "
+                    "cannot be appended to"
+                )
+            if name not in self._writers:
+                file_path = os.path.join(self._path, f"{name}.parquet")
+                self._writers[name] = parquet.ParquetWriter(
+                    file_path, table.schema
+                )
+                self._files[name] = [file_path]
+            writer = self._writers[name]
+            if not table.schema.equals(writer.schema):
+                schema = _concat_promote(
+                    [writer.schema.empty_table(), table]
+                ).schema
+                if not schema.equals(writer.schema):
+                    writer = self._rewrite(name, schema)
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+
+    def _rewrite(self, name: str, schema: pyarrow.Schema):
+        """Rewrite the single file of the named table with the specified
+        promoted schema, one row group at a time, and return a writer which
+        appends to the rewritten file.
+        """
+        from pyarrow import parquet
+
+        file_path = self._files[name][0]
+        temp_path = f"{file_path}.tmp"
+        self._writers.pop(name).close()
+        writer = parquet.ParquetWriter(temp_path, schema)
+        written = parquet.ParquetFile(file_path)
+        for i in range(written.num_row_groups):
+            writer.write_table(written.read_row_group(i).cast(schema))
+        written.close()
+        os.replace(temp_path, file_path)
+        self._writers[name] = writer
+        return writer
+
+    def _finalize(self, name: str) -> None:
+        if name in self._writers:
+            self._writers.pop(name).close()
+            self._finalized.add(name)
+
+    def get(self, name: str) -> Union[DataFrame, None]:
+        """Get all rows written for the named table.
+
+        If this sink was created with `partition_by=None`, this finalizes
+        the file of the named table, and any later call to
+        :py:func:`append` for that table raises a ValueError.
+
+        Args:
+            name (str): the table name
+
+        Returns:
+            Union[DataFrame, None]: the written rows, or None if nothing has
+                been appended for the named table.
+        """
+        from pyarrow import parquet
+
+        if name not in self._files:
+            return None
+        self._finalize(name)
+        tables = [parquet.read_table(f) for f in self._files[name]]
+        if len(tables) == 1:
+            table = tables[0]
+        else:
+            # the column types of separately written timesteps can differ,
+            # for example an integer column which has a NaN value in a
+            # later timestep, so the types are promoted as in pandas concat
+            table = _concat_promote(tables)
+        return dataframe.from_pandas(table.to_pandas())
+
+    def close(self) -> None:
+        for name in list(self._writers.keys()):
+            self._finalize(name)
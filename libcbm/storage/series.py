@@ -181,7 +181,8 @@ class Series(ABC):
 
           * pandas backend: a reference is returned
           * numpy backend (mixed column types): a reference is returned
-          * numpy backend (2d matrix storage): a copy is returned
+          * numpy backend (2d matrix storage): a reference is returned,
+            which is a strided view of the column of the matrix
 
         Returns:
             np.ndarray: the series values as a numpy array, either as a
@@ -201,8 +202,9 @@ class Series(ABC):
     @abstractmethod  # pragma: no cover
     def to_numpy_ptr(self) -> ctypes.pointer:
         """Get a ctypes pointer to this series underlying numpy
-        array.  In the case of numpy backend 2d matrix storage,
-        a pointer to a copy of the series value is returned.
+        array.  In the case of numpy backend 2d matrix storage, a pointer
+        to a copy of the series value is returned if the column is not
+        contiguous in the matrix.
 
         Returns:
             ctypes.pointer: a ctypes pointer for the numpy array
@@ -3,6 +3,7 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import ctypes
+import numpy as np
 from libcbm.wrapper.libcbm_error import LibCBM_Error
 from libcbm.wrapper.libcbm_ctypes import LibCBM_ctypes
 
@@ -93,6 +94,10 @@ class LibCBMHandle(LibCBM_ctypes):
         """Call a libcbm C/C++ function.  The specified args are passed
         as the arguments to the named function.
 
+        Array arguments which are not contiguous, such as the columns of a
+        row major matrix, are passed as contiguous copies, and the values
+        of the copies are written back to writable arrays after the call.
+
 
         Args:
             func_name (str): The name of the libcbm function
@@ -106,8 +111,16 @@ class LibCBMHandle(LibCBM_ctypes):
                 function.
         """
         func = getattr(self._dll, func_name)
-        args = (ctypes.byref(self.err), self.pointer) + args
-        result = func(*args)
+        strided = {}
+        args = list(args)
+        for i, arg in enumerate(args):
+            if isinstance(arg, np.ndarray) and not arg.flags["C_CONTIGUOUS"]:
+                strided[i] = arg
+                args[i] = np.ascontiguousarray(arg)
+        result = func(ctypes.byref(self.err), self.pointer, *args)
+        for i, arg in strided.items():
+            if arg.flags["WRITEABLE"]:
+                np.copyto(arg, args[i])
         if self.err.getError() != 0:
             raise RuntimeError(self.err.getErrorMessage())
         return result
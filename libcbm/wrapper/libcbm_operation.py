@@ -60,6 +60,7 @@ class Operation:
         self._op_process_id = op_process_id
         self._repeating_matrix_coords = None
         self._repeating_matrix_values = None
+        self._matrix_index = None
         self._init_value = init_value
         if self.format == OperationFormat.MatrixList:
             self._init_matrix_list(data)
@@ -114,6 +115,7 @@ class Operation:
     def _set_op(self, matrix_index: np.ndarray):
         if not matrix_index.dtype == np.uintp:
             matrix_index = matrix_index.astype(np.uintp)
+        self._matrix_index = matrix_index
         if self.format == OperationFormat.MatrixList:
             self._allocate_op(matrix_index.shape[0])
             self._dll.handle.call(
@@ -140,8 +142,52 @@ class Operation:
     def update_index(self, matrix_index: np.ndarray):
         if not matrix_index.dtype == np.uintp:
             matrix_index = matrix_index.astype(np.uintp)
+        self._matrix_index = matrix_index
         self._dll.update_op_index(self._op_id, matrix_index)
 
+    def update_values(
+        self, values_matrix: np.ndarray, matrix_index: np.ndarray = None
+    ):
+        """Replace the flow values of a
+        :py:attr:`OperationFormat.RepeatingCoordinates` operation.  The
+        values are copied into the buffer created with this operation, whose
+        coordinates are fixed for the lifetime of the operation, and the
+        matrix block is set again from the buffers.  Since LibCBM does not
+        overwrite the matrices of a block that was already set, the native
+        block is freed and allocated again with the same size: only the
+        python side buffers are re-used.
+
+        Args:
+            values_matrix (np.ndarray): a 2 dimensional array with one row
+                per matrix, and one column per coordinate, in the order of
+                the data this operation was created with.  Any memory
+                layout is accepted.
+            matrix_index (np.ndarray, optional): if specified, a new matrix
+                index of the same length as the current one, which replaces
+                it. Defaults to None, meaning the current matrix index is
+                kept.
+
+        Raises:
+            ValueError: this operation is not of the RepeatingCoordinates
+                format
+            ValueError: the shape of values_matrix does not match the
+                shape of the existing values
+        """
+        if self.format != OperationFormat.RepeatingCoordinates:
+            raise ValueError(
+                "update_values requires the RepeatingCoordinates format"
+            )
+        values = self._repeating_matrix_values.matrix
+        if values_matrix.shape != values.shape:
+            raise ValueError(
+                f"values_matrix shape {values_matrix.shape} does not match "
+                f"the operation values shape {values.shape}"
+            )
+        np.copyto(values, values_matrix, casting="same_kind")
+        self._set_op(
+            self._matrix_index if matrix_index is None else matrix_index
+        )
+
 
 def compute(
     dll: LibCBMWrapper,
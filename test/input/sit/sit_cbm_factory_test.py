@@ -1,7 +1,9 @@
 from types import SimpleNamespace
 import unittest
 import os
+import numpy as np
 import pandas as pd
+from pandas.testing import assert_frame_equal
 import json
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -11,6 +13,7 @@ from libcbm.input.sit.sit_cbm_factory import EventSort
 from libcbm.input.sit.sit_reader import load_table
 from libcbm.model.cbm import cbm_simulator
 from libcbm.model.cbm.cbm_output import CBMOutput
+from libcbm.storage.backends import BackendType
 from libcbm import resources
 
 
@@ -84,6 +87,89 @@ class SITCBMFactoryTest(unittest.TestCase):
                 len(rule_based_processor.sit_event_stats_by_timestep) > 0
             )
 
+    def test_chunked_inventory_is_converted_per_partition(self):
+        config_path = os.path.join(
+            resources.get_test_resources_dir(),
+            "cbm3_tutorial2",
+            "sit_config.json",
+        )
+        sit = sit_cbm_factory.load_sit(config_path)
+        expected = [
+            df.to_pandas()
+            for df in sit_cbm_factory.initialize_inventory(sit)
+        ]
+        inventory = sit.sit_data.inventory
+        chunk_size = len(inventory.index) // 2 + 1
+        sit.sit_data.inventory = [
+            inventory.iloc[:chunk_size].reset_index(drop=True),
+            inventory.iloc[chunk_size:].reset_index(drop=True),
+        ]
+        sit.sit_data.chunked_inventory = True
+        with patch(
+            "libcbm.input.sit.sit_cbm_factory._initialize_inventory",
+            wraps=sit_cbm_factory._initialize_inventory,
+        ) as convert:
+            result = sit_cbm_factory.initialize_inventory(
+                sit, BackendType.dask
+            )
+            # only the first chunk is converted until partitions are needed
+            self.assertEqual(convert.call_count, 1)
+            self.assertEqual(
+                result[1].chunks,
+                tuple(len(c.index) for c in sit.sit_data.inventory),
+            )
+            partition = result[1].get_partition(1).to_pandas()
+            self.assertEqual(convert.call_count, 2)
+        assert_frame_equal(
+            partition,
+            expected[1].iloc[chunk_size:].reset_index(drop=True),
+            check_dtype=False,
+        )
+        for df, expected_df in zip(result, expected):
+            assert_frame_equal(df.to_pandas(), expected_df, check_dtype=False)
+
+    def test_chunked_inventory_promotes_column_types(self):
+        config_path = os.path.join(
+            resources.get_test_resources_dir(),
+            "cbm3_tutorial2",
+            "sit_config.json",
+        )
+        sit = sit_cbm_factory.load_sit(config_path)
+        inventory = sit.sit_data.inventory
+        chunks = [
+            inventory.iloc[:2].reset_index(drop=True),
+            inventory.iloc[2:].reset_index(drop=True),
+        ]
+        chunks[0]["age"] = chunks[0]["age"].astype("int64")
+        chunks[1]["age"] = chunks[1]["age"].astype("float64") + 0.5
+        sit.sit_data.inventory = chunks
+        sit.sit_data.chunked_inventory = True
+        _, result = sit_cbm_factory.initialize_inventory(
+            sit, BackendType.dask
+        )
+        self.assertEqual(result["age"].to_numpy().dtype, np.float64)
+        self.assertEqual(
+            result["age"].to_list(),
+            pd.concat([c["age"] for c in chunks]).astype("float64").tolist(),
+        )
+
+        # a later chunk whose converted types cannot be stored in the types
+        # of the chunked result raises a clear error
+        classifiers, inventory = sit_cbm_factory.initialize_inventory(sit)
+        chunks[1]["inventory_id"] = chunks[1].index.to_numpy() + 0.5
+        with self.assertRaises(ValueError):
+            sit_cbm_factory._initialize_inventory_chunk(
+                1,
+                (
+                    classifiers.to_pandas().dtypes.to_dict(),
+                    inventory.to_pandas().dtypes.to_dict(),
+                ),
+                sit.sit_mapping,
+                sit.sit_data.classifiers,
+                sit.sit_data.classifier_values,
+                chunks[1],
+            )
+
     @patch("libcbm.input.sit.sit_cbm_factory.resources")
     @patch("libcbm.input.sit.sit_cbm_factory.SITCBMDefaults")
     @patch("libcbm.input.sit.sit_cbm_factory.SITMapping")
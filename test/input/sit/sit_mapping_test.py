@@ -397,6 +397,49 @@ class SITMappingTest(unittest.TestCase):
         )
         self.assertTrue(list(result) == [1000, 2000])
 
+    def test_admin_eco_mapping_looks_up_distinct_pairs_once(self):
+        mapping = {
+            "spatial_units": {
+                "mapping_mode": "SeparateAdminEcoClassifiers",
+                "admin_classifier": "classifier1",
+                "eco_classifier": "classifier2",
+                "admin_mapping": [
+                    {
+                        "user_admin_boundary": "a",
+                        "default_admin_boundary": "British Columbia",
+                    },
+                    {
+                        "user_admin_boundary": "b",
+                        "default_admin_boundary": "Alberta",
+                    },
+                ],
+                "eco_mapping": [
+                    {
+                        "user_eco_boundary": "a",
+                        "default_eco_boundary": "Montane Cordillera",
+                    }
+                ],
+            }
+        }
+        ref = Mock(spec=SITCBMDefaults)
+        classifiers, classifier_values = self.get_mock_classifiers()
+        inventory = pd.DataFrame(
+            {
+                "classifier1": ["b", "a", "b", "b", "a"] * 100,
+                "classifier2": ["a"] * 500,
+            }
+        )
+        ref.get_spatial_unit_id.side_effect = lambda admin, eco: {
+            ("British Columbia", "Montane Cordillera"): 1000,
+            ("Alberta", "Montane Cordillera"): 2000,
+        }[(admin, eco)]
+        sit_mapping = SITMapping(mapping, ref)
+        result = sit_mapping.get_spatial_unit(
+            inventory, classifiers, classifier_values
+        )
+        self.assertTrue(list(result) == [2000, 1000, 2000, 2000, 1000] * 100)
+        self.assertTrue(ref.get_spatial_unit_id.call_count == 2)
+
     def test_undefined_mapped_default_spatial_unit_error(self):
         """Checks that an error is raised when the default mapping of spatial
         unit does not match a defined value in the defaults reference in
@@ -0,0 +1,260 @@
+import os
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.backends import BackendType
+from libcbm.storage.backends import numpy_backend
+from libcbm.model.cbm import cbm_variables
+from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.model.cbm.cbm_model import CBM
+from libcbm.model.cbm.stand_cbm_factory import StandCBMFactory
+from libcbm.model.model_definition.spinup_cache import SpinupCache
+
+
+def _get_stand_cbm_factory() -> StandCBMFactory:
+    return StandCBMFactory(
+        {"c1": ["c1_v1"]},
+        [
+            {
+                "classifier_set": ["?"],
+                "merch_volumes": [
+                    {
+                        "species": "Spruce",
+                        "age_volume_pairs": [
+                            [0, 0],
+                            [50, 100],
+                            [100, 150],
+                            [150, 200],
+                        ],
+                    }
+                ],
+            }
+        ],
+    )
+
+
+def _init_spinup_vars(
+    cbm_factory: StandCBMFactory, cbm: CBM, backend_type: BackendType
+) -> CBMVariables:
+    # each of the 9 distinct stands appears twice with a different area
+    n_stands = 18
+    return_intervals = [50, 75, 100, 125, 150, 50, 75, 100, 300] * 2
+    max_rotations = [2, 3, 4, 5, 2, 10, 3, 3, 15] * 2
+    inventory = dataframe.convert_dataframe_backend(
+        dataframe.from_pandas(
+            pd.DataFrame(
+                {
+                    "c1": "c1_v1",
+                    "admin_boundary": "British Columbia",
+                    "eco_boundary": "Pacific Maritime",
+                    "age": [10 * i for i in range(9)] * 2,
+                    "area": [1.0] * 9 + [2.0] * 9,
+                    "delay": [0, 0, 0, 0, 0, 0, 3, 0, 0] * 2,
+                    "land_class": "UNFCCC_FL_R_FL",
+                    "afforestation_pre_type": "None",
+                    "historic_disturbance_type": "Wildfire",
+                    "last_pass_disturbance_type": (
+                        ["Wildfire", "Clearcut harvesting with salvage"] * 4
+                        + ["Wildfire"]
+                    )
+                    * 2,
+                }
+            )
+        ),
+        backend_type,
+    )
+    csets, inv = cbm_factory.prepare_inventory(inventory)
+    cbm_vars = cbm_variables.initialize_simulation_variables(
+        csets, inv, cbm.pool_codes, cbm.flux_indicator_codes, backend_type
+    )
+    return cbm_variables.initialize_spinup_variables(
+        cbm_vars,
+        backend_type,
+        cbm_variables.initialize_spinup_parameters(
+            n_stands,
+            backend_type,
+            series.from_numpy(
+                "return_interval", np.array(return_intervals, "int32")
+            ),
+            series.allocate(
+                "min_rotations", n_stands, 1, "int32", backend_type
+            ),
+            series.from_numpy(
+                "max_rotations", np.array(max_rotations, "int32")
+            ),
+            series.allocate(
+                "mean_annual_temp", n_stands, -1, "float", backend_type
+            ),
+        ),
+    )
+
+
+def _run_spinup(backend_type: BackendType, **kwargs):
+    cbm_factory = _get_stand_cbm_factory()
+    with cbm_factory.initialize_cbm() as cbm:
+        spinup_vars = _init_spinup_vars(cbm_factory, cbm, backend_type)
+        cbm.spinup(spinup_vars, **kwargs)
+        return spinup_vars
+
+
+def _assert_spinup_equal(result: CBMVariables, expected: CBMVariables):
+    assert_frame_equal(result.pools.to_pandas(), expected.pools.to_pandas())
+    assert_frame_equal(result.state.to_pandas(), expected.state.to_pandas())
+
+
+@pytest.mark.parametrize("backend_type", list(BackendType))
+def test_spinup_compaction_matches_spinup(backend_type):
+    expected = _run_spinup(backend_type)
+    for compaction_threshold in [0.1, 0.5, 0.9]:
+        result = _run_spinup(
+            backend_type, compaction_threshold=compaction_threshold
+        )
+        _assert_spinup_equal(result, expected)
+
+
+@pytest.mark.parametrize("backend_type", list(BackendType))
+def test_spinup_deduplicate_matches_spinup(backend_type):
+    expected = _run_spinup(backend_type)
+    _assert_spinup_equal(_run_spinup(backend_type, deduplicate=True), expected)
+    _assert_spinup_equal(
+        _run_spinup(backend_type, deduplicate=True, compaction_threshold=0.5),
+        expected,
+    )
+
+
+@pytest.mark.parametrize("backend_type", list(BackendType))
+def test_spinup_cache_matches_spinup(backend_type):
+    expected = _run_spinup(backend_type)
+    with tempfile.TemporaryDirectory() as tempdir:
+        cache = SpinupCache(tempdir, "test")
+        # first run populates the cache, the second reads from it
+        _assert_spinup_equal(_run_spinup(backend_type, cache=cache), expected)
+        assert len(os.listdir(tempdir)) == 1
+        _assert_spinup_equal(
+            _run_spinup(backend_type, cache=SpinupCache(tempdir, "test")),
+            expected,
+        )
+
+
+def test_spinup_compaction_errors():
+    cbm_factory = _get_stand_cbm_factory()
+    with cbm_factory.initialize_cbm() as cbm:
+        spinup_vars = _init_spinup_vars(cbm_factory, cbm, BackendType.numpy)
+        with pytest.raises(ValueError):
+            cbm.spinup(spinup_vars, compaction_threshold=1.5)
+        with pytest.raises(ValueError):
+            cbm.spinup(
+                spinup_vars,
+                reporting_func=lambda t, cbm_vars: None,
+                compaction_threshold=0.5,
+            )
+        with pytest.raises(ValueError):
+            cbm.spinup(
+                spinup_vars,
+                reporting_func=lambda t, cbm_vars: None,
+                deduplicate=True,
+            )
+
+
+def _init_step_vars(
+    cbm_factory: StandCBMFactory, cbm: CBM, backend_type: BackendType
+) -> CBMVariables:
+    spinup_vars = _init_spinup_vars(cbm_factory, cbm, backend_type)
+    cbm.spinup(spinup_vars)
+    cbm_vars = CBMVariables(
+        spinup_vars.pools,
+        cbm_variables._initialize_flux(
+            spinup_vars.pools.n_rows,
+            cbm.flux_indicator_codes,
+            backend_type,
+        ),
+        spinup_vars.classifiers,
+        cbm_variables._initialize_cbm_state_variables(
+            spinup_vars.pools.n_rows, backend_type
+        ),
+        spinup_vars.inventory,
+        cbm_variables._initialize_cbm_parameters(
+            spinup_vars.pools.n_rows, backend_type
+        ),
+    )
+    # cbm.init does not accept a delay with a non-zero age
+    cbm_vars.inventory["delay"].assign(0)
+    return cbm.init(cbm_vars)
+
+
+def _run_steps(backend_type: BackendType, sparse_disturbance: bool):
+    cbm_factory = _get_stand_cbm_factory()
+    with cbm_factory.initialize_cbm() as cbm:
+        cbm_vars = _init_step_vars(cbm_factory, cbm, backend_type)
+        disturbance_type_ids = {
+            v: k for k, v in cbm_factory.disturbance_types.items()
+        }
+        disturbances = [
+            {2: "Wildfire", 11: "Clearcut harvesting with salvage"},
+            {},
+            {0: "Wildfire", 2: "Wildfire", 17: "Wildfire"},
+        ]
+        results = []
+        for step_disturbances in disturbances:
+            disturbance_type = np.zeros(cbm_vars.pools.n_rows, "int32")
+            for idx, name in step_disturbances.items():
+                disturbance_type[idx] = disturbance_type_ids[name]
+            cbm_vars.parameters["disturbance_type"].assign(
+                series.from_numpy("disturbance_type", disturbance_type)
+            )
+            cbm_vars = cbm.step(cbm_vars, sparse_disturbance)
+            results.append(
+                (cbm_vars.pools.to_pandas(), cbm_vars.flux.to_pandas())
+            )
+        return results
+
+
+@pytest.mark.parametrize("backend_type", list(BackendType))
+def test_sparse_disturbance_matches_step(backend_type):
+    expected = _run_steps(backend_type, sparse_disturbance=False)
+    result = _run_steps(backend_type, sparse_disturbance=True)
+    for (pools, flux), (expected_pools, expected_flux) in zip(
+        result, expected
+    ):
+        assert_frame_equal(pools, expected_pools)
+        assert_frame_equal(flux, expected_flux)
+
+
+def test_numpy_step_layout_is_stable():
+    cbm_factory = _get_stand_cbm_factory()
+    with cbm_factory.initialize_cbm() as cbm:
+        cbm_vars = _init_step_vars(cbm_factory, cbm, BackendType.numpy)
+        # the first step settles each table into the layout it is used in
+        cbm_vars = cbm.step(cbm_vars)
+        numpy_backend.reset_layout_conversion_counts()
+        for _ in range(3):
+            cbm_vars = cbm.step(cbm_vars)
+    assert set(numpy_backend.get_layout_conversion_counts().values()) == {0}
+
+
+def test_library_writes_to_strided_numpy_columns():
+    cols = [
+        "enabled",
+        "growth_enabled",
+        "age",
+        "regeneration_delay",
+        "time_since_last_disturbance",
+        "time_since_land_class_change",
+    ]
+    values = np.array([[1, 1, 5, 0, 3, 2], [1, 0, 0, 2, 1, 4]], "int32")
+    cbm_factory = _get_stand_cbm_factory()
+    with cbm_factory.initialize_cbm() as cbm:
+        expected = dataframe.from_pandas(
+            pd.DataFrame(values.copy(), columns=cols)
+        )
+        cbm.model_functions.end_step(expected)
+        # the columns of a row major matrix are not contiguous
+        state = numpy_backend.NumpyDataFrameFrameBackend(values.copy(), cols)
+        cbm.model_functions.end_step(state)
+    assert state.to_numpy().flags["C_CONTIGUOUS"]
+    assert_frame_equal(state.to_pandas(), expected.to_pandas())
+    assert not (state.to_numpy() == values).all()
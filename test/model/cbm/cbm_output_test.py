@@ -1,3 +1,5 @@
+import tempfile
+import pytest
 import pandas as pd
 from pandas.testing import assert_frame_equal
 from unittest.mock import patch
@@ -5,6 +7,7 @@ from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.model.cbm.cbm_output import CBMOutput
 from libcbm.storage.backends import BackendType
 from libcbm.storage.dataframe import from_pandas
+from libcbm.storage.output_sink import ParquetSink
 
 
 def _make_test_data() -> CBMVariables:
@@ -283,3 +286,37 @@ def test_append_simulation_result_with_mapping_multiple_append():
             }
         ),
     )
+
+
+def test_append_simulation_result_parquet_sink():
+    pytest.importorskip("pyarrow")
+    kwargs = dict(
+        density=False,
+        classifier_map={1: "c1", 2: "c2"},
+        disturbance_type_map={-1: "-1", 0: "d0", 1: "d1", 2: "d2"},
+        backend_type=BackendType.pandas,
+    )
+    in_memory_output = CBMOutput(**kwargs)
+    with tempfile.TemporaryDirectory() as tempdir:
+        parquet_output = CBMOutput(
+            **kwargs, sink=ParquetSink(tempdir, partition_by="timestep")
+        )
+        for timestep in [1, 2]:
+            for cbm_output in [in_memory_output, parquet_output]:
+                cbm_output.append_simulation_result(
+                    timestep=timestep, cbm_vars=_make_test_data()
+                )
+        for name in [
+            "pools",
+            "flux",
+            "state",
+            "classifiers",
+            "parameters",
+            "area",
+        ]:
+            result = getattr(parquet_output, name)
+            assert result.backend_type == BackendType.pandas
+            assert_frame_equal(
+                result.to_pandas(),
+                getattr(in_memory_output, name).to_pandas(),
+            )
@@ -0,0 +1,135 @@
+import pytest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.storage import dataframe
+from libcbm.model.cbm import cbm_simulator
+from libcbm.model.cbm.stand_cbm_factory import StandCBMFactory
+from libcbm.model.cbm.cbm_output import CBMOutput
+
+
+def _create_stand_cbm_factory() -> StandCBMFactory:
+    classifiers = {
+        "c1": ["c1_v1", "c1_v2"],
+        "c2": ["c2_v1"],
+    }
+    merch_volumes = [
+        {
+            "classifier_set": ["?", "?"],
+            "merch_volumes": [
+                {
+                    "species": "Spruce",
+                    "age_volume_pairs": [
+                        [0, 0],
+                        [50, 100],
+                        [100, 150],
+                        [150, 200],
+                    ],
+                }
+            ],
+        }
+    ]
+    return StandCBMFactory(classifiers, merch_volumes)
+
+
+def _initialize_cbm():
+    return _create_stand_cbm_factory().initialize_cbm()
+
+
+@pytest.mark.parametrize("partition_by", [None, "c1"])
+def test_simulate_parallel_matches_simulate(partition_by):
+    cbm_factory = _create_stand_cbm_factory()
+    n_stands = 7
+    inventory = dataframe.from_pandas(
+        pd.DataFrame(
+            {
+                "c1": ["c1_v1", "c1_v2"] * 3 + ["c1_v1"],
+                "c2": "c2_v1",
+                "admin_boundary": "British Columbia",
+                "eco_boundary": "Pacific Maritime",
+                "age": [5 * i for i in range(n_stands)],
+                "area": [1.0 + i for i in range(n_stands)],
+                "delay": 0,
+                "land_class": "UNFCCC_FL_R_FL",
+                "afforestation_pre_type": "None",
+                "historic_disturbance_type": "Wildfire",
+                "last_pass_disturbance_type": "Wildfire",
+            }
+        )
+    )
+    csets, inv = cbm_factory.prepare_inventory(inventory)
+    n_steps = 5
+
+    expected = CBMOutput(
+        classifier_map=cbm_factory.classifier_value_names,
+        disturbance_type_map=cbm_factory.disturbance_types,
+    )
+    with cbm_factory.initialize_cbm() as cbm:
+        cbm_simulator.simulate(
+            cbm,
+            n_steps=n_steps,
+            classifiers=csets,
+            inventory=inv,
+            reporting_func=expected.append_simulation_result,
+        )
+
+    result = CBMOutput(
+        classifier_map=cbm_factory.classifier_value_names,
+        disturbance_type_map=cbm_factory.disturbance_types,
+    )
+    cbm_simulator.simulate_parallel(
+        _initialize_cbm,
+        n_workers=2,
+        n_steps=n_steps,
+        classifiers=csets,
+        inventory=inv,
+        output=result,
+        partition_by=partition_by,
+        n_partitions=3,
+    )
+    for name in [
+        "pools",
+        "flux",
+        "state",
+        "classifiers",
+        "parameters",
+        "area",
+    ]:
+        # the merged results are in the same order as those of simulate
+        assert_frame_equal(
+            getattr(result, name).to_pandas(),
+            getattr(expected, name).to_pandas(),
+            check_dtype=False,
+        )
+
+
+def test_simulate_parallel_error_on_unknown_partition_column():
+    cbm_factory = _create_stand_cbm_factory()
+    csets, inv = cbm_factory.prepare_inventory(
+        dataframe.from_pandas(
+            pd.DataFrame(
+                {
+                    "c1": ["c1_v1"],
+                    "c2": ["c2_v1"],
+                    "admin_boundary": "British Columbia",
+                    "eco_boundary": "Pacific Maritime",
+                    "age": 0,
+                    "area": 1.0,
+                    "delay": 0,
+                    "land_class": "UNFCCC_FL_R_FL",
+                    "afforestation_pre_type": "None",
+                    "historic_disturbance_type": "Wildfire",
+                    "last_pass_disturbance_type": "Wildfire",
+                }
+            )
+        )
+    )
+    with pytest.raises(ValueError):
+        cbm_simulator.simulate_parallel(
+            _initialize_cbm,
+            n_workers=1,
+            n_steps=1,
+            classifiers=csets,
+            inventory=inv,
+            output=CBMOutput(),
+            partition_by="missing",
+        )
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from libcbm.model.cbm import cbm_variables
+from libcbm.model.cbm.rule_based.classifier_index import ClassifierIndex
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.backends import BackendType
+
+
+def _get_cbm_vars(backend_type: BackendType) -> cbm_variables.CBMVariables:
+    n_stands = 3
+    inventory = dataframe.from_pandas(
+        pd.DataFrame(
+            {
+                "age": [1, 2, 3],
+                "area": [1.0, 2.0, 3.0],
+                "spatial_unit": 1,
+                "afforestation_pre_type_id": -1,
+                "land_class": 0,
+                "historical_disturbance_type": 1,
+                "last_pass_disturbance_type": 1,
+                "delay": 0,
+            }
+        )
+    )
+    classifiers = dataframe.from_pandas(
+        pd.DataFrame({"c1": np.arange(n_stands), "c2": 1})
+    )
+    return cbm_variables.initialize_simulation_variables(
+        classifiers, inventory, ["Input", "P1"], ["F1"], backend_type
+    )
+
+
+@pytest.mark.parametrize("backend_type", list(BackendType))
+def test_append_cbm_variables(backend_type: BackendType):
+    cbm_vars = _get_cbm_vars(backend_type)
+    cbm_vars.reserve(10)
+    cbm_vars.classifier_index = ClassifierIndex()
+    assert cbm_vars.n_active == 3
+
+    expected_area = [1.0, 2.0, 3.0]
+    for i in range(4):
+        idx = series.from_list("", [i % 3])
+        rows = cbm_variables.CBMVariables(
+            cbm_vars.pools.take(idx),
+            cbm_vars.flux.take(idx),
+            cbm_vars.classifiers.take(idx),
+            cbm_vars.state.take(idx),
+            cbm_vars.inventory.take(idx),
+            cbm_vars.parameters.take(idx),
+        )
+        cbm_vars = cbm_variables.append_cbm_variables(cbm_vars, rows)
+        expected_area.append(expected_area[i % 3])
+
+    assert cbm_vars.n_active == 7
+    assert cbm_vars.classifier_index.select(
+        cbm_vars.classifiers, {"c1": np.array([1, 0, 0, 0], dtype=bool)}
+    ).tolist() == [0, 3, 6]
+    for df in [
+        cbm_vars.pools,
+        cbm_vars.flux,
+        cbm_vars.classifiers,
+        cbm_vars.state,
+        cbm_vars.parameters,
+    ]:
+        assert df.n_rows == 7
+    assert cbm_vars.inventory["area"].to_list() == expected_area
+    assert cbm_vars.classifiers["c1"].to_list() == [0, 1, 2, 0, 1, 2, 0]
@@ -1,6 +1,7 @@
 import unittest
 import pandas as pd
 from libcbm.storage import dataframe
+from libcbm.storage import series
 from types import SimpleNamespace
 from libcbm.model.cbm import cbm_model
 
@@ -78,3 +79,61 @@ class ComputeProductionTest(unittest.TestCase):
         for flux_code in flux_indicator_codes:
             self.assertTrue(result[flux_code].to_list() == [1, 1, 1])
         self.assertTrue(result["Total"].to_list() == [3, 3, 3])
+
+    def test_compute_disturbance_production_eligible_subset(self):
+        mock_pools = dataframe.from_pandas(
+            pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [1.0, 2.0, 3.0]})
+        )
+        mock_inventory = dataframe.from_pandas(
+            pd.DataFrame({"age": [1, 1, 1], "area": [10.0, 20.0, 30.0]})
+        )
+        flux_indicator_codes = [
+            "DisturbanceSoftProduction",
+            "DisturbanceHardProduction",
+            "DisturbanceDOMProduction",
+        ]
+        mock_eligible = series.from_list("", [True, False, True])
+        allocated_sizes = []
+
+        def mock_allocate_op(n_stands):
+            allocated_sizes.append(n_stands)
+            return 999
+
+        def mock_get_disturbance_ops(op, inventory, parameters):
+            self.assertTrue(inventory["area"].to_list() == [10.0, 30.0])
+            self.assertTrue(parameters["disturbance_type"].to_list() == [7, 7])
+
+        def mock_compute_flux(ops, op_processes, pools, flux, enabled):
+            # only the eligible stands are computed
+            self.assertTrue(enabled is None)
+            flux.to_pandas()[:] = pools.to_pandas()[["a"]].to_numpy()
+
+        compute_functions = SimpleNamespace(
+            allocate_op=mock_allocate_op,
+            compute_flux=mock_compute_flux,
+            free_op=lambda op: None,
+        )
+        model_functions = SimpleNamespace(
+            get_disturbance_ops=mock_get_disturbance_ops
+        )
+        cbm = cbm_model.CBM(
+            compute_functions,
+            model_functions,
+            list(mock_pools.columns),
+            flux_indicator_codes,
+        )
+        mock_cbm_vars = SimpleNamespace(
+            pools=mock_pools, inventory=mock_inventory
+        )
+        result = cbm.compute_disturbance_production(
+            mock_cbm_vars, 7, mock_eligible
+        )
+        self.assertTrue(allocated_sizes == [2])
+        for flux_code in flux_indicator_codes:
+            self.assertTrue(result[flux_code].to_list() == [1.0, 0.0, 3.0])
+        self.assertTrue(result["Total"].to_list() == [3.0, 0.0, 9.0])
+
+        result = cbm.compute_disturbance_production(
+            mock_cbm_vars, 7, mock_eligible, density=False
+        )
+        self.assertTrue(result["Total"].to_list() == [30.0, 0.0, 270.0])
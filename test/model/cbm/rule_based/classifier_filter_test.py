@@ -1,7 +1,9 @@
 import unittest
 import pandas as pd
 from libcbm.storage import dataframe
+from libcbm.model.cbm.rule_based import rule_filter
 from libcbm.model.cbm.rule_based.classifier_filter import ClassifierFilter
+from libcbm.model.cbm.rule_based.classifier_index import ClassifierIndex
 
 
 def get_mock_classifiers_config():
@@ -223,3 +225,101 @@ class ClassifierFilterTest(unittest.TestCase):
                 ["undefined", "?", "agg1"],
                 dataframe.from_pandas(pd.DataFrame([[1, 3, 5]])),
             )
+
+    def test_compiled_filter_matches_expression(self):
+        classifiers_config = get_mock_classifiers_config()
+        classifier_aggregates = [
+            {
+                "classifier_id": 3,
+                "name": "agg1",
+                "description": "agg1",
+                "classifier_values": ["c3_v1", "c3_v3"],
+            }
+        ]
+        classifier_filter = ClassifierFilter(
+            classifiers_config, classifier_aggregates
+        )
+        # includes value ids outside of each classifier's range
+        classifier_values = dataframe.from_pandas(
+            pd.DataFrame(
+                {
+                    "c1": [1, 2, 1, 1, 1, 0, -1, 9],
+                    "c2": [3, 3, 4, 4, 3, 3, 3, 3],
+                    "c3": [7, 7, 7, 5, 6, 5, 5, 12],
+                }
+            )
+        )
+        for classifier_set in [
+            ["c1_v1", "?", "agg1"],
+            ["?", "c2_v1", "?"],
+            ["c1_v1", "c2_v2", "c3_v3"],
+        ]:
+            result = classifier_filter.create_classifiers_filter(
+                classifier_set, classifier_values
+            )
+            self.assertTrue(
+                result.evaluate().to_list()
+                == classifier_values.evaluate_filter(
+                    result.expression
+                ).to_list()
+            )
+            # each classifier set is compiled once
+            self.assertTrue(
+                classifier_filter.create_classifiers_filter(
+                    classifier_set, classifier_values
+                ).expression
+                is result.expression
+            )
+
+    def test_indexed_filter_matches_evaluate_filters(self):
+        classifier_filter = ClassifierFilter(get_mock_classifiers_config(), [])
+        classifier_values = dataframe.from_pandas(
+            pd.DataFrame(
+                {
+                    "c1": [1, 2, 1, 1, 1, 2, 1, 2],
+                    "c2": [3, 3, 4, 4, 3, 3, 3, 3],
+                    "c3": [7, 7, 7, 5, 6, 5, 5, 6],
+                }
+            )
+        )
+        state = dataframe.from_pandas(
+            pd.DataFrame({"age": [1, 2, 3, 4, 5, 6, 7, 8]})
+        )
+        age_filter = rule_filter.create_filter("(age > 2)", state)
+        index = ClassifierIndex()
+        filter_cache = rule_filter.FilterCache()
+        filter_cache.evaluate(age_filter)
+        for classifier_set in [
+            ["c1_v1", "?", "?"],
+            ["?", "c2_v1", "c3_v3"],
+            ["c1_v2", "c2_v2", "?"],
+        ]:
+            expected = rule_filter.evaluate_filters(
+                classifier_filter.create_classifiers_filter(
+                    classifier_set, classifier_values
+                ),
+                age_filter,
+            ).to_list()
+            indexed_filter = classifier_filter.create_classifiers_filter(
+                classifier_set, classifier_values, index
+            )
+            self.assertTrue(
+                indexed_filter.selected_indices().to_list()
+                == [
+                    i
+                    for i, x in enumerate(indexed_filter.evaluate().to_list())
+                    if x
+                ]
+            )
+            self.assertTrue(
+                rule_filter.evaluate_filters(
+                    indexed_filter, age_filter
+                ).to_list()
+                == expected
+            )
+            self.assertTrue(
+                filter_cache.evaluate_filters(
+                    age_filter, indexed_filter
+                ).to_list()
+                == expected
+            )
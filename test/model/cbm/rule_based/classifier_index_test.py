@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.backends import BackendType
+from libcbm.model.cbm.rule_based import classifier_index
+from libcbm.model.cbm.rule_based.classifier_index import ClassifierIndex
+
+
+def _expected(classifiers: dict, lookups: dict) -> np.ndarray:
+    result = np.ones(len(classifiers["c1"]), dtype=bool)
+    for name, lookup in lookups.items():
+        result &= classifier_index.match_value_ids(lookup, classifiers[name])
+    return np.flatnonzero(result)
+
+
+@pytest.mark.parametrize("rebuild_fraction", [0.0, 0.5, 10.0])
+def test_select_matches_lookups(rebuild_fraction):
+    rng = np.random.default_rng(1)
+    n_rows = 200
+    values = {
+        "c1": rng.integers(1, 4, n_rows).astype("int32"),
+        "c2": rng.integers(4, 10, n_rows).astype("int32"),
+    }
+    lookups_list = [
+        {"c1": np.array([0, 1, 0, 0, 0], dtype=bool)},
+        {
+            "c1": np.array([0, 0, 1, 1, 0], dtype=bool),
+            "c2": np.array([0] * 5 + [1, 0, 1, 0, 0, 0], dtype=bool),
+        },
+        # out of range value ids never match
+        {"c2": np.array([0, 0, 0, 0, 0, 1, 0], dtype=bool)},
+        {},
+    ]
+    index = ClassifierIndex(rebuild_fraction)
+
+    for _ in range(5):
+        df = dataframe.from_numpy(values)
+        index.append_rows(df)
+        for lookups in lookups_list:
+            assert (
+                index.select(df, lookups).tolist()
+                == _expected(values, lookups).tolist()
+            )
+
+        # transition some rows in place and report them
+        changed = rng.choice(n_rows, 20, replace=False)
+        df["c1"].assign(
+            series.from_numpy("", rng.integers(1, 4, 20).astype("int32")),
+            series.from_numpy("", changed),
+        )
+        index.update_rows(series.from_numpy("", changed))
+
+        # append some split rows, which are reported with the new table
+        values = {
+            name: np.concatenate(
+                [df[name].to_numpy(), df[name].to_numpy()[changed]]
+            )
+            for name in values
+        }
+        n_rows = values["c1"].shape[0]
+
+
+def test_select_rebuilds_for_a_different_table():
+    values = {
+        "c1": np.array([1, 2, 1, 2], dtype="int32"),
+        "c2": np.array([3, 3, 4, 4], dtype="int32"),
+    }
+    lookups = {"c1": np.array([0, 1, 0, 0], dtype=bool)}
+    index = ClassifierIndex()
+    assert index.select(dataframe.from_numpy(values), lookups).tolist() == [
+        0,
+        2,
+    ]
+
+    # a reordered table with the same number of rows is indexed again
+    reordered = {name: arr[::-1].copy() for name, arr in values.items()}
+    reordered["c1"][0] = 1
+    assert index.select(
+        dataframe.from_numpy(reordered), lookups
+    ).tolist() == [0, 1, 3]
+
+
+@pytest.mark.parametrize("backend_type", list(BackendType))
+def test_select_backends(backend_type):
+    df = dataframe.convert_dataframe_backend(
+        dataframe.from_numpy(
+            {
+                "c1": np.array([1, 2, 1, 2], dtype="int32"),
+                "c2": np.array([3, 3, 4, 4], dtype="int32"),
+            }
+        ),
+        backend_type,
+    )
+    lookups = {
+        "c1": np.array([0, 0, 1, 0], dtype=bool),
+        "c2": np.array([0, 0, 0, 1, 1, 0], dtype=bool),
+    }
+    assert ClassifierIndex().select(df, lookups).tolist() == [1, 3]
@@ -2,6 +2,7 @@ import unittest
 from types import SimpleNamespace
 import pandas as pd
 from libcbm.storage import dataframe
+from libcbm.storage import series
 from libcbm.model.cbm.rule_based import rule_filter
 
 
@@ -114,3 +115,27 @@ class RuleFilterTest(unittest.TestCase):
             ),
         )
         self.assertTrue(result is None)
+
+    def test_filter_cache_matches_evaluate_filters(self):
+        filter_cache = rule_filter.FilterCache()
+        data = dataframe.from_pandas(pd.DataFrame({"a": range(0, 6)}))
+
+        def check(data):
+            f = rule_filter.create_filter("a > 2", data)
+            self.assertTrue(
+                filter_cache.evaluate_filters(f).to_list()
+                == rule_filter.evaluate_filters(f).to_list()
+            )
+
+        check(data)
+
+        # changed rows are evaluated again once they are reported
+        data["a"].assign(10, series.from_list("", [0]))
+        filter_cache.update_rows(series.from_list("", [0]))
+        check(data)
+
+        # appended rows are evaluated as needed
+        data = dataframe.concat_data_frame(
+            [data, data.take(series.from_list("", [1, 4]))]
+        )
+        check(data)
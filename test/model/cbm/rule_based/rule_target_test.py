@@ -4,6 +4,7 @@ import numpy as np
 from libcbm.model.cbm.rule_based import rule_target
 from libcbm.storage import series
 from libcbm.storage import dataframe
+from libcbm.storage.backends import BackendType
 
 
 class RuleTargetTest(unittest.TestCase):
@@ -813,3 +814,47 @@ class RuleTargetTest(unittest.TestCase):
         #  proportion=1 results in zero splits
         self.assertTrue(result.statistics["num_splits"] == 0)
         self.assertTrue(result.statistics["num_eligible"] == n_eligble)
+
+    def test_sorted_disturbance_target_ties_and_backends(self):
+        for backend_type in BackendType:
+
+            def to_series(values):
+                return dataframe.convert_series_backend(
+                    series.from_numpy("", np.array(values)), backend_type
+                )
+
+            result = rule_target.sorted_disturbance_target(
+                target_var=to_series([10.0, 20.0, 0.0, 10.0, 10.0, 5.0]),
+                sort_var=to_series([2, 1, 5, 2, 2, 3]),
+                target=30.0,
+                eligible=to_series([True, True, True, True, False, True]),
+            )
+            self.assertTrue(result.target.backend_type == backend_type)
+            # equal sort values are taken in their original order, and
+            # records with no target value are excluded
+            self.assertTrue(
+                result.target["disturbed_index"].to_list() == [5, 0, 3, 1]
+            )
+            self.assertTrue(
+                result.target["area_proportions"].to_list()
+                == [1.0, 1.0, 1.0, 0.25]
+            )
+            self.assertTrue(result.statistics["total_eligible_value"] == 45)
+            self.assertTrue(result.statistics["shortfall"] == 0)
+            self.assertTrue(result.statistics["num_splits"] == 1)
+            self.assertTrue(result.statistics["num_eligible"] == 5)
+
+    def test_solve_sorted_target(self):
+        disturbed_index, proportions, total, remaining, num_splits = (
+            rule_target.solve_sorted_target(
+                target_var=np.array([1.0, 2.0, 3.0]),
+                sort_var=np.array([1.0, np.nan, 2.0]),
+                eligible=np.array([True, True, True]),
+                target=10.0,
+            )
+        )
+        self.assertTrue(disturbed_index.tolist() == [2, 0, 1])
+        self.assertTrue(proportions.tolist() == [1.0, 1.0, 1.0])
+        self.assertTrue(total == 6.0)
+        self.assertTrue(remaining == 4.0)
+        self.assertTrue(num_splits == 0)
@@ -7,6 +7,11 @@ from mock import Mock
 from libcbm.model.cbm.rule_based.sit.sit_event_processor import (
     SITEventProcessor,
 )
+from libcbm.model.cbm.rule_based.sit.sit_event_processor import (
+    _DisturbanceProductionCache,
+)
+from libcbm.storage import dataframe
+from libcbm.storage import series
 
 # used in patching (overriding) module imports in the module being tested
 PATCH_PATH = "libcbm.model.cbm.rule_based.sit.sit_event_processor"
@@ -65,12 +70,12 @@ class SITEventProcessorTest(unittest.TestCase):
 
             # mock event processor
             mock_event_processor = mocks["event_processor"]
-            mock_event_processor.process_event = Mock()
+            mock_event_processor.process_filtered_event = Mock()
 
             disturbance_id_order = []
 
             def mock_process_event(
-                event_filters,
+                filter_result,
                 undisturbed,
                 target_func,
                 disturbance_type_id,
@@ -91,6 +96,7 @@ class SITEventProcessorTest(unittest.TestCase):
                     cbm_vars=cbm_vars,
                     filter_result="mock_filter_result",
                     rule_target_result=SimpleNamespace(
+                        target=None,
                         statistics={
                             "sit_event_index": 0,
                             "total_eligible_value": 1,
@@ -99,11 +105,13 @@ class SITEventProcessorTest(unittest.TestCase):
                             "num_records_disturbed": 4,
                             "num_splits": 5,
                             "num_eligible": 6,
-                        }
+                        },
                     ),
                 )
 
-            mock_event_processor.process_event.side_effect = mock_process_event
+            mock_event_processor.process_filtered_event.side_effect = (
+                mock_process_event
+            )
 
             # mock classifier filter
             mock_classifier_filter_builder = Mock()
@@ -176,3 +184,56 @@ class SITEventProcessorTest(unittest.TestCase):
             self.assertTrue(
                 disturbance_id_order == expected_disturbance_id_order
             )
+
+    def test_disturbance_production_cache(self):
+        computed_rows = []
+
+        def compute_disturbance_production(
+            cbm_vars, disturbance_type, eligible=None
+        ):
+            a = cbm_vars.pools.to_pandas()["a"]
+            if eligible is not None:
+                a = a.where(eligible.to_numpy(), 0.0)
+                computed_rows.extend(
+                    [i for i, x in enumerate(eligible.to_list()) if x]
+                )
+            else:
+                computed_rows.extend(cbm_vars.inventory["id"].to_list())
+            return dataframe.from_pandas(
+                pd.DataFrame({"Total": a * disturbance_type})
+            )
+
+        cache = _DisturbanceProductionCache(
+            SimpleNamespace(
+                compute_disturbance_production=compute_disturbance_production
+            )
+        )
+
+        def make_cbm_vars(a):
+            return SimpleNamespace(
+                pools=dataframe.from_pandas(pd.DataFrame({"a": a})),
+                inventory=dataframe.from_pandas(
+                    pd.DataFrame({"id": range(len(a))})
+                ),
+                parameters=dataframe.from_pandas(
+                    pd.DataFrame({"disturbance_type": [0] * len(a)})
+                ),
+            )
+
+        cbm_vars = make_cbm_vars([1.0, 2.0, 3.0])
+        result = cache.compute(
+            cbm_vars, 2, series.from_pandas(pd.Series([True, False, True]))
+        )
+        self.assertTrue(result["Total"].to_list() == [2.0, 0.0, 6.0])
+        self.assertTrue(computed_rows == [0, 2])
+
+        # only stands which were not already computed are computed,
+        # including the stands appended by splits
+        cbm_vars = make_cbm_vars([1.0, 2.0, 3.0, 4.0])
+        result = cache.compute(
+            cbm_vars,
+            2,
+            series.from_pandas(pd.Series([True, True, False, True])),
+        )
+        self.assertTrue(result["Total"].to_list() == [2.0, 4.0, 0.0, 8.0])
+        self.assertTrue(computed_rows == [0, 2, 1, 3])
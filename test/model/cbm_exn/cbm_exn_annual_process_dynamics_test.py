@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.model.cbm_exn import cbm_exn_annual_process_dynamics
+from libcbm.model.cbm_exn.cbm_exn_annual_process_dynamics import (
+    DecayMatrices,
+)
+
+
+def _get_decay_parameters() -> dict[str, dict[str, float]]:
+    pools = [
+        "AboveGroundVeryFastSoil",
+        "BelowGroundVeryFastSoil",
+        "AboveGroundFastSoil",
+        "BelowGroundFastSoil",
+        "MediumSoil",
+        "AboveGroundSlowSoil",
+        "BelowGroundSlowSoil",
+        "StemSnag",
+        "BranchSnag",
+    ]
+    return {
+        pool: {
+            "base_decay_rate": 0.01 * (i + 1),
+            "reference_temp": 10.0,
+            "q10": 2.0,
+            "prop_to_atmosphere": 0.5,
+            "max_rate": 1.0,
+        }
+        for i, pool in enumerate(pools)
+    }
+
+
+def test_decay_matrices_match_per_stand_decay():
+    decay_parameters = _get_decay_parameters()
+    decay_matrices = DecayMatrices(decay_parameters)
+    for mean_annual_temp in [
+        np.array([-1.0, 2.5, -1.0, 2.5]),
+        np.array([2.5, 3.0, np.nan, 2.5, 3.0]),
+    ]:
+        for name in ["dom_decay", "slow_decay"]:
+            memoized = getattr(decay_matrices, name)(mean_annual_temp)
+            # each unique temperature appears once
+            assert memoized[DecayMatrices.temperature_key].is_unique
+            by_stand = (
+                pd.DataFrame({DecayMatrices.temperature_key: mean_annual_temp})
+                .merge(memoized, how="left")
+                .drop(columns=[DecayMatrices.temperature_key])
+            )
+            expected = getattr(cbm_exn_annual_process_dynamics, name)(
+                mean_annual_temp, decay_parameters
+            )
+            assert_frame_equal(by_stand, expected)
+    assert decay_matrices.dom_decay(np.array([3.0])).shape[0] == 4
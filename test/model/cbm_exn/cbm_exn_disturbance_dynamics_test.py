@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.model.cbm_exn import cbm_exn_disturbance_dynamics
+
+
+def _get_disturbance_matrices() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "disturbance_matrix_id": [2, 2, 5, 5, 7, 7],
+            "source_pool": ["a", "a", "a", "a", "b", "b"],
+            "sink_pool": ["b", "c", "b", "c", "b", "c"],
+            "proportion": [0.4, 0.6, 0.4, 0.6, 0.5, 0.5],
+        }
+    )
+
+
+def _get_dm_associations() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "spatial_unit_id": [1, 2, 1, 2],
+            "disturbance_type_id": [1, 1, 2, 2],
+            "sw_hw": [0, 1, 0, 1],
+            "disturbance_matrix_id": [7, 2, 5, 7],
+        }
+    )
+
+
+def test_compact_disturbance():
+    index, matrices = cbm_exn_disturbance_dynamics.compact_disturbance(
+        ["a", "b", "c"],
+        _get_disturbance_matrices(),
+        _get_dm_associations(),
+        False,
+    )
+    # matrix ids 2 and 5 are identical, so they are stored once
+    assert_frame_equal(
+        matrices,
+        pd.DataFrame(
+            {
+                "a.a": [0.0, 1.0],
+                "a.b": [0.4, 0.0],
+                "a.c": [0.6, 0.0],
+                "b.b": [1.0, 0.5],
+                "b.c": [0.0, 0.5],
+                "c.c": [1.0, 1.0],
+            }
+        ),
+    )
+    assert index.columns.tolist() == [
+        "[state.spatial_unit_id]",
+        "[parameters.disturbance_type]",
+        "[state.sw_hw]",
+        "matrix_index",
+    ]
+    assert index["matrix_index"].tolist() == [1, 0, 0, 1]
+
+
+def test_disturbance_expands_compact_disturbance():
+    result = cbm_exn_disturbance_dynamics.disturbance(
+        ["a", "b", "c"],
+        _get_disturbance_matrices(),
+        _get_dm_associations(),
+        True,
+    )
+    assert result.columns.tolist() == [
+        "[parameters.spatial_unit_id]",
+        "[state.disturbance_type]",
+        "[parameters.sw_hw]",
+        "a.a",
+        "a.b",
+        "a.c",
+        "b.b",
+        "b.c",
+        "c.c",
+    ]
+    assert np.allclose(
+        result["a.b"].to_numpy(), [0.0, 0.4, 0.4, 0.0]
+    ) and np.allclose(result["b.b"].to_numpy(), [0.5, 1.0, 1.0, 0.5])
+
+
+def test_compact_disturbance_missing_matrix_error():
+    dm_associations = _get_dm_associations()
+    dm_associations.loc[0, "disturbance_matrix_id"] = 99
+    with pytest.raises(ValueError):
+        cbm_exn_disturbance_dynamics.compact_disturbance(
+            ["a", "b", "c"],
+            _get_disturbance_matrices(),
+            dm_associations,
+            False,
+        )
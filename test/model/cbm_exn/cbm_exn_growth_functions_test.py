@@ -0,0 +1,128 @@
+import pytest
+import numpy as np
+import pandas as pd
+from libcbm.model.cbm_exn import cbm_exn_growth_functions
+from libcbm.model.model_definition.model_variables import ModelVariables
+
+
+def _get_root_parameters() -> dict[str, float]:
+    return {
+        "hw_a": 1.576,
+        "sw_a": 0.222,
+        "hw_b": 0.615,
+        "frp_a": 0.072,
+        "frp_b": 0.354,
+        "frp_c": -0.06021195,
+        "biomass_to_carbon_rate": 0.5,
+    }
+
+
+def _get_turnover_parameters() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "spatial_unit_id": [1, 1, 2, 2],
+            "sw_hw": [0, 1, 0, 1],
+            "OtherToBranchSnagSplit": [0.25, 0.3, 0.35, 0.4],
+            "CoarseRootAGSplit": [0.5, 0.45, 0.4, 0.35],
+            "FineRootAGSplit": [0.5, 0.55, 0.6, 0.65],
+        }
+    )
+
+
+def _get_cbm_vars() -> ModelVariables:
+    return ModelVariables.from_pandas(
+        {
+            "pools": pd.DataFrame(
+                {
+                    "Merch": [10.0, 20.0, 30.0, 0.0],
+                    "Foliage": [2.0, 3.0, 4.0, 0.0],
+                    "Other": [5.0, 6.0, 7.0, 0.0],
+                    "FineRoots": [1.0, 1.5, 2.0, 0.0],
+                    "CoarseRoots": [3.0, 4.0, 5.0, 0.0],
+                }
+            ),
+            "state": pd.DataFrame(
+                {"sw_hw": [0, 1, 1, 0], "spatial_unit_id": [2, 1, 2, 1]}
+            ),
+            "parameters": pd.DataFrame(
+                {
+                    "merch_inc": [1.0, -8.0, 0.5, 0.2],
+                    "foliage_inc": [0.1, -1.0, -0.1, 0.1],
+                    "other_inc": [0.2, -3.0, 0.1, 0.1],
+                }
+            ),
+        }
+    )
+
+
+def test_prepare_growth_info():
+    root_parameters = _get_root_parameters()
+    growth_info = cbm_exn_growth_functions.prepare_growth_info(
+        _get_cbm_vars(), _get_turnover_parameters(), root_parameters
+    )
+    merch = np.array([10.0, 20.0, 30.0, 0.0])
+    foliage = np.array([2.0, 3.0, 4.0, 0.0])
+    other = np.array([5.0, 6.0, 7.0, 0.0])
+    fine_root = np.array([1.0, 1.5, 2.0, 0.0])
+    coarse_root = np.array([3.0, 4.0, 5.0, 0.0])
+    sw_hw = np.array([0, 1, 1, 0])
+    merch_inc = np.array([1.0, -8.0, 0.5, 0.2])
+    foliage_inc = np.array([0.1, -1.0, -0.1, 0.1])
+    other_inc = np.array([0.2, -3.0, 0.1, 0.1])
+    rate = root_parameters["biomass_to_carbon_rate"]
+    total_ag_bio = (
+        merch + merch_inc + foliage + foliage_inc + other + other_inc
+    )
+    total_root_bio = np.where(
+        sw_hw,
+        root_parameters["hw_a"]
+        * np.power(total_ag_bio / rate, root_parameters["hw_b"]),
+        root_parameters["sw_a"] * total_ag_bio / rate,
+    )
+    fine_root_prop = root_parameters["frp_a"] + root_parameters[
+        "frp_b"
+    ] * np.exp(root_parameters["frp_c"] * total_root_bio)
+    coarse_root_inc = (
+        total_root_bio * (1 - fine_root_prop) * rate - coarse_root
+    )
+    fine_root_inc = total_root_bio * fine_root_prop * rate - fine_root
+    assert np.array_equal(growth_info["coarse_root_inc"], coarse_root_inc)
+    assert np.array_equal(growth_info["fine_root_inc"], fine_root_inc)
+
+    # only the second row is in overmature decline, and its splits are
+    # those of spatial unit 1, hardwood
+    expected = {
+        "merch_to_stem_snag_prop": 8.0 / 20.0,
+        "other_to_branch_snag_prop": 3.0 * 0.3 / 6.0,
+        "other_to_ag_fast_prop": 3.0 * (1 - 0.3) / 6.0,
+        "foliage_to_ag_fast_prop": 1.0 / 3.0,
+        "coarse_root_to_ag_fast_prop": (
+            -coarse_root_inc[1] * 0.45 / 4.0 if coarse_root_inc[1] < 0 else 0.0
+        ),
+        "coarse_root_to_bg_fast_prop": (
+            -coarse_root_inc[1] * (1 - 0.45) / 4.0
+            if coarse_root_inc[1] < 0
+            else 0.0
+        ),
+        "fine_root_to_ag_vfast_prop": (
+            -fine_root_inc[1] * 0.55 / 1.5 if fine_root_inc[1] < 0 else 0.0
+        ),
+        "fine_root_to_bg_vfast_prop": (
+            -fine_root_inc[1] * (1 - 0.55) / 1.5
+            if fine_root_inc[1] < 0
+            else 0.0
+        ),
+    }
+    for name, value in expected.items():
+        assert growth_info[name][[0, 2, 3]].tolist() == [0.0, 0.0, 0.0]
+        assert growth_info[name][1] == pytest.approx(value)
+
+
+def test_prepare_growth_info_missing_turnover_parameters():
+    turnover_parameters = _get_turnover_parameters()
+    with pytest.raises(ValueError):
+        cbm_exn_growth_functions.prepare_growth_info(
+            _get_cbm_vars(),
+            turnover_parameters[turnover_parameters["spatial_unit_id"] == 1],
+            _get_root_parameters(),
+        )
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import pytest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.model.cbm_exn import cbm_exn_model
+from libcbm.model.cbm_exn import cbm_exn_parameters
+from libcbm.model.cbm_exn import cbm_exn_spinup
+from libcbm.model.cbm_exn import cbm_exn_growth_functions
+from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm.model.cbm_exn.parameters import parameter_extraction
+from libcbm.model.model_definition.spinup_cache import SpinupCache
+from libcbm import resources
+
+
+def _get_spinup_input() -> dict[str, pd.DataFrame]:
+    # rows 0 and 2 are identical apart from area, and rows 1 and 3 share
+    # parameters but not increments
+    return {
+        "parameters": pd.DataFrame(
+            {
+                "age": [10, 25, 10, 25],
+                "area": [1, 1, 5, 1],
+                "delay": [0, 0, 0, 0],
+                "return_interval": [150, 100, 150, 100],
+                "min_rotations": [10, 10, 10, 10],
+                "max_rotations": [30, 30, 30, 30],
+                "spatial_unit_id": [1, 1, 1, 1],
+                "species": [1, 1, 1, 1],
+                "mean_annual_temperature": [-1.0, 2.0, -1.0, 2.0],
+                "historical_disturbance_type": [1, 1, 1, 1],
+                "last_pass_disturbance_type": [1, 1, 1, 1],
+            }
+        ),
+        "increments": pd.DataFrame(
+            {
+                "row_idx": [i for i in range(4) for _ in range(7)],
+                "age": [1, 2, 3, 4, 5, 6, 7] * 4,
+                "merch_inc": [0.1] * 21 + [0.2] * 7,
+                "other_inc": [0.1] * 28,
+                "foliage_inc": [0.1] * 28,
+            }
+        ),
+    }
+
+
+def test_spinup_deduplicate_and_cache():
+    with tempfile.TemporaryDirectory() as tempdir:
+        cache_dir = os.path.join(tempdir, "cache")
+        parameter_extraction.extract(
+            resources.get_cbm_defaults_path(), tempdir, locale_code="en-CA"
+        )
+        with cbm_exn_model.initialize(config_path=tempdir) as model:
+            expected = model.spinup(_get_spinup_input())
+            results = [
+                model.spinup(_get_spinup_input(), deduplicate=True),
+                model.spinup(
+                    _get_spinup_input(),
+                    cache=SpinupCache(cache_dir, "test"),
+                ),
+                model.spinup(
+                    _get_spinup_input(),
+                    cache=SpinupCache(cache_dir, "test"),
+                ),
+            ]
+        for result in results:
+            for name in ["pools", "state"]:
+                assert_frame_equal(result[name], expected[name])
+        assert not expected["pools"].iloc[1].equals(expected["pools"].iloc[3])
+
+
+def test_spinup_deduplicate_error_with_ops():
+    with tempfile.TemporaryDirectory() as tempdir:
+        parameter_extraction.extract(
+            resources.get_cbm_defaults_path(), tempdir, locale_code="en-CA"
+        )
+        with cbm_exn_model.initialize(config_path=tempdir) as model:
+            with pytest.raises(ValueError):
+                model.spinup(_get_spinup_input(), ops=[], deduplicate=True)
+
+
+def test_spinup_fused_operations_match_sequential_operations():
+    with tempfile.TemporaryDirectory() as tempdir:
+        parameter_extraction.extract(
+            resources.get_cbm_defaults_path(), tempdir, locale_code="en-CA"
+        )
+        # without flux, runs of time-invariant operations are fused
+        with cbm_exn_model.initialize(
+            config_path=tempdir, fuse_operations=True
+        ) as model:
+            fused = model.spinup(_get_spinup_input())
+        # by default no operations are fused
+        with cbm_exn_model.initialize(config_path=tempdir) as model:
+            expected = model.spinup(_get_spinup_input())
+    assert_frame_equal(fused["pools"], expected["pools"], rtol=1e-10)
+    assert_frame_equal(fused["state"], expected["state"])
+
+
+def test_prepare_spinup_growth_info_shares_growth_curves():
+    spinup_input = _get_spinup_input()
+    spinup_input["parameters"]["spatial_unit_id"] = [1, 1, 1, 3]
+    # the zero increment of row 1 at age 7 is equivalent to the missing
+    # increment of row 0, row 2 has a different increment at age 7, and
+    # row 3 has the curve of row 0 in a different spatial unit
+    increments = pd.DataFrame(
+        {
+            "row_idx": [0] * 6 + [1] * 7 + [2] * 7 + [3] * 6,
+            "age": [1, 2, 3, 4, 5, 6]
+            + [1, 2, 3, 4, 5, 6, 7] * 2
+            + [1, 2, 3, 4, 5, 6],
+        }
+    )
+    for name in ["merch_inc", "other_inc", "foliage_inc"]:
+        increments[name] = 0.1
+    increments.loc[12, "merch_inc"] = 0.0
+    increments.loc[12, "other_inc"] = 0.0
+    increments.loc[12, "foliage_inc"] = 0.0
+    increments.loc[19, "merch_inc"] = 0.2
+    spinup_input["increments"] = increments
+
+    parameters = cbm_exn_parameters.parameters_factory(
+        resources.get_cbm_exn_parameters_dir()
+    )
+    spinup_vars = cbm_exn_spinup.prepare_spinup_vars(
+        ModelVariables.from_pandas(spinup_input), parameters
+    )
+    growth_info = cbm_exn_growth_functions.prepare_spinup_growth_info(
+        spinup_vars,
+        parameters.get_turnover_parameters(),
+        parameters.get_root_parameters(),
+    )
+    growth_curve_id = spinup_vars["state"]["growth_curve_id"].to_numpy()
+    assert growth_curve_id[0] == growth_curve_id[1]
+    assert len(set(growth_curve_id.tolist())) == 3
+    n_ages = 8
+    assert growth_info["growth_curve_id"].tolist() == [
+        i for i in range(3) for _ in range(n_ages)
+    ]
+    merch_inc = growth_info["merch_inc"].reshape(3, n_ages)
+    assert merch_inc[growth_curve_id[0]].tolist() == [0.1] * 6 + [0.0] * 2
+    assert merch_inc[growth_curve_id[2]][6] == 0.2
@@ -0,0 +1,166 @@
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.model.cbm_exn import cbm_exn_model
+from libcbm.model.cbm_exn import cbm_exn_step
+from libcbm.model.cbm_exn.parameters import parameter_extraction
+from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm import resources
+
+
+def _get_spinup_input(n_stands: int) -> dict[str, pd.DataFrame]:
+    return {
+        "parameters": pd.DataFrame(
+            {
+                "age": np.arange(n_stands) * 10,
+                "area": [1] * n_stands,
+                "delay": [0] * n_stands,
+                "return_interval": [150] * n_stands,
+                "min_rotations": [10] * n_stands,
+                "max_rotations": [30] * n_stands,
+                "spatial_unit_id": [1] * n_stands,
+                "species": [1] * n_stands,
+                "mean_annual_temperature": [-1.0] * n_stands,
+                "historical_disturbance_type": [1] * n_stands,
+                "last_pass_disturbance_type": [1] * n_stands,
+            }
+        ),
+        "increments": pd.DataFrame(
+            {
+                "row_idx": [i for i in range(n_stands) for _ in range(7)],
+                "age": [1, 2, 3, 4, 5, 6, 7] * n_stands,
+                "merch_inc": [0.1] * 7 * n_stands,
+                "other_inc": [0.1] * 7 * n_stands,
+                "foliage_inc": [0.1] * 7 * n_stands,
+            }
+        ),
+    }
+
+
+def _run_steps(
+    model: cbm_exn_model.CBMEXNModel, sparse_disturbance: bool
+) -> list[dict[str, pd.DataFrame]]:
+    n_stands = 8
+    cbm_vars = ModelVariables.from_pandas(
+        model.spinup(_get_spinup_input(n_stands))
+    )
+    disturbances = [{1: 1, 5: 4}, {}, {0: 1, 1: 1, 7: 1}]
+    results = []
+    for step_disturbances in disturbances:
+        disturbance_type = np.zeros(n_stands, dtype="int32")
+        for idx, disturbance_type_id in step_disturbances.items():
+            disturbance_type[idx] = disturbance_type_id
+        cbm_vars["parameters"]["disturbance_type"].assign(disturbance_type)
+        cbm_vars["parameters"]["mean_annual_temperature"].assign(-1.0)
+        for name in ["merch_inc", "foliage_inc", "other_inc"]:
+            cbm_vars["parameters"][name].assign(0.1)
+        cbm_vars = model.step(cbm_vars, sparse_disturbance=sparse_disturbance)
+        results.append(
+            {k: cbm_vars[k].to_pandas().copy() for k in ["pools", "flux"]}
+        )
+    return results
+
+
+def test_sparse_disturbance_matches_step():
+    with tempfile.TemporaryDirectory() as tempdir:
+        parameter_extraction.extract(
+            resources.get_cbm_defaults_path(), tempdir, locale_code="en-CA"
+        )
+        with cbm_exn_model.initialize(config_path=tempdir) as model:
+            expected = _run_steps(model, sparse_disturbance=False)
+            result = _run_steps(model, sparse_disturbance=True)
+    for step_result, step_expected in zip(result, expected):
+        for name in ["pools", "flux"]:
+            assert_frame_equal(step_result[name], step_expected[name])
+    assert (expected[0]["flux"].iloc[[1, 5]].to_numpy() > 0).any()
+
+
+def test_registered_ops_match_default_ops():
+    static_ops = ["disturbance", "snag_turnover", "biomass_turnover"]
+
+    def _run(model, explicit_ops: bool) -> list[dict[str, pd.DataFrame]]:
+        cbm_vars = ModelVariables.from_pandas(
+            model.spinup(_get_spinup_input(4))
+        )
+        cbm_vars["parameters"]["disturbance_type"].assign(0)
+        results = []
+        wrappers = None
+        native_ops = None
+        for temperature in [-1.0, -1.0, 2.0]:
+            cbm_vars["parameters"]["mean_annual_temperature"].assign(
+                temperature
+            )
+            ops = (
+                cbm_exn_step.get_default_ops(model.parameters, cbm_vars)
+                if explicit_ops
+                else None
+            )
+            cbm_vars = cbm_exn_step.step(model, cbm_vars, ops)
+            results.append(
+                {k: cbm_vars[k].to_pandas().copy() for k in ["pools", "flux"]}
+            )
+            step_wrappers = [
+                model.matrix_ops._op_wrappers[name] for name in static_ops
+            ]
+            step_native_ops = [w._op for w in step_wrappers]
+            assert all(op is not None for op in step_native_ops)
+            if wrappers is not None:
+                # static ops, and the native operations they hold, are kept
+                # across steps only when registered
+                assert all(
+                    (a is b) != explicit_ops
+                    for a, b in zip(wrappers, step_wrappers)
+                )
+                assert all(
+                    (a is b) != explicit_ops
+                    for a, b in zip(native_ops, step_native_ops)
+                )
+            wrappers = step_wrappers
+            native_ops = step_native_ops
+        return results
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        parameter_extraction.extract(
+            resources.get_cbm_defaults_path(), tempdir, locale_code="en-CA"
+        )
+        with cbm_exn_model.initialize(config_path=tempdir) as model:
+            expected = _run(model, explicit_ops=True)
+            result = _run(model, explicit_ops=False)
+    for step_result, step_expected in zip(result, expected):
+        for name in ["pools", "flux"]:
+            assert_frame_equal(step_result[name], step_expected[name])
+
+
+def test_arrow_tables_match_pandas():
+    pyarrow = pytest.importorskip("pyarrow")
+
+    def _to_arrow(frames: dict[str, pd.DataFrame]) -> dict:
+        return {
+            k: pyarrow.Table.from_pandas(v, preserve_index=False)
+            for k, v in frames.items()
+        }
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        parameter_extraction.extract(
+            resources.get_cbm_defaults_path(), tempdir, locale_code="en-CA"
+        )
+        with cbm_exn_model.initialize(config_path=tempdir) as model:
+            expected = model.spinup(_get_spinup_input(4))
+            result = model.spinup(_to_arrow(_get_spinup_input(4)))
+            for name, table in result.items():
+                assert isinstance(table, pyarrow.Table)
+                assert_frame_equal(table.to_pandas(), expected[name])
+
+            parameters = expected["parameters"]
+            parameters["disturbance_type"] = np.array([0, 1, 0, 4], "int32")
+            parameters["mean_annual_temperature"] = -1.0
+            for name in ["merch_inc", "foliage_inc", "other_inc"]:
+                parameters[name] = 0.1
+            # arrow tables may share memory with the pandas dataframes
+            step_input = _to_arrow({k: v.copy() for k, v in expected.items()})
+            expected = model.step(expected)
+            result = model.step(step_input)
+    for name, table in result.items():
+        assert_frame_equal(table.to_pandas(), expected[name])
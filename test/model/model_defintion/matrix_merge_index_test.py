@@ -87,3 +87,68 @@ def test_merge_error_fill_value_out_of_range():
         m.merge({"a": np.array([1.0]), "b": np.array([1])}, fill_value=3)
     with pytest.raises(ValueError):
         m.merge({"a": np.array([1.0]), "b": np.array([1])}, fill_value=1000)
+
+
+@pytest.mark.parametrize(
+    "n_keys,key_range",
+    [
+        # small packed key space: lookup table
+        (2, 10),
+        # large packed key space: binary search of the packed keys
+        (2, 10**8),
+        (12, 10),
+        # packed key space exceeds int64: dense key id encoding
+        (3, 10**9),
+    ],
+)
+def test_merge_many_keys(n_keys, key_range):
+    rng = np.random.default_rng(1)
+    key_data = {
+        f"k{i}": rng.integers(-key_range, key_range, size=200)
+        for i in range(n_keys)
+    }
+    m = MatrixMergeIndex(200, key_data)
+    merge_rows = rng.integers(0, 200, size=1000)
+    merge_data = {k: v[merge_rows] for k, v in key_data.items()}
+    result = m.merge(merge_data)
+    # where key rows are duplicated the last occurrence is matched
+    expected = {tuple(v[i] for v in key_data.values()): i for i in range(200)}
+    assert result.tolist() == [
+        expected[tuple(v[i] for v in merge_data.values())] for i in range(1000)
+    ]
+
+
+def test_merge_duplicate_keys_and_non_integer_merge_values():
+    m = MatrixMergeIndex(
+        4,
+        {
+            "a": np.array([1, 2, 1, 3], dtype="int64"),
+            "b": np.array([5, 5, 5, 6], dtype="int64"),
+        },
+    )
+    result = m.merge(
+        {"a": np.array([1.0, 1.5, 3.0]), "b": np.array([5, 5, 6])},
+        fill_value=1,
+    )
+    assert result.tolist() == [2, 1, 3]
+
+
+def test_merge_float_keys():
+    m = MatrixMergeIndex(
+        4,
+        {
+            "t": np.array([-1.5, 0.0, 2.25, np.nan]),
+            "s": np.array([1, 1, 2, 1], dtype="int32"),
+        },
+        float_keys=["t"],
+    )
+    result = m.merge(
+        {
+            "t": np.array([2.25, -0.0, np.nan, -1.5, -1.5, 2.0]),
+            "s": np.array([2, 1, 1, 1, 2, 1]),
+        },
+        fill_value=0,
+    )
+    assert result.tolist() == [2, 1, 3, 0, 0, 0]
+    with pytest.raises(ValueError):
+        m.merge({"t": np.array([-1.4]), "s": np.array([1])})
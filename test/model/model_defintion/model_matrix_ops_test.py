@@ -0,0 +1,363 @@
+import numpy as np
+import pandas as pd
+from libcbm.model.model_definition import model
+from libcbm.model.model_definition.model_variables import ModelVariables
+
+
+def _compute(cbm_model, model_vars: ModelVariables) -> np.ndarray:
+    model_vars["pools"]["Input"].assign(1.0)
+    model_vars["pools"]["a"].assign(0.0)
+    cbm_model.compute(
+        model_vars,
+        cbm_model.matrix_ops.get_operations(["growth"], model_vars),
+    )
+    return model_vars["pools"]["a"].to_numpy().copy()
+
+
+def test_reindexing_on_changed_keys():
+    n_rows = 6
+    flux_config = [
+        {
+            "name": "growth",
+            "process": "growth",
+            "source_pools": ["Input"],
+            "sink_pools": ["a"],
+        }
+    ]
+    with model.initialize(["Input", "a"], flux_config) as cbm_model:
+        cbm_model.matrix_ops.create_operation(
+            name="growth",
+            op_process_name="growth",
+            op_data=pd.DataFrame(
+                {
+                    "[state.age]": [0, 1, 2, 3],
+                    "Input.a": [0.1, 0.2, 0.3, 0.4],
+                }
+            ),
+            requires_reindexing=True,
+            default_matrix_index=0,
+        )
+        model_vars = ModelVariables.from_pandas(
+            {
+                "pools": pd.DataFrame(
+                    {"Input": np.ones(n_rows), "a": np.zeros(n_rows)}
+                ),
+                "state": pd.DataFrame(
+                    {
+                        "age": np.array([0, 1, 2, 3, 2, 1], dtype="int32"),
+                        "enabled": np.ones(n_rows, dtype="int32"),
+                    }
+                ),
+            }
+        )
+        result = _compute(cbm_model, model_vars)
+        assert np.allclose(result, [0.1, 0.2, 0.3, 0.4, 0.3, 0.2])
+
+        # unchanged keys
+        result = _compute(cbm_model, model_vars)
+        assert np.allclose(result, [0.1, 0.2, 0.3, 0.4, 0.3, 0.2])
+
+        # a subset of changed keys, including one not found in the index
+        age = model_vars["state"]["age"].to_numpy()
+        age[1] = 3
+        age[4] = 99
+        result = _compute(cbm_model, model_vars)
+        assert np.allclose(result, [0.1, 0.4, 0.3, 0.4, 0.1, 0.2])
+
+        # a change in the number of rows
+        model_vars = ModelVariables.from_pandas(
+            {
+                "pools": pd.DataFrame({"Input": np.ones(2), "a": np.zeros(2)}),
+                "state": pd.DataFrame(
+                    {
+                        "age": np.array([2, 1], dtype="int32"),
+                        "enabled": np.ones(2, dtype="int32"),
+                    }
+                ),
+            }
+        )
+        result = _compute(cbm_model, model_vars)
+        assert np.allclose(result, [0.3, 0.2])
+
+
+def test_fused_operations_match_sequential_operations():
+    n_rows = 5
+    pools = ["Input", "a", "b", "c"]
+    flux_config = [
+        {
+            "name": "growth",
+            "process": "growth",
+            "source_pools": ["Input"],
+            "sink_pools": ["a"],
+        }
+    ]
+    ops = [
+        {
+            "name": "growth",
+            "op_process_name": "growth",
+            "op_data": pd.DataFrame(
+                {"[state.age]": [0, 1], "Input.a": [0.5, 1.0]}
+            ),
+            "requires_reindexing": True,
+        },
+        {
+            "name": "keyed",
+            "op_process_name": "growth",
+            "op_data": pd.DataFrame(
+                {
+                    "[state.k]": [1, 2],
+                    "a.a": [0.9, 0.5],
+                    "a.b": [0.1, 0.5],
+                    "b.c": [0.2, 0.0],
+                }
+            ),
+            "requires_reindexing": False,
+        },
+        {
+            "name": "by_row",
+            "op_process_name": "growth",
+            "op_data": pd.DataFrame(
+                {
+                    "b.b": np.linspace(0.5, 0.9, n_rows),
+                    "b.a": np.linspace(0.5, 0.1, n_rows),
+                    "c.a": np.linspace(0.0, 0.4, n_rows),
+                }
+            ),
+            "requires_reindexing": False,
+        },
+        {
+            "name": "single",
+            "op_process_name": "growth",
+            "op_data": pd.DataFrame({"a.c": [0.3], "a.a": [0.7]}),
+            "requires_reindexing": False,
+        },
+    ]
+    op_sequence = ["growth", "keyed", "by_row", "single", "growth", "keyed"]
+
+    def _run(fuse: bool) -> list[np.ndarray]:
+        results = []
+        with model.initialize(pools, flux_config) as cbm_model:
+            for op in ops:
+                cbm_model.matrix_ops.create_operation(**op)
+            model_vars = ModelVariables.from_pandas(
+                {
+                    "pools": pd.DataFrame({p: np.ones(n_rows) for p in pools}),
+                    "state": pd.DataFrame(
+                        {
+                            "age": np.array([0, 1, 0, 1, 1], dtype="int32"),
+                            "k": np.array([1, 2, 2, 1, 1], dtype="int32"),
+                            "enabled": np.ones(n_rows, dtype="int32"),
+                        }
+                    ),
+                }
+            )
+            for _ in range(3):
+                cbm_model.compute(
+                    model_vars,
+                    cbm_model.matrix_ops.get_operations(
+                        op_sequence, model_vars, fuse=fuse
+                    ),
+                )
+                results.append(model_vars["pools"].to_pandas().to_numpy())
+                model_vars["state"]["age"].assign(1)
+        return results
+
+    for result, expected in zip(_run(True), _run(False)):
+        assert np.allclose(result, expected)
+
+
+def test_fused_operation_follows_index_keys():
+    n_rows = 3
+    pools = ["a", "b"]
+    flux_config = [
+        {
+            "name": "growth",
+            "process": "growth",
+            "source_pools": ["a"],
+            "sink_pools": ["b"],
+        }
+    ]
+    with model.initialize(pools, flux_config) as cbm_model:
+        matrix_ops = cbm_model.matrix_ops
+        matrix_ops.create_operation(
+            "keyed",
+            "growth",
+            pd.DataFrame({"[state.k]": [1, 2], "a.b": [0.1, 0.5]}),
+            requires_reindexing=False,
+        )
+        matrix_ops.create_operation(
+            "single",
+            "growth",
+            pd.DataFrame({"b.a": [0.2]}),
+            requires_reindexing=False,
+        )
+        model_vars = ModelVariables.from_pandas(
+            {
+                "pools": pd.DataFrame({p: np.ones(n_rows) for p in pools}),
+                "state": pd.DataFrame(
+                    {
+                        "k": np.array([1, 2, 1], dtype="int32"),
+                        "enabled": np.ones(n_rows, dtype="int32"),
+                    }
+                ),
+            }
+        )
+        op_sequence = ["keyed", "single"]
+        op = matrix_ops.get_operations(op_sequence, model_vars, fuse=True)
+        assert len(op) == 1
+        # the products are re-used while the keys are unchanged
+        assert (
+            matrix_ops.get_operations(op_sequence, model_vars, fuse=True)[0]
+            is op[0]
+        )
+        model_vars["state"]["k"].assign(2)
+        op = matrix_ops.get_operations(op_sequence, model_vars, fuse=True)
+        cbm_model.compute(model_vars, op)
+        # a to b by 0.5, then b to a by 0.2, with unit diagonals
+        assert np.allclose(
+            model_vars["pools"].to_pandas().to_numpy(),
+            [[1.0 + 1.5 * 0.2, 1.5]] * n_rows,
+        )
+
+
+def test_register_operation():
+    n_rows = 3
+    flux_config = [
+        {
+            "name": "growth",
+            "process": "growth",
+            "source_pools": ["Input"],
+            "sink_pools": ["a"],
+        }
+    ]
+    with model.initialize(["Input", "a"], flux_config) as cbm_model:
+        model_vars = ModelVariables.from_pandas(
+            {
+                "pools": pd.DataFrame(
+                    {"Input": np.ones(n_rows), "a": np.zeros(n_rows)}
+                ),
+                "state": pd.DataFrame(
+                    {
+                        "age": np.array([0, 1, 1], dtype="int32"),
+                        "enabled": np.ones(n_rows, dtype="int32"),
+                    }
+                ),
+            }
+        )
+        matrix_ops = cbm_model.matrix_ops
+        op_data = pd.DataFrame({"Input.a": [0.1, 0.2, 0.3]})
+        matrix_ops.register_operation("growth", "growth", op_data)
+        wrapper = matrix_ops._op_wrappers["growth"]
+        assert np.allclose(_compute(cbm_model, model_vars), [0.1, 0.2, 0.3])
+
+        # the same instance is kept as is
+        matrix_ops.register_operation("growth", "growth", op_data)
+        assert matrix_ops._op_wrappers["growth"] is wrapper
+        assert np.allclose(_compute(cbm_model, model_vars), [0.1, 0.2, 0.3])
+
+        # new values are copied into the stored operation
+        op = wrapper.get_operation(model_vars)
+        matrix_ops.register_operation(
+            "growth", "growth", pd.DataFrame({"Input.a": [0.4, 0.5, 0.6]})
+        )
+        assert matrix_ops._op_wrappers["growth"] is wrapper
+        assert np.allclose(_compute(cbm_model, model_vars), [0.4, 0.5, 0.6])
+        assert wrapper.get_operation(model_vars) is op
+
+        # pending values are not copied into an operation which is about to
+        # be re-created for a different number of rows
+        matrix_ops.register_operation(
+            "growth", "growth", pd.DataFrame({"Input.a": [0.5]})
+        )
+        op = wrapper.get_operation(model_vars)
+        matrix_ops.register_operation(
+            "growth", "growth", pd.DataFrame({"Input.a": [0.6]})
+        )
+        n_updates = []
+        op.update_values = lambda *args: n_updates.append(1)
+        model_vars_2 = ModelVariables.from_pandas(
+            {
+                "pools": pd.DataFrame({"Input": np.ones(2), "a": np.zeros(2)}),
+                "state": pd.DataFrame(
+                    {
+                        "age": np.zeros(2, dtype="int32"),
+                        "enabled": np.ones(2, dtype="int32"),
+                    }
+                ),
+            }
+        )
+        assert np.allclose(_compute(cbm_model, model_vars_2), [0.6, 0.6])
+        assert wrapper.get_operation(model_vars_2) is not op
+        assert not n_updates
+
+        # index columns require the operation to be re-created
+        matrix_ops.register_operation(
+            "growth",
+            "growth",
+            pd.DataFrame({"[state.age]": [0, 1], "Input.a": [0.7, 0.8]}),
+        )
+        assert matrix_ops._op_wrappers["growth"] is not wrapper
+        assert np.allclose(_compute(cbm_model, model_vars), [0.7, 0.8, 0.8])
+
+
+def test_matrices_match_op_data():
+    n_rows = 5
+    pools = ["Input", "a", "b"]
+    flux_config = [
+        {
+            "name": "growth",
+            "process": "growth",
+            "source_pools": ["Input"],
+            "sink_pools": ["a"],
+        }
+    ]
+    keys = {"[state.k]": [1, 2, 3, 4]}
+    matrices = pd.DataFrame({"Input.a": [0.5, 0.2], "a.b": [0.1, 0.3]})
+    matrix_index = [1, 0, 0, 1]
+    op_data = pd.concat(
+        [
+            pd.DataFrame(keys),
+            matrices.iloc[matrix_index].reset_index(drop=True),
+        ],
+        axis=1,
+    )
+
+    def _run(op_kwargs: dict, fuse: bool) -> np.ndarray:
+        with model.initialize(pools, flux_config) as cbm_model:
+            cbm_model.matrix_ops.create_operation(
+                name="op",
+                op_process_name="growth",
+                requires_reindexing=False,
+                **op_kwargs,
+            )
+            model_vars = ModelVariables.from_pandas(
+                {
+                    "pools": pd.DataFrame({p: np.ones(n_rows) for p in pools}),
+                    "state": pd.DataFrame(
+                        {
+                            "k": np.array([4, 3, 2, 1, 2], dtype="int32"),
+                            "enabled": np.ones(n_rows, dtype="int32"),
+                        }
+                    ),
+                }
+            )
+            cbm_model.compute(
+                model_vars,
+                cbm_model.matrix_ops.get_operations(
+                    ["op", "op"], model_vars, fuse=fuse
+                ),
+            )
+            return model_vars["pools"].to_pandas().to_numpy()
+
+    expected = _run({"op_data": op_data}, False)
+    for fuse in [False, True]:
+        result = _run(
+            {
+                "op_data": pd.DataFrame(
+                    {**keys, "matrix_index": matrix_index}
+                ),
+                "matrices": matrices,
+            },
+            fuse,
+        )
+        assert np.allclose(result, expected)
@@ -0,0 +1,56 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.storage import dataframe
+from libcbm.storage.backends import BackendType
+from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm.model.model_definition.output_processor import (
+    ModelOutputProcessor,
+)
+
+
+def test_append_results():
+    for backend_type in BackendType:
+        output_processor = ModelOutputProcessor()
+        model_vars = ModelVariables(
+            {
+                "pools": dataframe.convert_dataframe_backend(
+                    dataframe.from_pandas(
+                        pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+                    ),
+                    backend_type,
+                ),
+                "state": dataframe.convert_dataframe_backend(
+                    dataframe.from_pandas(pd.DataFrame({"age": [5, 6]})),
+                    backend_type,
+                ),
+            }
+        )
+        for t in range(1, 4):
+            output_processor.append_results(t, model_vars)
+            # modifying the simulation state after appending does not
+            # affect the stored results
+            model_vars["pools"]["a"].assign(float(t * 10))
+
+        results = output_processor.get_results()
+        assert results["pools"].backend_type == backend_type
+        assert_frame_equal(
+            results["pools"].to_pandas(),
+            pd.DataFrame(
+                {
+                    "identifier": pd.Series([1, 2] * 3, dtype="int64"),
+                    "timestep": pd.Series([1, 1, 2, 2, 3, 3], dtype="int32"),
+                    "a": [1.0, 2.0, 10.0, 10.0, 20.0, 20.0],
+                    "b": [3.0, 4.0] * 3,
+                }
+            ),
+        )
+        assert_frame_equal(
+            results["state"].to_pandas(),
+            pd.DataFrame(
+                {
+                    "identifier": pd.Series([1, 2] * 3, dtype="int64"),
+                    "timestep": pd.Series([1, 1, 2, 2, 3, 3], dtype="int32"),
+                    "age": [5, 6] * 3,
+                }
+            ),
+        )
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.model.model_definition import spinup_cache
+from libcbm.model.model_definition.spinup_cache import SpinupCache
+
+
+def _key_data(values: list) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"a": np.array(values, dtype="float64"), "b": ["x"] * len(values)}
+    )
+
+
+def test_spinup_cache_round_trip():
+    with tempfile.TemporaryDirectory() as tempdir:
+        cache = SpinupCache(tempdir, "test")
+        found, tables = cache.get(_key_data([1.0, 2.0]))
+        assert not found.any() and tables == {}
+        cache.put(
+            _key_data([1.0, np.nan]),
+            {"pools": pd.DataFrame({"p": [10.0, 20.0]})},
+        )
+        assert all(f.endswith(".npz") for f in os.listdir(tempdir))
+
+        # a new instance reads the stored file, and missing values match
+        found, tables = SpinupCache(tempdir, "test").get(
+            _key_data([np.nan, 3.0, 1.0])
+        )
+        assert list(found) == [True, False, True]
+        assert_frame_equal(tables["pools"], pd.DataFrame({"p": [20.0, 10.0]}))
+
+        # stored rows are replaced by rows with the same key
+        cache.put(_key_data([1.0]), {"pools": pd.DataFrame({"p": [30.0]})})
+        found, tables = SpinupCache(tempdir, "test").get(_key_data([1.0]))
+        assert_frame_equal(tables["pools"], pd.DataFrame({"p": [30.0]}))
+
+        found, _ = SpinupCache(tempdir, "other").get(_key_data([1.0]))
+        assert not found.any()
+
+
+def test_spinup_cache_matches_key_values_exactly():
+    with tempfile.TemporaryDirectory() as tempdir:
+        cache = SpinupCache(tempdir, "test")
+        cache.put(_key_data([1.0]), {"pools": pd.DataFrame({"p": [10.0]})})
+        found, _ = cache.get(_key_data([1.0 + 1e-12]))
+        assert not found.any()
+
+
+def test_digest_rows():
+    data = pd.DataFrame({"a": [1.0, 2.0, 1.0], "b": [0.5, np.nan, 0.5]})
+    digests = spinup_cache.digest_rows(data)
+    assert digests[0] == digests[2]
+    assert digests[0] != digests[1]
+    # the column labels are part of the digest
+    assert (
+        spinup_cache.digest_rows(data.rename(columns={"a": "c"}))[0]
+        != digests[0]
+    )
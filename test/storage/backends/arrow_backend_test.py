@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from libcbm.storage import dataframe
+from libcbm.storage import series
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _address(arr: np.ndarray) -> int:
+    return arr.__array_interface__["data"][0]
+
+
+def test_zero_copy_import_and_export():
+    a = np.arange(5, dtype="float64")
+    table = pa.table({"a": a, "b": ["v1", "v2", "v3", "v4", "v5"]})
+    df = dataframe.from_arrow(table)
+    assert _address(df["a"].data) == _address(a)
+
+    exported = df.to_arrow()
+    assert exported.column("a").chunk(0).buffers()[1].address == _address(a)
+    assert exported.column("b").equals(table.column("b"))
+
+    taken = df.take(series.from_list("", [4, -5]))
+    assert taken.at(0) == {"a": 4.0, "b": "v5"}
+    assert taken.at(1) == {"a": 0.0, "b": "v1"}
+    with pytest.raises(IndexError):
+        df.take(series.from_list("", [5]))
+
+
+def test_copy_on_write():
+    table = pa.table({"a": np.arange(5, dtype="int32")})
+    df = dataframe.from_arrow(table)
+    # arrow memory is read only, so it is copied before being modified
+    assert df["a"].to_numpy_ptr()
+    df["a"].assign(0, series.from_list("", [1]))
+    assert df["a"].to_list() == [0, 0, 2, 3, 4]
+    assert table.column("a").to_pylist() == [0, 1, 2, 3, 4]
+
+    # the modified memory is shared with tables exported afterwards
+    a = df["a"].to_numpy()
+    exported = df.to_arrow()
+    assert exported.column("a").chunk(0).buffers()[1].address == _address(a)
+
+
+def test_matrix_is_stored_once():
+    df = dataframe.from_arrow(
+        pa.table({"a": np.zeros(3), "b": np.ones(3), "c": np.ones(3)})
+    )
+    matrix = df.to_numpy()
+    # columns are strided views of the matrix, which are assigned in place
+    # rather than copied out of it
+    df["a"].assign(2.0, series.from_list("", [1]))
+    df["b"].to_numpy()[:] = 3.0
+    assert df.to_numpy() is matrix
+    assert matrix.tolist() == [[0, 3, 1], [2, 3, 1], [0, 3, 1]]
+    assert np.shares_memory(df["c"].to_numpy(), matrix)
+
+    # contiguous buffers are copies of the strided columns
+    assert df["a"].to_numpy_ptr()[1] == 2.0
+    assert df.to_arrow().column("a").to_pylist() == [0.0, 2.0, 0.0]
+    assert df.to_numpy() is matrix
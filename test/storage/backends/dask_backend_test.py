@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.backends import dask_backend
+
+
+def _get_data() -> dict[str, np.ndarray]:
+    return {
+        "a": np.arange(10, dtype="float64"),
+        "b": np.arange(10, 0, -1, dtype="int32"),
+    }
+
+
+def test_partitions():
+    df = dask_backend.from_numpy(_get_data(), partition_size=4)
+    assert df.chunks == (4, 4, 2)
+    assert df.n_partitions == 3
+    assert_frame_equal(
+        df.get_partition(1).to_pandas(),
+        pd.DataFrame(_get_data()).iloc[4:8].reset_index(drop=True),
+    )
+    concat = dataframe.concat_data_frame(
+        [df, df.take(series.range("", 0, 3, 1, "int64", df.backend_type))]
+    )
+    assert concat.chunks == (4, 4, 2, 3)
+    assert concat.n_rows == 13
+
+
+def test_row_operations_across_partitions():
+    df = dask_backend.from_numpy(_get_data(), partition_size=3)
+    expected = pd.DataFrame(_get_data())
+    assert_frame_equal(
+        df.filter(df.evaluate_filter("(a > 2) & (b > 2)")).to_pandas(),
+        expected[(expected.a > 2) & (expected.b > 2)].reset_index(drop=True),
+    )
+    idx = np.array([9, 0, 5, 5, -1])
+    assert_frame_equal(
+        df.take(series.from_numpy("", idx)).to_pandas(),
+        expected.iloc[idx].reset_index(drop=True),
+    )
+    assert_frame_equal(
+        df.sort_values("b").to_pandas(),
+        expected.sort_values("b").reset_index(drop=True),
+    )
+
+
+def test_to_numpy_writes_through():
+    df = dask_backend.from_numpy(_get_data(), partition_size=3)
+    df["a"].assign(
+        series.from_list("", [100.0, 200.0]), series.from_list("", [0, 9])
+    )
+    expected = _get_data()["a"]
+    expected[[0, 9]] = [100.0, 200.0]
+
+    a = df["a"].to_numpy()
+    assert (a == expected).all()
+    a[1] = -1.0
+    assert df["a"].at(1) == -1.0
+
+    # the lazy results of operations are not affected by later changes
+    doubled = df["b"] * 2
+    df["b"].to_numpy()[:] = 0
+    assert doubled.to_list() == list(_get_data()["b"] * 2)
+
+    uniform = dataframe.numeric_dataframe(["x", "y"], 5, df.backend_type)
+    matrix = uniform.to_numpy()
+    matrix[:, 1] = 3.0
+    assert uniform["y"].to_list() == [3.0] * 5
+    assert uniform.to_numpy() is matrix
@@ -0,0 +1,123 @@
+import numpy as np
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.backends import BackendType
+from libcbm.storage.backends import numpy_backend
+
+
+def test_uniform_matrix_layout_conversions():
+    numpy_backend.reset_layout_conversion_counts()
+    df = dataframe.numeric_dataframe(["a", "b", "c"], 4, BackendType.numpy)
+
+    # columns are strided views which are assignable in place, and the
+    # layout of the matrix is never changed for them
+    matrix = df.to_numpy()
+    a = df["a"].to_numpy()
+    a[:] = 1.0
+    df["b"].assign(2.0, series.from_list("", [0, 3]))
+    assert np.shares_memory(a, matrix)
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert df.to_numpy() is matrix
+    assert matrix[:, 0].tolist() == [1.0] * 4
+    assert matrix[:, 1].tolist() == [2.0, 0.0, 0.0, 2.0]
+    matrix[0, 2] = 3.0
+    assert df["c"].at(0) == 3.0
+    assert df["c"].to_numpy()[0] == 3.0
+
+    # a pointer to a strided column refers to a contiguous copy
+    assert df["c"].to_numpy_ptr()[0] == 3.0
+    assert set(numpy_backend.get_layout_conversion_counts().values()) == {0}
+
+    # a column major matrix is converted once for whole matrix access
+    f_df = numpy_backend.NumpyDataFrameFrameBackend(
+        np.asfortranarray(np.ones((3, 2))), ["a", "b"]
+    )
+    assert f_df.to_numpy().flags["C_CONTIGUOUS"]
+    assert f_df.to_numpy().flags["C_CONTIGUOUS"]
+    assert numpy_backend.get_layout_conversion_counts()["row_major"] == 1
+
+    # adding a column splits the matrix into separate columns
+    df.add_column(series.allocate("d", 4, 0, "int32", BackendType.numpy), 3)
+    assert df["a"].to_list() == [1.0] * 4
+    assert numpy_backend.get_layout_conversion_counts()["mixed_columns"] == 1
+
+    numpy_backend.reset_layout_conversion_counts()
+    assert set(numpy_backend.get_layout_conversion_counts().values()) == {0}
+
+
+def _address(arr: np.ndarray) -> int:
+    return arr.__array_interface__["data"][0]
+
+
+def test_append_data_frame_capacity():
+    df = dataframe.numeric_dataframe(["a", "b"], 4, BackendType.numpy)
+    df["a"].assign(series.range("", 0, 4, 1, "float64", BackendType.numpy))
+    rows = df.take(series.from_list("", [3]))
+
+    # the first append allocates spare capacity
+    appended = dataframe.append_data_frame(df, rows)
+    address = _address(appended.to_numpy())
+    assert address != _address(df.to_numpy())
+
+    # later appends use the spare capacity until it is exhausted
+    appended2 = dataframe.append_data_frame(appended, rows)
+    assert _address(appended2.to_numpy()) == address
+    assert appended2["a"].to_list() == [0.0, 1.0, 2.0, 3.0, 3.0, 3.0]
+
+    # an appended dataframe stays valid as a view of the leading rows
+    assert appended.n_rows == 5
+    assert appended["a"].to_list() == [0.0, 1.0, 2.0, 3.0, 3.0]
+    assert _address(appended.to_numpy()) == address
+
+    # appending to it again copies rather than overwriting the rows of the
+    # longer view
+    other = dataframe.append_data_frame(
+        appended, df.take(series.from_list("", [0]))
+    )
+    assert _address(other.to_numpy()) != address
+    assert other["a"].to_list() == [0.0, 1.0, 2.0, 3.0, 3.0, 0.0]
+    assert appended2["a"].to_list() == [0.0, 1.0, 2.0, 3.0, 3.0, 3.0]
+
+    # a copy is made when the spare capacity is exhausted, and the original
+    # dataframe is unchanged
+    appended3 = dataframe.append_data_frame(appended2, appended2.copy())
+    assert _address(appended3.to_numpy()) != address
+    assert appended2["a"].to_list() == [0.0, 1.0, 2.0, 3.0, 3.0, 3.0]
+    appended3["a"].assign(-1.0)
+    assert appended2["a"].to_list() == [0.0, 1.0, 2.0, 3.0, 3.0, 3.0]
+
+    # column access keeps using the spare capacity
+    mixed = dataframe.from_numpy(
+        {"a": np.arange(3, dtype="float64"), "b": np.zeros(3, "int32")}
+    )
+    mixed = dataframe.reserve_data_frame(mixed, 10)
+    a = mixed["a"].to_numpy()
+    for _ in range(7):
+        mixed = dataframe.append_data_frame(
+            mixed, mixed.take(series.from_list("", [0]))
+        )
+    assert _address(mixed["a"].to_numpy()) == _address(a)
+    assert mixed.n_rows == 10
+
+
+def test_append_data_frame_promotes_dtypes():
+    df = dataframe.from_numpy({"a": np.arange(3, dtype="int32")})
+    df = dataframe.reserve_data_frame(df, 10)
+    rows = dataframe.from_numpy({"a": np.array([0.5])})
+    expected = dataframe.concat_data_frame([df, rows])
+    appended = dataframe.append_data_frame(df, rows)
+    assert appended["a"].to_numpy().dtype == expected["a"].to_numpy().dtype
+    assert appended["a"].to_list() == [0.0, 1.0, 2.0, 0.5]
+    # the promoted storage is a copy, so df is still usable
+    assert df["a"].to_list() == [0, 1, 2]
+
+    mixed = dataframe.from_numpy(
+        {"a": np.arange(2, dtype="float64"), "b": np.zeros(2, "int32")}
+    )
+    rows = dataframe.from_numpy(
+        {"a": np.ones(1, "float32"), "b": np.ones(1, "int64")}
+    )
+    appended = dataframe.append_data_frame(mixed, rows)
+    assert appended["a"].to_numpy().dtype == np.float64
+    assert appended["b"].to_numpy().dtype == np.int64
+    assert appended["b"].to_list() == [0, 0, 1]
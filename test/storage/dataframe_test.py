@@ -114,3 +114,45 @@ def test_dataframe_uniform_matrix():
 
         with pytest.raises(KeyError):
             data.map({0: 0})
+
+
+def test_append_data_frame():
+    data = {
+        "a": np.arange(4, dtype="float64"),
+        "b": np.arange(4, dtype="int32"),
+    }
+    for backend_type in BackendType:
+        df = dataframe.convert_dataframe_backend(
+            dataframe.from_numpy(data), backend_type
+        )
+        df = dataframe.reserve_data_frame(df, 6)
+        expected = df.to_pandas()
+        for i in range(3):
+            rows = df.take(series.from_list("", [i, 0]))
+            expected = pd.concat(
+                [expected, rows.to_pandas()], ignore_index=True
+            )
+            df = dataframe.append_data_frame(df, rows)
+            pd.testing.assert_frame_equal(df.to_pandas(), expected)
+
+
+def test_assign_rows():
+    for backend_type in BackendType:
+        dst = dataframe.convert_dataframe_backend(
+            dataframe.from_numpy(
+                {"a": np.zeros(4, "float64"), "b": np.zeros(4, "int32")}
+            ),
+            backend_type,
+        )
+        src = dataframe.convert_dataframe_backend(
+            dataframe.from_numpy(
+                {"a": np.array([1.5, 2.5]), "b": np.array([1, 2], "int32")}
+            ),
+            backend_type,
+        )
+        indices = dataframe.convert_series_backend(
+            series.from_list("", [3, 1]), backend_type
+        )
+        dataframe.assign_rows(src, dst, indices)
+        assert dst["a"].to_list() == [0.0, 2.5, 0.0, 1.5]
+        assert dst["b"].to_list() == [0, 2, 0, 1]
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.storage import dataframe
+from libcbm.storage.backends import BackendType
+from libcbm.storage.output_sink import InMemorySink
+from libcbm.storage.output_sink import ParquetSink
+
+
+def _make_chunk(timestep: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "identifier": pd.Series([1, 2], dtype="int64"),
+            "timestep": pd.Series([timestep, timestep], dtype="int64"),
+            "a": [1.0 * timestep, 2.0 * timestep],
+            "b": ["x", "y"],
+        }
+    )
+
+
+def _expected(n_steps: int) -> pd.DataFrame:
+    return pd.concat(
+        [_make_chunk(t) for t in range(n_steps)], ignore_index=True
+    )
+
+
+def test_in_memory_sink():
+    for backend_type in BackendType:
+        sink = InMemorySink(backend_type)
+        assert sink.get("a") is None
+        for t in range(3):
+            sink.append("a", t, dataframe.from_pandas(_make_chunk(t)))
+        result = sink.get("a")
+        assert result.backend_type == backend_type
+        assert_frame_equal(result.to_pandas(), _expected(3))
+        # repeated reads do not re-concatenate
+        assert sink.get("a") is result
+        sink.append("a", 3, dataframe.from_pandas(_make_chunk(3)))
+        assert_frame_equal(sink.get("a").to_pandas(), _expected(4))
+
+
+@pytest.mark.parametrize("partition_by", ["timestep", None])
+def test_parquet_sink(partition_by):
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as tempdir:
+        sink = ParquetSink(tempdir, partition_by=partition_by)
+        assert sink.get("a") is None
+        for t in range(3):
+            sink.append("a", t, dataframe.from_pandas(_make_chunk(t)))
+            sink.append("b", t, dataframe.from_pandas(_make_chunk(t)))
+        assert_frame_equal(sink.get("a").to_pandas(), _expected(3))
+        if partition_by == "timestep":
+            sink.append("a", 3, dataframe.from_pandas(_make_chunk(3)))
+            assert_frame_equal(sink.get("a").to_pandas(), _expected(4))
+        else:
+            with pytest.raises(ValueError):
+                sink.append("a", 3, dataframe.from_pandas(_make_chunk(3)))
+        sink.close()
+        assert_frame_equal(sink.get("b").to_pandas(), _expected(3))
+
+
+def test_parquet_sink_error_on_unknown_partition():
+    with tempfile.TemporaryDirectory() as tempdir:
+        with pytest.raises(ValueError):
+            ParquetSink(tempdir, partition_by="spatial_unit")
+
+
+@pytest.mark.parametrize("partition_by", ["timestep", None])
+def test_parquet_sink_promotes_differing_column_types(partition_by):
+    pytest.importorskip("pyarrow")
+    chunks = [_make_chunk(0), _make_chunk(1)]
+    # an integer column which becomes float once a NaN value appears
+    chunks[0]["c"] = pd.Series([1, 2], dtype="int64")
+    chunks[1]["c"] = [3.0, float("nan")]
+    expected = pd.concat(chunks, ignore_index=True)
+    with tempfile.TemporaryDirectory() as tempdir:
+        sink = ParquetSink(tempdir, partition_by=partition_by)
+        for t, chunk in enumerate(chunks):
+            sink.append("a", t, dataframe.from_pandas(chunk))
+        assert_frame_equal(sink.get("a").to_pandas(), expected)
+
+
+def test_parquet_sink_single_file_promotes_and_finalizes():
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as tempdir:
+        sink = ParquetSink(tempdir, partition_by=None)
+        sink.append("a", 1, dataframe.from_pandas(pd.DataFrame({"a": [1, 2]})))
+        sink.append(
+            "a", 2, dataframe.from_pandas(pd.DataFrame({"a": [1.5, np.nan]}))
+        )
+        sink.append("a", 3, dataframe.from_pandas(pd.DataFrame({"a": [3]})))
+        assert_frame_equal(
+            sink.get("a").to_pandas(),
+            pd.DataFrame({"a": [1.0, 2.0, 1.5, np.nan, 3.0]}),
+        )
+        assert os.listdir(tempdir) == ["a.parquet"]
+        with pytest.raises(ValueError):
+            sink.append(
+                "a", 4, dataframe.from_pandas(pd.DataFrame({"a": [4]}))
+            )
@@ -46,3 +46,45 @@ class LibCBMOperationTest(unittest.TestCase):
                 )
             ).all()
         )
+
+    def test_update_values(self):
+        pool_dict = {"a": 0, "b": 1}
+        pooldef = pool_flux_helpers.create_pools(list(pool_dict.keys()))
+        dll = pool_flux_helpers.load_dll(
+            {"pools": pooldef, "flux_indicators": []}
+        )
+        op = libcbm_operation.Operation(
+            dll,
+            libcbm_operation.OperationFormat.RepeatingCoordinates,
+            data=[
+                [pool_dict["a"], pool_dict["b"], np.array([2.0, 3.0])],
+                [pool_dict["b"], pool_dict["b"], 1.0],
+            ],
+            matrix_index=np.array([0, 1, 1], dtype=np.uint64),
+            op_process_id=0,
+        )
+
+        def _compute() -> np.ndarray:
+            pools = dataframe.from_numpy({"a": np.ones(3), "b": np.zeros(3)})
+            libcbm_operation.compute(dll, pools, [op])
+            return pools["b"].to_numpy()
+
+        self.assertTrue((_compute() == [2.0, 3.0, 3.0]).all())
+
+        # any memory layout is accepted
+        op.update_values(np.asfortranarray([[4.0, 1.0], [5.0, 1.0]]))
+        self.assertTrue((_compute() == [4.0, 5.0, 5.0]).all())
+
+        op.update_index(np.array([1, 0, 0], dtype=np.uint64))
+        op.update_values(np.array([[6.0, 1.0], [7.0, 1.0]]))
+        self.assertTrue((_compute() == [7.0, 6.0, 6.0]).all())
+
+        # the index can be replaced along with the values
+        op.update_values(
+            np.array([[8.0, 1.0], [9.0, 1.0]]),
+            np.array([0, 1, 0], dtype=np.uint64),
+        )
+        self.assertTrue((_compute() == [8.0, 9.0, 8.0]).all())
+
+        with self.assertRaises(ValueError):
+            op.update_values(np.ones((3, 2)))